@@ -0,0 +1,206 @@
+"""Compact address value types shared by the scanner, OUI and Snipe-IT code."""
+
+import re
+from string import hexdigits
+from typing import Iterable, Optional, Union
+
+# Separators accepted between MAC address groups
+_MAC_SEPARATORS = re.compile(r"[:\-.]")
+
+# Bits per group for each supported grouping: bare hex, Cisco dotted, octets
+_MAC_GROUP_BITS = {1: 48, 3: 16, 6: 8}
+
+_HEX_DIGITS = frozenset(hexdigits)
+
+_MAC_MAX = (1 << 48) - 1
+
+
+def _parse_mac(text: str) -> int:
+    """Parse a textual MAC address into its 48-bit integer value.
+
+    Accepts colon, dash or dot separated groups (one to two hex digits
+    per octet, or four per Cisco group) and bare hex strings. Octets with
+    dropped leading zeros, as printed by macOS, are accepted.
+
+    Args:
+        text: MAC address in any common format.
+
+    Returns:
+        Integer value of the address.
+
+    Raises:
+        ValueError: The text is not a MAC address.
+    """
+    groups = _MAC_SEPARATORS.split(text.strip())
+    bits = _MAC_GROUP_BITS.get(len(groups))
+    # Three groups only in Cisco notation, so an 'AA:BB:CC' prefix is rejected
+    if bits is None or (bits == 16 and "." not in text):
+        raise ValueError(f"Invalid MAC address: {text!r}")
+    # Bare hex must spell out every digit, so an 'AABBCC' prefix is rejected
+    if bits == 48 and len(groups[0]) != 12:
+        raise ValueError(f"Invalid MAC address: {text!r}")
+
+    value = 0
+    for group in groups:
+        if not group or len(group) * 4 > bits or not _HEX_DIGITS.issuperset(group):
+            raise ValueError(f"Invalid MAC address: {text!r}")
+        value = (value << bits) | int(group, 16)
+    return value
+
+
+class MacAddress:
+    """A 48-bit MAC address stored as an integer.
+
+    Instances are immutable and hashable; equality and ordering are
+    integer comparisons. The canonical 'AA:BB:CC:DD:EE:FF' text is built
+    on first use and cached.
+
+    A MacAddress never equals a string; wrap text in MacAddress to compare
+    it, so equality stays consistent with hashing.
+    """
+
+    __slots__ = ("_value", "_text")
+
+    _value: int
+    _text: Optional[str]
+
+    def __init__(self, value: Union["MacAddress", int, str, bytes]) -> None:
+        """Create a MAC address.
+
+        Args:
+            value: Another MacAddress, a 48-bit integer, 6 raw bytes or text
+                in any common notation.
+
+        Raises:
+            ValueError: The value is out of range or not a MAC address.
+            TypeError: The value has an unsupported type.
+        """
+        self._text = None
+
+        if isinstance(value, MacAddress):
+            self._value = value._value
+            self._text = value._text
+        elif isinstance(value, str):
+            self._value = _parse_mac(value)
+        elif isinstance(value, (bytes, bytearray)):
+            if len(value) != 6:
+                raise ValueError(f"MAC address needs 6 bytes, got {len(value)}")
+            self._value = int.from_bytes(value, "big")
+        elif isinstance(value, int) and not isinstance(value, bool):
+            if not 0 <= value <= _MAC_MAX:
+                raise ValueError(f"MAC address out of range: {value}")
+            self._value = value
+        else:
+            raise TypeError(f"Cannot make a MAC address from {type(value).__name__}")
+
+    @classmethod
+    def parse(
+        cls, value: Optional[Union["MacAddress", int, str, bytes]]
+    ) -> Optional["MacAddress"]:
+        """Create a MAC address, returning None for blank or invalid input.
+
+        Args:
+            value: Anything accepted by the constructor, or None.
+
+        Returns:
+            MacAddress, or None if the value is empty or not a MAC address.
+        """
+        if value is None or (isinstance(value, str) and not value.strip()):
+            return None
+        try:
+            return cls(value)
+        except (TypeError, ValueError):
+            return None
+
+    @property
+    def oui(self) -> int:
+        """The 24-bit Organizationally Unique Identifier prefix."""
+        return self._value >> 24
+
+    @property
+    def packed(self) -> bytes:
+        """The address as 6 raw bytes."""
+        return self._value.to_bytes(6, "big")
+
+    @property
+    def is_multicast(self) -> bool:
+        """True for group addresses, including broadcast."""
+        return bool(self._value & (1 << 40))
+
+    @property
+    def is_unicast(self) -> bool:
+        """True for usable unicast addresses (not zero, broadcast or multicast)."""
+        return self._value != 0 and not self.is_multicast
+
+    def __int__(self) -> int:
+        return self._value
+
+    def __str__(self) -> str:
+        if self._text is None:
+            hex_value = f"{self._value:012X}"
+            self._text = ":".join(hex_value[i : i + 2] for i in range(0, 12, 2))
+        return self._text
+
+    def __repr__(self) -> str:
+        return f"MacAddress('{self}')"
+
+    def __hash__(self) -> int:
+        return hash(self._value)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, MacAddress):
+            return NotImplemented
+        return self._value == other._value
+
+    def __lt__(self, other: object) -> bool:
+        if not isinstance(other, MacAddress):
+            return NotImplemented
+        return self._value < other._value
+
+    def __le__(self, other: object) -> bool:
+        if not isinstance(other, MacAddress):
+            return NotImplemented
+        return self._value <= other._value
+
+    def __gt__(self, other: object) -> bool:
+        if not isinstance(other, MacAddress):
+            return NotImplemented
+        return self._value > other._value
+
+    def __ge__(self, other: object) -> bool:
+        if not isinstance(other, MacAddress):
+            return NotImplemented
+        return self._value >= other._value
+
+
+def parse_mac_values(
+    values: Iterable[Optional[Union[MacAddress, int, str, bytes]]],
+) -> list[Optional[int]]:
+    """Parse many MAC addresses to their integer values at once.
+
+    Colon or dash separated octets, as in ARP tables and router dumps, are
+    converted without building MacAddress objects; other notations go
+    through MacAddress.parse.
+
+    Args:
+        values: Anything accepted by MacAddress.parse.
+
+    Returns:
+        Integer value of each address in input order, None where invalid.
+    """
+    parsed: list[Optional[int]] = []
+    append = parsed.append
+    for value in values:
+        if isinstance(value, MacAddress):
+            append(value._value)
+            continue
+        if isinstance(value, str) and len(value) == 17:
+            separator = value[2]
+            if separator in ":-" and value[2::3] == separator * 5:
+                compact = value.replace(separator, "")
+                if len(compact) == 12 and _HEX_DIGITS.issuperset(compact):
+                    append(int(compact, 16))
+                    continue
+        mac = MacAddress.parse(value)
+        append(mac._value if mac is not None else None)
+    return parsed
@@ -27,8 +27,16 @@ def cli(ctx: click.Context, verbose: bool) -> None:
 @click.option(
     "--network",
     "-n",
-    required=True,
-    help="Network CIDR to scan (e.g., 192.168.68.0/24)",
+    default=None,
+    help=(
+        "Network CIDR to scan (e.g., 192.168.68.0/24); separate several "
+        "CIDRs, addresses or first-last ranges with commas"
+    ),
+)
+@click.option(
+    "--all-interfaces",
+    is_flag=True,
+    help="Scan every subnet attached to a local interface, in parallel",
 )
 @click.option(
     "--yes",
@@ -41,14 +49,79 @@ def cli(ctx: click.Context, verbose: bool) -> None:
     is_flag=True,
     help="Skip ping sweep (use existing ARP table only)",
 )
+@click.option(
+    "--backend",
+    type=click.Choice(["auto", "icmp", "ping", "arp", "tcp", "race"]),
+    default=None,
+    help="Sweep backend (default: SCAN_BACKEND or auto)",
+)
+@click.option(
+    "--no-resume",
+    is_flag=True,
+    help="Probe everything again instead of resuming an interrupted sweep",
+)
+@click.option(
+    "--incremental",
+    is_flag=True,
+    help="Only re-probe hosts that may have changed since earlier scans",
+)
+@click.option(
+    "--pcap",
+    type=click.Path(exists=True, dir_okay=False),
+    default=None,
+    help="Read devices from a pcap/pcapng capture instead of scanning",
+)
+@click.option(
+    "--passive",
+    is_flag=True,
+    help="Read devices heard by a running `listen` command instead of scanning",
+)
 @click.pass_context
-def discover(ctx: click.Context, network: str, yes: bool, no_ping: bool) -> None:
+def discover(
+    ctx: click.Context,
+    network: str | None,
+    all_interfaces: bool,
+    yes: bool,
+    no_ping: bool,
+    backend: str | None,
+    no_resume: bool,
+    incremental: bool,
+    pcap: str | None,
+    passive: bool,
+) -> None:
     """Discover devices on a network and sync with Snipe-IT."""
+    if network is None and not all_interfaces:
+        raise click.UsageError(
+            "Missing option '--network' / '-n' (or use --all-interfaces)."
+        )
+
+    import sys
+    from datetime import datetime, timedelta, timezone
+
+    from rich.progress import Progress
     from rich.table import Table
 
+    from network_tools.addresses import MacAddress
     from network_tools.config import get_config
-    from network_tools.oui import guess_device_type, lookup_manufacturer
-    from network_tools.scanner import scan_network
+    from network_tools.history import HistoryError, HistoryStore, incremental_scan
+    from network_tools.oui import (
+        guess_device_type,
+        lookup_manufacturer,
+        preload_oui_database,
+    )
+    from network_tools.passive import (
+        DeviceTable,
+        PassiveDevice,
+        PassiveError,
+        load_capture,
+    )
+    from network_tools.scanner import (
+        LocalSubnet,
+        ScanCheckpoint,
+        iter_scan_interfaces,
+        iter_scan_network,
+        local_subnets,
+    )
     from network_tools.snipeit import (
         SnipeITClient,
         SnipeITConnectionError,
@@ -60,11 +133,47 @@ def discover(ctx: click.Context, network: str, yes: bool, no_ping: bool) -> None
     verbose = ctx.obj.get("verbose", False)
     config = get_config()
 
+    if network is not None and all_interfaces:
+        console.print("[red]ERROR[/red] --network cannot be used with --all-interfaces")
+        return
+
+    if incremental and no_ping:
+        console.print("[red]ERROR[/red] --incremental cannot be used with --no-ping")
+        return
+
+    if pcap and incremental:
+        console.print("[red]ERROR[/red] --incremental cannot be used with --pcap")
+        return
+
+    if passive and (pcap or incremental):
+        console.print(
+            "[red]ERROR[/red] --passive cannot be used with --pcap or --incremental"
+        )
+        return
+
+    subnets: list[LocalSubnet] = []
+    if all_interfaces:
+        subnets = local_subnets()
+        if not subnets:
+            console.print("[red]ERROR[/red] No subnets attached to local interfaces")
+            return
+        network = ",".join(str(subnet.network) for subnet in subnets)
+    assert network is not None
+
     console.print("[bold]Network Discovery[/bold]")
     console.print(f"  Network: {network}")
+    for subnet in subnets:
+        console.print(f"    {subnet.network} on {subnet.interface}")
     console.print(f"  Auto-confirm: {yes}")
     console.print()
 
+    # Parse the vendor database while Snipe-IT is contacted and hosts probed
+    preload_oui_database()
+
+    # Finished sweep shards; kept if the run fails so the next one resumes
+    checkpoints: dict[str, ScanCheckpoint] = {}
+    failed = False
+
     try:
         # Step 1: Connect to Snipe-IT
         console.print("[cyan]Connecting to Snipe-IT...[/cyan]")
@@ -92,22 +201,7 @@ def discover(ctx: click.Context, network: str, yes: bool, no_ping: bool) -> None
 
         console.print()
 
-        # Step 2: Scan network
-        console.print(f"[cyan]Scanning network {network}...[/cyan]")
-        if no_ping:
-            console.print("  (using existing ARP table only)")
-        else:
-            console.print("  (ping sweep + ARP table)")
-
-        arp_entries = scan_network(network, use_ping=not no_ping)
-        console.print(f"[green]OK[/green] Found {len(arp_entries)} devices on network")
-        console.print()
-
-        if not arp_entries:
-            console.print("[yellow]No devices found on network[/yellow]")
-            return
-
-        # Step 3: Get existing Snipe-IT assets
+        # Step 2: Get existing Snipe-IT assets
         console.print("[cyan]Fetching Snipe-IT inventory...[/cyan]")
         existing_assets = client.get_network_assets(
             category_id=config.snipeit_network_category_id
@@ -116,56 +210,185 @@ def discover(ctx: click.Context, network: str, yes: bool, no_ping: bool) -> None
         console.print()
 
         # Build MAC -> Asset lookup
-        mac_to_asset = {}
-        for asset in existing_assets:
-            if asset.mac_address:
-                mac_normalized = asset.mac_address.upper().replace("-", ":")
-                mac_to_asset[mac_normalized] = asset
+        mac_to_asset = {
+            asset.mac_address: asset for asset in existing_assets if asset.mac_address
+        }
+
+        # Step 3: Scan network, comparing devices with inventory as they are found
+        console.print(f"[cyan]Scanning network {network}...[/cyan]")
+        if pcap:
+            console.print(f"  (passive: devices seen in {pcap})")
+        elif passive:
+            console.print(
+                f"  (passive: devices heard by listener, {config.passive_table_path})"
+            )
+        elif no_ping:
+            console.print("  (using existing ARP table only)")
+        elif incremental:
+            console.print("  (incremental: re-probe known hosts + ARP table)")
+        elif all_interfaces:
+            console.print("  (ping sweep + ARP table, all interfaces in parallel)")
+        else:
+            console.print("  (ping sweep + ARP table)")
 
-        # Step 4: Compare with inventory
-        console.print("[cyan]Comparing discovered devices...[/cyan]")
+        if not (no_ping or incremental or pcap or passive):
+            sweeps = [str(s.network) for s in subnets] if all_interfaces else [network]
+            try:
+                checkpoints = {n: ScanCheckpoint.for_targets(n) for n in sweeps}
+            except ValueError:
+                pass  # Invalid targets are reported by the scan
+            resumed = sum(c.done_hosts for c in checkpoints.values())
+            if resumed and no_resume:
+                for checkpoint in checkpoints.values():
+                    checkpoint.discard()
+            elif resumed:
+                console.print(
+                    f"  (resuming interrupted sweep: {resumed} hosts already probed)"
+                )
 
         new_devices: list[DiscoveredDevice] = []
         existing_devices: list[tuple] = []  # (discovered, asset)
         updated_devices: list[tuple] = []  # (discovered, asset, changes)
+        found_count = 0
+        scan_started = datetime.now(timezone.utc)
+        # Devices learned passively, for their hostnames and times
+        heard: dict[MacAddress, PassiveDevice] = {}
 
-        for entry in arp_entries:
-            manufacturer = lookup_manufacturer(entry.mac_address)
-            device_type = guess_device_type(manufacturer)
+        with Progress(console=console, transient=True) as progress_bar:
+            sweep_task = progress_bar.add_task("Sweeping", total=None)
 
-            mac_normalized = entry.mac_address.upper().replace("-", ":")
+            def _on_progress(done: int, total: int) -> None:
+                progress_bar.update(sweep_task, completed=done, total=total)
 
-            discovered = DiscoveredDevice(
-                ip_address=entry.ip_address,
-                mac_address=entry.mac_address,
-                manufacturer=manufacturer,
-                device_type_guess=device_type,
-                discovery_method="arp",
-            )
-
-            # Check if device exists in Snipe-IT
-            existing_asset = mac_to_asset.get(mac_normalized)
-
-            if existing_asset is None:
-                # New device
-                discovered.status = "new"
-                new_devices.append(discovered)
+            if incremental:
+                try:
+                    delta = incremental_scan(
+                        network, progress=_on_progress, backend=backend
+                    )
+                except HistoryError as e:
+                    console.print(f"[red]ERROR[/red] Scan history unavailable: {e}")
+                    return
+                entries = iter(delta.devices)
+            elif pcap or passive:
+                try:
+                    if pcap:
+                        table = load_capture(pcap)
+                    else:
+                        table = DeviceTable.load(config.passive_table_path)
+                except (PassiveError, OSError) as e:
+                    console.print(f"[red]ERROR[/red] Cannot read devices: {e}")
+                    return
+                since = None
+                if passive and config.passive_max_age > 0:
+                    since = scan_started - timedelta(seconds=config.passive_max_age)
+                heard = {device.mac_address: device for device in table.devices(since)}
+                entries = iter(table.entries(network, since))
             else:
-                # Existing device - check for IP changes
-                discovered.matched_asset = existing_asset
-                if existing_asset.ip_address != entry.ip_address:
-                    discovered.status = "updated"
-                    updated_devices.append(
-                        (discovered, existing_asset, {"ip_address": entry.ip_address})
+                # Start probe timeouts from the RTTs earlier scans measured
+                timing = None
+                if not no_ping:
+                    try:
+                        with HistoryStore() as history:
+                            timing = history.timing(network)
+                    except (HistoryError, ValueError):
+                        pass  # Start from config scan_probe_timeout
+                if all_interfaces:
+                    entries = iter_scan_interfaces(
+                        subnets,
+                        use_ping=not no_ping,
+                        progress=_on_progress,
+                        backend=backend,
+                        timing=timing,
+                        checkpoints={
+                            s: checkpoints[str(s.network)]
+                            for s in subnets
+                            if str(s.network) in checkpoints
+                        },
                     )
                 else:
-                    discovered.status = "existing"
-                    existing_devices.append((discovered, existing_asset))
+                    entries = iter_scan_network(
+                        network,
+                        use_ping=not no_ping,
+                        progress=_on_progress,
+                        backend=backend,
+                        timing=timing,
+                        checkpoint=checkpoints.get(network),
+                    )
+
+            for entry in entries:
+                found_count += 1
+
+                manufacturer = lookup_manufacturer(entry.mac_address)
+                device_type = guess_device_type(manufacturer)
+                seen: PassiveDevice | None = heard.get(entry.mac_address)
+
+                discovered = DiscoveredDevice(
+                    ip_address=entry.ip_address,
+                    mac_address=entry.mac_address,
+                    hostname=seen.hostname if seen else None,
+                    manufacturer=manufacturer,
+                    device_type_guess=device_type,
+                    response_time_ms=entry.response_time_ms,
+                    discovery_method="passive" if seen else "arp",
+                    last_seen=seen.last_seen if seen else datetime.now(timezone.utc),
+                )
 
-        console.print(f"[green]OK[/green] Comparison complete")
+                # Check if device exists in Snipe-IT
+                existing_asset = mac_to_asset.get(entry.mac_address)
+
+                if existing_asset is None:
+                    # New device
+                    discovered.status = "new"
+                    new_devices.append(discovered)
+                else:
+                    # Existing device - check for IP changes
+                    discovered.matched_asset = existing_asset
+                    if existing_asset.ip_address != entry.ip_address:
+                        discovered.status = "updated"
+                        updated_devices.append(
+                            (
+                                discovered,
+                                existing_asset,
+                                {"ip_address": entry.ip_address},
+                            )
+                        )
+                    else:
+                        discovered.status = "existing"
+                        existing_devices.append((discovered, existing_asset))
+
+        console.print(f"[green]OK[/green] Found {found_count} devices on network")
+
+        if incremental:
+            # incremental_scan has already recorded the run
+            console.print(
+                f"  Probed {delta.probed} hosts "
+                f"({'full sweep' if delta.full else 'known hosts only'}): "
+                f"{len(delta.new)} never seen before, {len(delta.changed)} moved, "
+                f"{len(delta.gone)} gone"
+            )
+        elif not (pcap or passive):
+            # Keep every device's last-seen time across runs; passively
+            # learned devices are not recorded since nothing was probed
+            try:
+                with HistoryStore() as history:
+                    history.record_scan(
+                        network,
+                        new_devices
+                        + [d for d, _ in existing_devices]
+                        + [d for d, _, _ in updated_devices],
+                        seen_at=scan_started,
+                        full=not no_ping,
+                    )
+                    history.prune()
+            except HistoryError as e:
+                console.print(f"[yellow]WARNING[/yellow] Scan history not saved: {e}")
         console.print()
 
-        # Step 5: Display results summary
+        if not found_count:
+            console.print("[yellow]No devices found on network[/yellow]")
+            return
+
+        # Step 4: Display results summary
         console.print("[bold]Summary:[/bold]")
         console.print(f"  New devices:      {len(new_devices)}")
         console.print(f"  Updated (IP):     {len(updated_devices)}")
@@ -191,7 +414,7 @@ def discover(ctx: click.Context, network: str, yes: bool, no_ping: bool) -> None
             for discovered, asset, changes in updated_devices:
                 update_table.add_row(
                     asset.name,
-                    discovered.mac_address,
+                    str(discovered.mac_address),
                     asset.ip_address or "-",
                     changes.get("ip_address", "-"),
                 )
@@ -212,7 +435,7 @@ def discover(ctx: click.Context, network: str, yes: bool, no_ping: bool) -> None
                 new_table.add_row(
                     str(i),
                     device.ip_address,
-                    device.mac_address,
+                    str(device.mac_address),
                     device.manufacturer or "Unknown",
                     device.device_type_guess or "unknown",
                 )
@@ -227,7 +450,7 @@ def discover(ctx: click.Context, network: str, yes: bool, no_ping: bool) -> None
                 )
                 console.print()
 
-            # Step 6: Handle new devices
+            # Step 5: Handle new devices
             if yes:
                 # Auto-confirm all
                 console.print("[cyan]Auto-confirming all new devices...[/cyan]")
@@ -333,11 +556,114 @@ def discover(ctx: click.Context, network: str, yes: bool, no_ping: bool) -> None
             console.print("[green]No new devices found - inventory is up to date[/green]")
 
     except Exception as e:
+        failed = True
         console.print(f"[red]ERROR[/red] Discovery failed: {e}")
         if verbose:
             import traceback
 
             console.print(f"[dim]{traceback.format_exc()}[/dim]")
+    finally:
+        # A failed or interrupted (Ctrl-C) run keeps its finished shards
+        for checkpoint in checkpoints.values():
+            if failed or sys.exc_info()[0] is not None:
+                checkpoint.close()
+            else:
+                checkpoint.discard()
+
+
+@cli.command()
+@click.option(
+    "--interface",
+    "-i",
+    default=None,
+    help="Interface to listen on (default: PASSIVE_INTERFACE or all interfaces)",
+)
+@click.option(
+    "--replay",
+    type=click.Path(exists=True, dir_okay=False),
+    default=None,
+    help="Replay frames from a pcap/pcapng file instead of listening live",
+)
+@click.option(
+    "--duration",
+    type=int,
+    default=0,
+    help="Stop after this many seconds (default: run until Ctrl-C)",
+)
+@click.pass_context
+def listen(
+    ctx: click.Context, interface: str | None, replay: str | None, duration: int
+) -> None:
+    """Learn devices passively from ARP, DHCP and mDNS traffic."""
+    import time
+    from pathlib import Path
+
+    from network_tools.config import get_config
+    from network_tools.passive import (
+        DeviceTable,
+        PassiveDevice,
+        PassiveError,
+        PassiveListener,
+    )
+
+    console = get_console()
+    config = get_config()
+
+    console.print("[bold]Passive Listener[/bold]")
+    console.print(f"  Device table: {config.passive_table_path}")
+    console.print()
+
+    # Continue from the last snapshot so a restart keeps what was learned
+    table = DeviceTable()
+    if Path(config.passive_table_path).exists():
+        try:
+            table = DeviceTable.load(config.passive_table_path)
+        except PassiveError as e:
+            console.print(f"[yellow]WARNING[/yellow] Starting with an empty table: {e}")
+
+    def _on_device(device: PassiveDevice) -> None:
+        console.print(
+            f"  [green]+[/green] {device.mac_address}  "
+            f"{device.ip_address or '-'}  {device.hostname or ''}"
+        )
+
+    listener = PassiveListener(interface=interface, table=table, on_device=_on_device)
+
+    if replay:
+        try:
+            listener.replay(replay)
+        except (PassiveError, OSError) as e:
+            console.print(f"[red]ERROR[/red] Cannot replay capture: {e}")
+            return
+        finally:
+            listener.stop()
+    else:
+        try:
+            listener.start()
+        except PassiveError as e:
+            console.print(f"[red]ERROR[/red] {e}")
+            return
+
+        console.print(
+            f"[cyan]Listening on {listener.interface or 'all interfaces'}... "
+            "(Ctrl-C to stop)[/cyan]"
+        )
+        deadline = time.monotonic() + duration if duration > 0 else None
+        try:
+            while listener.running and (
+                deadline is None or time.monotonic() < deadline
+            ):
+                time.sleep(0.5)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            listener.stop()
+
+    console.print()
+    console.print(
+        f"[green]OK[/green] {len(listener.table)} devices in "
+        f"{listener.snapshot_path} ({listener.frames} frames)"
+    )
 
 
 @cli.command()
@@ -463,5 +789,54 @@ def search(ctx: click.Context, mac: str | None, ip: str | None) -> None:
         console.print(f"[red]FAIL[/red] Error: {e}")
 
 
+@cli.command("build-oui-index")
+@click.option(
+    "--source",
+    "-s",
+    "sources",
+    multiple=True,
+    type=click.Path(dir_okay=False),
+    help="Vendor database; repeat for several (default: the configured ones)",
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(dir_okay=False),
+    help="Index file to write (default: OUI_INDEX_PATH)",
+)
+@click.pass_context
+def build_oui_index(
+    ctx: click.Context, sources: tuple[str, ...], output: str | None
+) -> None:
+    """Compile the vendor databases into an index for fast manufacturer lookups."""
+    from network_tools.config import get_config
+    from network_tools.oui.exceptions import OuiError
+    from network_tools.oui.index import build_oui_index as compile_index
+    from network_tools.oui.lookup import registry_paths
+
+    console = get_console()
+    config = get_config()
+    if not sources:
+        sources = tuple(str(path) for path in registry_paths() if path.exists())
+        if not sources:
+            console.print(
+                f"[red]ERROR[/red] No vendor database found at "
+                f"{config.oui_database_path}"
+            )
+            return
+    output = output or config.oui_index_path
+
+    try:
+        count = compile_index(sources, output)
+    except OuiError as e:
+        console.print(f"[red]ERROR[/red] {e}")
+        return
+
+    console.print(
+        f"[green]OK[/green] Compiled {count} OUI entries from "
+        f"{', '.join(sources)} into {output}"
+    )
+
+
 if __name__ == "__main__":
     cli()
@@ -31,10 +31,38 @@ class Config:
     # Network scanning
     default_network: str = "192.168.68.0/22"
     scan_timeout: int = 5
+    scan_probe_timeout: float = 1  # Per-host timeout until a segment's RTTs are known
+    scan_min_timeout: float = 0.1  # Lower bound of adaptive probe timeouts
+    scan_max_timeout: float = 10  # Upper bound of adaptive probe timeouts
     scan_concurrency: int = 50
-
-    # OUI database
-    oui_database_path: str = "./data/oui.txt"
+    scan_backend: str = "auto"  # auto, icmp, ping, arp, tcp, race
+    scan_max_hosts: int = 65536  # Refuse larger targets; 0 disables the limit
+    scan_rate_limit: float = 0  # Probe packets/sec in total; 0 is unlimited
+    scan_subnet_rate_limit: float = 0  # Probe packets/sec per subnet; 0 is unlimited
+    scan_subnet_prefix: int = 24  # IPv4 prefix length of a rate-limited subnet
+    scan_tcp_ports: str = "22,80,443,445,3389,8080"  # Ports the tcp backend tries
+    scan_checkpoint_dir: str = "./data/checkpoints"  # Progress of unfinished sweeps
+    scan_checkpoint_max_age: int = 86400  # Seconds an unfinished sweep can resume
+    neighbor_backend: str = "auto"  # auto, netlink, proc, arp
+
+    # OUI database; IEEE text or CSV registries, or a Wireshark manuf file
+    oui_database_path: str = "./data/oui.txt"  # MA-L (24-bit) registry
+    oui_mam_path: str = "./data/mam.txt"  # MA-M (28-bit) registry, optional
+    oui_oui36_path: str = "./data/oui36.txt"  # MA-S (36-bit) registry, optional
+    oui_manuf_path: str = "./data/manuf"  # Wireshark manuf, optional
+    oui_index_path: str = "./data/oui.idx"  # Compiled cache; empty disables it
+
+    # Scan history
+    history_database_path: str = "./data/history.db"
+    history_retention_days: int = 90  # 0 keeps history forever
+    incremental_trust_ttl: int = 0  # Seconds a sighting is trusted without a probe
+    incremental_full_interval: int = 86400  # Seconds between full sweeps
+
+    # Passive listener
+    passive_interface: str = ""  # Interface to listen on; empty for all
+    passive_table_path: str = "./data/passive.json"
+    passive_flush_interval: int = 10  # Seconds between table snapshots
+    passive_max_age: int = 3600  # Ignore devices silent for longer; 0 keeps all
 
     @classmethod
     def from_env(cls) -> "Config":
@@ -71,10 +99,64 @@ class Config:
             # Network scanning
             default_network=os.getenv("DEFAULT_NETWORK", cls.default_network),
             scan_timeout=int(os.getenv("SCAN_TIMEOUT", str(cls.scan_timeout))),
+            scan_probe_timeout=float(
+                os.getenv("SCAN_PROBE_TIMEOUT", str(cls.scan_probe_timeout))
+            ),
+            scan_min_timeout=float(
+                os.getenv("SCAN_MIN_TIMEOUT", str(cls.scan_min_timeout))
+            ),
+            scan_max_timeout=float(
+                os.getenv("SCAN_MAX_TIMEOUT", str(cls.scan_max_timeout))
+            ),
             scan_concurrency=int(
                 os.getenv("SCAN_CONCURRENCY", str(cls.scan_concurrency))
             ),
+            scan_backend=os.getenv("SCAN_BACKEND", cls.scan_backend),
+            scan_max_hosts=int(os.getenv("SCAN_MAX_HOSTS", str(cls.scan_max_hosts))),
+            scan_rate_limit=float(
+                os.getenv("SCAN_RATE_LIMIT", str(cls.scan_rate_limit))
+            ),
+            scan_subnet_rate_limit=float(
+                os.getenv("SCAN_SUBNET_RATE_LIMIT", str(cls.scan_subnet_rate_limit))
+            ),
+            scan_subnet_prefix=int(
+                os.getenv("SCAN_SUBNET_PREFIX", str(cls.scan_subnet_prefix))
+            ),
+            scan_tcp_ports=os.getenv("SCAN_TCP_PORTS", cls.scan_tcp_ports),
+            scan_checkpoint_dir=os.getenv(
+                "SCAN_CHECKPOINT_DIR", cls.scan_checkpoint_dir
+            ),
+            scan_checkpoint_max_age=int(
+                os.getenv("SCAN_CHECKPOINT_MAX_AGE", str(cls.scan_checkpoint_max_age))
+            ),
+            neighbor_backend=os.getenv("NEIGHBOR_BACKEND", cls.neighbor_backend),
             oui_database_path=os.getenv("OUI_DATABASE_PATH", cls.oui_database_path),
+            oui_mam_path=os.getenv("OUI_MAM_PATH", cls.oui_mam_path),
+            oui_oui36_path=os.getenv("OUI_OUI36_PATH", cls.oui_oui36_path),
+            oui_manuf_path=os.getenv("OUI_MANUF_PATH", cls.oui_manuf_path),
+            oui_index_path=os.getenv("OUI_INDEX_PATH", cls.oui_index_path),
+            # Scan history
+            history_database_path=os.getenv(
+                "HISTORY_DATABASE_PATH", cls.history_database_path
+            ),
+            history_retention_days=int(
+                os.getenv("HISTORY_RETENTION_DAYS", str(cls.history_retention_days))
+            ),
+            incremental_trust_ttl=int(
+                os.getenv("INCREMENTAL_TRUST_TTL", str(cls.incremental_trust_ttl))
+            ),
+            incremental_full_interval=int(
+                os.getenv(
+                    "INCREMENTAL_FULL_INTERVAL", str(cls.incremental_full_interval)
+                )
+            ),
+            # Passive listener
+            passive_interface=os.getenv("PASSIVE_INTERFACE", cls.passive_interface),
+            passive_table_path=os.getenv("PASSIVE_TABLE_PATH", cls.passive_table_path),
+            passive_flush_interval=int(
+                os.getenv("PASSIVE_FLUSH_INTERVAL", str(cls.passive_flush_interval))
+            ),
+            passive_max_age=int(os.getenv("PASSIVE_MAX_AGE", str(cls.passive_max_age))),
         )
 
     @classmethod
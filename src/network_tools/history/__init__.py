@@ -0,0 +1,14 @@
+"""Persistent scan history module."""
+
+from .exceptions import HistoryError
+from .incremental import incremental_scan
+from .models import ScanDelta, Sighting
+from .store import HistoryStore
+
+__all__ = [
+    "HistoryError",
+    "HistoryStore",
+    "ScanDelta",
+    "Sighting",
+    "incremental_scan",
+]
@@ -0,0 +1,7 @@
+"""Custom exceptions for the scan history store."""
+
+
+class HistoryError(Exception):
+    """Raised when the scan history database cannot be used."""
+
+    pass
@@ -0,0 +1,188 @@
+"""Incremental rescans driven by the recorded scan history.
+
+Between full sweeps only addresses that were alive since the last full
+sweep are probed again, and hosts seen within the trust TTL are not probed
+at all. A host that fails its confirmation probe is not probed again until
+the next full sweep, unless it turns up in the neighbor table first. The remaining, long-dead address space is swept once the full
+sweep interval has passed; hosts that appear in the meantime are still
+picked up from the neighbor table, which costs no probes.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from network_tools.config import get_config
+from network_tools.logging import get_logger
+from network_tools.scanner.arp_scanner import scan_network
+from network_tools.scanner.models import ARPEntry
+from network_tools.scanner.sweep import ProgressCallback
+from network_tools.scanner.targets import Targets, TargetSet
+
+from .exceptions import HistoryError
+from .models import ScanDelta, Sighting
+from .store import HistoryStore
+
+logger = get_logger("history.incremental")
+
+
+def incremental_scan(
+    network: Targets,
+    store: Optional[HistoryStore] = None,
+    timeout: Optional[float] = None,
+    progress: Optional[ProgressCallback] = None,
+    backend: Optional[str] = None,
+    trust_ttl: Optional[int] = None,
+    full_interval: Optional[int] = None,
+) -> ScanDelta:
+    """Rescan a target, probing only hosts whose state may have changed.
+
+    The scan is recorded in the history store; devices that were trusted
+    without a probe are reported but not recorded as seen again.
+
+    Args:
+        network: Scan targets (see scan_network).
+        store: History store. Defaults to one at config history_database_path.
+        timeout: Probe timeout in seconds. Defaults to a timeout adapted to
+            the RTTs of this and earlier scans.
+        progress: Optional callback receiving (hosts_done, hosts_total).
+        backend: Sweep backend name. Defaults to config scan_backend.
+        trust_ttl: Seconds a sighting is trusted without a probe. Defaults
+            to config incremental_trust_ttl.
+        full_interval: Seconds between full sweeps. Defaults to config
+            incremental_full_interval.
+
+    Returns:
+        Current devices and the changes since the previous scans.
+
+    Raises:
+        HistoryError: The history store cannot be opened or written.
+        ScanLimitError: A full sweep exceeds config scan_max_hosts.
+    """
+    config = get_config()
+    if trust_ttl is None:
+        trust_ttl = config.incremental_trust_ttl
+    if full_interval is None:
+        full_interval = config.incremental_full_interval
+
+    try:
+        targets = TargetSet.parse(network)
+    except ValueError as e:
+        logger.error(f"Invalid scan targets: {e}")
+        return ScanDelta()
+
+    own_store = store is None
+    history = HistoryStore() if store is None else store
+    try:
+        return _run(
+            targets, history, timeout, progress, backend, trust_ttl, full_interval
+        )
+    finally:
+        if own_store:
+            history.close()
+
+
+def _run(
+    targets: TargetSet,
+    history: HistoryStore,
+    timeout: Optional[float],
+    progress: Optional[ProgressCallback],
+    backend: Optional[str],
+    trust_ttl: int,
+    full_interval: int,
+) -> ScanDelta:
+    """Plan, probe, compare and record one incremental scan."""
+    started = datetime.now(timezone.utc)
+    last_full = history.last_full_scan(targets)
+    full = last_full is None or (
+        started - last_full >= timedelta(seconds=full_interval)
+    )
+
+    # Hosts alive at some point since the last full sweep, less those a
+    # confirmation probe has since found gone
+    previous: dict[str, Sighting] = {}
+    if last_full is not None:
+        departed = history.departures(targets, last_full)
+        previous = {
+            ip: sighting
+            for ip, sighting in history.latest_by_ip(last_full).items()
+            if ip in targets
+            and not (ip in departed and departed[ip] >= sighting.seen_at)
+        }
+
+    timing = history.timing(targets) if timeout is None else None
+
+    trusted: list[Sighting] = []
+    if full:
+        confirm = list(previous)
+        found = scan_network(
+            targets,
+            timeout=timeout,
+            progress=progress,
+            backend=backend,
+            timing=timing,
+        )
+        probed = targets.num_hosts
+    else:
+        trust_cutoff = started - timedelta(seconds=trust_ttl)
+        trusted = [s for s in previous.values() if s.seen_at >= trust_cutoff]
+        confirm = [ip for ip, s in previous.items() if s.seen_at < trust_cutoff]
+        found = []
+        if confirm:
+            found = scan_network(
+                confirm,
+                timeout=timeout,
+                progress=progress,
+                backend=backend,
+                timing=timing,
+            )
+        # Newly arrived hosts that have already talked are in the table
+        found += scan_network(targets, use_ping=False)
+        probed = len(confirm)
+
+    observed: dict[str, ARPEntry] = {}
+    for entry in found:
+        observed.setdefault(entry.ip_address, entry)
+
+    delta = ScanDelta(devices=list(observed.values()), probed=probed, full=full)
+
+    for sighting in trusted:
+        if sighting.ip_address not in observed:
+            delta.devices.append(
+                ARPEntry(
+                    ip_address=sighting.ip_address,
+                    mac_address=sighting.mac_address,
+                    interface=sighting.interface,
+                )
+            )
+
+    delta.gone = [previous[ip] for ip in confirm if ip not in observed]
+
+    known_macs = history.last_seen(entry.mac_address for entry in observed.values())
+    previous_ip = {s.mac_address: s.ip_address for s in previous.values()}
+    for entry in observed.values():
+        old_ip = previous_ip.get(entry.mac_address)
+        if entry.mac_address not in known_macs:
+            delta.new.append(entry)
+        elif old_ip is not None and old_ip != entry.ip_address:
+            delta.changed.append((entry, old_ip))
+
+    history.record_scan(
+        targets,
+        observed.values(),
+        seen_at=started,
+        full=full,
+        gone=[s.ip_address for s in delta.gone],
+    )
+    try:
+        history.prune()
+    except HistoryError as e:
+        # The scan itself is recorded; old rows go on the next run
+        logger.warning(f"Failed to prune scan history: {e}")
+
+    logger.info(
+        f"Incremental scan of {targets}: probed {probed} hosts "
+        f"({'full sweep' if full else 'confirmation'}), {len(delta.devices)} "
+        f"present, {len(delta.new)} new, {len(delta.changed)} moved, "
+        f"{len(delta.gone)} gone"
+    )
+    return delta
@@ -0,0 +1,39 @@
+"""Data models for scan history."""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+
+from network_tools.addresses import MacAddress
+from network_tools.scanner.models import ARPEntry
+
+
+@dataclass
+class Sighting:
+    """One device seen by one recorded scan."""
+
+    scan_id: int
+    mac_address: MacAddress
+    ip_address: str
+    seen_at: datetime
+    interface: Optional[str] = None
+    response_time_ms: Optional[float] = None
+    manufacturer: Optional[str] = None
+
+
+@dataclass
+class ScanDelta:
+    """Outcome of an incremental scan compared with the recorded history."""
+
+    # Every device currently believed present in the target
+    devices: list[ARPEntry] = field(default_factory=list)
+    # Devices whose MAC was never recorded before
+    new: list[ARPEntry] = field(default_factory=list)
+    # (device, previous IP) for known MACs that moved address
+    changed: list[tuple[ARPEntry, str]] = field(default_factory=list)
+    # Previously present hosts that failed their confirmation probe
+    gone: list[Sighting] = field(default_factory=list)
+    # Number of addresses actually probed
+    probed: int = 0
+    # Whether this run swept the whole target
+    full: bool = False
@@ -0,0 +1,399 @@
+"""SQLite-backed store of scan results.
+
+Each recorded scan is one row in `scans` plus one `sightings` row per
+device, written in a single transaction. MACs are stored as 48-bit
+integers and sightings are indexed by MAC, IP and timestamp, so "when was
+this device last seen" stays an index lookup however long the history.
+"""
+
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+from network_tools.addresses import MacAddress
+from network_tools.config import get_config
+from network_tools.logging import get_logger
+from network_tools.scanner.models import ARPEntry
+from network_tools.scanner.targets import Targets, TargetSet
+from network_tools.scanner.timing import AdaptiveTimeout
+from network_tools.snipeit.models import DiscoveredDevice
+
+from .exceptions import HistoryError
+from .models import Sighting
+
+logger = get_logger("history.store")
+
+# Days of RTT history that seed adaptive probe timeouts
+RTT_HISTORY_DAYS = 7
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scans (
+    id INTEGER PRIMARY KEY,
+    network TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    device_count INTEGER NOT NULL DEFAULT 0,
+    full INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS idx_scans_started ON scans (started_at);
+CREATE INDEX IF NOT EXISTS idx_scans_network ON scans (network, full, started_at);
+
+CREATE TABLE IF NOT EXISTS sightings (
+    scan_id INTEGER NOT NULL REFERENCES scans (id) ON DELETE CASCADE,
+    mac INTEGER NOT NULL,
+    ip TEXT NOT NULL,
+    seen_at REAL NOT NULL,
+    interface TEXT,
+    rtt_ms REAL,
+    manufacturer TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_sightings_mac ON sightings (mac, seen_at);
+CREATE INDEX IF NOT EXISTS idx_sightings_ip ON sightings (ip, seen_at);
+CREATE INDEX IF NOT EXISTS idx_sightings_seen ON sightings (seen_at);
+CREATE INDEX IF NOT EXISTS idx_sightings_scan ON sightings (scan_id);
+
+CREATE TABLE IF NOT EXISTS departures (
+    scan_id INTEGER NOT NULL REFERENCES scans (id) ON DELETE CASCADE,
+    ip TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_departures_scan ON departures (scan_id);
+"""
+
+_SIGHTING_COLUMNS = "scan_id, mac, ip, seen_at, interface, rtt_ms, manufacturer"
+
+
+def _from_timestamp(value: float) -> datetime:
+    """Convert a stored UNIX timestamp to an aware UTC datetime."""
+    return datetime.fromtimestamp(value, tz=timezone.utc)
+
+
+def _network_key(network: Targets) -> str:
+    """Canonical text for a scan target, so equal targets match across runs."""
+    try:
+        return str(TargetSet.parse(network))
+    except ValueError:
+        return str(network)
+
+
+def _to_sighting(row: tuple) -> Sighting:
+    """Build a Sighting from a row of _SIGHTING_COLUMNS."""
+    scan_id, mac, ip, seen_at, interface, rtt_ms, manufacturer = row
+    return Sighting(
+        scan_id=scan_id,
+        mac_address=MacAddress(mac),
+        ip_address=ip,
+        seen_at=_from_timestamp(seen_at),
+        interface=interface,
+        response_time_ms=rtt_ms,
+        manufacturer=manufacturer,
+    )
+
+
+class HistoryStore:
+    """Persistent history of discovered devices.
+
+    Usable as a context manager; the connection is closed on exit.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None) -> None:
+        """Open (and create if needed) the history database.
+
+        Args:
+            path: Database file, or ':memory:'. Defaults to config
+                history_database_path.
+
+        Raises:
+            HistoryError: The database cannot be opened.
+        """
+        if path is None:
+            path = get_config().history_database_path
+        self.path = str(path)
+
+        try:
+            if self.path != ":memory:":
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path)
+            self._conn.execute("PRAGMA foreign_keys = ON")
+            # Only takes effect on a new database, before the tables exist
+            self._conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            self._conn.executescript(_SCHEMA)
+        except (OSError, sqlite3.Error) as e:
+            raise HistoryError(f"Cannot open history database {self.path}: {e}") from e
+
+    def __enter__(self) -> "HistoryStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    def record_scan(
+        self,
+        network: Targets,
+        devices: Iterable[Union[ARPEntry, DiscoveredDevice]],
+        seen_at: Optional[datetime] = None,
+        full: bool = True,
+        gone: Iterable[str] = (),
+    ) -> int:
+        """Record the devices found by one scan in a single transaction.
+
+        Devices without a MAC address are skipped.
+
+        Args:
+            network: Scan target, as given to the scanner.
+            devices: ARP entries or discovered devices.
+            seen_at: Scan time. Defaults to now.
+            full: Whether every address of the target was probed.
+            gone: IP addresses this scan probed and found no longer present.
+
+        Returns:
+            ID of the recorded scan.
+
+        Raises:
+            HistoryError: The scan could not be written.
+        """
+        timestamp = (seen_at or datetime.now(timezone.utc)).timestamp()
+
+        rows = [
+            (
+                int(device.mac_address),
+                device.ip_address,
+                timestamp,
+                getattr(device, "interface", None),
+                device.response_time_ms,
+                getattr(device, "manufacturer", None),
+            )
+            for device in devices
+            if device.mac_address is not None
+        ]
+
+        try:
+            with self._conn:
+                cursor = self._conn.execute(
+                    "INSERT INTO scans (network, started_at, device_count, full) "
+                    "VALUES (?, ?, ?, ?)",
+                    (_network_key(network), timestamp, len(rows), int(full)),
+                )
+                scan_id = cursor.lastrowid
+                assert scan_id is not None  # Set by the INSERT above
+                self._conn.executemany(
+                    f"INSERT INTO sightings ({_SIGHTING_COLUMNS}) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(scan_id, *row) for row in rows],
+                )
+                self._conn.executemany(
+                    "INSERT INTO departures (scan_id, ip) VALUES (?, ?)",
+                    [(scan_id, ip) for ip in gone],
+                )
+        except sqlite3.Error as e:
+            raise HistoryError(f"Failed to record scan: {e}") from e
+
+        logger.debug(f"Recorded scan {scan_id} of {network}: {len(rows)} devices")
+        return scan_id
+
+    def last_seen(
+        self, mac_addresses: Iterable[Union[MacAddress, str]]
+    ) -> dict[MacAddress, datetime]:
+        """Look up when each MAC address was last seen, in one query.
+
+        Args:
+            mac_addresses: MAC addresses to look up.
+
+        Returns:
+            Mapping of MAC address to last sighting time. MACs that were
+            never seen are absent.
+        """
+        macs = {int(MacAddress(mac)) for mac in mac_addresses}
+        if not macs:
+            return {}
+
+        # A temp table join avoids SQLite's bound-parameter limit
+        with self._conn:
+            self._conn.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS query_macs (mac INTEGER PRIMARY KEY)"
+            )
+            self._conn.execute("DELETE FROM query_macs")
+            self._conn.executemany(
+                "INSERT INTO query_macs (mac) VALUES (?)", ((mac,) for mac in macs)
+            )
+            rows = self._conn.execute(
+                "SELECT s.mac, MAX(s.seen_at) FROM sightings s "
+                "JOIN query_macs q ON s.mac = q.mac GROUP BY s.mac"
+            ).fetchall()
+
+        return {MacAddress(mac): _from_timestamp(seen) for mac, seen in rows}
+
+    def sightings(
+        self,
+        mac_address: Optional[Union[MacAddress, str]] = None,
+        ip_address: Optional[str] = None,
+        since: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> list[Sighting]:
+        """Query recorded sightings, newest first.
+
+        Args:
+            mac_address: Only sightings of this MAC address.
+            ip_address: Only sightings at this IP address.
+            since: Only sightings at or after this time.
+            limit: Maximum number of sightings to return.
+
+        Returns:
+            Matching sightings.
+        """
+        clauses = []
+        params: list = []
+        if mac_address is not None:
+            clauses.append("mac = ?")
+            params.append(int(MacAddress(mac_address)))
+        if ip_address is not None:
+            clauses.append("ip = ?")
+            params.append(ip_address)
+        if since is not None:
+            clauses.append("seen_at >= ?")
+            params.append(since.timestamp())
+
+        query = f"SELECT {_SIGHTING_COLUMNS} FROM sightings"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY seen_at DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        return [_to_sighting(row) for row in self._conn.execute(query, params)]
+
+    def latest_by_ip(self, since: datetime) -> dict[str, Sighting]:
+        """Latest sighting at each IP address since a point in time.
+
+        Args:
+            since: Oldest sighting time to consider.
+
+        Returns:
+            Mapping of IP address to its newest sighting.
+        """
+        # SQLite takes the bare columns from the row holding MAX(seen_at)
+        rows = self._conn.execute(
+            "SELECT scan_id, mac, ip, MAX(seen_at), interface, rtt_ms, manufacturer "
+            "FROM sightings WHERE seen_at >= ? GROUP BY ip",
+            (since.timestamp(),),
+        )
+        return {row[2]: _to_sighting(row) for row in rows}
+
+    def rtt_samples(
+        self, since: datetime, network: Optional[Targets] = None
+    ) -> list[tuple[str, float]]:
+        """Round-trip times measured by earlier scans.
+
+        Args:
+            since: Oldest sighting time to consider.
+            network: Only addresses within these targets.
+
+        Returns:
+            (IP address, RTT in ms) pairs, oldest first.
+        """
+        targets = None if network is None else TargetSet.parse(network)
+        rows = self._conn.execute(
+            "SELECT ip, rtt_ms FROM sightings "
+            "WHERE rtt_ms IS NOT NULL AND seen_at >= ? ORDER BY seen_at",
+            (since.timestamp(),),
+        )
+        return [(ip, rtt_ms) for ip, rtt_ms in rows if targets is None or ip in targets]
+
+    def timing(self, network: Optional[Targets] = None) -> AdaptiveTimeout:
+        """Adaptive probe timeouts seeded with recently measured RTTs.
+
+        Args:
+            network: Only seed from addresses within these targets.
+
+        Returns:
+            Timeout estimator primed with the last RTT_HISTORY_DAYS of RTTs.
+        """
+        since = datetime.now(timezone.utc) - timedelta(days=RTT_HISTORY_DAYS)
+        timing = AdaptiveTimeout()
+        timing.seed(self.rtt_samples(since, network))
+        return timing
+
+    def last_full_scan(self, network: Targets) -> Optional[datetime]:
+        """Time of the most recent full sweep of a target.
+
+        Args:
+            network: Scan target, as given to the scanner.
+
+        Returns:
+            Start time of the last full scan, or None if there was none.
+        """
+        (started_at,) = self._conn.execute(
+            "SELECT MAX(started_at) FROM scans WHERE network = ? AND full = 1",
+            (_network_key(network),),
+        ).fetchone()
+        return None if started_at is None else _from_timestamp(started_at)
+
+    def departures(self, network: Targets, since: datetime) -> dict[str, datetime]:
+        """When each address was last found gone by a scan of a target.
+
+        Args:
+            network: Scan target, as given to the scanner.
+            since: Oldest scan time to consider.
+
+        Returns:
+            Mapping of IP address to the time of its latest departure.
+        """
+        rows = self._conn.execute(
+            "SELECT d.ip, MAX(s.started_at) FROM departures d "
+            "JOIN scans s ON s.id = d.scan_id "
+            "WHERE s.network = ? AND s.started_at >= ? GROUP BY d.ip",
+            (_network_key(network), since.timestamp()),
+        )
+        return {ip: _from_timestamp(started_at) for ip, started_at in rows}
+
+    def prune(self, retention_days: Optional[int] = None) -> int:
+        """Delete scans older than the retention period.
+
+        When anything was deleted, the freed pages are returned to the
+        file system with an incremental vacuum, which touches only those
+        pages rather than rewriting the whole database.
+
+        Args:
+            retention_days: Days of history to keep. Defaults to config
+                history_retention_days; 0 keeps everything.
+
+        Returns:
+            Number of sightings deleted.
+
+        Raises:
+            HistoryError: The old scans could not be deleted.
+        """
+        if retention_days is None:
+            retention_days = get_config().history_retention_days
+        if retention_days <= 0:
+            return 0
+
+        cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+
+        try:
+            with self._conn:
+                deleted = self._conn.execute(
+                    "DELETE FROM sightings WHERE scan_id IN "
+                    "(SELECT id FROM scans WHERE started_at < ?)",
+                    (cutoff.timestamp(),),
+                ).rowcount
+                self._conn.execute(
+                    "DELETE FROM scans WHERE started_at < ?", (cutoff.timestamp(),)
+                )
+        except sqlite3.Error as e:
+            raise HistoryError(f"Failed to prune scan history: {e}") from e
+
+        if deleted:
+            logger.info(f"Pruned {deleted} sightings older than {retention_days} days")
+            try:
+                # executescript steps the pragma to completion; execute()
+                # would free a single page
+                self._conn.executescript("PRAGMA incremental_vacuum;")
+            except sqlite3.Error as e:
+                # The rows are gone either way; the space is reclaimed next time
+                logger.warning(f"Failed to reclaim pruned history space: {e}")
+        return deleted
@@ -1,13 +1,22 @@
 """OUI (MAC vendor) lookup module."""
 
+from network_tools.oui.exceptions import OuiError
+from network_tools.oui.index import OuiIndex, build_oui_index
 from network_tools.oui.lookup import (
     COMMON_OUIS,
     guess_device_type,
     lookup_manufacturer,
+    lookup_manufacturers,
+    preload_oui_database,
 )
 
 __all__ = [
     "COMMON_OUIS",
+    "OuiError",
+    "OuiIndex",
+    "build_oui_index",
     "guess_device_type",
     "lookup_manufacturer",
+    "lookup_manufacturers",
+    "preload_oui_database",
 ]
@@ -0,0 +1,172 @@
+"""Longest-prefix matching for large batches of MAC addresses.
+
+With NumPy installed (the 'fast' extra), a batch is parsed and matched
+with array operations: the MACs are shifted down to their prefixes and
+searchsorted against the sorted key table, one pass per registered
+prefix length. Without it, each distinct OUI is matched once and the
+result shared by every MAC under it; only OUIs with MA-M or MA-S blocks
+carved out of them are matched per block.
+"""
+
+from types import ModuleType
+from typing import Any, AbstractSet, Callable, Optional, Sequence
+
+from network_tools.addresses import parse_mac_values
+from network_tools.oui.registry import MAC_BITS, PREFIX_LENGTHS
+
+# Below this many addresses, array setup costs more than it saves
+NUMPY_MIN_BATCH = 256
+
+# The longest prefix decides every shorter match
+_BLOCK_SHIFT = MAC_BITS - max(PREFIX_LENGTHS)
+# Keeps block memo keys apart from OUI memo keys
+_BLOCK_TAG = 1 << max(PREFIX_LENGTHS)
+
+# Length and separator positions of 'AA:BB:CC:DD:EE:FF' notation
+_CANONICAL_LENGTH = 17
+_SEPARATOR_COLUMNS = [2, 5, 8, 11, 14]
+_HEX_COLUMNS = [0, 1, 3, 4, 6, 7, 9, 10, 12, 13, 15, 16]
+
+_numpy: Optional[ModuleType] = None
+_numpy_checked = False
+
+
+def load_numpy() -> Optional[ModuleType]:
+    """Import NumPy if it is installed.
+
+    Returns:
+        The numpy module, or None.
+    """
+    global _numpy, _numpy_checked
+    if not _numpy_checked:
+        try:
+            import numpy
+        except ImportError:
+            _numpy = None
+        else:
+            _numpy = numpy
+        _numpy_checked = True
+    return _numpy
+
+
+def match_each(
+    match: Callable[[int], Optional[str]],
+    values: Sequence[Optional[int]],
+    carved: Optional[AbstractSet[int]] = None,
+) -> list[Optional[str]]:
+    """Match a batch one address at a time, once per distinct prefix.
+
+    Args:
+        match: Longest-prefix match of a single 48-bit MAC value.
+        values: MAC values; None entries stay unmatched.
+        carved: OUIs with longer blocks registered inside them. Defaults
+            to treating every OUI as carved.
+
+    Returns:
+        Manufacturer of each value in input order, None if unknown.
+    """
+    # OUI, or tagged 36-bit block inside a carved OUI -> manufacturer
+    memo: dict[int, Optional[str]] = {}
+    results: list[Optional[str]] = []
+    for value in values:
+        if value is None:
+            results.append(None)
+            continue
+        key = value >> 24
+        if carved is None or key in carved:
+            key = _BLOCK_TAG | (value >> _BLOCK_SHIFT)
+        if key not in memo:
+            memo[key] = match(value)
+        results.append(memo[key])
+    return results
+
+
+def parse_macs(numpy: ModuleType, mac_addresses: Sequence[Any]) -> Any:
+    """Parse a batch of MAC addresses into an array.
+
+    A batch of only six-octet strings such as 'AA:BB:CC:DD:EE:FF' or
+    'aa-bb-cc-dd-ee-ff' is decoded as one byte matrix; anything else goes
+    through parse_mac_values.
+
+    Args:
+        numpy: The numpy module.
+        mac_addresses: MacAddress objects or MAC address strings.
+
+    Returns:
+        int64 array of MAC values, -1 where not a valid MAC.
+    """
+    count = len(mac_addresses)
+    canonical = all(
+        type(mac) is str and len(mac) == _CANONICAL_LENGTH for mac in mac_addresses
+    )
+    if canonical:
+        try:
+            blob = "".join(mac_addresses).encode("ascii")
+        except UnicodeEncodeError:
+            canonical = False
+    if not canonical:
+        values = parse_mac_values(mac_addresses)
+        return numpy.fromiter(
+            (-1 if value is None else value for value in values),
+            dtype=numpy.int64,
+            count=count,
+        )
+
+    chars = numpy.frombuffer(blob, dtype=numpy.uint8).reshape(count, _CANONICAL_LENGTH)
+    # ASCII code -> nibble value, 255 for non-hex characters
+    nibbles = numpy.full(256, 255, dtype=numpy.uint8)
+    for digit in b"0123456789":
+        nibbles[digit] = digit - ord("0")
+    for offset in range(6):
+        nibbles[ord("a") + offset] = nibbles[ord("A") + offset] = 10 + offset
+    digits = nibbles[chars[:, _HEX_COLUMNS]]
+    # Any mix of separators, as MacAddress accepts
+    separators = numpy.isin(chars[:, _SEPARATOR_COLUMNS], list(b":-."))
+    valid = (digits != 255).all(axis=1) & separators.all(axis=1)
+    weights = numpy.left_shift(
+        numpy.int64(1), numpy.arange(44, -1, -4, dtype=numpy.int64)
+    )
+    macs = digits.astype(numpy.int64) @ weights
+    macs[~valid] = -1
+    return macs
+
+
+def match_sorted(
+    numpy: ModuleType,
+    keys: Any,
+    name_at: Callable[[int], str],
+    macs: Any,
+) -> list[Optional[str]]:
+    """Match a batch against a sorted key table with NumPy.
+
+    Args:
+        numpy: The numpy module.
+        keys: Ascending uint64 array of registry.prefix_key values.
+        name_at: Manufacturer of the key at a table position.
+        macs: int64 array of MAC values, -1 for none.
+
+    Returns:
+        Manufacturer of each value in input order, None if unknown.
+    """
+    count = len(macs)
+    if count == 0 or len(keys) == 0:
+        return [None] * count
+
+    valid = macs >= 0
+    values = macs.astype(numpy.uint64)
+    # Table position of each value's longest match, -1 for none yet
+    positions = numpy.full(count, -1, dtype=numpy.int64)
+    last = len(keys) - 1
+    for bits in PREFIX_LENGTHS:
+        wanted = (values >> numpy.uint64(MAC_BITS - bits)) | numpy.uint64(
+            bits << MAC_BITS
+        )
+        found = numpy.minimum(numpy.searchsorted(keys, wanted), last)
+        hit = valid & (positions < 0) & (keys[found] == wanted)
+        positions[hit] = found[hit]
+
+    names = {
+        position: name_at(position)
+        for position in numpy.unique(positions[positions >= 0]).tolist()
+    }
+    return [names.get(position) for position in positions.tolist()]
@@ -0,0 +1,7 @@
+"""Custom exceptions for OUI lookup."""
+
+
+class OuiError(Exception):
+    """Raised when an OUI registry or index cannot be read or written."""
+
+    pass
@@ -0,0 +1,368 @@
+"""Compiled, memory-mapped cache of the MAC address registries.
+
+Parsing the registries takes a pass over ~50k entries. Compiling them
+once gives a file that lookups map straight into memory:
+
+    header    magic, version, byte-order mark, entry count, manifest size
+    manifest  JSON list of the source files' path, size, mtime and SHA-256
+    keys      entry count x uint64, prefix length << 48 | prefix, ascending
+    names     entry count x uint32, offset of each entry's name
+    strings   deduplicated names, each a uint16 length plus UTF-8 bytes
+
+A lookup is a binary search over the keys for each registered prefix
+length, so opening the index costs nothing beyond the mmap, and
+concurrent processes share its pages through the page cache.
+
+The manifest keys the cache to its sources. A source whose size and
+mtime are unchanged is trusted as is; one whose mtime moved is hashed,
+so a re-downloaded but identical registry does not force a rebuild.
+"""
+
+import array
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+from bisect import bisect_left
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional, Sequence, Union
+
+from network_tools.logging import get_logger
+from network_tools.oui.exceptions import OuiError
+from network_tools.oui.registry import (
+    MAC_BITS,
+    PREFIX_LENGTHS,
+    OuiTable,
+    RegistryEntry,
+    iter_registry,
+    prefix_key,
+)
+
+logger = get_logger("oui.index")
+
+INDEX_MAGIC = b"OUIX"
+INDEX_VERSION = 1
+# Written in native byte order; a host of the other order sees a bad mark
+_BYTE_ORDER_MARK = 0xFEFF
+# magic, version, byte-order mark, entries, manifest bytes
+_HEADER = struct.Struct("=4sHHII")
+_NAME_LENGTH = struct.Struct("=H")
+_PREFIX_MASK = (1 << MAC_BITS) - 1
+# Keeps the key table 8-byte aligned after the manifest
+_ALIGNMENT = 8
+_HASH_CHUNK_SIZE = 1 << 20
+
+
+def _file_sha256(path: Path) -> str:
+    """SHA-256 of a file's content, as hex."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class SourceStamp:
+    """Identity of a source file an index was compiled from."""
+
+    path: str
+    size: int
+    mtime_ns: int
+    sha256: str
+
+    @classmethod
+    def of(cls, path: Union[str, Path]) -> "SourceStamp":
+        """Stamp a file as it is now.
+
+        Args:
+            path: Source file.
+
+        Returns:
+            The file's resolved path, size, mtime and content hash.
+
+        Raises:
+            OSError: The file cannot be read.
+        """
+        path = Path(path).resolve()
+        stat = path.stat()
+        return cls(
+            path=str(path),
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            sha256=_file_sha256(path),
+        )
+
+
+def write_oui_index(
+    entries: Iterable[RegistryEntry],
+    target: Union[str, Path],
+    sources: Sequence[SourceStamp] = (),
+) -> int:
+    """Write registry entries as a binary index.
+
+    The index is written to a temporary file and moved into place, so
+    readers, and other processes writing the same index, never see a
+    partial file.
+
+    Args:
+        entries: (prefix length, prefix, manufacturer) triples; later
+            entries for a prefix override earlier ones.
+        target: Index file to write.
+        sources: Stamps of the files the entries were read from.
+
+    Returns:
+        Number of prefixes in the index.
+
+    Raises:
+        OuiError: The index cannot be written.
+    """
+    target = Path(target)
+    # sort key -> manufacturer
+    names = {prefix_key(bits, prefix): name for bits, prefix, name in entries}
+    keys = array.array("Q", sorted(names))
+    offsets = array.array("I")
+    strings = bytearray()
+    # manufacturer -> offset of its name in the string table
+    interned: dict[str, int] = {}
+    for key in keys:
+        name = names[key]
+        offset = interned.get(name)
+        if offset is None:
+            encoded = name.encode("utf-8")[:0xFFFF]
+            offset = interned[name] = len(strings)
+            strings += _NAME_LENGTH.pack(len(encoded)) + encoded
+        offsets.append(offset)
+
+    manifest = json.dumps([asdict(stamp) for stamp in sources]).encode()
+    manifest += b" " * (-(_HEADER.size + len(manifest)) % _ALIGNMENT)
+    header = _HEADER.pack(
+        INDEX_MAGIC, INDEX_VERSION, _BYTE_ORDER_MARK, len(keys), len(manifest)
+    )
+    try:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(header)
+                f.write(manifest)
+                f.write(keys.tobytes())
+                f.write(offsets.tobytes())
+                f.write(strings)
+            os.replace(temp, target)
+        except BaseException:
+            os.unlink(temp)
+            raise
+    except OSError as e:
+        raise OuiError(f"Cannot write OUI index {target}: {e}") from e
+
+    logger.info(
+        f"Compiled {len(keys)} OUI entries ({len(interned)} manufacturers) "
+        f"into {target}"
+    )
+    return len(keys)
+
+
+def build_oui_index(
+    sources: Sequence[Union[str, Path]], target: Union[str, Path]
+) -> int:
+    """Compile registry files into a binary index.
+
+    Each source may be an IEEE text or CSV registry or a Wireshark manuf
+    file. Later entries for a prefix override earlier ones, also across
+    files.
+
+    Args:
+        sources: Registry files, in override order.
+        target: Index file to write.
+
+    Returns:
+        Number of prefixes in the index.
+
+    Raises:
+        OuiError: A registry cannot be read or the index cannot be written.
+    """
+    table = OuiTable()
+    stamps = []
+    for source in sources:
+        try:
+            # Stamped first, so a change while parsing marks the index stale
+            stamps.append(SourceStamp.of(source))
+            table.update(iter_registry(source))
+        except OSError as e:
+            raise OuiError(f"Cannot read OUI registry {source}: {e}") from e
+    return write_oui_index(table.entries(), target, stamps)
+
+
+class OuiIndex:
+    """Read-only view of a compiled OUI index."""
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        """Map an index file into memory.
+
+        Args:
+            path: Index written by build_oui_index.
+
+        Raises:
+            OuiError: The file is missing, truncated or not an index of
+                this version and byte order.
+        """
+        self.path = Path(path)
+        try:
+            with open(self.path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            # mmap raises ValueError for an empty file
+            raise OuiError(f"Cannot open OUI index {self.path}: {e}") from e
+
+        try:
+            magic, version, mark, count, manifest_size = _HEADER.unpack_from(self._mmap)
+        except struct.error as e:
+            self._mmap.close()
+            raise OuiError(f"Truncated OUI index {self.path}") from e
+        if (magic, version, mark) != (INDEX_MAGIC, INDEX_VERSION, _BYTE_ORDER_MARK):
+            self._mmap.close()
+            raise OuiError(f"{self.path} is not a compatible OUI index")
+
+        self._keys_start = _HEADER.size + manifest_size
+        names_start = self._keys_start + 8 * count
+        self._strings_start = names_start + 4 * count
+        if len(self._mmap) < self._strings_start:
+            self._mmap.close()
+            raise OuiError(f"Truncated OUI index {self.path}")
+        try:
+            manifest = json.loads(self._mmap[_HEADER.size : self._keys_start])
+            self.sources = [SourceStamp(**stamp) for stamp in manifest]
+        except (ValueError, TypeError) as e:
+            self._mmap.close()
+            raise OuiError(f"Corrupt OUI index manifest in {self.path}") from e
+
+        # Zero-copy NumPy view of the keys, made for batch matching
+        self._array: Any = None
+        self._carved: Optional[frozenset[int]] = None
+        view = memoryview(self._mmap)
+        self._keys = view[self._keys_start : names_start].cast("Q")
+        self._offsets = view[names_start : self._strings_start].cast("I")
+        view.release()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def get(self, bits: int, prefix: int) -> Optional[str]:
+        """Manufacturer of one exact prefix.
+
+        Args:
+            bits: Prefix length.
+            prefix: Prefix value.
+
+        Returns:
+            Manufacturer name, or None if the prefix is not registered.
+        """
+        key = prefix_key(bits, prefix)
+        position = bisect_left(self._keys, key)
+        if position == len(self._keys) or self._keys[position] != key:
+            return None
+        return self.name_at(position)
+
+    @property
+    def carved_ouis(self) -> frozenset[int]:
+        """OUIs with MA-M or MA-S blocks registered inside them."""
+        if self._carved is None:
+            # Keys sort by prefix length first, so longer blocks come last
+            start = bisect_left(self._keys, prefix_key(25, 0))
+            self._carved = frozenset(
+                (key & _PREFIX_MASK) >> ((key >> MAC_BITS) - 24)
+                for key in self._keys[start:]
+            )
+        return self._carved
+
+    def name_at(self, position: int) -> str:
+        """Manufacturer of the entry at a position of the key table."""
+        start = self._strings_start + self._offsets[position]
+        (length,) = _NAME_LENGTH.unpack_from(self._mmap, start)
+        start += _NAME_LENGTH.size
+        return self._mmap[start : start + length].decode("utf-8", errors="replace")
+
+    def sorted_keys(self, numpy: Any) -> Any:
+        """The key table as a NumPy array over the mapped file.
+
+        Args:
+            numpy: The numpy module.
+
+        Returns:
+            Read-only uint64 array of prefix_key values, ascending.
+        """
+        if self._array is None:
+            self._array = numpy.frombuffer(
+                self._mmap,
+                dtype=numpy.uint64,
+                count=len(self),
+                offset=self._keys_start,
+            )
+        return self._array
+
+    def match(self, mac: int) -> Optional[str]:
+        """Manufacturer of the longest registered prefix of a MAC address.
+
+        Args:
+            mac: 48-bit MAC address value.
+
+        Returns:
+            Manufacturer name, or None if no prefix is registered.
+        """
+        for bits in PREFIX_LENGTHS:
+            name = self.get(bits, mac >> (MAC_BITS - bits))
+            if name is not None:
+                return name
+        return None
+
+    def entries(self) -> Iterator[RegistryEntry]:
+        """All entries of the index.
+
+        Yields:
+            (prefix length, prefix, manufacturer) in key order.
+        """
+        for position, key in enumerate(self._keys):
+            yield key >> MAC_BITS, key & _PREFIX_MASK, self.name_at(position)
+
+    def check_sources(self, sources: Sequence[Union[str, Path]]) -> Optional[bool]:
+        """Compare the index with the source files it should reflect.
+
+        Args:
+            sources: Existing source files, in override order.
+
+        Returns:
+            True if every source is unchanged; None if their content is
+            unchanged but an mtime moved, so the manifest should be
+            restamped; False if a source was added, removed or changed.
+            With no sources at all, the index counts as current, so it
+            can be shipped on its own.
+        """
+        paths = [Path(source).resolve() for source in sources]
+        if not paths:
+            return True
+        if [stamp.path for stamp in self.sources] != [str(path) for path in paths]:
+            return False
+
+        touched = False
+        for stamp, path in zip(self.sources, paths):
+            try:
+                stat = path.stat()
+                if (stat.st_size, stat.st_mtime_ns) == (stamp.size, stamp.mtime_ns):
+                    continue
+                if stat.st_size != stamp.size or _file_sha256(path) != stamp.sha256:
+                    return False
+            except OSError:
+                return False
+            touched = True
+        return None if touched else True
+
+    def close(self) -> None:
+        """Unmap the index."""
+        self._array = None
+        self._keys.release()
+        self._offsets.release()
+        self._mmap.close()
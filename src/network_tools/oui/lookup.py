@@ -1,14 +1,28 @@
 """OUI (Organizationally Unique Identifier) lookup for MAC addresses."""
 
-import re
+import threading
 from pathlib import Path
-from typing import Optional
+from string import hexdigits
+from typing import Iterable, Optional, Sequence, Union
 
+from network_tools.addresses import MacAddress, parse_mac_values
 from network_tools.config import get_config
 from network_tools.logging import get_logger
+from network_tools.oui.batch import (
+    NUMPY_MIN_BATCH,
+    load_numpy,
+    match_each,
+    match_sorted,
+    parse_macs,
+)
+from network_tools.oui.exceptions import OuiError
+from network_tools.oui.index import OuiIndex, SourceStamp, write_oui_index
+from network_tools.oui.registry import OuiTable, iter_registry
 
 logger = get_logger("oui.lookup")
 
+_HEX_DIGITS = frozenset(hexdigits)
+
 # Common manufacturers for quick lookup (most common first)
 COMMON_OUIS: dict[str, str] = {
     # Apple
@@ -331,71 +345,273 @@ COMMON_OUIS: dict[str, str] = {
     "34:4D:F7": "LG Electronics",
 }
 
-# Global cache for OUI database
-_oui_db: Optional[dict[str, str]] = None
+# Global cache for OUI database: built-in prefixes plus parsed registries
+_oui_db: Optional[OuiTable] = None
+# Compiled registries, used instead of parsing the text files when current
+_oui_index: Optional[OuiIndex] = None
+# Held while the database loads, so concurrent lookups wait for one load
+_oui_lock = threading.Lock()
+
+
+def _oui_key(prefix: str) -> int:
+    """Convert an 'AA:BB:CC' or 'AA-BB-CC' prefix to its integer OUI."""
+    return int(prefix.replace(":", "").replace("-", ""), 16)
+
+
+def registry_paths() -> list[Path]:
+    """The configured vendor databases, in override order.
+
+    Wireshark's manuf comes first, so the IEEE registries take precedence
+    over it. Each file may be in any supported format.
+
+    Returns:
+        manuf, MA-L, MA-M and MA-S database paths.
+    """
+    config = get_config()
+    return [
+        Path(config.oui_manuf_path),
+        Path(config.oui_database_path),
+        Path(config.oui_mam_path),
+        Path(config.oui_oui36_path),
+    ]
+
+
+def _open_oui_index(index_path: Path, sources: list[Path]) -> Optional[OuiIndex]:
+    """Open the compiled index if it is up to date with the databases."""
+    if not index_path.exists():
+        return None
+    try:
+        index = OuiIndex(index_path)
+    except OuiError as e:
+        logger.warning(f"Ignoring OUI index: {e}")
+        return None
+
+    current = index.check_sources(sources)
+    if current is None:
+        # Same content under a new mtime; restamp so later runs skip hashing
+        try:
+            stamps = [SourceStamp.of(path) for path in sources]
+            write_oui_index(index.entries(), index_path, stamps)
+            restamped = OuiIndex(index_path)
+            index.close()
+            index = restamped
+        except (OSError, OuiError) as e:
+            logger.debug(f"Cannot restamp OUI index {index_path}: {e}")
+    elif not current:
+        logger.info(f"OUI index {index_path} is out of date; rebuilding")
+        index.close()
+        return None
+    logger.debug(f"Using {len(index)} compiled OUI entries from {index_path}")
+    return index
+
+
+def _compile_oui_index(
+    index_path: Optional[Path], sources: list[Path]
+) -> tuple[OuiTable, Optional[OuiIndex]]:
+    """Parse the databases and cache the result as a compiled index.
+
+    Returns:
+        The parsed entries, and the index if it could be written.
+    """
+    registry = OuiTable()
+    stamps: list[SourceStamp] = []
+    for path in sources:
+        try:
+            # Stamped first, so a change while parsing marks the cache stale
+            stamps.append(SourceStamp.of(path))
+            registry.update(iter_registry(path))
+            logger.info(f"Loaded OUI entries from {path}")
+
+        except Exception as e:
+            logger.error(f"Failed to load OUI database {path}: {e}")
+            # A cache missing this database would pass for a complete one
+            index_path = None
+
+    if index_path is not None:
+        try:
+            write_oui_index(registry.entries(), index_path, stamps)
+            return registry, OuiIndex(index_path)
+        except OuiError as e:
+            logger.warning(f"Cannot cache OUI database: {e}")
+    return registry, None
 
 
-def _load_oui_database() -> dict[str, str]:
-    """Load OUI database from file.
+def _load_oui_database() -> OuiTable:
+    """Load OUI database from the configured vendor databases.
+
+    The databases are parsed once and cached as a compiled index, which
+    later loads map into memory instead; only the built-in list is then
+    loaded here and database entries are read from the index on lookup.
+    Safe to call from several threads: one loads, the others wait for it.
 
     Returns:
-        Dictionary mapping OUI prefix to manufacturer name.
+        Built-in prefixes, plus database entries unless the index is used.
     """
-    global _oui_db
+    global _oui_db, _oui_index
 
     if _oui_db is not None:
         return _oui_db
 
-    # Start with common OUIs
-    _oui_db = COMMON_OUIS.copy()
+    with _oui_lock:
+        if _oui_db is not None:
+            return _oui_db
 
-    config = get_config()
-    oui_path = Path(config.oui_database_path)
+        # Start with common OUIs
+        db = OuiTable(
+            (24, _oui_key(prefix), name) for prefix, name in COMMON_OUIS.items()
+        )
 
-    if not oui_path.exists():
-        logger.warning(f"OUI database not found at {oui_path}, using built-in list")
-        return _oui_db
+        config = get_config()
+        if not Path(config.oui_database_path).exists():
+            logger.warning(
+                f"OUI database not found at {config.oui_database_path}, "
+                f"using built-in list"
+            )
+        sources = [path for path in registry_paths() if path.exists()]
+        # An empty OUI_INDEX_PATH turns the compiled cache off
+        index_path = Path(config.oui_index_path) if config.oui_index_path else None
+
+        if _oui_index is not None:
+            _oui_index.close()
+        index = None
+        if index_path is not None:
+            index = _open_oui_index(index_path, sources)
+        if index is None and sources:
+            registry, index = _compile_oui_index(index_path, sources)
+            if index is None:
+                # Database entries override the built-in list
+                db.update(registry.entries())
+
+        # Published before the table, so a loaded table implies a set index
+        _oui_index = index
+        _oui_db = db
+        return db
 
-    try:
-        # Parse IEEE OUI file format
-        # Format: "AA-BB-CC   (hex)    Company Name"
-        pattern = re.compile(r"^([0-9A-F]{2}-[0-9A-F]{2}-[0-9A-F]{2})\s+\(hex\)\s+(.+)$")
 
-        with open(oui_path, "r", encoding="utf-8", errors="ignore") as f:
-            for line in f:
-                match = pattern.match(line.strip())
-                if match:
-                    oui = match.group(1).replace("-", ":")
-                    manufacturer = match.group(2).strip()
-                    _oui_db[oui] = manufacturer
+def preload_oui_database() -> threading.Thread:
+    """Start loading the OUI database in the background.
 
-        logger.info(f"Loaded {len(_oui_db)} OUI entries from {oui_path}")
+    Lookups made before the load finishes wait for it; later ones return
+    at once. Call this early, so the load overlaps with other work.
+
+    Returns:
+        The loading thread, a daemon.
+    """
+    thread = threading.Thread(
+        target=_load_oui_database, name="oui-preload", daemon=True
+    )
+    thread.start()
+    return thread
+
+
+def _prefix_oui(text: str) -> Optional[int]:
+    """OUI named by the first six hex digits of a bare vendor prefix."""
+    cleaned = text.strip().replace(":", "").replace("-", "").replace(".", "")
+    if len(cleaned) < 6 or not _HEX_DIGITS.issuperset(cleaned[:6]):
+        return None
+    return int(cleaned[:6], 16)
 
-    except Exception as e:
-        logger.error(f"Failed to load OUI database: {e}")
 
-    return _oui_db
+def _lookup_prefixes(
+    mac_addresses: Sequence[Optional[Union[MacAddress, str]]],
+    positions: Iterable[int],
+    results: list[Optional[str]],
+) -> None:
+    """Fill in the results of inputs that are vendor prefixes, not MACs."""
+    for position in positions:
+        text = mac_addresses[position]
+        if isinstance(text, str):
+            results[position] = lookup_manufacturer(text)
 
 
-def lookup_manufacturer(mac_address: str) -> Optional[str]:
+def lookup_manufacturer(mac_address: Union[MacAddress, str]) -> Optional[str]:
     """Look up manufacturer from MAC address.
 
+    The longest registered prefix wins, so devices from MA-M (28-bit) and
+    MA-S (36-bit) blocks get their own vendor rather than the IEEE's.
+
     Args:
-        mac_address: MAC address in any format.
+        mac_address: MacAddress, or a MAC address string in any format. A
+            string of at least six hex digits that is not a full MAC, such
+            as '00:50:56', is looked up by its OUI.
 
     Returns:
-        Manufacturer name or None if not found.
+        Manufacturer name or None if not found or not valid.
     """
-    # Normalize MAC address
-    cleaned = mac_address.upper().replace(":", "").replace("-", "").replace(".", "")
-    if len(cleaned) < 6:
-        return None
+    mac = MacAddress.parse(mac_address)
+    if mac is None:
+        oui = _prefix_oui(mac_address) if isinstance(mac_address, str) else None
+        if oui is None:
+            return None
+        db = _load_oui_database()
+        manufacturer: Optional[str] = None
+        if _oui_index is not None:
+            manufacturer = _oui_index.get(24, oui)
+        if manufacturer is None:
+            manufacturer = db.get(24, oui)
+        return manufacturer
+
+    db = _load_oui_database()
+    manufacturer = None
+    if _oui_index is not None:
+        # Registry entries override the built-in list
+        manufacturer = _oui_index.match(int(mac))
+    if manufacturer is None:
+        manufacturer = db.match(int(mac))
+    return manufacturer
+
+
+def lookup_manufacturers(
+    mac_addresses: Sequence[Optional[Union[MacAddress, str]]],
+) -> list[Optional[str]]:
+    """Look up the manufacturers of many MAC addresses at once.
 
-    # Get OUI prefix (first 3 bytes)
-    oui = f"{cleaned[0:2]}:{cleaned[2:4]}:{cleaned[4:6]}"
+    Gives the same answers as calling lookup_manufacturer for each
+    address, but parses the batch in one pass, loads the database once
+    and matches each distinct prefix once, vectorized when NumPy is
+    installed.
 
+    Args:
+        mac_addresses: MacAddress objects or MAC address strings.
+
+    Returns:
+        Manufacturer of each address in input order; None where unknown
+        or not a valid MAC.
+    """
     db = _load_oui_database()
-    return db.get(oui)
+    # Registry entries override the built-in list
+    tables: list[Union[OuiIndex, OuiTable]] = [db]
+    if _oui_index is not None:
+        tables.insert(0, _oui_index)
+
+    numpy = load_numpy()
+    if numpy is not None and len(mac_addresses) >= NUMPY_MIN_BATCH:
+        macs = parse_macs(numpy, mac_addresses)
+        results: list[Optional[str]] = match_sorted(
+            numpy, tables[0].sorted_keys(numpy), tables[0].name_at, macs
+        )
+        for table in tables[1:]:
+            missing = [i for i, name in enumerate(results) if name is None]
+            fallback = match_sorted(
+                numpy, table.sorted_keys(numpy), table.name_at, macs[missing]
+            )
+            for i, name in zip(missing, fallback):
+                results[i] = name
+        _lookup_prefixes(mac_addresses, numpy.flatnonzero(macs < 0).tolist(), results)
+        return results
+
+    values = parse_mac_values(mac_addresses)
+    results = match_each(tables[0].match, values, tables[0].carved_ouis)
+    for table in tables[1:]:
+        missing = [i for i, name in enumerate(results) if name is None]
+        fallback = match_each(
+            table.match, [values[i] for i in missing], table.carved_ouis
+        )
+        for i, name in zip(missing, fallback):
+            results[i] = name
+    invalid = [i for i, value in enumerate(values) if value is None]
+    _lookup_prefixes(mac_addresses, invalid, results)
+    return results
 
 
 def guess_device_type(manufacturer: Optional[str], hostname: Optional[str] = None) -> str:
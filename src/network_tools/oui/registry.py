@@ -0,0 +1,330 @@
+"""MAC address block registries and longest-prefix matching.
+
+The IEEE assigns three block sizes: MA-L (24-bit OUI, oui.txt), MA-M
+(28-bit, mam.txt) and MA-S (36-bit, oui36.txt). MA-M and MA-S blocks are
+carved out of OUIs registered to the IEEE itself, so a MAC address is
+matched against the longest registered prefix first.
+
+Registries are read from the IEEE text files, the IEEE CSV exports
+(oui.csv, mam.csv, oui36.csv) or Wireshark's manuf file.
+"""
+
+import csv
+import re
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Optional, Union
+
+from network_tools.oui.exceptions import OuiError
+
+# Registered prefix lengths in bits, longest first
+PREFIX_LENGTHS = (36, 28, 24)
+MAC_BITS = 48
+
+# "AA-BB-CC   (hex)    Company Name"
+_HEX_LINE = re.compile(r"^([0-9A-F]{2})-([0-9A-F]{2})-([0-9A-F]{2})\s+\(hex\)\s+(.+)$")
+# "AABBCC     (base 16)  ..." for MA-L, "C08000-C08FFF  (base 16)  ..." below
+_BASE16_LINE = re.compile(r"^([0-9A-F]{6})(?:-([0-9A-F]{6}))?\s+\(base 16\)")
+# Wireshark manuf prefix: "00:00:0C" or "00:1B:C5:00:00:00/36"
+_MANUF_PREFIX = re.compile(r"^((?:[0-9A-Fa-f]{2}[:.-]){2,5}[0-9A-Fa-f]{2})(?:/(\d+))?$")
+
+# Hex digits of an IEEE CSV assignment -> prefix length
+_CSV_ASSIGNMENT_BITS = {6: 24, 7: 28, 9: 36}
+# Bytes read to tell registry formats apart
+_SNIFF_SIZE = 4096
+
+# (prefix length in bits, prefix value, manufacturer)
+RegistryEntry = tuple[int, int, str]
+
+
+def prefix_key(bits: int, prefix: int) -> int:
+    """Single sortable integer for a prefix of any registered length."""
+    return (bits << MAC_BITS) | prefix
+
+
+def _block_prefix(oui: int, low: int, high: int) -> Optional[tuple[int, int]]:
+    """Prefix of the block low..high within an OUI, or None if not a block."""
+    size = high - low + 1
+    if size <= 0 or size & (size - 1) or low & (size - 1):
+        return None
+    host_bits = size.bit_length() - 1
+    bits = MAC_BITS - host_bits
+    if bits not in PREFIX_LENGTHS:
+        return None
+    return bits, ((oui << 24) | low) >> host_bits
+
+
+def iter_ieee_text(path: Union[str, Path]) -> Iterator[RegistryEntry]:
+    """Read the entries of an IEEE registry text file.
+
+    Handles oui.txt, mam.txt and oui36.txt. An entry's '(hex)' line names
+    its OUI; in MA-M and MA-S files the '(base 16)' line that follows
+    gives the range of the block within that OUI.
+
+    Args:
+        path: Registry in the IEEE text format.
+
+    Yields:
+        (prefix length, prefix, manufacturer) in file order.
+
+    Raises:
+        OSError: The file cannot be read.
+    """
+    pending: Optional[tuple[int, str]] = None
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            line = line.strip()
+            match = _HEX_LINE.match(line)
+            if match:
+                if pending is not None:
+                    yield 24, pending[0], pending[1]
+                oui = int("".join(match.group(1, 2, 3)), 16)
+                pending = (oui, match.group(4).strip())
+                continue
+            match = _BASE16_LINE.match(line)
+            if match is None or pending is None:
+                continue
+            oui, name = pending
+            pending = None
+            if match.group(2) is None:
+                yield 24, oui, name
+                continue
+            low, high = int(match.group(1), 16), int(match.group(2), 16)
+            block = _block_prefix(oui, low, high)
+            if block is not None:
+                yield block[0], block[1], name
+    if pending is not None:
+        yield 24, pending[0], pending[1]
+
+
+def iter_ieee_csv(path: Union[str, Path]) -> Iterator[RegistryEntry]:
+    """Read the entries of an IEEE registry CSV export.
+
+    Handles oui.csv, mam.csv and oui36.csv; the prefix length follows
+    from the number of hex digits in the Assignment column. Company IDs
+    (CID) are not MAC address blocks and are skipped.
+
+    Args:
+        path: Registry in the IEEE CSV format.
+
+    Yields:
+        (prefix length, prefix, manufacturer) in file order.
+
+    Raises:
+        OSError: The file cannot be read.
+    """
+    with open(path, "r", encoding="utf-8", errors="ignore", newline="") as f:
+        for row in csv.reader(f):
+            if len(row) < 3 or row[0] in ("Registry", "CID"):
+                continue
+            assignment, name = row[1].strip(), row[2].strip()
+            bits = _CSV_ASSIGNMENT_BITS.get(len(assignment))
+            if bits is None or not name:
+                continue
+            try:
+                yield bits, int(assignment, 16), name
+            except ValueError:
+                continue
+
+
+def iter_manuf(path: Union[str, Path]) -> Iterator[RegistryEntry]:
+    """Read the entries of a Wireshark manuf file.
+
+    The long name is used where the file has one. Prefixes of lengths
+    other than 24, 28 and 36 bits are skipped.
+
+    Args:
+        path: Wireshark manuf file.
+
+    Yields:
+        (prefix length, prefix, manufacturer) in file order.
+
+    Raises:
+        OSError: The file cannot be read.
+    """
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            if line.startswith("#"):
+                continue
+            fields = [field.strip() for field in line.split("\t") if field.strip()]
+            if len(fields) < 2:
+                # Older files separate the columns with spaces
+                fields = line.split(None, 2)
+                if len(fields) < 2:
+                    continue
+            match = _MANUF_PREFIX.match(fields[0])
+            if match is None:
+                continue
+            digits = re.sub(r"[:.-]", "", match.group(1))
+            bits = int(match.group(2)) if match.group(2) else len(digits) * 4
+            if bits not in PREFIX_LENGTHS or bits > len(digits) * 4:
+                continue
+            prefix = int(digits, 16) >> (len(digits) * 4 - bits)
+            # Older files give the long name as a comment
+            name = fields[2].lstrip("# ").strip() if len(fields) > 2 else ""
+            yield bits, prefix, name or fields[1].strip()
+
+
+# Registry format name -> reader
+REGISTRY_FORMATS: dict[str, Callable[[Union[str, Path]], Iterator[RegistryEntry]]] = {
+    "ieee": iter_ieee_text,
+    "csv": iter_ieee_csv,
+    "manuf": iter_manuf,
+}
+
+
+def detect_format(path: Union[str, Path]) -> str:
+    """Tell which registry format a file is in.
+
+    Args:
+        path: Registry file.
+
+    Returns:
+        A REGISTRY_FORMATS name.
+
+    Raises:
+        OSError: The file cannot be read.
+    """
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        head = f.read(_SNIFF_SIZE)
+    if head.lstrip("\ufeff").startswith("Registry,"):
+        return "csv"
+    if "(hex)" in head:
+        return "ieee"
+    return "manuf"
+
+
+def iter_registry(
+    path: Union[str, Path], fmt: Optional[str] = None
+) -> Iterator[RegistryEntry]:
+    """Read the entries of a registry in any supported format.
+
+    Args:
+        path: Registry file.
+        fmt: A REGISTRY_FORMATS name. Detected from the content by default.
+
+    Yields:
+        (prefix length, prefix, manufacturer) in file order.
+
+    Raises:
+        OSError: The file cannot be read.
+        OuiError: The format is unknown.
+    """
+    if fmt is None:
+        fmt = detect_format(path)
+    try:
+        reader = REGISTRY_FORMATS[fmt]
+    except KeyError:
+        available = ", ".join(REGISTRY_FORMATS)
+        raise OuiError(
+            f"Unknown registry format '{fmt}' (available: {available})"
+        ) from None
+    return reader(path)
+
+
+class OuiTable:
+    """Manufacturers of registered prefixes, one hash table per length.
+
+    A lookup probes at most one table per registered prefix length, so it
+    takes constant time regardless of the registry size.
+    """
+
+    def __init__(self, entries: Iterable[RegistryEntry] = ()) -> None:
+        # prefix length -> prefix -> manufacturer
+        self.tables: dict[int, dict[int, str]] = {bits: {} for bits in PREFIX_LENGTHS}
+        # Sorted prefix keys and their names, built for batch matching
+        self._sorted: Optional[tuple[Any, list[str]]] = None
+        self._carved: Optional[frozenset[int]] = None
+        self.update(entries)
+
+    def __len__(self) -> int:
+        return sum(len(table) for table in self.tables.values())
+
+    def update(self, entries: Iterable[RegistryEntry]) -> None:
+        """Add entries, replacing earlier names of the same prefixes.
+
+        Args:
+            entries: (prefix length, prefix, manufacturer) triples.
+        """
+        for bits, prefix, name in entries:
+            self.tables[bits][prefix] = name
+        self._sorted = None
+        self._carved = None
+
+    @property
+    def carved_ouis(self) -> frozenset[int]:
+        """OUIs with MA-M or MA-S blocks registered inside them."""
+        if self._carved is None:
+            self._carved = frozenset(
+                prefix >> (bits - 24)
+                for bits, table in self.tables.items()
+                if bits > 24
+                for prefix in table
+            )
+        return self._carved
+
+    def entries(self) -> Iterator[RegistryEntry]:
+        """All entries of the table.
+
+        Yields:
+            (prefix length, prefix, manufacturer), longest prefixes first.
+        """
+        for bits, table in self.tables.items():
+            for prefix, name in table.items():
+                yield bits, prefix, name
+
+    def get(self, bits: int, prefix: int) -> Optional[str]:
+        """Manufacturer of one exact prefix.
+
+        Args:
+            bits: Prefix length.
+            prefix: Prefix value.
+
+        Returns:
+            Manufacturer name, or None if the prefix is not registered.
+        """
+        return self.tables.get(bits, {}).get(prefix)
+
+    def match(self, mac: int) -> Optional[str]:
+        """Manufacturer of the longest registered prefix of a MAC address.
+
+        Args:
+            mac: 48-bit MAC address value.
+
+        Returns:
+            Manufacturer name, or None if no prefix is registered.
+        """
+        for bits in PREFIX_LENGTHS:
+            table = self.tables[bits]
+            if table:
+                name = table.get(mac >> (MAC_BITS - bits))
+                if name is not None:
+                    return name
+        return None
+
+    def sorted_keys(self, numpy: Any) -> Any:
+        """All prefixes as an ascending array of prefix_key values.
+
+        Built on first use and kept until the table changes; name_at
+        resolves positions in it.
+
+        Args:
+            numpy: The numpy module.
+
+        Returns:
+            uint64 array.
+        """
+        if self._sorted is None:
+            entries = sorted(
+                (prefix_key(bits, prefix), name)
+                for bits, table in self.tables.items()
+                for prefix, name in table.items()
+            )
+            keys = numpy.array([key for key, _ in entries], dtype=numpy.uint64)
+            self._sorted = (keys, [name for _, name in entries])
+        return self._sorted[0]
+
+    def name_at(self, position: int) -> str:
+        """Manufacturer at a position of the sorted_keys array."""
+        if self._sorted is None:
+            raise IndexError("sorted_keys has not been built")
+        return self._sorted[1][position]
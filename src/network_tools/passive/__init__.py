@@ -0,0 +1,23 @@
+"""Passive device discovery from observed network traffic."""
+
+from .capture import iter_observations, load_capture, read_capture
+from .decode import decode_frame
+from .exceptions import CaptureFormatError, PassiveError
+from .listener import PassiveListener, open_packet_socket
+from .models import Frame, Observation, PassiveDevice
+from .table import DeviceTable
+
+__all__ = [
+    "CaptureFormatError",
+    "DeviceTable",
+    "Frame",
+    "Observation",
+    "PassiveDevice",
+    "PassiveError",
+    "PassiveListener",
+    "decode_frame",
+    "iter_observations",
+    "load_capture",
+    "open_packet_socket",
+    "read_capture",
+]
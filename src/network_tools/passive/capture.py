@@ -0,0 +1,234 @@
+"""Streaming reader for pcap and pcapng capture files.
+
+Records are read one at a time through a buffered file, so memory use is
+independent of the capture size and throughput is bounded by the disk.
+"""
+
+import os
+import struct
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional, Union
+
+from network_tools.logging import get_logger
+
+from .decode import LINKTYPE_ETHERNET, LINKTYPE_LINUX_SLL, decode_frame
+from .exceptions import CaptureFormatError
+from .models import Frame, Observation
+from .table import DeviceTable
+
+logger = get_logger("passive.capture")
+
+_READ_BUFFER = 1 << 20
+
+# pcap magic numbers: microsecond and nanosecond timestamps
+_PCAP_MAGIC = {0xA1B2C3D4: 1e-6, 0xA1B23C4D: 1e-9}
+
+# pcapng block types
+_SECTION_HEADER = 0x0A0D0D0A
+_INTERFACE_DESCRIPTION = 0x00000001
+_OBSOLETE_PACKET = 0x00000002
+_SIMPLE_PACKET = 0x00000003
+_ENHANCED_PACKET = 0x00000006
+_BYTE_ORDER_MAGIC = 0x1A2B3C4D
+
+# pcapng interface option carrying the timestamp resolution
+_IF_TSRESOL = 9
+
+
+def _read_exact(stream: BinaryIO, size: int, what: str) -> Optional[bytes]:
+    """Read exactly `size` bytes.
+
+    Returns:
+        The bytes, or None at a clean end of file.
+
+    Raises:
+        CaptureFormatError: The file ends part way through.
+    """
+    data = stream.read(size)
+    if not data:
+        return None
+    if len(data) < size:
+        raise CaptureFormatError(f"Capture truncated in {what}")
+    return data
+
+
+def _iter_pcap(stream: BinaryIO, header: bytes) -> Iterator[Frame]:
+    """Yield the frames of a classic pcap file after its first 4 bytes."""
+    for endian in "<>":
+        (magic,) = struct.unpack(endian + "I", header)
+        if magic in _PCAP_MAGIC:
+            break
+    resolution = _PCAP_MAGIC[magic]
+
+    rest = _read_exact(stream, 20, "file header")
+    if rest is None:
+        raise CaptureFormatError("Capture truncated in file header")
+    linktype = struct.unpack(endian + "I", rest[16:20])[0] & 0xFFFF
+
+    record_header = struct.Struct(endian + "IIII")
+    while (record := _read_exact(stream, 16, "record header")) is not None:
+        seconds, fraction, captured, _ = record_header.unpack(record)
+        data = _read_exact(stream, captured, "record data")
+        if data is None:
+            raise CaptureFormatError("Capture truncated in record data")
+        yield Frame(seconds + fraction * resolution, linktype, data)
+
+
+def _ts_resolution(options: bytes, endian: str) -> float:
+    """Timestamp unit of a pcapng interface, from its options."""
+    offset = 0
+    while offset + 4 <= len(options):
+        code, length = struct.unpack_from(endian + "HH", options, offset)
+        if code == 0:
+            break
+        if code == _IF_TSRESOL and length >= 1:
+            value = options[offset + 4]
+            return 2.0 ** -(value & 0x7F) if value & 0x80 else 10.0**-value
+        offset += 4 + (length + 3) // 4 * 4
+    return 1e-6
+
+
+def _iter_pcapng(
+    stream: BinaryIO, header: bytes, capture_time: float
+) -> Iterator[Frame]:
+    """Yield the frames of a pcapng file after its first 4 bytes.
+
+    Simple packets carry no timestamp; they are dated like the last
+    timestamped packet before them, or at `capture_time` if none came yet.
+    """
+    endian = "<"
+    # (linktype, snaplen, seconds per timestamp unit) per interface ID
+    interfaces: list[tuple[int, int, float]] = []
+    block_type = _SECTION_HEADER
+    timestamp = capture_time
+
+    while True:
+        length_bytes = _read_exact(stream, 4, "block header")
+        if length_bytes is None:
+            raise CaptureFormatError("Capture truncated in block header")
+
+        if block_type == _SECTION_HEADER:
+            # The byte-order magic decides how the rest of the section reads
+            magic = _read_exact(stream, 4, "section header")
+            if magic is None:
+                raise CaptureFormatError("Capture truncated in section header")
+            endian = "<" if struct.unpack("<I", magic)[0] == _BYTE_ORDER_MAGIC else ">"
+            (total,) = struct.unpack(endian + "I", length_bytes)
+            body = magic + (_read_exact(stream, total - 12, "section header") or b"")
+            interfaces = []
+        else:
+            (total,) = struct.unpack(endian + "I", length_bytes)
+            if total < 12:
+                raise CaptureFormatError(f"Invalid pcapng block length {total}")
+            body = _read_exact(stream, total - 8, "block") or b""
+            if len(body) < total - 8:
+                raise CaptureFormatError("Capture truncated in block")
+
+        body = body[:-4]  # trailing copy of the block length
+
+        if block_type == _INTERFACE_DESCRIPTION:
+            linktype, _, snaplen = struct.unpack_from(endian + "HHI", body)
+            interfaces.append((linktype, snaplen, _ts_resolution(body[8:], endian)))
+
+        elif block_type in (_ENHANCED_PACKET, _OBSOLETE_PACKET):
+            if block_type == _ENHANCED_PACKET:
+                iface, high, low, captured, _ = struct.unpack_from(
+                    endian + "IIIII", body
+                )
+            else:
+                iface, _, high, low, captured, _ = struct.unpack_from(
+                    endian + "HHIIII", body
+                )
+            if iface < len(interfaces):
+                linktype, _, resolution = interfaces[iface]
+                data = body[20 : 20 + captured]
+                timestamp = ((high << 32) | low) * resolution
+                yield Frame(timestamp, linktype, data)
+
+        elif block_type == _SIMPLE_PACKET and interfaces:
+            linktype, snaplen, _ = interfaces[0]
+            (original,) = struct.unpack_from(endian + "I", body)
+            captured = min(original, snaplen) if snaplen else original
+            yield Frame(timestamp, linktype, body[4 : 4 + captured])
+
+        type_bytes = _read_exact(stream, 4, "block header")
+        if type_bytes is None:
+            return
+        (block_type,) = struct.unpack(endian + "I", type_bytes)
+
+
+def read_capture(path: Union[str, Path]) -> Iterator[Frame]:
+    """Stream the frames of a pcap or pcapng file.
+
+    Args:
+        path: Capture file.
+
+    Yields:
+        Frames in file order.
+
+    Raises:
+        CaptureFormatError: The file is not a pcap/pcapng file or is
+            corrupt.
+        OSError: The file cannot be read.
+    """
+    with open(path, "rb", buffering=_READ_BUFFER) as stream:
+        # When the capture was last written, for frames without a timestamp
+        capture_time = os.fstat(stream.fileno()).st_mtime
+        header = stream.read(4)
+        if len(header) < 4:
+            raise CaptureFormatError(f"{path} is not a capture file")
+
+        if struct.unpack("<I", header)[0] == _SECTION_HEADER:
+            yield from _iter_pcapng(stream, header, capture_time)
+        elif {struct.unpack(e + "I", header)[0] for e in "<>"} & _PCAP_MAGIC.keys():
+            yield from _iter_pcap(stream, header)
+        else:
+            raise CaptureFormatError(f"{path} is not a pcap or pcapng file")
+
+
+def iter_observations(path: Union[str, Path]) -> Iterator[Observation]:
+    """Stream the device observations found in a capture file.
+
+    Args:
+        path: pcap or pcapng file.
+
+    Yields:
+        Observations in capture order.
+
+    Raises:
+        CaptureFormatError: The file is not a pcap/pcapng file or is
+            corrupt.
+        OSError: The file cannot be read.
+    """
+    frames = 0
+    skipped = 0
+    for frame in read_capture(path):
+        frames += 1
+        if frame.linktype not in (LINKTYPE_ETHERNET, LINKTYPE_LINUX_SLL):
+            skipped += 1
+            continue
+        yield from decode_frame(frame)
+
+    if skipped:
+        logger.warning(f"Skipped {skipped} frames with unsupported link types")
+    logger.info(f"Read {frames} frames from {path}")
+
+
+def load_capture(path: Union[str, Path]) -> DeviceTable:
+    """Build a device table from a capture file in a single pass.
+
+    Args:
+        path: pcap or pcapng file.
+
+    Returns:
+        Table of every device seen in the capture.
+
+    Raises:
+        CaptureFormatError: The file is not a pcap/pcapng file or is
+            corrupt.
+        OSError: The file cannot be read.
+    """
+    table = DeviceTable()
+    count = table.update_all(iter_observations(path))
+    logger.info(f"Learned {len(table)} devices from {count} observations")
+    return table
@@ -0,0 +1,325 @@
+"""Decoders extracting MAC/IP/hostname observations from captured frames.
+
+Only protocols that tie a MAC address to its own IP address or name are
+used: ARP senders, DHCP clients, mDNS and NetBIOS responders announcing
+themselves, and LLDP neighbors. Routed unicast traffic is ignored, since
+its Ethernet source is the router rather than the sending host.
+"""
+
+import socket
+import struct
+from datetime import datetime, timezone
+from typing import Optional
+
+from network_tools.addresses import MacAddress
+
+from .models import Frame, Observation
+
+LINKTYPE_ETHERNET = 1
+LINKTYPE_LINUX_SLL = 113
+# SLL packet types of frames sent to a broadcast or multicast address
+_SLL_GROUP_PACKET_TYPES = (1, 2)
+
+ETHERTYPE_IPV4 = 0x0800
+ETHERTYPE_ARP = 0x0806
+ETHERTYPE_LLDP = 0x88CC
+_VLAN_ETHERTYPES = (0x8100, 0x88A8)
+
+_DHCP_PORTS = (67, 68)
+_DHCP_MAGIC = b"\x63\x82\x53\x63"
+_DHCP_ACK = 5
+_MDNS_PORT = 5353
+_NETBIOS_NS_PORT = 137
+
+_DNS_TYPE_A = 1
+_NETBIOS_HOST_SUFFIXES = (0x00, 0x20)
+
+# Guards against compression pointer loops in DNS names
+_MAX_DNS_POINTERS = 16
+
+
+def _ipv4_text(packed: bytes) -> Optional[str]:
+    """Format a host IPv4 address, or None for unusable source addresses."""
+    if len(packed) != 4 or packed[0] == 0 or packed[0] >= 224 or packed[0] == 127:
+        return None
+    return socket.inet_ntoa(packed)
+
+
+def _unicast_mac(packed: bytes) -> Optional[MacAddress]:
+    """MacAddress for a usable unicast address, else None."""
+    mac = MacAddress(packed)
+    return mac if mac.is_unicast else None
+
+
+def _clean_hostname(name: str) -> Optional[str]:
+    """Strip mDNS/DNS suffixes and whitespace from a hostname."""
+    name = name.strip().rstrip(".")
+    if name.lower().endswith(".local"):
+        name = name[: -len(".local")]
+    return name or None
+
+
+def _read_dns_name(data: bytes, offset: int) -> tuple[str, int]:
+    """Read a possibly compressed DNS name.
+
+    Returns:
+        Tuple of (dotted name, offset just past the name in the record).
+
+    Raises:
+        ValueError: The name is malformed.
+    """
+    labels: list[str] = []
+    end: Optional[int] = None
+    jumps = 0
+    while True:
+        length = data[offset]
+        if length & 0xC0 == 0xC0:
+            if jumps >= _MAX_DNS_POINTERS:
+                raise ValueError("DNS compression loop")
+            if end is None:
+                end = offset + 2
+            offset = ((length & 0x3F) << 8) | data[offset + 1]
+            jumps += 1
+            continue
+        offset += 1
+        if length == 0:
+            break
+        labels.append(data[offset : offset + length].decode("utf-8", "replace"))
+        offset += length
+    return ".".join(labels), end if end is not None else offset
+
+
+def _decode_netbios_name(data: bytes, offset: int) -> tuple[str, int, int]:
+    """Decode a first-level encoded NetBIOS name.
+
+    Returns:
+        Tuple of (name, suffix byte, offset just past the name).
+
+    Raises:
+        ValueError: The name is not a NetBIOS name.
+    """
+    if data[offset] != 32:
+        raise ValueError("Not a NetBIOS name")
+    encoded = data[offset + 1 : offset + 33]
+    raw = bytes(
+        ((encoded[i] - 0x41) << 4) | (encoded[i + 1] - 0x41) for i in range(0, 32, 2)
+    )
+    _, end = _read_dns_name(data, offset)
+    return raw[:15].decode("ascii", "replace").strip(), raw[15], end
+
+
+def _arp(payload: bytes, seen_at: datetime) -> list[Observation]:
+    """Sender MAC/IP of an Ethernet/IPv4 ARP packet."""
+    if len(payload) < 28 or payload[:6] != b"\x00\x01\x08\x00\x06\x04":
+        return []
+    mac = _unicast_mac(payload[8:14])
+    # Address probes (RFC 5227) have an all-zero sender IP
+    ip = _ipv4_text(payload[14:18])
+    if mac is None or ip is None:
+        return []
+    return [Observation(mac, ip, None, "arp", seen_at)]
+
+
+def _dhcp(payload: bytes, seen_at: datetime) -> list[Observation]:
+    """Client MAC with its leased IP and hostname from a DHCP message."""
+    if len(payload) < 240 or payload[236:240] != _DHCP_MAGIC:
+        return []
+    if payload[1] != 1 or payload[2] != 6:
+        return []
+    mac = _unicast_mac(payload[28:34])
+    if mac is None:
+        return []
+
+    message_type = None
+    hostname = None
+    offset = 240
+    while offset < len(payload):
+        code = payload[offset]
+        if code == 255:
+            break
+        if code == 0:
+            offset += 1
+            continue
+        if offset + 1 >= len(payload):
+            break
+        length = payload[offset + 1]
+        value = payload[offset + 2 : offset + 2 + length]
+        if code == 53 and value:
+            message_type = value[0]
+        elif code == 12:
+            hostname = _clean_hostname(value.decode("utf-8", "replace"))
+        elif code == 81 and len(value) > 3 and hostname is None:
+            # Client FQDN: flags, two legacy rcodes, then the name
+            hostname = _clean_hostname(value[3:].decode("utf-8", "replace"))
+        offset += 2 + length
+
+    # A client's own address, or the one a server just acknowledged
+    ip = _ipv4_text(payload[12:16])
+    if ip is None and message_type == _DHCP_ACK:
+        ip = _ipv4_text(payload[16:20])
+
+    if ip is None and hostname is None:
+        return []
+    return [Observation(mac, ip, hostname, "dhcp", seen_at)]
+
+
+def _mdns(
+    payload: bytes, mac: MacAddress, ip: str, seen_at: datetime
+) -> list[Observation]:
+    """Sender with the name it claims in an mDNS response."""
+    hostname = None
+    if len(payload) >= 12:
+        flags, questions, answers, authority, additional = struct.unpack_from(
+            "!HHHHH", payload, 2
+        )
+        if flags & 0x8000:
+            try:
+                offset = 12
+                for _ in range(questions):
+                    _, offset = _read_dns_name(payload, offset)
+                    offset += 4
+                for _ in range(answers + authority + additional):
+                    name, offset = _read_dns_name(payload, offset)
+                    rtype, _, _, rdlength = struct.unpack_from("!HHIH", payload, offset)
+                    offset += 10
+                    rdata = payload[offset : offset + rdlength]
+                    offset += rdlength
+                    if rtype == _DNS_TYPE_A and _ipv4_text(rdata) == ip:
+                        hostname = _clean_hostname(name)
+                        break
+            except (IndexError, struct.error, ValueError):
+                pass
+    return [Observation(mac, ip, hostname, "mdns", seen_at)]
+
+
+def _netbios(
+    payload: bytes, mac: MacAddress, ip: str, seen_at: datetime
+) -> list[Observation]:
+    """Sender with its workstation name from a NetBIOS name registration."""
+    hostname = None
+    try:
+        questions, answers, _, additional = struct.unpack_from("!HHHH", payload, 4)
+        name, suffix, offset = _decode_netbios_name(payload, 12)
+        if questions:
+            offset += 4
+            if additional:
+                _, offset = _read_dns_name(payload, offset)
+        if answers or additional:
+            # The record's address must be the sender's own, not a WINS reply
+            rdlength = struct.unpack_from("!H", payload, offset + 8)[0]
+            rdata = payload[offset + 10 : offset + 10 + rdlength]
+            if (
+                suffix in _NETBIOS_HOST_SUFFIXES
+                and rdlength >= 6
+                and _ipv4_text(rdata[2:6]) == ip
+            ):
+                hostname = name or None
+    except (IndexError, struct.error, ValueError):
+        pass
+    return [Observation(mac, ip, hostname, "netbios", seen_at)]
+
+
+def _lldp(payload: bytes, source: MacAddress, seen_at: datetime) -> list[Observation]:
+    """Chassis MAC, management address and system name of an LLDP neighbor."""
+    mac = source
+    ip = None
+    hostname = None
+    offset = 0
+    while offset + 2 <= len(payload):
+        (header,) = struct.unpack_from("!H", payload, offset)
+        tlv_type, length = header >> 9, header & 0x1FF
+        value = payload[offset + 2 : offset + 2 + length]
+        offset += 2 + length
+        if tlv_type == 0:
+            break
+        if tlv_type == 1 and len(value) == 7 and value[0] == 4:
+            mac = _unicast_mac(value[1:]) or source
+        elif tlv_type == 5:
+            hostname = _clean_hostname(value.decode("utf-8", "replace"))
+        elif tlv_type == 8 and ip is None and len(value) >= 6 and value[1] == 1:
+            ip = _ipv4_text(value[2:6])
+    return [Observation(mac, ip, hostname, "lldp", seen_at)]
+
+
+def _ipv4(
+    payload: bytes, source: MacAddress, group: bool, seen_at: datetime
+) -> list[Observation]:
+    """Dispatch the UDP protocols carried in an IPv4 packet.
+
+    `group` tells whether the frame went to a broadcast/multicast MAC, which
+    means it was sent on the local link rather than routed to us.
+    """
+    if len(payload) < 20 or payload[0] >> 4 != 4 or payload[9] != socket.IPPROTO_UDP:
+        return []
+    # Only the first fragment carries the UDP header
+    if struct.unpack_from("!H", payload, 6)[0] & 0x1FFF:
+        return []
+    header_length = (payload[0] & 0x0F) * 4
+    udp = payload[header_length:]
+    if len(udp) < 8:
+        return []
+
+    source_port, dest_port = struct.unpack_from("!HH", udp)
+    data = udp[8:]
+
+    if source_port in _DHCP_PORTS and dest_port in _DHCP_PORTS:
+        return _dhcp(data, seen_at)
+
+    ip = _ipv4_text(payload[12:16])
+    if ip is None:
+        return []
+    if source_port == _MDNS_PORT:
+        return _mdns(data, source, ip, seen_at)
+    if source_port == _NETBIOS_NS_PORT and group:
+        return _netbios(data, source, ip, seen_at)
+    return []
+
+
+def decode_frame(frame: Frame) -> list[Observation]:
+    """Extract device observations from one captured frame.
+
+    Args:
+        frame: Ethernet or Linux cooked (SLL) frame.
+
+    Returns:
+        Observations found in the frame; empty for unrelated traffic or
+        frames too short to parse.
+    """
+    data = frame.data
+    if frame.linktype == LINKTYPE_ETHERNET:
+        if len(data) < 14:
+            return []
+        source_bytes, offset = data[6:12], 12
+        # I/G bit of the destination address
+        group = bool(data[0] & 1)
+    elif frame.linktype == LINKTYPE_LINUX_SLL:
+        # Packet type, ARPHRD type, address length, 8-byte address
+        if len(data) < 16 or struct.unpack_from("!H", data, 4)[0] != 6:
+            return []
+        source_bytes, offset = data[6:12], 14
+        group = struct.unpack_from("!H", data, 0)[0] in _SLL_GROUP_PACKET_TYPES
+    else:
+        return []
+
+    (ethertype,) = struct.unpack_from("!H", data, offset)
+    offset += 2
+    while ethertype in _VLAN_ETHERTYPES and len(data) >= offset + 4:
+        (ethertype,) = struct.unpack_from("!H", data, offset + 2)
+        offset += 4
+
+    source = _unicast_mac(source_bytes)
+    if source is None:
+        return []
+
+    seen_at = datetime.fromtimestamp(frame.timestamp, tz=timezone.utc)
+    payload = data[offset:]
+    try:
+        if ethertype == ETHERTYPE_ARP:
+            return _arp(payload, seen_at)
+        if ethertype == ETHERTYPE_IPV4:
+            return _ipv4(payload, source, group, seen_at)
+        if ethertype == ETHERTYPE_LLDP:
+            return _lldp(payload, source, seen_at)
+    except (IndexError, struct.error, ValueError):
+        pass
+    return []
@@ -0,0 +1,13 @@
+"""Custom exceptions for passive discovery."""
+
+
+class PassiveError(Exception):
+    """Base exception for passive discovery errors."""
+
+    pass
+
+
+class CaptureFormatError(PassiveError):
+    """Raised when a capture file is not a readable pcap or pcapng file."""
+
+    pass
@@ -0,0 +1,234 @@
+"""Live passive listener that learns devices without sending any probes.
+
+A background thread reads every frame from a Linux packet socket, decodes
+ARP, DHCP, mDNS, NetBIOS and LLDP traffic, and keeps a DeviceTable up to
+date. The table is periodically written to a snapshot file that
+`discover --passive` reads instead of sweeping.
+"""
+
+import select
+import socket
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+from network_tools.config import get_config
+from network_tools.logging import get_logger
+
+from .capture import read_capture
+from .decode import LINKTYPE_ETHERNET, decode_frame
+from .exceptions import PassiveError
+from .models import Frame, PassiveDevice
+from .table import DeviceTable
+
+logger = get_logger("passive.listener")
+
+# Every ethertype, from <linux/if_ether.h>
+ETH_P_ALL = 0x0003
+
+_RECV_BUFFER = 65535
+
+# How often the listener thread checks whether it should stop
+_POLL_INTERVAL = 0.5
+
+# Called with each device that is new or whose IP or hostname changed
+DeviceCallback = Callable[[PassiveDevice], None]
+
+
+def open_packet_socket(interface: Optional[str] = None) -> socket.socket:
+    """Open a raw packet socket receiving every Ethernet frame.
+
+    Args:
+        interface: Interface to bind to, or None for all interfaces.
+
+    Returns:
+        Non-blocking AF_PACKET socket.
+
+    Raises:
+        PassiveError: Packet sockets are unavailable or access was refused.
+    """
+    if not hasattr(socket, "AF_PACKET"):
+        raise PassiveError("Live capture needs Linux packet sockets (AF_PACKET)")
+
+    try:
+        sock = socket.socket(socket.AF_PACKET, socket.SOCK_RAW, socket.htons(ETH_P_ALL))
+    except PermissionError as e:
+        raise PassiveError(
+            "Live capture needs raw socket access; run as root or grant CAP_NET_RAW"
+        ) from e
+
+    try:
+        if interface:
+            sock.bind((interface, 0))
+        sock.setblocking(False)
+    except OSError as e:
+        sock.close()
+        raise PassiveError(f"Cannot listen on interface {interface}: {e}") from e
+    return sock
+
+
+class PassiveListener:
+    """Background listener feeding observed devices into a DeviceTable.
+
+    Usable as a context manager; the thread is started on entry and stopped
+    (with a final snapshot) on exit. Frames can also be fed in directly or
+    replayed from a capture file, which is how it is exercised in tests.
+    """
+
+    def __init__(
+        self,
+        interface: Optional[str] = None,
+        table: Optional[DeviceTable] = None,
+        snapshot_path: Optional[Union[str, Path]] = None,
+        flush_interval: Optional[int] = None,
+        on_device: Optional[DeviceCallback] = None,
+    ) -> None:
+        """Create a listener.
+
+        Args:
+            interface: Interface to listen on. Defaults to config
+                passive_interface; empty for all interfaces.
+            table: Table to update. Defaults to a new, empty table.
+            snapshot_path: File the table is saved to. Defaults to config
+                passive_table_path.
+            flush_interval: Seconds between snapshots. Defaults to config
+                passive_flush_interval.
+            on_device: Called with each device that is new or changed.
+        """
+        config = get_config()
+        if interface is None:
+            interface = config.passive_interface
+        if flush_interval is None:
+            flush_interval = config.passive_flush_interval
+
+        self.interface = interface
+        self.table = table if table is not None else DeviceTable()
+        self.snapshot_path = Path(snapshot_path or config.passive_table_path)
+        self.flush_interval = flush_interval
+        self.on_device = on_device
+        self.frames = 0
+
+        self._sock: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._dirty = False
+
+    def __enter__(self) -> "PassiveListener":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    @property
+    def running(self) -> bool:
+        """Whether the listener thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def feed(self, frame: Frame) -> int:
+        """Decode one frame and merge what it reveals into the table.
+
+        Args:
+            frame: Captured frame.
+
+        Returns:
+            Number of devices that were new or changed.
+        """
+        self.frames += 1
+        changed = 0
+        for observation in decode_frame(frame):
+            # Any observation refreshes last_seen, so the snapshot is stale
+            self._dirty = True
+            if self.table.update(observation):
+                changed += 1
+                if self.on_device is not None:
+                    device = self.table.get(observation.mac_address)
+                    if device is not None:
+                        self.on_device(device)
+        return changed
+
+    def replay(self, path: Union[str, Path]) -> int:
+        """Feed every frame of a capture file, as if heard live.
+
+        Args:
+            path: pcap or pcapng file.
+
+        Returns:
+            Number of frames replayed.
+
+        Raises:
+            CaptureFormatError: The file is not a pcap/pcapng file.
+            OSError: The file cannot be read.
+        """
+        count = 0
+        for frame in read_capture(path):
+            self.feed(frame)
+            count += 1
+        logger.info(f"Replayed {count} frames from {path}: {len(self.table)} devices")
+        return count
+
+    def flush(self) -> None:
+        """Write the table snapshot if anything changed since the last one.
+
+        Raises:
+            PassiveError: The snapshot cannot be written.
+        """
+        if self._dirty:
+            self._dirty = False
+            self.table.save(self.snapshot_path)
+            logger.debug(f"Saved {len(self.table)} devices to {self.snapshot_path}")
+
+    def start(self) -> None:
+        """Open the packet socket and start the listener thread.
+
+        Raises:
+            PassiveError: The interface cannot be opened.
+        """
+        if self.running:
+            return
+        self._sock = open_packet_socket(self.interface or None)
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="passive-listener", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Listening for devices on {self.interface or 'all interfaces'}")
+
+    def stop(self) -> None:
+        """Stop the listener thread and write a final snapshot."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        try:
+            self.flush()
+        except PassiveError as e:
+            logger.error(str(e))
+
+    def _run(self) -> None:
+        """Receive frames until stopped, flushing the table periodically."""
+        assert self._sock is not None
+        next_flush = time.monotonic() + self.flush_interval
+
+        while not self._stop.is_set():
+            readable, _, _ = select.select([self._sock], [], [], _POLL_INTERVAL)
+            while readable:
+                try:
+                    data = self._sock.recv(_RECV_BUFFER)
+                except BlockingIOError:
+                    break
+                except OSError as e:
+                    logger.error(f"Packet socket error: {e}")
+                    return
+                self.feed(Frame(time.time(), LINKTYPE_ETHERNET, data))
+
+            if time.monotonic() >= next_flush:
+                next_flush = time.monotonic() + self.flush_interval
+                try:
+                    self.flush()
+                except PassiveError as e:
+                    logger.error(str(e))
@@ -0,0 +1,47 @@
+"""Data models for passive discovery."""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+
+from network_tools.addresses import MacAddress
+
+
+@dataclass
+class Frame:
+    """One captured link-layer frame."""
+
+    timestamp: float  # UNIX time in seconds
+    linktype: int  # pcap LINKTYPE_* value
+    data: bytes
+
+
+@dataclass
+class Observation:
+    """A MAC address seen on the wire, with what the frame revealed about it."""
+
+    mac_address: MacAddress
+    ip_address: Optional[str]
+    hostname: Optional[str]
+    protocol: str  # arp, dhcp, mdns, netbios, lldp
+    seen_at: datetime
+
+    def __post_init__(self) -> None:
+        if isinstance(self.mac_address, str):
+            self.mac_address = MacAddress(self.mac_address)
+
+
+@dataclass
+class PassiveDevice:
+    """Everything learned about one MAC address from observed traffic."""
+
+    mac_address: MacAddress
+    ip_address: Optional[str] = None
+    hostname: Optional[str] = None
+    first_seen: Optional[datetime] = None
+    last_seen: Optional[datetime] = None
+    protocols: set[str] = field(default_factory=set)
+
+    def __post_init__(self) -> None:
+        if isinstance(self.mac_address, str):
+            self.mac_address = MacAddress(self.mac_address)
@@ -0,0 +1,215 @@
+"""In-memory table of devices learned from observed traffic."""
+
+import json
+import os
+import threading
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+from network_tools.addresses import MacAddress
+from network_tools.scanner.models import ARPEntry
+from network_tools.scanner.targets import Targets, TargetSet
+
+from .exceptions import PassiveError
+from .models import Observation, PassiveDevice
+
+
+def _device_to_dict(device: PassiveDevice) -> dict:
+    """Serialize a device for a table snapshot."""
+    return {
+        "mac_address": str(device.mac_address),
+        "ip_address": device.ip_address,
+        "hostname": device.hostname,
+        "first_seen": device.first_seen.isoformat() if device.first_seen else None,
+        "last_seen": device.last_seen.isoformat() if device.last_seen else None,
+        "protocols": sorted(device.protocols),
+    }
+
+
+def _device_from_dict(data: dict) -> PassiveDevice:
+    """Deserialize a device from a table snapshot."""
+    first_seen, last_seen = data.get("first_seen"), data.get("last_seen")
+    return PassiveDevice(
+        mac_address=MacAddress(data["mac_address"]),
+        ip_address=data.get("ip_address"),
+        hostname=data.get("hostname"),
+        first_seen=datetime.fromisoformat(first_seen) if first_seen else None,
+        last_seen=datetime.fromisoformat(last_seen) if last_seen else None,
+        protocols=set(data.get("protocols", [])),
+    )
+
+
+class DeviceTable:
+    """Devices keyed by MAC address, merged from a stream of observations.
+
+    Memory grows with the number of distinct devices, not with the number
+    of observations. Thread-safe, so a listener thread can update the table
+    while others read it.
+    """
+
+    def __init__(self) -> None:
+        self._devices: dict[MacAddress, PassiveDevice] = {}
+        self._lock = threading.Lock()
+
+    def update(self, observation: Observation) -> bool:
+        """Merge one observation into the table.
+
+        The newest IP address and hostname win; older observations only fill
+        in values that are still unknown.
+
+        Args:
+            observation: Observation to merge.
+
+        Returns:
+            True if the device is new or its IP address or hostname changed.
+        """
+        with self._lock:
+            device = self._devices.get(observation.mac_address)
+            if device is None:
+                device = PassiveDevice(
+                    mac_address=observation.mac_address,
+                    first_seen=observation.seen_at,
+                    last_seen=observation.seen_at,
+                )
+                self._devices[observation.mac_address] = device
+                changed = True
+            else:
+                changed = False
+
+            newest = device.last_seen is None or observation.seen_at >= device.last_seen
+            ip, hostname = observation.ip_address, observation.hostname
+            if ip and ip != device.ip_address and (newest or not device.ip_address):
+                device.ip_address = ip
+                changed = True
+            if (
+                hostname
+                and hostname != device.hostname
+                and (newest or not device.hostname)
+            ):
+                device.hostname = hostname
+                changed = True
+
+            if newest:
+                device.last_seen = observation.seen_at
+            if device.first_seen is None or observation.seen_at < device.first_seen:
+                device.first_seen = observation.seen_at
+            device.protocols.add(observation.protocol)
+            return changed
+
+    def update_all(self, observations: Iterable[Observation]) -> int:
+        """Merge a stream of observations.
+
+        Args:
+            observations: Observations, consumed lazily.
+
+        Returns:
+            Number of observations merged.
+        """
+        count = 0
+        for observation in observations:
+            self.update(observation)
+            count += 1
+        return count
+
+    def get(self, mac_address: Union[MacAddress, str]) -> Optional[PassiveDevice]:
+        """Look up a copy of a device by MAC address."""
+        with self._lock:
+            device = self._devices.get(MacAddress(mac_address))
+            return replace(device, protocols=set(device.protocols)) if device else None
+
+    def devices(self, since: Optional[datetime] = None) -> list[PassiveDevice]:
+        """Known devices, most recently seen first.
+
+        Args:
+            since: Only devices seen at or after this time.
+
+        Returns:
+            Copies of the devices, safe to use while the table is updated.
+        """
+        with self._lock:
+            devices = [
+                replace(device, protocols=set(device.protocols))
+                for device in self._devices.values()
+                if since is None
+                or (device.last_seen is not None and device.last_seen >= since)
+            ]
+        return sorted(
+            devices,
+            key=lambda d: d.last_seen.timestamp() if d.last_seen else 0,
+            reverse=True,
+        )
+
+    def entries(
+        self, network: Optional[Targets] = None, since: Optional[datetime] = None
+    ) -> list[ARPEntry]:
+        """Devices with a known IP address, as scanner entries.
+
+        Args:
+            network: Only devices inside these targets. Defaults to all.
+            since: Only devices seen at or after this time.
+
+        Returns:
+            ARP entries, in the same form scan_network returns.
+
+        Raises:
+            ValueError: The targets are invalid.
+        """
+        targets = TargetSet.parse(network) if network is not None else None
+        return [
+            ARPEntry(ip_address=device.ip_address, mac_address=device.mac_address)
+            for device in self.devices(since)
+            if device.ip_address is not None
+            and (targets is None or device.ip_address in targets)
+        ]
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write a snapshot of the table, replacing the file atomically.
+
+        Args:
+            path: JSON file to write.
+
+        Raises:
+            PassiveError: The snapshot cannot be written.
+        """
+        path = Path(path)
+        data = {"devices": [_device_to_dict(d) for d in self.devices()]}
+        temp = path.with_name(path.name + ".tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp.write_text(json.dumps(data, indent=1))
+            # Readers never see a half-written snapshot
+            os.replace(temp, path)
+        except OSError as e:
+            raise PassiveError(f"Cannot write device table {path}: {e}") from e
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "DeviceTable":
+        """Read a table snapshot written by save().
+
+        Args:
+            path: JSON file to read.
+
+        Returns:
+            DeviceTable.
+
+        Raises:
+            PassiveError: The snapshot is missing or invalid.
+        """
+        table = cls()
+        try:
+            data = json.loads(Path(path).read_text())
+            for item in data["devices"]:
+                device = _device_from_dict(item)
+                table._devices[device.mac_address] = device
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            raise PassiveError(f"Cannot read device table {path}: {e}") from e
+        return table
+
+    def __len__(self) -> int:
+        return len(self._devices)
+
+    def __contains__(self, mac_address: object) -> bool:
+        mac = MacAddress.parse(mac_address)  # type: ignore[arg-type]
+        return mac is not None and mac in self._devices
@@ -3,15 +3,61 @@
 from network_tools.scanner.arp_scanner import (
     ARPEntry,
     get_arp_table,
-    normalize_mac,
+    iter_scan_interfaces,
+    iter_scan_network,
     ping_sweep,
     scan_network,
 )
+from network_tools.scanner.async_scanner import (
+    AsyncIcmpPinger,
+    async_get_arp_table,
+    async_ping_host,
+    async_ping_sweep,
+    async_scan_network,
+)
+from network_tools.scanner.backends import SWEEP_BACKENDS, get_sweep_backend
+from network_tools.scanner.checkpoint import ScanCheckpoint
+from network_tools.scanner.exceptions import (
+    ScanLimitError,
+    ScannerError,
+    ScannerPermissionError,
+)
+from network_tools.scanner.interfaces import LocalSubnet, local_subnets
+from network_tools.scanner.ipv6 import discover_ipv6, multicast_echo
+from network_tools.scanner.models import normalize_mac
+from network_tools.scanner.neighbors import NEIGHBOR_BACKENDS, read_neighbor_table
+from network_tools.scanner.sweep import ProbeResult, run_sweep
+from network_tools.scanner.targets import TargetSet
+from network_tools.scanner.tcp import tcp_probe, tcp_sweep
 
 __all__ = [
     "ARPEntry",
+    "AsyncIcmpPinger",
+    "LocalSubnet",
+    "NEIGHBOR_BACKENDS",
+    "ProbeResult",
+    "SWEEP_BACKENDS",
+    "ScanCheckpoint",
+    "ScanLimitError",
+    "ScannerError",
+    "ScannerPermissionError",
+    "TargetSet",
+    "async_get_arp_table",
+    "async_ping_host",
+    "async_ping_sweep",
+    "async_scan_network",
+    "discover_ipv6",
     "get_arp_table",
+    "get_sweep_backend",
+    "iter_scan_interfaces",
+    "iter_scan_network",
+    "local_subnets",
+    "multicast_echo",
     "normalize_mac",
     "ping_sweep",
+    "read_neighbor_table",
+    "run_sweep",
     "scan_network",
+    "tcp_probe",
+    "tcp_sweep",
 ]
@@ -0,0 +1,127 @@
+"""Active ARP scanning backend (requires the optional `scan` extra).
+
+Sends a broadcast who-has frame for every target in a chunk and collects
+all replies in one capture window. Hosts that firewall ICMP still answer
+ARP, and the MAC comes straight from the reply instead of the OS cache.
+"""
+
+from types import ModuleType
+from typing import Optional, Sequence
+
+from network_tools.addresses import MacAddress
+from network_tools.logging import get_logger
+from network_tools.scanner.exceptions import ScannerError, ScannerPermissionError
+from network_tools.scanner.ratelimit import get_rate_limiter
+from network_tools.scanner.sweep import ProbeResult, ProgressCallback
+
+logger = get_logger("scanner.active_arp")
+
+# ARP replies come from the local segment; waiting longer never helps
+MAX_ARP_WINDOW = 2.0
+
+
+def _load_scapy() -> ModuleType:
+    """Import scapy lazily so it stays an optional dependency.
+
+    Raises:
+        ScannerError: scapy is not installed.
+    """
+    try:
+        import scapy.all as scapy_all
+    except ImportError as e:
+        raise ScannerError(
+            "The 'arp' backend requires scapy: pip install 'network-tools[scan]'"
+        ) from e
+    return scapy_all
+
+
+def arp_available() -> bool:
+    """Check whether scapy is importable.
+
+    Returns:
+        True if the active ARP backend can be used.
+    """
+    try:
+        _load_scapy()
+    except ScannerError:
+        return False
+    return True
+
+
+def arp_request_sweep(
+    hosts: Sequence[str],
+    timeout: float,
+    concurrency: int = 0,
+    progress: Optional[ProgressCallback] = None,
+    interface: Optional[str] = None,
+) -> list[ProbeResult]:
+    """Sweep IPv4 hosts with batched ARP who-has requests.
+
+    Args:
+        hosts: IPv4 addresses on a directly attached segment.
+        timeout: Capture window in seconds (capped at MAX_ARP_WINDOW).
+        concurrency: Unused; accepted for backend interface compatibility.
+        progress: Optional callback receiving (done, total).
+        interface: Interface to send every request on. Defaults to scapy's
+            route lookup for each host, sending one batch per interface.
+
+    Returns:
+        One result per host, in input order, with MACs for responders.
+
+    Raises:
+        ScannerError: scapy is not installed.
+        ScannerPermissionError: Raw layer-2 access was refused.
+    """
+    total = len(hosts)
+    if total == 0:
+        return []
+
+    scapy_all = _load_scapy()
+
+    # A chunk can span several attached links, so each host goes out of the
+    # interface its own route points at
+    by_interface: dict[str, list[str]] = {}
+    for ip in hosts:
+        iface = interface or scapy_all.conf.route.route(ip)[0]
+        by_interface.setdefault(iface, []).append(ip)
+
+    replies: dict[str, ProbeResult] = {}
+    for iface, targets in by_interface.items():
+        frames = scapy_all.Ether(dst="ff:ff:ff:ff:ff:ff") / scapy_all.ARP(pdst=targets)
+
+        try:
+            answered, _ = scapy_all.srp(
+                frames,
+                timeout=min(timeout, MAX_ARP_WINDOW),
+                iface=iface,
+                # scapy sends the whole batch itself, so pace it by interval
+                inter=get_rate_limiter().packet_interval(),
+                verbose=0,
+            )
+        except PermissionError as e:
+            raise ScannerPermissionError(
+                "Active ARP scanning needs raw socket access; "
+                "run as root/administrator"
+            ) from e
+
+        for sent, received in answered:
+            ip = received.psrc
+            if ip in replies:
+                continue
+            replies[ip] = ProbeResult(
+                ip_address=ip,
+                alive=True,
+                rtt_ms=(received.time - sent.sent_time) * 1000,
+                mac_address=MacAddress(received.hwsrc),
+                interface=iface,
+            )
+
+        logger.debug(
+            f"ARP sweep on {iface}: "
+            f"{sum(ip in replies for ip in targets)}/{len(targets)} hosts replied"
+        )
+
+    if progress is not None:
+        progress(total, total)
+
+    return [replies.get(ip) or ProbeResult(ip_address=ip, alive=False) for ip in hosts]
@@ -0,0 +1,296 @@
+"""Native asyncio ARP prober on a Linux packet socket.
+
+Unlike the scapy-based `arp` backend, which sends a whole chunk and waits
+for one capture window, this answers one awaitable probe per host, so an
+ARP reply can be raced against other protocols. Only hosts on a directly
+attached IPv4 subnet can be probed; others are reported down immediately.
+"""
+
+import asyncio
+import ipaddress
+import socket
+import struct
+import time
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable, Optional
+
+from network_tools.addresses import MacAddress
+from network_tools.logging import get_logger
+from network_tools.scanner.exceptions import ScannerError, ScannerPermissionError
+from network_tools.scanner.sweep import ProbeResult
+
+logger = get_logger("scanner.arp_ping")
+
+ETH_P_ARP = 0x0806
+
+# Interface ioctls from <linux/sockios.h>
+SIOCGIFADDR = 0x8915
+SIOCGIFNETMASK = 0x891B
+SIOCGIFHWADDR = 0x8927
+
+ARP_REQUEST = 1
+ARP_REPLY = 2
+
+# Ethernet/IPv4 ARP: htype, ptype, hlen, plen
+_ARP_ETHERNET_IPV4 = struct.pack("!HHBB", 1, 0x0800, 6, 4)
+_BROADCAST = b"\xff" * 6
+_RECV_BUFFER = 2048
+
+
+@dataclass(frozen=True)
+class Ipv4Link:
+    """A local interface with the IPv4 subnet it is attached to."""
+
+    interface: str
+    mac_address: MacAddress
+    ip_address: str
+    network: ipaddress.IPv4Network
+
+
+def _ifreq(
+    ioctl: Callable[[int, int, bytes], bytes],
+    sock: socket.socket,
+    request: int,
+    name: str,
+) -> bytes:
+    """Run an interface ioctl and return the filled-in ifreq."""
+    return ioctl(sock.fileno(), request, struct.pack("256s", name[:15].encode()))
+
+
+def ipv4_links() -> list[Ipv4Link]:
+    """List the Ethernet interfaces with an IPv4 address.
+
+    Returns:
+        One link per interface, loopback excluded. Empty where interface
+        ioctls are unavailable, as on Windows.
+    """
+    try:
+        from fcntl import ioctl
+    except ImportError:
+        logger.debug("Interface ioctls are unavailable on this platform")
+        return []
+
+    links = []
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        ifreq = partial(_ifreq, ioctl, sock)
+        for _, name in socket.if_nameindex():
+            if name == "lo":
+                continue
+            try:
+                address = socket.inet_ntoa(ifreq(SIOCGIFADDR, name)[20:24])
+                netmask = socket.inet_ntoa(ifreq(SIOCGIFNETMASK, name)[20:24])
+                mac = MacAddress(ifreq(SIOCGIFHWADDR, name)[18:24])
+            except OSError:
+                continue  # Down, or no IPv4 address
+            if not mac.is_unicast:
+                continue
+            links.append(
+                Ipv4Link(
+                    interface=name,
+                    mac_address=mac,
+                    ip_address=address,
+                    network=ipaddress.IPv4Network(f"{address}/{netmask}", strict=False),
+                )
+            )
+    return links
+
+
+def build_arp_request(link: Ipv4Link, target: str) -> bytes:
+    """Build a broadcast who-has Ethernet frame.
+
+    Args:
+        link: Interface the request is sent from.
+        target: IPv4 address to resolve.
+
+    Returns:
+        Frame bytes.
+    """
+    sender: bytes = link.mac_address.packed
+    return (
+        _BROADCAST
+        + sender
+        + struct.pack("!H", ETH_P_ARP)
+        + _ARP_ETHERNET_IPV4
+        + struct.pack("!H", ARP_REQUEST)
+        + sender
+        + socket.inet_aton(link.ip_address)
+        + bytes(6)
+        + socket.inet_aton(target)
+    )
+
+
+def parse_arp_reply(frame: bytes) -> Optional[tuple[str, MacAddress]]:
+    """Extract the sender of an ARP reply frame.
+
+    Args:
+        frame: Ethernet frame read from the packet socket.
+
+    Returns:
+        Tuple of (sender IP, sender MAC), or None if not an ARP reply.
+    """
+    if len(frame) < 42 or struct.unpack_from("!H", frame, 12)[0] != ETH_P_ARP:
+        return None
+    if frame[14:20] != _ARP_ETHERNET_IPV4:
+        return None
+    if struct.unpack_from("!H", frame, 20)[0] != ARP_REPLY:
+        return None
+    return socket.inet_ntoa(frame[28:32]), MacAddress(frame[22:28])
+
+
+class AsyncArpPinger:
+    """Shared packet socket serving many concurrent ARP probes.
+
+    Requires Linux and raw socket access (root or CAP_NET_RAW).
+    """
+
+    def __init__(self, interface: Optional[str] = None) -> None:
+        """Create a pinger.
+
+        Args:
+            interface: Only probe hosts attached to this interface. Defaults
+                to every interface.
+        """
+        self.interface = interface
+        self._sock: Optional[socket.socket] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._links: list[Ipv4Link] = []
+        # ip -> (reply future, send time)
+        self._waiters: dict[str, tuple[asyncio.Future, float]] = {}
+
+    async def __aenter__(self) -> "AsyncArpPinger":
+        self.open()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+    def open(self) -> None:
+        """Open the packet socket and register it with the running loop.
+
+        Raises:
+            ScannerError: Packet sockets are unavailable on this platform.
+            ScannerPermissionError: Raw socket access was refused.
+            NotImplementedError: The event loop has no reader support.
+        """
+        if not hasattr(socket, "AF_PACKET"):
+            raise ScannerError("Native ARP probing needs Linux packet sockets")
+
+        self._loop = asyncio.get_running_loop()
+        try:
+            self._sock = socket.socket(
+                socket.AF_PACKET, socket.SOCK_RAW, socket.htons(ETH_P_ARP)
+            )
+        except PermissionError as e:
+            raise ScannerPermissionError(
+                "ARP probing needs raw socket access; run as root or grant "
+                "CAP_NET_RAW"
+            ) from e
+
+        self._sock.setblocking(False)
+        self._links = [
+            link
+            for link in ipv4_links()
+            if self.interface is None or link.interface == self.interface
+        ]
+        try:
+            self._loop.add_reader(self._sock.fileno(), self._on_readable)
+        except NotImplementedError:
+            self._sock.close()
+            self._sock = None
+            raise
+
+    def close(self) -> None:
+        """Unregister and close the socket, cancelling pending probes."""
+        for future, _ in self._waiters.values():
+            future.cancel()
+        self._waiters.clear()
+
+        if self._sock is not None:
+            if self._loop is not None:
+                self._loop.remove_reader(self._sock.fileno())
+            self._sock.close()
+            self._sock = None
+
+    def link_for(self, ip: str) -> Optional[Ipv4Link]:
+        """Find the interface whose subnet contains an address.
+
+        Args:
+            ip: IPv4 address.
+
+        Returns:
+            The directly attached link, or None if the host is off-link.
+        """
+        try:
+            address = ipaddress.IPv4Address(ip)
+        except ValueError:
+            return None
+        for link in self._links:
+            if address in link.network and ip != link.ip_address:
+                return link
+        return None
+
+    def _on_readable(self) -> None:
+        """Drain the socket and resolve matching probe futures."""
+        assert self._sock is not None
+
+        while True:
+            try:
+                frame = self._sock.recv(_RECV_BUFFER)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as e:
+                logger.debug(f"ARP receive error: {e}")
+                return
+
+            reply = parse_arp_reply(frame)
+            if reply is None:
+                continue
+
+            ip, mac = reply
+            waiter = self._waiters.get(ip)
+            if waiter is not None and not waiter[0].done():
+                future, sent_at = waiter
+                future.set_result(((time.monotonic() - sent_at) * 1000, mac))
+
+    async def ping(self, ip: str, timeout: float) -> ProbeResult:
+        """Send one who-has request and wait for the reply.
+
+        Args:
+            ip: IPv4 address to probe.
+            timeout: Seconds to wait for the reply.
+
+        Returns:
+            Probe result with the RTT and the MAC from the reply. Off-link
+            hosts are reported down without sending anything.
+        """
+        if self._sock is None or self._loop is None:
+            raise ScannerError("AsyncArpPinger is not open")
+
+        link = self.link_for(ip)
+        if link is None or ip in self._waiters:
+            return ProbeResult(ip_address=ip, alive=False)
+
+        future = self._loop.create_future()
+        try:
+            self._waiters[ip] = (future, time.monotonic())
+            await self._loop.sock_sendto(
+                self._sock, build_arp_request(link, ip), (link.interface, ETH_P_ARP)
+            )
+            rtt_ms, mac = await asyncio.wait_for(future, timeout)
+            logger.debug(f"Host {ip} answered ARP from {mac}")
+            return ProbeResult(
+                ip_address=ip,
+                alive=True,
+                rtt_ms=rtt_ms,
+                mac_address=mac,
+                interface=link.interface,
+            )
+        except TimeoutError:
+            pass
+        except OSError as e:
+            logger.debug(f"ARP send failed for {ip}: {e}")
+        finally:
+            self._waiters.pop(ip, None)
+
+        return ProbeResult(ip_address=ip, alive=False)
@@ -1,169 +1,397 @@
 """ARP-based network scanner for device discovery."""
 
-import subprocess
-import re
-import ipaddress
-from dataclasses import dataclass
-from typing import Optional
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Iterator, Optional
 
 from network_tools.logging import get_logger
+from network_tools.scanner.backends import get_sweep_backend
+from network_tools.scanner.checkpoint import ScanCheckpoint
+from network_tools.scanner.exceptions import ScannerError
+from network_tools.scanner.interfaces import LocalSubnet, local_subnets
+from network_tools.scanner.models import ARPEntry
+from network_tools.scanner.neighbors import read_neighbor_table
+from network_tools.scanner.plan import multicast_rtts, plan_sweep, resolve_timing
+from network_tools.scanner.ratelimit import get_rate_limiter
+from network_tools.scanner.sweep import (
+    DEFAULT_CHUNK_SIZE,
+    ProbeResult,
+    ProgressCallback,
+    iter_sweep,
+)
+from network_tools.scanner.targets import Targets, TargetSet
+from network_tools.scanner.timing import AdaptiveTimeout
 
 logger = get_logger("scanner.arp")
 
 
-@dataclass
-class ARPEntry:
-    """Represents an ARP table entry."""
-
-    ip_address: str
-    mac_address: str
-    interface: Optional[str] = None
-
-
-def normalize_mac(mac: str) -> str:
-    """Normalize MAC address to uppercase colon-separated format.
+def get_arp_table(backend: Optional[str] = None) -> list[ARPEntry]:
+    """Get current ARP table entries from the system.
 
     Args:
-        mac: MAC address in any format.
-
-    Returns:
-        Normalized MAC (e.g., 'AA:BB:CC:DD:EE:FF').
-    """
-    # Remove all separators and convert to uppercase
-    cleaned = mac.upper().replace(":", "").replace("-", "").replace(".", "")
-
-    # Pad if needed (some systems show shortened MACs)
-    cleaned = cleaned.zfill(12)
-
-    # Insert colons
-    return ":".join(cleaned[i : i + 2] for i in range(0, 12, 2))
-
-
-def get_arp_table() -> list[ARPEntry]:
-    """Get current ARP table entries from the system.
+        backend: Neighbor table backend ('auto', 'netlink', 'proc', 'arp').
+            Defaults to config neighbor_backend.
 
     Returns:
         List of ARP entries.
     """
-    entries = []
+    entries: list[ARPEntry] = []
 
     try:
-        # Run arp -a command (works on Windows)
-        result = subprocess.run(
-            ["arp", "-a"],
-            capture_output=True,
-            text=True,
-            timeout=30,
-        )
-
-        if result.returncode != 0:
-            logger.warning(f"ARP command failed: {result.stderr}")
-            return entries
-
-        # Parse Windows ARP output
-        # Format: "  192.168.68.1         aa-bb-cc-dd-ee-ff     dynamic"
-        # Or: "Interface: 192.168.68.x --- 0xNN"
-        pattern = r"^\s*(\d+\.\d+\.\d+\.\d+)\s+([\da-fA-F-]{17})\s+(\w+)"
-
-        for line in result.stdout.splitlines():
-            match = re.match(pattern, line)
-            if match:
-                ip_addr = match.group(1)
-                mac_addr = normalize_mac(match.group(2))
-
-                # Skip broadcast and multicast MACs
-                if mac_addr.startswith("FF:FF:FF") or mac_addr.startswith("01:00:5E"):
-                    continue
-
-                entries.append(ARPEntry(ip_address=ip_addr, mac_address=mac_addr))
-
+        entries = read_neighbor_table(backend)
         logger.info(f"Found {len(entries)} ARP entries")
-
-    except subprocess.TimeoutExpired:
-        logger.error("ARP command timed out")
-    except Exception as e:
+    except ScannerError as e:
         logger.error(f"Failed to get ARP table: {e}")
 
     return entries
 
 
-def ping_sweep(network: str, timeout: int = 1) -> list[str]:
-    """Ping sweep a network to populate ARP table.
-
-    Args:
-        network: Network CIDR (e.g., '192.168.68.0/24').
-        timeout: Ping timeout in seconds.
+def _iter_alive(
+    network: Targets,
+    timeout: Optional[float],
+    concurrency: Optional[int],
+    progress: Optional[ProgressCallback],
+    backend: Optional[str],
+    timing: Optional[AdaptiveTimeout] = None,
+    interface: Optional[str] = None,
+    checkpoint: Optional[ScanCheckpoint] = None,
+    resolve: Optional[Callable[[list[ProbeResult]], None]] = None,
+) -> Iterator[ProbeResult]:
+    """Probe every host of a network, yielding responders as chunks finish.
+
+    Without an explicit timeout, timeouts adapt to the RTTs measured so far.
+    With an interface, the backend probes through that interface only.
+    With a checkpoint, finished chunks are skipped and new ones recorded.
+    With a resolve callback, each probed chunk's results are passed to it
+    before they are recorded or yielded.
+
+    Yields:
+        Results for responding hosts, in address order.
+    """
+    plan = plan_sweep(network, timeout, concurrency, backend)
+    if plan is None:
+        return
+
+    sweep: Callable[..., list[ProbeResult]] = get_sweep_backend(plan.backend)
+    if interface is not None:
+        sweep = partial(sweep, interface=interface)
+    timing = resolve_timing(timeout, timing, plan)
+
+    logger.info(
+        f"Starting ping sweep of {plan.total} hosts in {network} "
+        f"(backend={plan.backend}, interface={interface or 'any'}, "
+        f"concurrency={plan.concurrency}, "
+        f"timeout={'adaptive' if timing else f'{plan.timeout}s'})"
+    )
+
+    def finish_chunk(index: int, results: list[ProbeResult]) -> None:
+        if resolve is not None:
+            resolve(results)
+        if checkpoint is not None:
+            checkpoint.record(index, results)
+
+    responded = 0
+    for result in iter_sweep(
+        plan.targets,
+        sweep,
+        plan.timeout,
+        plan.concurrency,
+        plan.total,
+        progress=progress,
+        chunk_size=checkpoint.shard_size if checkpoint else DEFAULT_CHUNK_SIZE,
+        limiter=get_rate_limiter(),
+        timing=timing,
+        completed=checkpoint.completed if checkpoint else None,
+        on_chunk=finish_chunk,
+    ):
+        if result.alive:
+            responded += 1
+            yield result
+
+    logger.info(f"Ping sweep complete: {responded} hosts responded")
+
+
+def _sweep(
+    network: Targets,
+    timeout: Optional[float],
+    concurrency: Optional[int],
+    progress: Optional[ProgressCallback],
+    backend: Optional[str],
+    timing: Optional[AdaptiveTimeout] = None,
+) -> list[ProbeResult]:
+    """Probe every host of a network with the selected backend.
 
     Returns:
-        List of responding IP addresses.
+        Results for responding hosts, in address order.
     """
-    responding = []
-
-    try:
-        net = ipaddress.ip_network(network, strict=False)
-    except ValueError as e:
-        logger.error(f"Invalid network CIDR: {e}")
-        return responding
+    return list(_iter_alive(network, timeout, concurrency, progress, backend, timing))
 
-    # For large networks, limit the scan
-    hosts = list(net.hosts())
-    if len(hosts) > 1024:
-        logger.warning(f"Network has {len(hosts)} hosts, limiting to first 1024")
-        hosts = hosts[:1024]
 
-    logger.info(f"Starting ping sweep of {len(hosts)} hosts in {network}")
-
-    for i, host in enumerate(hosts):
-        ip = str(host)
-
-        try:
-            # Windows ping: -n 1 (count), -w (timeout in ms)
-            result = subprocess.run(
-                ["ping", "-n", "1", "-w", str(timeout * 1000), ip],
-                capture_output=True,
-                text=True,
-                timeout=timeout + 2,
-            )
+def ping_sweep(
+    network: Targets,
+    timeout: Optional[float] = None,
+    concurrency: Optional[int] = None,
+    progress: Optional[ProgressCallback] = None,
+    backend: Optional[str] = None,
+    timing: Optional[AdaptiveTimeout] = None,
+) -> list[str]:
+    """Ping sweep a network to populate ARP table.
 
-            if result.returncode == 0:
-                responding.append(ip)
-                logger.debug(f"Host {ip} responded")
+    Hosts are probed in parallel; the returned list is in address order
+    regardless of completion order.
 
-        except subprocess.TimeoutExpired:
-            pass
-        except Exception as e:
-            logger.debug(f"Ping failed for {ip}: {e}")
+    Args:
+        network: Network CIDR (e.g., '192.168.68.0/24'), or comma-separated
+            CIDRs, addresses and 'first-last' ranges, or a TargetSet.
+        timeout: Fixed ping timeout in seconds. Defaults to timeouts adapted
+            to measured RTTs, starting from config scan_probe_timeout.
+        concurrency: Maximum pings in flight. Defaults to config scan_concurrency.
+        progress: Optional callback receiving (hosts_done, hosts_total).
+        backend: Sweep backend name ('auto', 'icmp', 'ping', 'arp', 'tcp',
+            'race'). Defaults to config scan_backend.
+        timing: Adaptive timeouts to use and refine, e.g. seeded from scan
+            history. Ignored when `timeout` is given.
 
-        # Progress logging every 50 hosts
-        if (i + 1) % 50 == 0:
-            logger.info(f"Progress: {i + 1}/{len(hosts)} hosts scanned")
+    Returns:
+        List of responding IP addresses.
 
-    logger.info(f"Ping sweep complete: {len(responding)} hosts responded")
-    return responding
+    Raises:
+        ScanLimitError: The targets have more hosts than config scan_max_hosts.
+    """
+    results = _sweep(network, timeout, concurrency, progress, backend, timing)
+    return [r.ip_address for r in results]
+
+
+def iter_scan_network(
+    network: Targets,
+    use_ping: bool = True,
+    timeout: Optional[float] = None,
+    progress: Optional[ProgressCallback] = None,
+    backend: Optional[str] = None,
+    timing: Optional[AdaptiveTimeout] = None,
+    interface: Optional[str] = None,
+    checkpoint: Optional[ScanCheckpoint] = None,
+) -> Iterator[ARPEntry]:
+    """Scan a network, yielding ARP entries as hosts are confirmed alive.
+
+    Responders are looked up in the neighbor table as each sweep chunk
+    completes, so callers can enrich and compare devices while the rest of
+    the network is still being probed. Entries that are in the neighbor
+    table but did not answer the sweep are yielded at the end.
 
+    Args:
+        network: Network CIDR to scan, or comma-separated CIDRs, addresses
+            and 'first-last' ranges, or a TargetSet.
+        use_ping: Whether to ping sweep first to populate ARP table.
+        timeout: Fixed ping timeout in seconds. Defaults to timeouts adapted
+            to measured RTTs, starting from config scan_probe_timeout.
+        progress: Optional callback receiving (hosts_done, hosts_total).
+        backend: Sweep backend name. Defaults to config scan_backend.
+        timing: Adaptive timeouts to use and refine, e.g. seeded from scan
+            history. Ignored when `timeout` is given.
+        interface: Probe through this interface only, and only report
+            neighbors learned on it. Defaults to any interface.
+        checkpoint: Checkpoint of these targets. Sweep shards it has
+            finished are not probed again, and each newly finished shard is
+            added to it.
+
+    Yields:
+        Discovered ARP entries, each IP at most once.
+
+    Raises:
+        ScanLimitError: The targets have more hosts than config scan_max_hosts.
+    """
+    try:
+        targets: Optional[TargetSet] = TargetSet.parse(network)
+    except ValueError:
+        targets = None
+
+    def in_network(entry: ARPEntry) -> bool:
+        if interface is not None and entry.interface not in (None, interface):
+            return False
+        return targets is None or entry.ip_address in targets
+
+    def resolve(results: list[ProbeResult]) -> None:
+        """Fill in responders' MACs from one neighbor table read per chunk.
+
+        Done before the chunk is checkpointed, so a resumed sweep does not
+        depend on neighbor entries that have long expired.
+        """
+        pending = [r for r in results if r.alive and r.mac_address is None]
+        if not pending:
+            return
+        table = {e.ip_address: e for e in get_arp_table()}
+        for result in pending:
+            entry = table.get(result.ip_address)
+            if entry is not None:
+                result.mac_address = entry.mac_address
+                result.interface = entry.interface or result.interface
+
+    yielded: set[str] = set()
+    # Responders not yet in the neighbor table, with their RTTs
+    unresolved: dict[str, Optional[float]] = {}
+    count = 0
 
-def scan_network(network: str, use_ping: bool = True) -> list[ARPEntry]:
+    if use_ping:
+        alive = _iter_alive(
+            network,
+            timeout,
+            None,
+            progress,
+            backend,
+            timing,
+            interface,
+            checkpoint,
+            resolve,
+        )
+        for result in alive:
+            if result.mac_address is None:
+                unresolved[result.ip_address] = result.rtt_ms
+                continue
+            entry = ARPEntry(
+                ip_address=result.ip_address,
+                mac_address=result.mac_address,
+                interface=result.interface or interface,
+                response_time_ms=result.rtt_ms,
+            )
+            if not in_network(entry):
+                continue
+            yielded.add(entry.ip_address)
+            count += 1
+            yield entry
+
+        # Every IPv6 responder is now in the neighbor table read below
+        unresolved.update(multicast_rtts(targets, timeout))
+
+    # Remaining neighbors: cache-only hosts, or everything when not sweeping
+    for entry in get_arp_table():
+        if entry.ip_address in yielded or not in_network(entry):
+            continue
+        entry.response_time_ms = unresolved.get(entry.ip_address)
+        entry.interface = entry.interface or interface
+        yielded.add(entry.ip_address)
+        count += 1
+        yield entry
+
+    logger.info(f"Found {count} devices in {network}")
+
+
+def scan_network(
+    network: Targets,
+    use_ping: bool = True,
+    timeout: Optional[float] = None,
+    progress: Optional[ProgressCallback] = None,
+    backend: Optional[str] = None,
+    timing: Optional[AdaptiveTimeout] = None,
+) -> list[ARPEntry]:
     """Scan a network for devices using ARP.
 
     Args:
-        network: Network CIDR to scan.
+        network: Network CIDR to scan, or comma-separated CIDRs, addresses
+            and 'first-last' ranges, or a TargetSet.
         use_ping: Whether to ping sweep first to populate ARP table.
+        timeout: Fixed ping timeout in seconds. Defaults to timeouts adapted
+            to measured RTTs, starting from config scan_probe_timeout.
+        progress: Optional callback receiving (hosts_done, hosts_total).
+        backend: Sweep backend name; 'race' probes ICMP, ARP and TCP at once
+            and takes the first answer. Defaults to config scan_backend.
+        timing: Adaptive timeouts to use and refine, e.g. seeded from scan
+            history. Ignored when `timeout` is given.
 
     Returns:
-        List of discovered ARP entries.
+        List of discovered ARP entries, with RTTs where the sweep measured them.
+
+    Raises:
+        ScanLimitError: The targets have more hosts than config scan_max_hosts.
     """
-    if use_ping:
-        ping_sweep(network, timeout=1)
+    return list(
+        iter_scan_network(network, use_ping, timeout, progress, backend, timing)
+    )
 
-    # Get ARP table after ping sweep
-    entries = get_arp_table()
 
-    # Filter to only include IPs in the target network
-    try:
-        net = ipaddress.ip_network(network, strict=False)
-        entries = [e for e in entries if ipaddress.ip_address(e.ip_address) in net]
-    except ValueError:
-        pass
+def iter_scan_interfaces(
+    subnets: Optional[list[LocalSubnet]] = None,
+    use_ping: bool = True,
+    timeout: Optional[float] = None,
+    progress: Optional[ProgressCallback] = None,
+    backend: Optional[str] = None,
+    timing: Optional[AdaptiveTimeout] = None,
+    checkpoints: Optional[dict[LocalSubnet, ScanCheckpoint]] = None,
+) -> Iterator[ARPEntry]:
+    """Scan every directly attached subnet in parallel, one per interface.
 
-    logger.info(f"Found {len(entries)} devices in {network}")
-    return entries
+    Each subnet is swept by its own worker, probing through its own
+    interface, so the whole run takes about as long as the slowest segment.
+
+    Args:
+        subnets: Subnets to scan. Defaults to every attached IPv4 subnet.
+        use_ping: Whether to sweep first to populate the ARP table.
+        timeout: Fixed probe timeout in seconds. Defaults to adaptive
+            timeouts, starting from config scan_probe_timeout.
+        progress: Optional callback receiving (hosts_done, hosts_total)
+            summed over every subnet.
+        backend: Sweep backend name. Defaults to config scan_backend.
+        timing: Adaptive timeouts shared by every subnet's sweep.
+        checkpoints: Checkpoint of each subnet's sweep, for resuming.
+
+    Yields:
+        Discovered ARP entries tagged with their interface, as any subnet
+        finds them.
+
+    Raises:
+        ScanLimitError: A subnet has more hosts than config scan_max_hosts.
+    """
+    if subnets is None:
+        subnets = local_subnets()
+    if not subnets:
+        logger.warning("No directly attached IPv4 subnets to scan")
+        return
+
+    logger.info(
+        "Scanning " + ", ".join(f"{s.network} on {s.interface}" for s in subnets)
+    )
+
+    found: queue.Queue[Optional[ARPEntry]] = queue.Queue()
+    lock = threading.Lock()
+    # subnet -> (hosts done, hosts total)
+    counts: dict[LocalSubnet, tuple[int, int]] = {}
+
+    def scan(subnet: LocalSubnet) -> None:
+        def on_progress(done: int, total: int) -> None:
+            assert progress is not None
+            with lock:
+                counts[subnet] = (done, total)
+                all_done = sum(d for d, _ in counts.values())
+                all_total = sum(t for _, t in counts.values())
+            progress(all_done, all_total)
+
+        try:
+            for entry in iter_scan_network(
+                str(subnet.network),
+                use_ping=use_ping,
+                timeout=timeout,
+                progress=on_progress if progress is not None else None,
+                backend=backend,
+                timing=timing,
+                interface=subnet.interface,
+                checkpoint=(checkpoints or {}).get(subnet),
+            ):
+                found.put(entry)
+        finally:
+            found.put(None)  # This subnet is finished
+
+    with ThreadPoolExecutor(
+        max_workers=len(subnets), thread_name_prefix="scan-interface"
+    ) as pool:
+        futures = [pool.submit(scan, subnet) for subnet in subnets]
+        running = len(futures)
+        while running:
+            entry = found.get()
+            if entry is None:
+                running -= 1
+            else:
+                yield entry
+        for future in futures:
+            future.result()  # Re-raise a worker's error
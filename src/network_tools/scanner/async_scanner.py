@@ -0,0 +1,307 @@
+"""asyncio counterparts of the blocking scanner API.
+
+Probes are coroutines bounded by a semaphore, so thousands of them can be
+in flight on one event loop. With the ICMP backend every probe shares a
+single socket registered with the loop; cancelling the calling task
+cancels all outstanding probes and releases the socket.
+"""
+
+import asyncio
+from functools import partial
+from typing import Any, Awaitable, Callable, Coroutine, Optional
+
+from network_tools.config import get_config
+from network_tools.logging import get_logger
+from network_tools.scanner.arp_scanner import get_arp_table
+from network_tools.scanner.backends import check_sweep_backend
+from network_tools.scanner.exceptions import ScannerError, ScannerPermissionError
+from network_tools.scanner.icmp import AsyncIcmpPinger
+from network_tools.scanner.models import ARPEntry
+from network_tools.scanner.ping import parse_rtt, ping_command
+from network_tools.scanner.plan import (
+    multicast_rtts,
+    plan_sweep,
+    resolve_timing,
+    select_entries,
+)
+from network_tools.scanner.race import LivenessRacer
+from network_tools.scanner.ratelimit import get_rate_limiter
+from network_tools.scanner.sweep import (
+    DEFAULT_CHUNK_SIZE,
+    ProbeResult,
+    ProgressCallback,
+    chunked,
+)
+from network_tools.scanner.targets import Targets, TargetSet
+from network_tools.scanner.tcp import parse_ports, tcp_probe
+from network_tools.scanner.timing import AdaptiveTimeout
+
+logger = get_logger("scanner.async")
+
+# Sweep backends with an asyncio probe; ARP needs a blocking raw socket
+_ASYNC_BACKENDS = ("auto", "icmp", "ping", "tcp", "race")
+
+# Backends whose probes wait for the rate limiter before each packet
+_SELF_PACED = ("tcp", "race")
+
+
+async def async_ping_host(ip: str, timeout: float) -> ProbeResult:
+    """Ping one host with the system `ping` command without blocking.
+
+    Args:
+        ip: IP address to ping.
+        timeout: Ping timeout in seconds.
+
+    Returns:
+        Probe result for the host.
+    """
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *ping_command(ip, timeout),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+    except OSError as e:
+        logger.debug(f"Ping failed for {ip}: {e}")
+        return ProbeResult(ip_address=ip, alive=False)
+
+    try:
+        stdout, _ = await asyncio.wait_for(proc.communicate(), timeout + 2)
+    except TimeoutError:
+        proc.kill()
+        await proc.wait()
+        return ProbeResult(ip_address=ip, alive=False)
+    except asyncio.CancelledError:
+        # Don't leave ping processes behind when the sweep is cancelled;
+        # the shielded wait reaps the child even if cancelled again
+        if proc.returncode is None:
+            proc.kill()
+        await asyncio.shield(proc.wait())
+        raise
+
+    if proc.returncode == 0:
+        logger.debug(f"Host {ip} responded")
+        output = stdout.decode(errors="ignore")
+        return ProbeResult(ip_address=ip, alive=True, rtt_ms=parse_rtt(output))
+
+    return ProbeResult(ip_address=ip, alive=False)
+
+
+async def async_get_arp_table(backend: Optional[str] = None) -> list[ARPEntry]:
+    """Read the neighbor table without blocking the event loop.
+
+    Args:
+        backend: Neighbor table backend. Defaults to config neighbor_backend.
+
+    Returns:
+        List of ARP entries.
+    """
+    return await asyncio.to_thread(get_arp_table, backend)
+
+
+async def _async_sweep(
+    network: Targets,
+    timeout: Optional[float],
+    concurrency: Optional[int],
+    progress: Optional[ProgressCallback],
+    backend: Optional[str],
+    timing: Optional[AdaptiveTimeout] = None,
+) -> list[ProbeResult]:
+    """Probe every host of a network concurrently on the running loop.
+
+    Without an explicit timeout, each chunk's timeout adapts to the RTTs
+    measured so far.
+
+    Returns:
+        Results for responding hosts, in address order.
+    """
+    plan = plan_sweep(network, timeout, concurrency, backend)
+    if plan is None:
+        return []
+
+    check_sweep_backend(plan.backend)
+    if plan.backend not in _ASYNC_BACKENDS:
+        raise ScannerError(f"Backend '{plan.backend}' has no async implementation")
+
+    pinger: Optional[AsyncIcmpPinger] = None
+    if plan.backend in ("auto", "icmp"):
+        pinger = AsyncIcmpPinger()
+        try:
+            pinger.open()
+        except (ScannerPermissionError, NotImplementedError):
+            if plan.backend == "icmp":
+                raise
+            pinger = None
+
+    limiter = get_rate_limiter()
+    timing = resolve_timing(timeout, timing, plan)
+    chunk_timeout = plan.timeout
+    racer: Optional[LivenessRacer] = None
+    probe: Callable[[str, float], Awaitable[ProbeResult]]
+    if plan.backend == "race":
+        racer = LivenessRacer(limiter=limiter)
+        racer.open()
+        probe = racer.probe
+        backend_name = "race"
+    elif plan.backend == "tcp":
+        ports = parse_ports(get_config().scan_tcp_ports)
+        probe = partial(tcp_probe, ports=ports, limiter=limiter)
+        backend_name = "tcp"
+    elif pinger is not None:
+        probe = pinger.ping
+        backend_name = "icmp"
+    else:
+        probe = async_ping_host
+        backend_name = "ping"
+    semaphore = asyncio.Semaphore(plan.concurrency)
+    done = 0
+
+    async def paced(ip: str) -> ProbeResult:
+        async with semaphore:
+            delay = 0.0 if backend_name in _SELF_PACED else limiter.reserve(ip)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            return await probe(ip, chunk_timeout)
+
+    async def bounded(ip: str) -> ProbeResult:
+        nonlocal done
+        result = await paced(ip)
+        done += 1
+        if progress is not None:
+            progress(done, plan.total)
+        return result
+
+    async def probe_all(
+        hosts: list[str], prober: Callable[[str], Coroutine[Any, Any, ProbeResult]]
+    ) -> list[ProbeResult]:
+        # TaskGroup cancels every sibling probe if one fails or we are cancelled
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(prober(ip)) for ip in hosts]
+        return [task.result() for task in tasks]
+
+    logger.info(
+        f"Starting async sweep of {plan.total} hosts in {network} "
+        f"(backend={backend_name}, "
+        f"concurrency={plan.concurrency}, "
+        f"timeout={'adaptive' if timing else f'{plan.timeout}s'})"
+    )
+
+    responding: list[ProbeResult] = []
+    try:
+        for chunk in chunked(plan.targets, DEFAULT_CHUNK_SIZE):
+            if timing is not None:
+                chunk_timeout = timing.timeout_for_hosts(chunk)
+            results = await probe_all(chunk, bounded)
+            alive = [result for result in results if result.alive]
+
+            # Same loss handling as sweep.retry_on_loss
+            if limiter.observe(len(results), len(alive)):
+                limiter.back_off()
+                silent = [result.ip_address for result in results if not result.alive]
+                recovered = {
+                    result.ip_address: result
+                    for result in await probe_all(silent, paced)
+                    if result.alive
+                }
+                if recovered:
+                    alive = [
+                        recovered.get(result.ip_address, result)
+                        for result in results
+                        if result.alive or result.ip_address in recovered
+                    ]
+                else:
+                    limiter.recover()
+
+            if timing is not None:
+                for result in alive:
+                    if result.rtt_ms is not None:
+                        timing.observe(result.ip_address, result.rtt_ms)
+            responding.extend(alive)
+    finally:
+        if pinger is not None:
+            pinger.close()
+        if racer is not None:
+            racer.close()
+
+    logger.info(f"Async sweep complete: {len(responding)} hosts responded")
+    return responding
+
+
+async def async_ping_sweep(
+    network: Targets,
+    timeout: Optional[float] = None,
+    concurrency: Optional[int] = None,
+    progress: Optional[ProgressCallback] = None,
+    backend: Optional[str] = None,
+    timing: Optional[AdaptiveTimeout] = None,
+) -> list[str]:
+    """Async counterpart of ping_sweep.
+
+    Args:
+        network: Network CIDR (e.g., '192.168.68.0/24'), or comma-separated
+            CIDRs, addresses and 'first-last' ranges, or a TargetSet.
+        timeout: Probe timeout in seconds. Defaults to a timeout adapted to
+            measured RTTs, starting from config scan_probe_timeout.
+        concurrency: Maximum probes in flight. Defaults to config scan_concurrency.
+        progress: Optional callback receiving (hosts_done, hosts_total).
+        backend: 'auto', 'icmp', 'ping', 'tcp' or 'race'. Defaults to config
+            scan_backend.
+        timing: Adaptive timeout state to use and update, e.g. seeded from
+            scan history. Ignored when timeout is given.
+
+    Returns:
+        List of responding IP addresses, in address order.
+
+    Raises:
+        ScanLimitError: The targets have more hosts than config scan_max_hosts.
+    """
+    results = await _async_sweep(
+        network, timeout, concurrency, progress, backend, timing
+    )
+    return [r.ip_address for r in results]
+
+
+async def async_scan_network(
+    network: Targets,
+    use_ping: bool = True,
+    timeout: Optional[float] = None,
+    concurrency: Optional[int] = None,
+    progress: Optional[ProgressCallback] = None,
+    backend: Optional[str] = None,
+    timing: Optional[AdaptiveTimeout] = None,
+) -> list[ARPEntry]:
+    """Async counterpart of scan_network.
+
+    Args:
+        network: Network CIDR to scan, or comma-separated CIDRs, addresses
+            and 'first-last' ranges, or a TargetSet.
+        use_ping: Whether to sweep first to populate the ARP table.
+        timeout: Probe timeout in seconds. Defaults to a timeout adapted to
+            measured RTTs, starting from config scan_probe_timeout.
+        concurrency: Maximum probes in flight. Defaults to config scan_concurrency.
+        progress: Optional callback receiving (hosts_done, hosts_total).
+        backend: 'auto', 'icmp', 'ping', 'tcp' or 'race'. Defaults to config
+            scan_backend.
+        timing: Adaptive timeout state to use and update, e.g. seeded from
+            scan history. Ignored when timeout is given.
+
+    Returns:
+        List of discovered ARP entries, with RTTs where the sweep measured them.
+
+    Raises:
+        ScanLimitError: The targets have more hosts than config scan_max_hosts.
+    """
+    rtts: dict[str, Optional[float]] = {}
+    if use_ping:
+        results = await _async_sweep(
+            network, timeout, concurrency, progress, backend, timing
+        )
+        rtts = {r.ip_address: r.rtt_ms for r in results}
+        try:
+            targets: Optional[TargetSet] = TargetSet.parse(network)
+        except ValueError:
+            targets = None
+        rtts.update(await asyncio.to_thread(multicast_rtts, targets, timeout))
+
+    entries: list[ARPEntry] = select_entries(await async_get_arp_table(), network, rtts)
+    return entries
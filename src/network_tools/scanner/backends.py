@@ -0,0 +1,54 @@
+"""Selectable sweep backends for host liveness probing."""
+
+from network_tools.logging import get_logger
+from network_tools.scanner.active_arp import arp_request_sweep
+from network_tools.scanner.exceptions import ScannerError
+from network_tools.scanner.icmp import icmp_available, icmp_sweep
+from network_tools.scanner.ping import subprocess_sweep
+from network_tools.scanner.race import race_sweep
+from network_tools.scanner.sweep import SweepBackend
+from network_tools.scanner.tcp import tcp_sweep
+
+logger = get_logger("scanner.backends")
+
+SWEEP_BACKENDS: dict[str, SweepBackend] = {
+    "ping": subprocess_sweep,
+    "icmp": icmp_sweep,
+    "arp": arp_request_sweep,
+    "tcp": tcp_sweep,
+    "race": race_sweep,
+}
+
+
+def check_sweep_backend(name: str) -> None:
+    """Ensure a name is 'auto' or a registered sweep backend.
+
+    Args:
+        name: Backend name.
+
+    Raises:
+        ScannerError: Unknown backend name.
+    """
+    if name != "auto" and name not in SWEEP_BACKENDS:
+        available = ", ".join(["auto", *SWEEP_BACKENDS])
+        raise ScannerError(f"Unknown sweep backend '{name}' (available: {available})")
+
+
+def get_sweep_backend(name: str = "auto") -> SweepBackend:
+    """Resolve a sweep backend by name.
+
+    Args:
+        name: Backend name, or 'auto' to use the native ICMP engine when an
+            ICMP socket can be opened and the system `ping` otherwise.
+
+    Returns:
+        Sweep backend callable.
+
+    Raises:
+        ScannerError: Unknown backend name.
+    """
+    check_sweep_backend(name)
+    if name == "auto":
+        name = "icmp" if icmp_available() else "ping"
+        logger.debug(f"Auto-selected sweep backend: {name}")
+    return SWEEP_BACKENDS[name]
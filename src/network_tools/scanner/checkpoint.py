@@ -0,0 +1,235 @@
+"""Checkpoints that let an interrupted sweep resume where it stopped.
+
+A sweep is cut into fixed-size shards, the chunks iter_sweep hands to a
+backend. As each shard finishes, its responders are appended to a
+JSON-lines file. A resumed sweep restores the finished shards and probes
+only the rest, so re-running after a failure costs only the unfinished
+work.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import IO, Optional, Union
+
+from network_tools.addresses import MacAddress
+from network_tools.config import get_config
+from network_tools.logging import get_logger
+from network_tools.scanner.sweep import DEFAULT_CHUNK_SIZE, ProbeResult
+from network_tools.scanner.targets import Targets, TargetSet
+
+logger = get_logger("scanner.checkpoint")
+
+
+def _result_to_dict(result: ProbeResult) -> dict:
+    """Serialize a responder for the checkpoint file."""
+    return {
+        "ip_address": result.ip_address,
+        "rtt_ms": result.rtt_ms,
+        "mac_address": str(result.mac_address) if result.mac_address else None,
+        "interface": result.interface,
+        "tcp_ports": {str(port): is_open for port, is_open in result.tcp_ports.items()},
+    }
+
+
+def _shard_line(index: int, alive: list[ProbeResult]) -> str:
+    """One line of the checkpoint file recording a finished shard."""
+    return json.dumps({"shard": index, "alive": [_result_to_dict(r) for r in alive]})
+
+
+def _result_from_dict(data: dict) -> ProbeResult:
+    """Deserialize a responder from the checkpoint file."""
+    mac = data.get("mac_address")
+    return ProbeResult(
+        ip_address=data["ip_address"],
+        alive=True,
+        rtt_ms=data.get("rtt_ms"),
+        mac_address=MacAddress(mac) if mac else None,
+        interface=data.get("interface"),
+        tcp_ports={
+            int(port): bool(is_open)
+            for port, is_open in data.get("tcp_ports", {}).items()
+        },
+    )
+
+
+class ScanCheckpoint:
+    """Finished shards of one sweep, persisted as they complete.
+
+    Only responders are stored; every other host of a finished shard was
+    probed and found down.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        network: Targets,
+        shard_size: int = DEFAULT_CHUNK_SIZE,
+        max_age: Optional[int] = None,
+    ) -> None:
+        """Open a checkpoint, loading the finished shards of an earlier run.
+
+        A checkpoint of other targets or another shard size, or one older
+        than max_age, is started over.
+
+        Args:
+            path: JSON-lines checkpoint file.
+            network: Scan targets the sweep covers.
+            shard_size: Hosts per shard; must match the sweep's chunk size.
+            max_age: Seconds an unfinished sweep can be resumed. Defaults to
+                config scan_checkpoint_max_age.
+
+        Raises:
+            ValueError: The targets are invalid.
+        """
+        targets = TargetSet.parse(network)
+        swept = targets.family(4)
+        self.path = Path(path)
+        self.network = str(targets)
+        self.hosts = swept.num_hosts if swept is not None else 0
+        self.shard_size = shard_size
+        if max_age is None:
+            max_age = get_config().scan_checkpoint_max_age
+        self.max_age = max_age
+        # shard index -> responders of that shard
+        self.completed: dict[int, list[ProbeResult]] = {}
+        self.created_at = datetime.now(timezone.utc)
+        self._file: Optional[IO[str]] = None
+        self._disabled = False
+        self._load()
+
+    @classmethod
+    def for_targets(
+        cls, network: Targets, directory: Optional[Union[str, Path]] = None
+    ) -> "ScanCheckpoint":
+        """Open the checkpoint of a target in the checkpoint directory.
+
+        Args:
+            network: Scan targets the sweep covers.
+            directory: Checkpoint directory. Defaults to config
+                scan_checkpoint_dir.
+
+        Returns:
+            The target's checkpoint, with any resumable shards loaded.
+
+        Raises:
+            ValueError: The targets are invalid.
+        """
+        if directory is None:
+            directory = get_config().scan_checkpoint_dir
+        key = hashlib.sha256(str(TargetSet.parse(network)).encode()).hexdigest()
+        return cls(Path(directory) / f"sweep-{key[:16]}.jsonl", network)
+
+    @property
+    def done_hosts(self) -> int:
+        """Number of hosts in finished shards."""
+        return sum(
+            min(self.shard_size, self.hosts - index * self.shard_size)
+            for index in self.completed
+        )
+
+    def _header(self) -> dict:
+        return {
+            "network": self.network,
+            "hosts": self.hosts,
+            "shard_size": self.shard_size,
+        }
+
+    def _load(self) -> None:
+        """Read finished shards, unless the file belongs to another sweep."""
+        try:
+            lines = self.path.read_text().splitlines()
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            logger.warning(f"Cannot read scan checkpoint {self.path}: {e}")
+            return
+
+        try:
+            header = json.loads(lines[0])
+            created_at = datetime.fromisoformat(header.pop("created_at"))
+        except (IndexError, ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.debug(f"Ignoring unreadable scan checkpoint {self.path}: {e}")
+            return
+        if header != self._header():
+            logger.debug(f"Scan checkpoint {self.path} is for another sweep")
+            return
+        if datetime.now(timezone.utc) - created_at > timedelta(seconds=self.max_age):
+            logger.info(f"Scan checkpoint of {self.network} expired; starting over")
+            return
+
+        self.created_at = created_at
+        for line in lines[1:]:
+            try:
+                shard = json.loads(line)
+                self.completed[int(shard["shard"])] = [
+                    _result_from_dict(item) for item in shard["alive"]
+                ]
+            except (ValueError, KeyError, TypeError):
+                break  # Torn last line of an interrupted write
+
+        if self.completed:
+            logger.info(
+                f"Resuming sweep of {self.network}: {self.done_hosts}/{self.hosts} "
+                f"hosts already probed"
+            )
+
+    def _open(self) -> IO[str]:
+        """Rewrite the file with the restored shards and open it to append."""
+        header = {**self._header(), "created_at": self.created_at.isoformat()}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp = self.path.with_name(self.path.name + ".tmp")
+        with open(temp, "w") as f:
+            f.write(json.dumps(header) + "\n")
+            for index, alive in sorted(self.completed.items()):
+                f.write(_shard_line(index, alive) + "\n")
+        # A torn line left by a crash never survives into the new file
+        os.replace(temp, self.path)
+        return open(self.path, "a")
+
+    def record(self, index: int, results: list[ProbeResult]) -> None:
+        """Persist a finished shard.
+
+        A checkpoint that cannot be written is logged and disabled; the
+        sweep itself carries on.
+
+        Args:
+            index: Shard index within the sweep.
+            results: Results of every host in the shard.
+        """
+        if self._disabled:
+            return
+        alive = [result for result in results if result.alive]
+        try:
+            if self._file is None:
+                self._file = self._open()
+            self._file.write(_shard_line(index, alive) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        except OSError as e:
+            logger.warning(f"Cannot write scan checkpoint {self.path}: {e}")
+            self.close()
+            self._disabled = True
+            return
+        self.completed[index] = alive
+
+    def close(self) -> None:
+        """Close the checkpoint file, keeping it for a later resume."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def discard(self) -> None:
+        """Delete the checkpoint, e.g. once its sweep's results were used.
+
+        The checkpoint stays usable and starts over on the next record.
+        """
+        self.close()
+        self.completed.clear()
+        self.created_at = datetime.now(timezone.utc)
+        try:
+            self.path.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"Cannot remove scan checkpoint {self.path}: {e}")
@@ -0,0 +1,19 @@
+"""Custom exceptions for the network scanner."""
+
+
+class ScannerError(Exception):
+    """Base exception for scanner errors."""
+
+    pass
+
+
+class ScannerPermissionError(ScannerError):
+    """Raised when the OS refuses the sockets a scan backend needs."""
+
+    pass
+
+
+class ScanLimitError(ScannerError):
+    """Raised when a scan target exceeds the configured host limit."""
+
+    pass
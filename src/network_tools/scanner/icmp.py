@@ -0,0 +1,374 @@
+"""In-process ICMP echo engine.
+
+A single socket sends echo requests to every target and one receive loop
+matches replies back to their request by identifier and sequence number,
+so no `ping` process is spawned per host. AsyncIcmpPinger does the same
+on an asyncio event loop, one awaitable probe per host.
+"""
+
+import asyncio
+import random
+import select
+import socket
+import struct
+import time
+from typing import Optional, Sequence
+
+from network_tools.logging import get_logger
+from network_tools.scanner.exceptions import ScannerError, ScannerPermissionError
+from network_tools.scanner.interfaces import bind_to_interface
+from network_tools.scanner.ratelimit import get_rate_limiter
+from network_tools.scanner.sweep import ProbeResult, ProgressCallback
+
+logger = get_logger("scanner.icmp")
+
+ICMP_ECHO_REPLY = 0
+ICMP_ECHO_REQUEST = 8
+
+# type, code, checksum, identifier, sequence
+_ICMP_HEADER = struct.Struct("!BBHHH")
+
+_PAYLOAD = b"network-tools"
+_RECV_BUFFER = 2048
+
+# Kernel receive buffer; replies to a burst of requests must fit until read
+_SOCKET_RCVBUF = 1 << 20
+
+
+def checksum(data: bytes) -> int:
+    """Compute the RFC 1071 internet checksum.
+
+    Args:
+        data: Bytes to checksum.
+
+    Returns:
+        16-bit one's complement checksum.
+    """
+    if len(data) % 2:
+        data += b"\x00"
+    total: int = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def build_echo_request(ident: int, seq: int, payload: bytes = _PAYLOAD) -> bytes:
+    """Build an ICMP echo request packet.
+
+    Args:
+        ident: 16-bit identifier.
+        seq: 16-bit sequence number.
+        payload: Echo payload.
+
+    Returns:
+        Packet bytes with checksum filled in.
+    """
+    header = _ICMP_HEADER.pack(ICMP_ECHO_REQUEST, 0, 0, ident, seq)
+    csum = checksum(header + payload)
+    return _ICMP_HEADER.pack(ICMP_ECHO_REQUEST, 0, csum, ident, seq) + payload
+
+
+def parse_echo_reply(packet: bytes) -> Optional[tuple[int, int]]:
+    """Extract identifier and sequence from an ICMP echo reply.
+
+    Raw sockets (and datagram sockets on some BSDs) deliver the IPv4
+    header in front of the ICMP message; it is skipped when present.
+
+    Args:
+        packet: Bytes read from the socket.
+
+    Returns:
+        Tuple of (identifier, sequence), or None if not an echo reply.
+    """
+    if packet and packet[0] >> 4 == 4:
+        packet = packet[(packet[0] & 0x0F) * 4 :]
+
+    if len(packet) < _ICMP_HEADER.size:
+        return None
+
+    icmp_type, code, _, ident, seq = _ICMP_HEADER.unpack_from(packet)
+    if icmp_type != ICMP_ECHO_REPLY or code != 0:
+        return None
+
+    return ident, seq
+
+
+def open_icmp_socket(interface: Optional[str] = None) -> tuple[socket.socket, bool]:
+    """Open a non-blocking ICMP socket.
+
+    Prefers an unprivileged ICMP datagram socket (Linux with
+    net.ipv4.ping_group_range, macOS) and falls back to a raw socket.
+
+    Args:
+        interface: Interface to bind the socket to. Defaults to none.
+
+    Returns:
+        Tuple of (socket, is_raw).
+
+    Raises:
+        ScannerPermissionError: Neither socket type is permitted.
+    """
+    try:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+        is_raw = False
+    except OSError:
+        try:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP)
+            is_raw = True
+        except OSError as e:
+            raise ScannerPermissionError(
+                "Cannot open an ICMP socket; run as root/administrator or allow "
+                "unprivileged ICMP (net.ipv4.ping_group_range)"
+            ) from e
+
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, _SOCKET_RCVBUF)
+    except OSError:
+        pass  # Keep the default size
+
+    if interface is not None:
+        bind_to_interface(sock, interface)
+
+    sock.setblocking(False)
+    return sock, is_raw
+
+
+def icmp_available() -> bool:
+    """Check whether an ICMP socket can be opened in this process.
+
+    Returns:
+        True if the native ICMP engine can be used.
+    """
+    try:
+        sock, _ = open_icmp_socket()
+    except ScannerPermissionError:
+        return False
+    sock.close()
+    return True
+
+
+def icmp_sweep(
+    hosts: Sequence[str],
+    timeout: float,
+    concurrency: int = 0,
+    progress: Optional[ProgressCallback] = None,
+    interface: Optional[str] = None,
+) -> list[ProbeResult]:
+    """Sweep hosts with ICMP echo over a single socket.
+
+    Requests are sent as fast as the shared rate limiter allows, and
+    replies are collected in one receive loop until every host answered or
+    `timeout` seconds passed since the last request went out.
+
+    Args:
+        hosts: IPv4 addresses to probe.
+        timeout: Seconds to wait for replies after the last request.
+        concurrency: Unused; accepted for backend interface compatibility.
+        progress: Optional callback receiving (done, total).
+        interface: Interface to send and receive on. Defaults to the
+            kernel's route lookup.
+
+    Returns:
+        One result per host, in input order, with measured RTTs.
+
+    Raises:
+        ScannerPermissionError: No ICMP socket could be opened.
+    """
+    total = len(hosts)
+    if total == 0:
+        return []
+
+    sock, is_raw = open_icmp_socket(interface)
+    # Datagram sockets get their identifier rewritten by the kernel and only
+    # receive their own replies, so the identifier is only checked on raw.
+    ident = random.getrandbits(16)
+
+    pending: dict[tuple[str, int], float] = {}
+    rtts: dict[str, float] = {}
+
+    def drain(wait: float) -> None:
+        readable, _, _ = select.select([sock], [], [], wait)
+        while readable:
+            try:
+                packet, addr = sock.recvfrom(_RECV_BUFFER)
+            except BlockingIOError:
+                return
+            except OSError as e:
+                logger.debug(f"ICMP receive error: {e}")
+                return
+
+            received_at = time.monotonic()
+            reply = parse_echo_reply(packet)
+            if reply is None:
+                continue
+
+            reply_ident, seq = reply
+            if is_raw and reply_ident != ident:
+                continue
+
+            sent_at = pending.pop((addr[0], seq), None)
+            if sent_at is not None:
+                rtts[addr[0]] = (received_at - sent_at) * 1000
+                logger.debug(f"Host {addr[0]} responded")
+
+    limiter = get_rate_limiter()
+
+    try:
+        for i, ip in enumerate(hosts):
+            # Collect replies while waiting for a send slot
+            send_at = time.monotonic() + limiter.reserve(ip)
+            while (wait := send_at - time.monotonic()) > 0:
+                drain(wait)
+
+            seq = i & 0xFFFF
+            packet = build_echo_request(ident, seq)
+
+            while True:
+                try:
+                    sock.sendto(packet, (ip, 0))
+                    pending[(ip, seq)] = time.monotonic()
+                    break
+                except BlockingIOError:
+                    select.select([], [sock], [], timeout)
+                except OSError as e:
+                    logger.debug(f"ICMP send failed for {ip}: {e}")
+                    break
+
+            # Keep the receive buffer from overflowing while sending
+            drain(0)
+
+            if progress is not None:
+                progress(i + 1, total)
+
+        deadline = time.monotonic() + timeout
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            drain(remaining)
+    finally:
+        sock.close()
+
+    logger.debug(f"ICMP sweep: {len(rtts)}/{total} hosts replied")
+
+    return [
+        ProbeResult(ip_address=ip, alive=ip in rtts, rtt_ms=rtts.get(ip))
+        for ip in hosts
+    ]
+
+
+class AsyncIcmpPinger:
+    """Shared ICMP socket serving many concurrent echo probes.
+
+    Requires an event loop with reader callbacks (the default selector
+    loop; not the Windows proactor loop).
+    """
+
+    def __init__(self, interface: Optional[str] = None) -> None:
+        """Create a pinger.
+
+        Args:
+            interface: Interface to bind the socket to. Defaults to none.
+        """
+        self.interface = interface
+        self._sock: Optional[socket.socket] = None
+        self._is_raw = False
+        self._ident = random.getrandbits(16)
+        self._seq = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # (ip, seq) -> (reply future, send time)
+        self._waiters: dict[tuple[str, int], tuple[asyncio.Future, float]] = {}
+
+    async def __aenter__(self) -> "AsyncIcmpPinger":
+        self.open()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+    def open(self) -> None:
+        """Open the socket and register it with the running loop.
+
+        Raises:
+            ScannerPermissionError: No ICMP socket could be opened.
+            NotImplementedError: The event loop has no reader support.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._sock, self._is_raw = open_icmp_socket(self.interface)
+        try:
+            self._loop.add_reader(self._sock.fileno(), self._on_readable)
+        except NotImplementedError:
+            self._sock.close()
+            self._sock = None
+            raise
+
+    def close(self) -> None:
+        """Unregister and close the socket, cancelling pending probes."""
+        for future, _ in self._waiters.values():
+            future.cancel()
+        self._waiters.clear()
+
+        if self._sock is not None:
+            if self._loop is not None:
+                self._loop.remove_reader(self._sock.fileno())
+            self._sock.close()
+            self._sock = None
+
+    def _on_readable(self) -> None:
+        """Drain the socket and resolve matching probe futures."""
+        assert self._sock is not None
+
+        while True:
+            try:
+                packet, addr = self._sock.recvfrom(_RECV_BUFFER)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as e:
+                logger.debug(f"ICMP receive error: {e}")
+                return
+
+            reply = parse_echo_reply(packet)
+            if reply is None:
+                continue
+
+            ident, seq = reply
+            if self._is_raw and ident != self._ident:
+                continue
+
+            waiter = self._waiters.get((addr[0], seq))
+            if waiter is not None and not waiter[0].done():
+                future, sent_at = waiter
+                future.set_result((time.monotonic() - sent_at) * 1000)
+
+    async def ping(self, ip: str, timeout: float) -> ProbeResult:
+        """Send one echo request and wait for its reply.
+
+        Args:
+            ip: IPv4 address to probe.
+            timeout: Seconds to wait for the reply.
+
+        Returns:
+            Probe result with the measured RTT.
+        """
+        if self._sock is None or self._loop is None:
+            raise ScannerError("AsyncIcmpPinger is not open")
+
+        self._seq = (self._seq + 1) & 0xFFFF
+        key = (ip, self._seq)
+        future = self._loop.create_future()
+        packet = build_echo_request(self._ident, self._seq)
+
+        try:
+            self._waiters[key] = (future, time.monotonic())
+            await self._loop.sock_sendto(self._sock, packet, (ip, 0))
+            rtt_ms = await asyncio.wait_for(future, timeout)
+            logger.debug(f"Host {ip} responded")
+            return ProbeResult(ip_address=ip, alive=True, rtt_ms=rtt_ms)
+        except TimeoutError:
+            pass
+        except OSError as e:
+            logger.debug(f"ICMP send failed for {ip}: {e}")
+        finally:
+            self._waiters.pop(key, None)
+
+        return ProbeResult(ip_address=ip, alive=False)
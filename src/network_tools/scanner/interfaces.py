@@ -0,0 +1,131 @@
+"""Enumeration of local interfaces and their directly attached subnets.
+
+Every IPv4 route without a gateway is a subnet the host sits on, so the
+kernel routing table lists exactly the segments an ARP sweep can reach.
+"""
+
+import ipaddress
+import socket
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Sequence
+
+from network_tools.logging import get_logger
+from network_tools.scanner.arp_ping import ipv4_links
+
+logger = get_logger("scanner.interfaces")
+
+ROUTE_TABLE_PATH = Path("/proc/net/route")
+
+# Route flags from <linux/route.h>
+RTF_UP = 0x0001
+RTF_GATEWAY = 0x0002
+RTF_HOST = 0x0004
+
+# SO_BINDTODEVICE from <asm-generic/socket.h>; missing from older Pythons
+SO_BINDTODEVICE = getattr(socket, "SO_BINDTODEVICE", 25)
+
+
+@dataclass(frozen=True)
+class LocalSubnet:
+    """An IPv4 subnet directly attached to a local interface."""
+
+    interface: str
+    network: ipaddress.IPv4Network
+
+
+def parse_route_table(text: str) -> list[LocalSubnet]:
+    """Extract directly attached subnets from /proc/net/route content.
+
+    Default, gateway and host routes are skipped, as is loopback.
+
+    Args:
+        text: Content of /proc/net/route.
+
+    Returns:
+        Attached subnets, in table order without duplicates.
+    """
+    subnets: list[LocalSubnet] = []
+    for line in text.splitlines()[1:]:
+        fields = line.split()
+        if len(fields) < 8:
+            continue
+        name, destination, flags, mask = fields[0], fields[1], fields[3], fields[7]
+        try:
+            flag_bits = int(flags, 16)
+            # Addresses are written in host byte order
+            address = struct.pack("=I", int(destination, 16))
+            netmask = struct.pack("=I", int(mask, 16))
+        except (ValueError, struct.error):
+            continue
+        if name == "lo" or not flag_bits & RTF_UP:
+            continue
+        if flag_bits & (RTF_GATEWAY | RTF_HOST) or netmask == bytes(4):
+            continue
+        try:
+            network = ipaddress.IPv4Network(
+                f"{socket.inet_ntoa(address)}/{socket.inet_ntoa(netmask)}"
+            )
+        except ValueError:
+            continue
+        if network.prefixlen == 32:
+            continue
+        subnet = LocalSubnet(interface=name, network=network)
+        if subnet not in subnets:
+            subnets.append(subnet)
+    return subnets
+
+
+def local_subnets(interfaces: Optional[Sequence[str]] = None) -> list[LocalSubnet]:
+    """List the IPv4 subnets attached to local interfaces.
+
+    Reads the kernel routing table, so secondary subnets on one interface
+    are included. Where procfs is unavailable, the primary address of each
+    interface is used instead.
+
+    Args:
+        interfaces: Only subnets on these interfaces. Defaults to all.
+
+    Returns:
+        Attached subnets, loopback excluded.
+    """
+    try:
+        subnets = parse_route_table(ROUTE_TABLE_PATH.read_text())
+    except OSError as e:
+        logger.debug(f"Cannot read {ROUTE_TABLE_PATH}: {e}")
+        subnets = [
+            LocalSubnet(interface=link.interface, network=link.network)
+            for link in ipv4_links()
+            if link.network.prefixlen < 32
+        ]
+
+    if interfaces is not None:
+        subnets = [s for s in subnets if s.interface in interfaces]
+    logger.debug(
+        "Attached subnets: "
+        + ", ".join(f"{s.network} on {s.interface}" for s in subnets)
+    )
+    return subnets
+
+
+def bind_to_interface(sock: socket.socket, interface: str) -> bool:
+    """Send and receive only through one interface.
+
+    Binding needs CAP_NET_RAW on older kernels; without it, the kernel's
+    route lookup still sends traffic for an attached subnet out of the
+    interface it is attached to.
+
+    Args:
+        sock: Socket to bind.
+        interface: Interface name.
+
+    Returns:
+        True if the socket was bound.
+    """
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, SO_BINDTODEVICE, interface.encode())
+    except OSError as e:
+        logger.debug(f"Cannot bind socket to {interface}: {e}")
+        return False
+    return True
@@ -0,0 +1,327 @@
+"""IPv6 neighbor discovery by multicast echo.
+
+An IPv6 prefix cannot be swept, but every node on a link listens on the
+all-nodes group ff02::1. One echo request per link reaches all of them.
+Nodes answer from the address matching our source's scope, so a request
+from our link-local address only finds link-local addresses; to find the
+addresses in a global prefix, the request is repeated from each of our
+own addresses in that prefix. Before answering, each responder resolves
+our address with NDP, which puts its reply address in the kernel
+neighbor table where the regular table backends pick it up.
+"""
+
+import ipaddress
+import random
+import select
+import socket
+import struct
+import time
+from typing import Optional, Sequence
+
+from network_tools.config import get_config
+from network_tools.logging import get_logger
+from network_tools.scanner.exceptions import ScannerPermissionError
+from network_tools.scanner.models import ARPEntry
+from network_tools.scanner.neighbors import read_neighbor_table
+from network_tools.scanner.ratelimit import get_rate_limiter
+from network_tools.scanner.sweep import ProbeResult
+from network_tools.scanner.targets import Targets, TargetSet
+
+logger = get_logger("scanner.ipv6")
+
+ALL_NODES = "ff02::1"
+
+ICMPV6_ECHO_REQUEST = 128
+ICMPV6_ECHO_REPLY = 129
+
+# type, code, checksum, identifier, sequence
+_ICMPV6_HEADER = struct.Struct("!BBHHH")
+
+_PAYLOAD = b"network-tools"
+_RECV_BUFFER = 2048
+
+# Link-local responders answer within milliseconds; waiting longer never helps
+MAX_MULTICAST_WINDOW = 2.0
+
+# Scope field of /proc/net/if_inet6 for link-local addresses
+_SCOPE_LINK = 0x20
+
+
+def build_echo6_request(ident: int, seq: int, payload: bytes = _PAYLOAD) -> bytes:
+    """Build an ICMPv6 echo request.
+
+    The checksum is left zero: it covers the IPv6 pseudo-header, which the
+    kernel fills in for ICMPv6 sockets.
+
+    Args:
+        ident: 16-bit identifier.
+        seq: 16-bit sequence number.
+        payload: Echo payload.
+
+    Returns:
+        Packet bytes.
+    """
+    return _ICMPV6_HEADER.pack(ICMPV6_ECHO_REQUEST, 0, 0, ident, seq) + payload
+
+
+def parse_echo6_reply(packet: bytes) -> Optional[tuple[int, int]]:
+    """Extract identifier and sequence from an ICMPv6 echo reply.
+
+    Args:
+        packet: Bytes read from the socket (ICMPv6 sockets never include the
+            IPv6 header).
+
+    Returns:
+        Tuple of (identifier, sequence), or None if not an echo reply.
+    """
+    if len(packet) < _ICMPV6_HEADER.size:
+        return None
+    icmp_type, code, _, ident, seq = _ICMPV6_HEADER.unpack_from(packet)
+    if icmp_type != ICMPV6_ECHO_REPLY or code != 0:
+        return None
+    return ident, seq
+
+
+def open_icmp6_socket() -> tuple[socket.socket, bool]:
+    """Open a non-blocking ICMPv6 socket for link-local multicast.
+
+    Prefers an unprivileged datagram socket and falls back to a raw one.
+
+    Returns:
+        Tuple of (socket, is_raw).
+
+    Raises:
+        ScannerPermissionError: Neither socket type is permitted.
+    """
+    try:
+        sock = socket.socket(socket.AF_INET6, socket.SOCK_DGRAM, socket.IPPROTO_ICMPV6)
+        is_raw = False
+    except OSError:
+        try:
+            sock = socket.socket(
+                socket.AF_INET6, socket.SOCK_RAW, socket.IPPROTO_ICMPV6
+            )
+            is_raw = True
+        except OSError as e:
+            raise ScannerPermissionError(
+                "Cannot open an ICMPv6 socket; run as root/administrator or allow "
+                "unprivileged ICMP (net.ipv4.ping_group_range)"
+            ) from e
+
+    sock.setsockopt(socket.IPPROTO_IPV6, socket.IPV6_MULTICAST_HOPS, 1)
+    # Our own request and the kernel's answer to it are not neighbors
+    sock.setsockopt(socket.IPPROTO_IPV6, socket.IPV6_MULTICAST_LOOP, 0)
+    sock.setblocking(False)
+    return sock, is_raw
+
+
+def _local_addresses(path: str = "/proc/net/if_inet6") -> dict[str, set[str]]:
+    """Map each interface with IPv6 to its own addresses.
+
+    Falls back to every non-loopback interface, with no known addresses,
+    where procfs is unavailable.
+    """
+    interfaces: dict[str, set[str]] = {}
+    try:
+        with open(path) as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) < 6:
+                    continue
+                hex_addr, _, _, scope, _, name = fields[:6]
+                if name == "lo":
+                    continue
+                address = socket.inet_ntop(socket.AF_INET6, bytes.fromhex(hex_addr))
+                addresses = interfaces.setdefault(name, set())
+                addresses.add(address)
+                if int(scope, 16) == _SCOPE_LINK:
+                    addresses.add(f"{address}%{name}")
+    except OSError:
+        return {name: set() for _, name in socket.if_nameindex() if name != "lo"}
+    return interfaces
+
+
+def link_interfaces() -> list[str]:
+    """Interfaces that can carry IPv6 link-local multicast.
+
+    Returns:
+        Interface names, loopback excluded.
+    """
+    return sorted(_local_addresses())
+
+
+def _echo_sources(
+    local: dict[str, set[str]], name: str, targets: Optional[TargetSet]
+) -> list[Optional[str]]:
+    """Source addresses to echo from on one link.
+
+    None stands for the kernel's default, link-local source. Our own
+    global addresses inside the targets are added, so that responders
+    answer from their addresses in the same prefix.
+    """
+    sources: list[Optional[str]] = [None]
+    if targets is None or not hasattr(socket, "IPV6_PKTINFO"):
+        return sources
+    for address in sorted(local.get(name, ())):
+        if "%" in address or ipaddress.IPv6Address(address).is_link_local:
+            continue
+        if address in targets:
+            sources.append(address)
+    return sources
+
+
+def _send_echo(
+    sock: socket.socket, packet: bytes, index: int, source: Optional[str]
+) -> None:
+    """Send one echo request to ff02::1 on a link, from a chosen source."""
+    destination = (ALL_NODES, 0, 0, index)
+    if source is None:
+        sock.sendto(packet, destination)
+        return
+    # struct in6_pktinfo: source address and outgoing interface index
+    info = struct.pack("=16sI", socket.inet_pton(socket.AF_INET6, source), index)
+    sock.sendmsg(
+        [packet], [(socket.IPPROTO_IPV6, socket.IPV6_PKTINFO, info)], 0, destination
+    )
+
+
+def multicast_echo(
+    interfaces: Optional[Sequence[str]] = None,
+    timeout: Optional[float] = None,
+    targets: Optional[TargetSet] = None,
+) -> list[ProbeResult]:
+    """Send echo requests to ff02::1 on each link and collect every reply.
+
+    Args:
+        interfaces: Links to probe. Defaults to every IPv6 interface.
+        timeout: Seconds to wait for replies (capped at MAX_MULTICAST_WINDOW).
+            Defaults to config scan_timeout.
+        targets: Also echo from each of our addresses inside these targets,
+            so that responders in a global prefix answer from addresses in
+            it. Defaults to link-local discovery only.
+
+    Returns:
+        One result per responding (address, interface), with RTTs.
+        Addresses carry no zone suffix; the link is in `interface`.
+
+    Raises:
+        ScannerPermissionError: No ICMPv6 socket could be opened.
+    """
+    local = _local_addresses()
+    if interfaces is None:
+        interfaces = sorted(local)
+    if timeout is None:
+        timeout = get_config().scan_timeout
+    if not interfaces:
+        return []
+
+    sock, is_raw = open_icmp6_socket()
+    ident = random.getrandbits(16)
+    limiter = get_rate_limiter()
+
+    # seq -> (interface, send time)
+    sent: dict[int, tuple[str, float]] = {}
+    replies: dict[tuple[str, str], ProbeResult] = {}
+
+    probes = [
+        (name, source)
+        for name in interfaces
+        for source in _echo_sources(local, name, targets)
+    ]
+
+    try:
+        for seq, (name, source) in enumerate(probes):
+            try:
+                index = socket.if_nametoindex(name)
+                sock.setsockopt(socket.IPPROTO_IPV6, socket.IPV6_MULTICAST_IF, index)
+                limiter.acquire(ALL_NODES)
+                _send_echo(sock, build_echo6_request(ident, seq), index, source)
+                sent[seq] = (name, time.monotonic())
+            except OSError as e:
+                logger.debug(
+                    f"Multicast echo on {name} from {source or 'link-local'} "
+                    f"failed: {e}"
+                )
+
+        deadline = time.monotonic() + min(timeout, MAX_MULTICAST_WINDOW)
+        while sent and (remaining := deadline - time.monotonic()) > 0:
+            readable, _, _ = select.select([sock], [], [], remaining)
+            if not readable:
+                break
+            try:
+                packet, addr = sock.recvfrom(_RECV_BUFFER)
+            except BlockingIOError:
+                continue
+            except OSError as e:
+                logger.debug(f"ICMPv6 receive error: {e}")
+                break
+
+            received_at = time.monotonic()
+            reply = parse_echo6_reply(packet)
+            if reply is None:
+                continue
+            reply_ident, seq = reply
+            if (is_raw and reply_ident != ident) or seq not in sent:
+                continue
+
+            name, sent_at = sent[seq]
+            ip = addr[0].split("%", 1)[0]
+            if ip in local.get(name, ()) or (ip, name) in replies:
+                continue
+            replies[(ip, name)] = ProbeResult(
+                ip_address=ip,
+                alive=True,
+                rtt_ms=(received_at - sent_at) * 1000,
+                interface=name,
+            )
+    finally:
+        sock.close()
+
+    logger.debug(
+        f"Multicast echo with {len(sent)} requests: {len(replies)} IPv6 responders"
+    )
+    return list(replies.values())
+
+
+def discover_ipv6(
+    network: Optional[Targets] = None,
+    interfaces: Optional[Sequence[str]] = None,
+    timeout: Optional[float] = None,
+) -> list[ARPEntry]:
+    """Discover IPv6 neighbors with one multicast echo per link.
+
+    Responders are merged with the IPv6 entries of the neighbor table,
+    which also holds hosts that ignore multicast echo but talked to us
+    recently.
+
+    Args:
+        network: Only neighbors inside these targets. Defaults to all.
+        interfaces: Links to probe. Defaults to every IPv6 interface.
+        timeout: Seconds to wait for replies. Defaults to config scan_timeout.
+
+    Returns:
+        IPv6 neighbor entries, with RTTs for responders.
+
+    Raises:
+        ScannerPermissionError: No ICMPv6 socket could be opened.
+        ValueError: The targets are invalid.
+    """
+    targets = TargetSet.parse(network) if network is not None else None
+    rtts = {
+        (r.ip_address, r.interface): r.rtt_ms
+        for r in multicast_echo(interfaces, timeout, targets)
+    }
+
+    entries = []
+    for entry in read_neighbor_table():
+        if ":" not in entry.ip_address:
+            continue
+        if interfaces is not None and entry.interface not in interfaces:
+            continue
+        if targets is not None and entry.ip_address not in targets:
+            continue
+        entry.response_time_ms = rtts.get((entry.ip_address, entry.interface))
+        entries.append(entry)
+
+    logger.info(f"Found {len(entries)} IPv6 neighbors ({len(rtts)} responded)")
+    return entries
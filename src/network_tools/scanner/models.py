@@ -0,0 +1,35 @@
+"""Data models for the network scanner."""
+
+from dataclasses import dataclass
+from typing import Optional, Union
+
+from network_tools.addresses import MacAddress
+
+
+@dataclass
+class ARPEntry:
+    """Represents an ARP table entry."""
+
+    ip_address: str
+    mac_address: MacAddress
+    interface: Optional[str] = None
+    response_time_ms: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        if isinstance(self.mac_address, str):
+            self.mac_address = MacAddress(self.mac_address)
+
+
+def normalize_mac(mac: Union[MacAddress, str]) -> str:
+    """Normalize MAC address to uppercase colon-separated format.
+
+    Args:
+        mac: MAC address in any format.
+
+    Returns:
+        Normalized MAC (e.g., 'AA:BB:CC:DD:EE:FF').
+
+    Raises:
+        ValueError: The value is not a MAC address.
+    """
+    return str(MacAddress(mac))
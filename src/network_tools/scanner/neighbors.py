@@ -0,0 +1,296 @@
+"""Neighbor (ARP/NDP) table backends.
+
+Each backend returns the OS neighbor cache as ARP entries with the
+interface filled in. On Linux the table is read in-process from rtnetlink
+or /proc/net/arp; elsewhere the `arp -a` command output is parsed.
+"""
+
+import re
+import socket
+import struct
+import subprocess
+import sys
+from pathlib import Path
+from typing import Callable, Optional
+
+from network_tools.addresses import MacAddress
+from network_tools.config import get_config
+from network_tools.logging import get_logger
+from network_tools.scanner.exceptions import ScannerError
+from network_tools.scanner.models import ARPEntry
+
+logger = get_logger("scanner.neighbors")
+
+# rtnetlink constants (linux/rtnetlink.h, linux/neighbour.h)
+NETLINK_ROUTE = 0
+RTM_NEWNEIGH = 28
+RTM_GETNEIGH = 30
+NLM_F_REQUEST = 0x01
+NLM_F_DUMP = 0x300
+NLMSG_ERROR = 2
+NLMSG_DONE = 3
+NDA_DST = 1
+NDA_LLADDR = 2
+NUD_INCOMPLETE = 0x01
+NUD_FAILED = 0x20
+
+_NLMSGHDR = struct.Struct("=IHHII")  # len, type, flags, seq, pid
+_NDMSG = struct.Struct("=BBHiHBB")  # family, pad1, pad2, ifindex, state, flags, type
+_RTATTR = struct.Struct("=HH")  # len, type
+
+# /proc/net/arp flag for a resolved entry (ATF_COM)
+_ATF_COM = 0x02
+
+# Windows: "  192.168.68.1         aa-bb-cc-dd-ee-ff     dynamic"
+_WINDOWS_ENTRY = re.compile(r"^\s*(\d+\.\d+\.\d+\.\d+)\s+([\da-fA-F-]{17})\s+(\w+)")
+# Windows: "Interface: 192.168.68.5 --- 0xb"
+_WINDOWS_INTERFACE = re.compile(r"^Interface:\s+(\S+)\s+---")
+# Linux/BSD/macOS: "? (192.168.1.1) at aa:bb:cc:dd:ee:ff [ether] on eth0"
+_UNIX_ENTRY = re.compile(
+    r"\((\d+\.\d+\.\d+\.\d+)\)\s+at\s+([\da-fA-F:]+)\b.*?\bon\s+(\S+)"
+)
+
+
+def read_proc_net_arp(path: str = "/proc/net/arp") -> list[ARPEntry]:
+    """Read the IPv4 neighbor table from procfs.
+
+    Args:
+        path: Path to the procfs ARP table.
+
+    Returns:
+        List of resolved ARP entries.
+    """
+    entries = []
+
+    with open(path, "r") as f:
+        next(f, None)  # Header line
+        for line in f:
+            fields = line.split()
+            if len(fields) < 6:
+                continue
+
+            ip_addr, _, flags, hw_addr, _, device = fields[:6]
+            if not int(flags, 16) & _ATF_COM:
+                continue
+
+            mac_addr = MacAddress.parse(hw_addr)
+            if mac_addr is None or not mac_addr.is_unicast:
+                continue
+
+            entries.append(
+                ARPEntry(ip_address=ip_addr, mac_address=mac_addr, interface=device)
+            )
+
+    return entries
+
+
+def read_netlink_neighbors(family: int = socket.AF_UNSPEC) -> list[ARPEntry]:
+    """Dump the kernel neighbor table over rtnetlink.
+
+    Covers both ARP (IPv4) and NDP (IPv6) neighbors.
+
+    Args:
+        family: Address family filter (AF_UNSPEC for both).
+
+    Returns:
+        List of resolved neighbor entries.
+
+    Raises:
+        OSError: Netlink is not available on this system.
+    """
+    request = _NLMSGHDR.pack(
+        _NLMSGHDR.size + _NDMSG.size, RTM_GETNEIGH, NLM_F_REQUEST | NLM_F_DUMP, 1, 0
+    ) + _NDMSG.pack(family, 0, 0, 0, 0, 0, 0)
+
+    entries = []
+    if_names: dict[int, Optional[str]] = {}
+
+    with socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_ROUTE) as sock:
+        sock.bind((0, 0))
+        sock.sendall(request)
+
+        done = False
+        while not done:
+            data = sock.recv(65536)
+            offset = 0
+
+            while offset + _NLMSGHDR.size <= len(data):
+                msg_len, msg_type, _, _, _ = _NLMSGHDR.unpack_from(data, offset)
+                if msg_len < _NLMSGHDR.size:
+                    done = True
+                    break
+
+                if msg_type == NLMSG_DONE:
+                    done = True
+                    break
+                if msg_type == NLMSG_ERROR:
+                    (error,) = struct.unpack_from("=i", data, offset + _NLMSGHDR.size)
+                    raise OSError(-error, "rtnetlink neighbor dump failed")
+
+                if msg_type == RTM_NEWNEIGH:
+                    entry = _parse_neighbor(data, offset, msg_len, if_names)
+                    if entry is not None:
+                        entries.append(entry)
+
+                # Messages are 4-byte aligned
+                offset += (msg_len + 3) & ~3
+
+    return entries
+
+
+def _parse_neighbor(
+    data: bytes, offset: int, msg_len: int, if_names: dict[int, Optional[str]]
+) -> Optional[ARPEntry]:
+    """Parse one RTM_NEWNEIGH message into an ARP entry."""
+    body = offset + _NLMSGHDR.size
+    nd_family, _, _, ifindex, state, _, _ = _NDMSG.unpack_from(data, body)
+
+    if state & (NUD_INCOMPLETE | NUD_FAILED):
+        return None
+
+    dst: Optional[bytes] = None
+    lladdr: Optional[bytes] = None
+
+    attr = body + _NDMSG.size
+    end = offset + msg_len
+    while attr + _RTATTR.size <= end:
+        attr_len, attr_type = _RTATTR.unpack_from(data, attr)
+        if attr_len < _RTATTR.size:
+            break
+        value = data[attr + _RTATTR.size : attr + attr_len]
+        if attr_type == NDA_DST:
+            dst = value
+        elif attr_type == NDA_LLADDR:
+            lladdr = value
+        attr += (attr_len + 3) & ~3
+
+    if dst is None or lladdr is None or len(lladdr) != 6:
+        return None
+
+    mac_addr = MacAddress(lladdr)
+    if not mac_addr.is_unicast:
+        return None
+
+    if ifindex not in if_names:
+        try:
+            if_names[ifindex] = socket.if_indextoname(ifindex)
+        except OSError:
+            if_names[ifindex] = None
+
+    return ARPEntry(
+        ip_address=socket.inet_ntop(nd_family, dst),
+        mac_address=mac_addr,
+        interface=if_names[ifindex],
+    )
+
+
+def read_arp_command() -> list[ARPEntry]:
+    """Read the neighbor table by parsing `arp -a` output.
+
+    Understands both the Windows table format and the BSD-style format
+    printed by net-tools on Linux and by macOS.
+
+    Returns:
+        List of ARP entries.
+
+    Raises:
+        ScannerError: The arp command failed.
+    """
+    result = subprocess.run(
+        ["arp", "-a"],
+        capture_output=True,
+        text=True,
+        timeout=30,
+    )
+
+    if result.returncode != 0:
+        raise ScannerError(f"ARP command failed: {result.stderr}")
+
+    entries = []
+    interface: Optional[str] = None
+
+    for line in result.stdout.splitlines():
+        header = _WINDOWS_INTERFACE.match(line)
+        if header:
+            interface = header.group(1)
+            continue
+
+        match = _WINDOWS_ENTRY.match(line)
+        if match:
+            ip_addr, mac_raw, iface = match.group(1), match.group(2), interface
+        else:
+            match = _UNIX_ENTRY.search(line)
+            if not match:
+                continue
+            # macOS drops leading zeros per octet (e.g. "0:1b:2c:3:4:5"),
+            # which MacAddress accepts as-is
+            ip_addr, mac_raw, iface = match.group(1), match.group(2), match.group(3)
+
+        mac_addr = MacAddress.parse(mac_raw)
+
+        # Skip broadcast and multicast MACs
+        if mac_addr is None or not mac_addr.is_unicast:
+            continue
+
+        entries.append(
+            ARPEntry(ip_address=ip_addr, mac_address=mac_addr, interface=iface)
+        )
+
+    return entries
+
+
+NEIGHBOR_BACKENDS: dict[str, Callable[[], list[ARPEntry]]] = {
+    "netlink": read_netlink_neighbors,
+    "proc": read_proc_net_arp,
+    "arp": read_arp_command,
+}
+
+
+def _auto_backends() -> list[str]:
+    """Neighbor backends to try, fastest first, for this platform."""
+    if sys.platform.startswith("linux"):
+        candidates = ["netlink"]
+        if Path("/proc/net/arp").exists():
+            candidates.append("proc")
+        return candidates + ["arp"]
+    return ["arp"]
+
+
+def read_neighbor_table(backend: Optional[str] = None) -> list[ARPEntry]:
+    """Read the OS neighbor table using the selected backend.
+
+    Args:
+        backend: Backend name ('auto', 'netlink', 'proc', 'arp').
+            Defaults to config neighbor_backend. With 'auto' each
+            platform-appropriate backend is tried until one succeeds.
+
+    Returns:
+        List of neighbor entries.
+
+    Raises:
+        ScannerError: Unknown backend, or every candidate backend failed.
+    """
+    if backend is None:
+        backend = get_config().neighbor_backend
+
+    if backend == "auto":
+        candidates = _auto_backends()
+    elif backend in NEIGHBOR_BACKENDS:
+        candidates = [backend]
+    else:
+        available = ", ".join(["auto", *NEIGHBOR_BACKENDS])
+        raise ScannerError(
+            f"Unknown neighbor backend '{backend}' (available: {available})"
+        )
+
+    errors = []
+    for name in candidates:
+        try:
+            entries = NEIGHBOR_BACKENDS[name]()
+            logger.debug(f"Read {len(entries)} neighbors via {name}")
+            return entries
+        except (OSError, subprocess.SubprocessError, ScannerError) as e:
+            logger.debug(f"Neighbor backend {name} unavailable: {e}")
+            errors.append(f"{name}: {e}")
+
+    raise ScannerError(f"No neighbor backend succeeded ({'; '.join(errors)})")
@@ -0,0 +1,115 @@
+"""Subprocess ping backend using the system `ping` command."""
+
+import re
+import subprocess
+import sys
+from typing import Optional, Sequence
+
+from network_tools.logging import get_logger
+from network_tools.scanner.ratelimit import get_rate_limiter
+from network_tools.scanner.sweep import ProbeResult, ProgressCallback, run_sweep
+
+logger = get_logger("scanner.ping")
+
+# Matches "time=0.045 ms" (Linux/macOS), "time=3ms" and "time<1ms" (Windows)
+_RTT_PATTERN = re.compile(r"time[=<]\s*([\d.]+)\s*ms")
+
+
+def ping_command(ip: str, timeout: float, interface: Optional[str] = None) -> list[str]:
+    """Build a single-echo ping command line for the current platform.
+
+    Args:
+        ip: IP address to ping.
+        timeout: Reply timeout in seconds.
+        interface: Interface to send from; only honoured on Linux.
+
+    Returns:
+        Command argument list.
+    """
+    if sys.platform == "win32":
+        # Windows ping: -n 1 (count), -w (timeout in ms)
+        return ["ping", "-n", "1", "-w", str(int(timeout * 1000)), ip]
+    if sys.platform == "darwin":
+        # macOS ping: -c 1 (count), -W (timeout in ms)
+        return ["ping", "-c", "1", "-W", str(int(timeout * 1000)), ip]
+    # Linux iputils/busybox ping: -c 1 (count), -W (timeout in whole seconds),
+    # -I (source interface)
+    command = ["ping", "-c", "1", "-W", str(max(1, round(timeout)))]
+    if interface is not None:
+        command += ["-I", interface]
+    return command + [ip]
+
+
+def parse_rtt(output: str) -> Optional[float]:
+    """Extract the round-trip time in ms from ping output, if present."""
+    match = _RTT_PATTERN.search(output)
+    return float(match.group(1)) if match else None
+
+
+def ping_host(ip: str, timeout: float, interface: Optional[str] = None) -> ProbeResult:
+    """Send a single ping to a host.
+
+    Args:
+        ip: IP address to ping.
+        timeout: Ping timeout in seconds.
+        interface: Interface to send from (Linux only). Defaults to the
+            kernel's route lookup.
+
+    Returns:
+        Probe result for the host, with the RTT reported by ping if any.
+    """
+    try:
+        result = subprocess.run(
+            ping_command(ip, timeout, interface),
+            capture_output=True,
+            text=True,
+            timeout=timeout + 2,
+        )
+
+        if result.returncode == 0:
+            logger.debug(f"Host {ip} responded")
+            return ProbeResult(
+                ip_address=ip, alive=True, rtt_ms=parse_rtt(result.stdout)
+            )
+
+    except subprocess.TimeoutExpired:
+        pass
+    except Exception as e:
+        logger.debug(f"Ping failed for {ip}: {e}")
+
+    return ProbeResult(ip_address=ip, alive=False)
+
+
+def subprocess_sweep(
+    hosts: Sequence[str],
+    timeout: float,
+    concurrency: int,
+    progress: Optional[ProgressCallback] = None,
+    interface: Optional[str] = None,
+) -> list[ProbeResult]:
+    """Sweep hosts with one `ping` process per host in a worker pool.
+
+    Args:
+        hosts: IP addresses to probe.
+        timeout: Per-host timeout in seconds.
+        concurrency: Maximum pings in flight.
+        progress: Optional callback receiving (done, total).
+        interface: Interface to send from (Linux only). Defaults to the
+            kernel's route lookup.
+
+    Returns:
+        One result per host, in input order.
+    """
+    limiter = get_rate_limiter()
+
+    def probe(ip: str) -> ProbeResult:
+        limiter.acquire(ip)
+        return ping_host(ip, timeout, interface)
+
+    results: list[ProbeResult] = run_sweep(
+        hosts,
+        probe,
+        concurrency=concurrency,
+        progress=progress,
+    )
+    return results
@@ -0,0 +1,121 @@
+"""Sweep planning shared by the blocking and asyncio scanners."""
+
+from dataclasses import dataclass
+from typing import Optional
+
+from network_tools.config import get_config
+from network_tools.logging import get_logger
+from network_tools.scanner.exceptions import ScanLimitError, ScannerPermissionError
+from network_tools.scanner.ipv6 import multicast_echo
+from network_tools.scanner.models import ARPEntry
+from network_tools.scanner.targets import Targets, TargetSet
+from network_tools.scanner.timing import AdaptiveTimeout
+
+logger = get_logger("scanner.plan")
+
+
+@dataclass
+class SweepPlan:
+    """Resolved parameters for sweeping a target set."""
+
+    targets: TargetSet
+    total: int
+    timeout: float
+    concurrency: int
+    backend: str
+
+
+def plan_sweep(
+    network: Targets,
+    timeout: Optional[float],
+    concurrency: Optional[int],
+    backend: Optional[str],
+) -> Optional[SweepPlan]:
+    """Validate sweep targets and fill unset parameters from config.
+
+    Only IPv4 targets are swept; IPv6 prefixes are far too large to probe
+    host by host and are covered by a multicast echo instead.
+
+    Returns:
+        Sweep plan, or None if the targets are invalid or have no IPv4 part.
+
+    Raises:
+        ScanLimitError: The targets have more hosts than config scan_max_hosts.
+    """
+    config = get_config()
+
+    try:
+        parsed = TargetSet.parse(network)
+    except ValueError as e:
+        logger.error(f"Invalid scan targets: {e}")
+        return None
+
+    targets = parsed.family(4)
+    if targets is None:
+        logger.debug(f"No IPv4 targets to sweep in {network}")
+        return None
+
+    total = targets.num_hosts
+    if config.scan_max_hosts and total > config.scan_max_hosts:
+        raise ScanLimitError(
+            f"Network {network} has {total} hosts, more than the limit of "
+            f"{config.scan_max_hosts} (raise SCAN_MAX_HOSTS to scan it)"
+        )
+
+    return SweepPlan(
+        targets=targets,
+        total=total,
+        timeout=config.scan_probe_timeout if timeout is None else timeout,
+        concurrency=config.scan_concurrency if concurrency is None else concurrency,
+        backend=config.scan_backend if backend is None else backend,
+    )
+
+
+def resolve_timing(
+    timeout: Optional[float], timing: Optional[AdaptiveTimeout], plan: SweepPlan
+) -> Optional[AdaptiveTimeout]:
+    """Adaptive timeouts to sweep with, or None for the fixed plan timeout.
+
+    An explicit timeout always wins; otherwise the given estimator is used,
+    or a fresh one starting from the plan timeout.
+    """
+    if timeout is not None:
+        return None
+    return timing if timing is not None else AdaptiveTimeout(plan.timeout)
+
+
+def multicast_rtts(
+    targets: Optional[TargetSet], timeout: Optional[float]
+) -> dict[str, Optional[float]]:
+    """Find the IPv6 neighbors of the targets with a multicast echo per link.
+
+    Returns:
+        RTTs of responders inside the targets, keyed by IP address. Empty if
+        the targets have no IPv6 part or ICMPv6 is not permitted.
+    """
+    if targets is None or targets.family(6) is None:
+        return {}
+    try:
+        results = multicast_echo(timeout=timeout, targets=targets)
+    except ScannerPermissionError as e:
+        logger.warning(f"Skipping IPv6 discovery: {e}")
+        return {}
+    return {r.ip_address: r.rtt_ms for r in results if r.ip_address in targets}
+
+
+def select_entries(
+    entries: list[ARPEntry], network: Targets, rtts: dict[str, Optional[float]]
+) -> list[ARPEntry]:
+    """Keep neighbor entries inside the targets and attach RTTs."""
+    # Filter to only include IPs in the targets
+    try:
+        targets = TargetSet.parse(network)
+        entries = [e for e in entries if e.ip_address in targets]
+    except ValueError:
+        pass
+
+    for entry in entries:
+        entry.response_time_ms = rtts.get(entry.ip_address)
+
+    logger.info(f"Found {len(entries)} devices in {network}")
+    return entries
@@ -0,0 +1,239 @@
+"""First-reply-wins liveness probing across protocols.
+
+Every host is probed with ICMP echo, an ARP request and TCP connects at
+the same time. The first positive answer decides and the other probes
+are cancelled, so a host costs the latency of its fastest protocol
+instead of the sum of every protocol's timeout.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Optional, Sequence
+
+from network_tools.config import get_config
+from network_tools.logging import get_logger
+from network_tools.scanner.arp_ping import AsyncArpPinger
+from network_tools.scanner.exceptions import ScannerError, ScannerPermissionError
+from network_tools.scanner.icmp import AsyncIcmpPinger
+from network_tools.scanner.ratelimit import RateLimiter, get_rate_limiter
+from network_tools.scanner.sweep import ProbeResult, ProgressCallback
+from network_tools.scanner.tcp import parse_ports, tcp_probe
+
+logger = get_logger("scanner.race")
+
+RACE_PROTOCOLS = ("icmp", "arp", "tcp")
+
+# (ip, timeout) -> result of one protocol's probe
+_Leg = Callable[[str, float], Awaitable[ProbeResult]]
+
+
+class LivenessRacer:
+    """Races ICMP, ARP and TCP probes for each host on one event loop.
+
+    Protocols that cannot be used here (no raw socket access, no packet
+    sockets) are left out of the race; TCP connects need no privileges, so
+    at least that one always runs.
+    """
+
+    def __init__(
+        self,
+        protocols: Sequence[str] = RACE_PROTOCOLS,
+        ports: Optional[Sequence[int]] = None,
+        limiter: Optional[RateLimiter] = None,
+        interface: Optional[str] = None,
+    ) -> None:
+        """Create a racer.
+
+        Args:
+            protocols: Protocols to race, a subset of RACE_PROTOCOLS.
+            ports: TCP ports to try. Defaults to config scan_tcp_ports.
+            limiter: Paces every packet sent. Defaults to no pacing.
+            interface: Interface every protocol probes through. Defaults to
+                the kernel's route lookup.
+
+        Raises:
+            ScannerError: An unknown protocol was given.
+        """
+        unknown = set(protocols) - set(RACE_PROTOCOLS)
+        if unknown:
+            raise ScannerError(
+                f"Unknown race protocols {sorted(unknown)} "
+                f"(available: {', '.join(RACE_PROTOCOLS)})"
+            )
+        self.requested = tuple(protocols)
+        self.ports = ports
+        self.limiter = limiter
+        self.interface = interface
+        self._icmp: Optional[AsyncIcmpPinger] = None
+        self._arp: Optional[AsyncArpPinger] = None
+        self._legs: dict[str, _Leg] = {}
+
+    async def __aenter__(self) -> "LivenessRacer":
+        self.open()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def protocols(self) -> list[str]:
+        """Protocols taking part in the race, once opened."""
+        return list(self._legs)
+
+    def open(self) -> None:
+        """Open the sockets of every usable protocol on the running loop.
+
+        Raises:
+            ScannerError: None of the requested protocols can be used.
+        """
+        if "icmp" in self.requested:
+            pinger = AsyncIcmpPinger(self.interface)
+            try:
+                pinger.open()
+                self._icmp = pinger
+                self._legs["icmp"] = self._paced(pinger.ping)
+            except (ScannerPermissionError, NotImplementedError) as e:
+                logger.debug(f"ICMP left out of the race: {e}")
+
+        if "arp" in self.requested:
+            arp = AsyncArpPinger(self.interface)
+            try:
+                arp.open()
+                self._arp = arp
+                self._legs["arp"] = self._paced(arp.ping)
+            except (ScannerError, NotImplementedError) as e:
+                logger.debug(f"ARP left out of the race: {e}")
+
+        if "tcp" in self.requested:
+            ports = self.ports or parse_ports(get_config().scan_tcp_ports)
+
+            async def tcp(ip: str, timeout: float) -> ProbeResult:
+                return await tcp_probe(ip, timeout, ports, self.limiter, self.interface)
+
+            self._legs["tcp"] = tcp
+
+        if not self._legs:
+            raise ScannerError(
+                f"None of the race protocols {list(self.requested)} can be used"
+            )
+        logger.debug(f"Racing {', '.join(self._legs)} per host")
+
+    def close(self) -> None:
+        """Close every protocol's socket, cancelling pending probes."""
+        if self._icmp is not None:
+            self._icmp.close()
+            self._icmp = None
+        if self._arp is not None:
+            self._arp.close()
+            self._arp = None
+        self._legs.clear()
+
+    def _paced(self, leg: _Leg) -> _Leg:
+        """Wrap a single-packet probe so it waits for a rate limiter slot."""
+        limiter = self.limiter
+        if limiter is None:
+            return leg
+
+        async def paced(ip: str, timeout: float) -> ProbeResult:
+            delay = limiter.reserve(ip)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            return await leg(ip, timeout)
+
+        return paced
+
+    async def probe(self, ip: str, timeout: float) -> ProbeResult:
+        """Probe one host with every protocol; the first positive answer wins.
+
+        Args:
+            ip: Address to probe.
+            timeout: Seconds each protocol waits for its answer.
+
+        Returns:
+            The winning protocol's result, or a down result if none answered.
+
+        Raises:
+            ScannerError: The racer is not open.
+        """
+        if not self._legs:
+            raise ScannerError("LivenessRacer is not open")
+
+        tasks = {
+            asyncio.ensure_future(leg(ip, timeout)): name
+            for name, leg in self._legs.items()
+        }
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    result = task.result()
+                    if result.alive:
+                        logger.debug(f"Host {ip} answered {tasks[task]} first")
+                        return result
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        return ProbeResult(ip_address=ip, alive=False)
+
+
+async def _race_sweep(
+    hosts: Sequence[str],
+    timeout: float,
+    concurrency: int,
+    progress: Optional[ProgressCallback],
+    interface: Optional[str],
+) -> list[ProbeResult]:
+    """Race every host with at most `concurrency` hosts in flight."""
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    total = len(hosts)
+    done = 0
+
+    async with LivenessRacer(limiter=get_rate_limiter(), interface=interface) as racer:
+
+        async def bounded(ip: str) -> ProbeResult:
+            nonlocal done
+            async with semaphore:
+                result = await racer.probe(ip, timeout)
+            done += 1
+            if progress is not None:
+                progress(done, total)
+            return result
+
+        return list(await asyncio.gather(*(bounded(ip) for ip in hosts)))
+
+
+def race_sweep(
+    hosts: Sequence[str],
+    timeout: float,
+    concurrency: int = 50,
+    progress: Optional[ProgressCallback] = None,
+    interface: Optional[str] = None,
+) -> list[ProbeResult]:
+    """Sweep hosts, racing ICMP, ARP and TCP connects for each.
+
+    Args:
+        hosts: IP addresses to probe.
+        timeout: Seconds each protocol waits for an answer.
+        concurrency: Maximum hosts in flight.
+        progress: Optional callback receiving (done, total).
+        interface: Interface to probe through. Defaults to the kernel's
+            route lookup.
+
+    Returns:
+        One result per host, in input order. ARP winners carry the MAC.
+
+    Raises:
+        ValueError: Config scan_tcp_ports is invalid.
+    """
+    if not hosts:
+        return []
+
+    results = asyncio.run(_race_sweep(hosts, timeout, concurrency, progress, interface))
+
+    alive = sum(1 for r in results if r.alive)
+    logger.debug(f"Race sweep: {alive}/{len(hosts)} hosts up")
+    return results
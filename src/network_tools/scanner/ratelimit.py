@@ -0,0 +1,278 @@
+"""Packet-rate limiting shared by every probe engine.
+
+A global token bucket caps the total probe rate, and one bucket per target
+subnet caps what any single segment receives. When the reply rate of a
+sweep chunk falls sharply the limiter halves its rate and burst (and the
+sweep re-probes the silent hosts); clean chunks raise it back step by step.
+"""
+
+import socket
+import threading
+import time
+from typing import Callable, Optional
+
+from network_tools.config import get_config
+from network_tools.logging import get_logger
+
+logger = get_logger("scanner.ratelimit")
+
+# A chunk whose reply ratio drops below this fraction of the running
+# baseline is treated as probe loss
+LOSS_THRESHOLD = 0.5
+
+# Rate multiplier bounds and steps (multiplicative decrease, additive increase)
+MIN_SCALE = 0.05
+BACKOFF_FACTOR = 0.5
+RECOVERY_STEP = 0.1
+
+# Weight of the newest chunk in the reply-ratio baseline
+_BASELINE_WEIGHT = 0.2
+
+# IPv6 targets are grouped per /64 for the per-subnet limit
+_IPV6_SUBNET_PREFIX = 64
+
+
+class TokenBucket:
+    """Token bucket handing out send slots at a fixed average rate.
+
+    Callers reserve a slot and wait for the returned delay, so concurrent
+    callers are spaced out instead of all waking at once.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create a bucket.
+
+        Args:
+            rate: Tokens added per second.
+            burst: Bucket capacity. Defaults to a tenth of a second's worth
+                (at least one token); it scales with later rate changes.
+            clock: Monotonic time source.
+        """
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate / 10)
+        self._burst_seconds = self.burst / rate
+        self._clock = clock
+        self._tokens = self.burst
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        """Add the tokens earned since the last update."""
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def set_rate(self, rate: float) -> None:
+        """Change the refill rate, scaling the burst capacity with it.
+
+        Args:
+            rate: New tokens added per second.
+        """
+        self._refill()
+        self.rate = rate
+        self.burst = max(1.0, rate * self._burst_seconds)
+        self._tokens = min(self._tokens, self.burst)
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take tokens, going into debt if the bucket is empty.
+
+        Args:
+            tokens: Tokens to take.
+
+        Returns:
+            Seconds the caller must wait before sending.
+        """
+        self._refill()
+        self._tokens -= tokens
+        return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+class RateLimiter:
+    """Global and per-subnet packet rate limit with loss back-off.
+
+    Thread-safe; one instance is shared by all backends of a process.
+    """
+
+    def __init__(
+        self,
+        rate: float = 0,
+        subnet_rate: float = 0,
+        subnet_prefix: int = 24,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create a limiter.
+
+        Args:
+            rate: Packets per second across all targets; 0 for no limit.
+            subnet_rate: Packets per second per target subnet; 0 for no limit.
+            subnet_prefix: IPv4 prefix length grouping targets into subnets.
+            clock: Monotonic time source.
+        """
+        self.rate = rate
+        self.subnet_rate = subnet_rate
+        self.subnet_prefix = subnet_prefix
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._scale = 1.0
+        self._baseline: Optional[float] = None
+        self._global = TokenBucket(rate, clock=clock) if rate > 0 else None
+        self._subnets: dict[tuple[int, int], TokenBucket] = {}
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any limit is configured."""
+        return self.rate > 0 or self.subnet_rate > 0
+
+    @property
+    def scale(self) -> float:
+        """Current fraction of the configured rates in use."""
+        return self._scale
+
+    def _subnet_key(self, ip: str) -> tuple[int, int]:
+        """Group an address into its rate-limited subnet."""
+        try:
+            packed = socket.inet_pton(socket.AF_INET, ip)
+            prefix = self.subnet_prefix
+        except OSError:
+            packed = socket.inet_pton(socket.AF_INET6, ip.split("%", 1)[0])
+            prefix = _IPV6_SUBNET_PREFIX
+        bits = len(packed) * 8
+        return bits, int.from_bytes(packed, "big") >> (bits - prefix)
+
+    def reserve(self, ip: str) -> float:
+        """Reserve a send slot for one probe to `ip`.
+
+        Args:
+            ip: Target address.
+
+        Returns:
+            Seconds to wait before sending.
+        """
+        if not self.enabled:
+            return 0.0
+
+        with self._lock:
+            delay = 0.0
+            if self._global is not None:
+                delay = self._global.reserve()
+            if self.subnet_rate > 0:
+                key = self._subnet_key(ip)
+                bucket = self._subnets.get(key)
+                if bucket is None:
+                    rate = self.subnet_rate * self._scale
+                    bucket = TokenBucket(rate, clock=self._clock)
+                    self._subnets[key] = bucket
+                delay = max(delay, bucket.reserve())
+            return delay
+
+    def acquire(self, ip: str) -> None:
+        """Block until a probe to `ip` may be sent.
+
+        Args:
+            ip: Target address.
+        """
+        delay = self.reserve(ip)
+        if delay > 0:
+            time.sleep(delay)
+
+    def packet_interval(self) -> float:
+        """Seconds between packets of one back-to-back burst to a subnet.
+
+        Returns:
+            Interval for engines that hand a whole batch to the OS at once,
+            or 0 when unlimited.
+        """
+        rates = [r * self._scale for r in (self.rate, self.subnet_rate) if r > 0]
+        return 1 / min(rates) if rates else 0.0
+
+    def observe(self, sent: int, replied: int) -> bool:
+        """Feed back the outcome of a sweep chunk.
+
+        Args:
+            sent: Probes sent in the chunk.
+            replied: Hosts that replied.
+
+        Returns:
+            True if the reply rate fell enough to suspect probe loss.
+        """
+        if not self.enabled or sent == 0:
+            return False
+
+        ratio = replied / sent
+        with self._lock:
+            if self._baseline is None:
+                self._baseline = ratio
+                return False
+
+            if self._baseline > 0 and ratio < self._baseline * LOSS_THRESHOLD:
+                return True
+
+            self._baseline += _BASELINE_WEIGHT * (ratio - self._baseline)
+            if self._scale < 1.0:
+                self._set_scale(self._scale + RECOVERY_STEP)
+            return False
+
+    def back_off(self) -> None:
+        """Cut the rate after suspected loss.
+
+        The reply-ratio baseline is dropped, so the next chunk sets a new
+        one at the reduced rate.
+        """
+        with self._lock:
+            self._set_scale(self._scale * BACKOFF_FACTOR)
+            self._baseline = None
+        logger.info(f"Probe loss suspected; rate reduced to {self._scale:.0%}")
+
+    def recover(self) -> None:
+        """Undo the last back-off once loss turned out not to be the cause."""
+        with self._lock:
+            self._set_scale(self._scale / BACKOFF_FACTOR)
+            self._baseline = None
+
+    def _set_scale(self, scale: float) -> None:
+        """Apply a new rate multiplier to every bucket; lock must be held."""
+        self._scale = min(1.0, max(MIN_SCALE, scale))
+        if self._global is not None:
+            self._global.set_rate(self.rate * self._scale)
+        for bucket in self._subnets.values():
+            bucket.set_rate(self.subnet_rate * self._scale)
+
+
+# Shared limiter, rebuilt when the configured limits change
+_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get the process-wide rate limiter for the current config.
+
+    Returns:
+        Shared RateLimiter.
+    """
+    global _limiter
+    config = get_config()
+    settings = (
+        config.scan_rate_limit,
+        config.scan_subnet_rate_limit,
+        config.scan_subnet_prefix,
+    )
+    if (
+        _limiter is None
+        or (
+            _limiter.rate,
+            _limiter.subnet_rate,
+            _limiter.subnet_prefix,
+        )
+        != settings
+    ):
+        _limiter = RateLimiter(*settings)
+    return _limiter
+
+
+def set_rate_limiter(limiter: Optional[RateLimiter]) -> None:
+    """Set the shared rate limiter (for testing)."""
+    global _limiter
+    _limiter = limiter
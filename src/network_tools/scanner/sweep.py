@@ -0,0 +1,259 @@
+"""Concurrent probe engine used by the network sweeps."""
+
+import ipaddress
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import (
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    Sequence,
+    TypeVar,
+)
+
+from network_tools.addresses import MacAddress
+from network_tools.logging import get_logger
+from network_tools.scanner.ratelimit import RateLimiter
+from network_tools.scanner.timing import AdaptiveTimeout
+
+logger = get_logger("scanner.sweep")
+
+# Called with (hosts_done, hosts_total) as the sweep advances
+ProgressCallback = Callable[[int, int], None]
+
+# Hosts handed to a backend at a time; bounds memory for any prefix length
+DEFAULT_CHUNK_SIZE = 1024
+
+T = TypeVar("T")
+
+
+@dataclass
+class ProbeResult:
+    """Outcome of probing a single host."""
+
+    ip_address: str
+    alive: bool
+    rtt_ms: Optional[float] = None
+    # Set by layer-2 backends that learn the MAC from the reply itself
+    mac_address: Optional[MacAddress] = None
+    interface: Optional[str] = None
+    # TCP ports that answered, mapped to True if open (SYN-ACK), False if closed
+    tcp_ports: dict[int, bool] = field(default_factory=dict)
+
+
+# (hosts, timeout_seconds, concurrency, progress) -> one result per host
+SweepBackend = Callable[
+    [Sequence[str], float, int, Optional[ProgressCallback]], list[ProbeResult]
+]
+
+
+def run_sweep(
+    hosts: Sequence[str],
+    probe: Callable[[str], ProbeResult],
+    concurrency: int = 50,
+    progress: Optional[ProgressCallback] = None,
+) -> list[ProbeResult]:
+    """Probe hosts in a bounded worker pool.
+
+    Results are returned in the same order as ``hosts`` regardless of the
+    order in which the probes complete.
+
+    Args:
+        hosts: IP addresses to probe.
+        probe: Function probing one host; must not raise.
+        concurrency: Maximum number of probes in flight.
+        progress: Optional callback receiving (done, total).
+
+    Returns:
+        One result per host, in input order.
+    """
+    total = len(hosts)
+    results: list[ProbeResult] = []
+
+    if total == 0:
+        return results
+
+    workers = max(1, min(concurrency, total))
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sweep") as pool:
+        # map() yields in submission order, which keeps output deterministic
+        for done, result in enumerate(pool.map(probe, hosts), 1):
+            results.append(result)
+
+            if progress is not None:
+                progress(done, total)
+
+    return results
+
+
+def count_hosts(net: ipaddress.IPv4Network | ipaddress.IPv6Network) -> int:
+    """Count the usable hosts of a network without enumerating them.
+
+    Matches the addresses yielded by ``net.hosts()``.
+
+    Args:
+        net: Network to count.
+
+    Returns:
+        Number of host addresses.
+    """
+    if net.version == 4:
+        return net.num_addresses if net.prefixlen >= 31 else net.num_addresses - 2
+    # IPv6 hosts() skips only the subnet-router anycast address
+    return net.num_addresses if net.prefixlen >= 127 else net.num_addresses - 1
+
+
+def iter_hosts(net: ipaddress.IPv4Network | ipaddress.IPv6Network) -> Iterator[str]:
+    """Lazily yield the host addresses of a network as strings.
+
+    Args:
+        net: Network to walk.
+
+    Yields:
+        Host IP addresses in ascending order.
+    """
+    for host in net.hosts():
+        yield str(host)
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[list[T]]:
+    """Split an iterable into lists of at most `size` items.
+
+    Args:
+        items: Items to split; consumed lazily.
+        size: Maximum chunk length.
+
+    Yields:
+        Consecutive chunks.
+    """
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def iter_sweep(
+    hosts: Iterable[str],
+    sweep: SweepBackend,
+    timeout: float,
+    concurrency: int,
+    total: int,
+    progress: Optional[ProgressCallback] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    limiter: Optional[RateLimiter] = None,
+    timing: Optional[AdaptiveTimeout] = None,
+    completed: Optional[Mapping[int, list[ProbeResult]]] = None,
+    on_chunk: Optional[Callable[[int, list[ProbeResult]], None]] = None,
+) -> Iterator[ProbeResult]:
+    """Run a sweep backend over a host stream one chunk at a time.
+
+    Only one chunk of hosts and results is held at once, so memory stays
+    flat however large the target range is.
+
+    With a rate limiter, each chunk's reply count is fed back to it; when
+    the limiter suspects loss, the silent hosts of the chunk are probed
+    once more at the reduced rate.
+
+    With adaptive timing, each chunk waits as long as the RTTs seen so far
+    on its subnets call for, and its replies refine the estimate.
+
+    Chunks listed in `completed` (e.g. by a resumed checkpoint) are not
+    probed again; their stored responders are yielded and every other host
+    of the chunk is reported down.
+
+    Args:
+        hosts: Host addresses to probe, consumed lazily.
+        sweep: Backend probing one chunk; see scanner.backends.
+        timeout: Per-host timeout in seconds, unless `timing` is given.
+        concurrency: Maximum probes in flight.
+        total: Total number of hosts, for progress reporting.
+        progress: Optional callback receiving (done, total) across chunks.
+        chunk_size: Hosts per chunk.
+        limiter: Rate limiter the backend draws from, for loss feedback.
+        timing: Adaptive timeouts replacing the fixed `timeout`.
+        completed: Responders of already finished chunks, by chunk index.
+        on_chunk: Called with (chunk index, results) as each probed chunk
+            finishes.
+
+    Yields:
+        One result per host, in input order.
+    """
+    done = 0
+
+    for index, chunk in enumerate(chunked(hosts, chunk_size)):
+        if completed is not None and index in completed:
+            stored = {result.ip_address: result for result in completed[index]}
+            results = [
+                stored.get(ip) or ProbeResult(ip_address=ip, alive=False)
+                for ip in chunk
+            ]
+            if progress is not None:
+                progress(done + len(chunk), total)
+        else:
+            chunk_progress: Optional[ProgressCallback] = None
+            if progress is not None:
+                offset = done
+                chunk_progress = lambda d, _t: progress(offset + d, total)  # noqa: E731
+
+            if timing is not None:
+                timeout = timing.timeout_for_hosts(chunk)
+
+            results = sweep(chunk, timeout, concurrency, chunk_progress)
+            if limiter is not None:
+                results = retry_on_loss(results, sweep, timeout, concurrency, limiter)
+            if on_chunk is not None:
+                on_chunk(index, results)
+
+        if timing is not None:
+            for result in results:
+                if result.alive and result.rtt_ms is not None:
+                    timing.observe(result.ip_address, result.rtt_ms)
+        yield from results
+        done += len(chunk)
+
+        logger.info(f"Progress: {done}/{total} hosts scanned")
+
+
+def retry_on_loss(
+    results: list[ProbeResult],
+    sweep: SweepBackend,
+    timeout: float,
+    concurrency: int,
+    limiter: RateLimiter,
+) -> list[ProbeResult]:
+    """Report a chunk to the rate limiter and re-probe it if loss is suspected.
+
+    A drop in the reply rate may be loss or simply a sparser part of the
+    address space. The rate is cut either way and the silent hosts are
+    probed once more; if none of them answer the cut is undone.
+
+    Args:
+        results: Results of one sweep chunk.
+        sweep: Backend that produced them.
+        timeout: Per-host timeout in seconds.
+        concurrency: Maximum probes in flight.
+        limiter: Rate limiter the backend draws from.
+
+    Returns:
+        The results, with re-probed hosts that answered marked alive.
+    """
+    replied = sum(result.alive for result in results)
+    if not limiter.observe(len(results), replied):
+        return results
+
+    limiter.back_off()
+    silent = [result.ip_address for result in results if not result.alive]
+    recovered = {
+        result.ip_address: result
+        for result in sweep(silent, timeout, concurrency, None)
+        if result.alive
+    }
+
+    if recovered:
+        logger.info(f"Re-probe at reduced rate found {len(recovered)} more hosts")
+    else:
+        limiter.recover()
+
+    return [recovered.get(result.ip_address, result) for result in results]
@@ -0,0 +1,208 @@
+"""Scan target sets built from CIDRs, addresses and address ranges.
+
+Targets are stored as sorted, non-overlapping integer intervals per
+address family, so membership is a binary search however many prefixes
+were given, and overlapping targets are only ever swept once. Sweeps skip
+the network and broadcast addresses of a CIDR, but membership covers the
+whole prefix, so neighbors seen at those addresses are still in range.
+"""
+
+import ipaddress
+import socket
+from bisect import bisect_right
+from typing import Iterable, Iterator, Optional, Union
+
+# A textual target list, or an already parsed set
+Targets = Union[str, Iterable[str], "TargetSet"]
+
+_FAMILIES = {4: socket.AF_INET, 6: socket.AF_INET6}
+
+
+def _intervals(item: str) -> tuple[int, tuple[int, int], tuple[int, int]]:
+    """Convert one target item to inclusive integer address intervals.
+
+    Args:
+        item: CIDR ('10.0.0.0/24'), address ('10.0.0.5') or range
+            ('10.0.0.10-10.0.0.20').
+
+    Returns:
+        Tuple of (ip_version, (first, last) of every address in the item,
+        (first, last) of the host addresses to sweep).
+
+    Raises:
+        ValueError: The item is not a valid target.
+    """
+    if "-" in item:
+        start_text, end_text = item.split("-", 1)
+        start = ipaddress.ip_address(start_text.strip())
+        end = ipaddress.ip_address(end_text.strip())
+        if start.version != end.version or int(end) < int(start):
+            raise ValueError(f"Invalid address range: {item!r}")
+        span = (int(start), int(end))
+        return start.version, span, span
+
+    if "/" not in item:
+        address = ipaddress.ip_address(item)
+        span = (int(address), int(address))
+        return address.version, span, span
+
+    net = ipaddress.ip_network(item, strict=False)
+    first, last = int(net.network_address), int(net.broadcast_address)
+    span = (first, last)
+    # Same addresses as net.hosts(): IPv4 drops network and broadcast,
+    # IPv6 drops the subnet-router anycast address
+    if net.version == 4 and net.prefixlen < 31:
+        first, last = first + 1, last - 1
+    elif net.version == 6 and net.prefixlen < 127:
+        first += 1
+    return net.version, span, (first, last)
+
+
+def _address_to_int(ip: str) -> Optional[tuple[int, int]]:
+    """Convert a textual address to (version, integer), or None if invalid."""
+    # Drop an IPv6 zone suffix such as 'fe80::1%eth0'
+    text = ip.split("%", 1)[0]
+    for version, family in _FAMILIES.items():
+        try:
+            packed = socket.inet_pton(family, text)
+        except OSError:
+            continue
+        return version, int.from_bytes(packed, "big")
+    return None
+
+
+def _merge(intervals: list[tuple[int, int]]) -> tuple[list[int], list[int]]:
+    """Merge overlapping or adjacent intervals.
+
+    Returns:
+        Parallel lists of interval starts and ends, sorted by start.
+    """
+    starts: list[int] = []
+    ends: list[int] = []
+    for first, last in sorted(intervals):
+        if ends and first <= ends[-1] + 1:
+            ends[-1] = max(ends[-1], last)
+        else:
+            starts.append(first)
+            ends.append(last)
+    return starts, ends
+
+
+class TargetSet:
+    """Union of scan targets as merged integer intervals.
+
+    Iteration yields every host address once, in ascending order (IPv4
+    before IPv6). Membership also includes the network and broadcast
+    addresses of CIDR targets, and takes O(log n) in the number of merged
+    intervals.
+    """
+
+    def __init__(self, items: Iterable[str]) -> None:
+        """Build a target set.
+
+        Args:
+            items: CIDRs, single addresses or 'first-last' address ranges.
+
+        Raises:
+            ValueError: An item is not a valid target.
+        """
+        self._items = [item.strip() for item in items if item.strip()]
+        if not self._items:
+            raise ValueError("No scan targets given")
+
+        spans: dict[int, list[tuple[int, int]]] = {4: [], 6: []}
+        hosts: dict[int, list[tuple[int, int]]] = {4: [], 6: []}
+        for item in self._items:
+            version, span, host_span = _intervals(item)
+            spans[version].append(span)
+            hosts[version].append(host_span)
+
+        self._spans = {v: _merge(intervals) for v, intervals in spans.items()}
+        self._intervals = {v: _merge(intervals) for v, intervals in hosts.items()}
+
+    @classmethod
+    def parse(cls, targets: Targets) -> "TargetSet":
+        """Build a target set from text, a list of items, or a TargetSet.
+
+        Args:
+            targets: Comma or whitespace separated target text, an iterable
+                of target items, or an existing TargetSet (returned as is).
+
+        Returns:
+            TargetSet.
+
+        Raises:
+            ValueError: A target is invalid.
+        """
+        if isinstance(targets, TargetSet):
+            return targets
+        if isinstance(targets, str):
+            targets = targets.replace(",", " ").split()
+        return cls(targets)
+
+    def family(self, version: int) -> Optional["TargetSet"]:
+        """Restrict the set to one address family.
+
+        Args:
+            version: IP version (4 or 6).
+
+        Returns:
+            TargetSet with only the targets of that family, or None if the
+            set has none.
+        """
+        if not self._intervals[version][0]:
+            return None
+        if not self._intervals[6 if version == 4 else 4][0]:
+            return self
+        return TargetSet(item for item in self._items if _intervals(item)[0] == version)
+
+    @property
+    def num_hosts(self) -> int:
+        """Total number of host addresses in the set."""
+        return sum(
+            last - first + 1
+            for starts, ends in self._intervals.values()
+            for first, last in zip(starts, ends)
+        )
+
+    @property
+    def num_intervals(self) -> int:
+        """Number of merged, non-overlapping intervals."""
+        return sum(len(starts) for starts, _ in self._intervals.values())
+
+    def contains_int(self, version: int, value: int) -> bool:
+        """Check membership of an address given as an integer.
+
+        Args:
+            version: IP version (4 or 6).
+            value: Integer address.
+
+        Returns:
+            True if the address lies within a target, including the
+            network and broadcast addresses of a CIDR.
+        """
+        starts, ends = self._spans[version]
+        i = bisect_right(starts, value) - 1
+        return i >= 0 and value <= ends[i]
+
+    def __contains__(self, ip: object) -> bool:
+        if not isinstance(ip, str):
+            return False
+        parsed = _address_to_int(ip)
+        return parsed is not None and self.contains_int(*parsed)
+
+    def __iter__(self) -> Iterator[str]:
+        for version, (starts, ends) in self._intervals.items():
+            make = ipaddress.IPv4Address if version == 4 else ipaddress.IPv6Address
+            for first, last in zip(starts, ends):
+                for value in range(first, last + 1):
+                    yield str(make(value))
+
+    def __bool__(self) -> bool:
+        return self.num_intervals > 0
+
+    def __str__(self) -> str:
+        return ", ".join(self._items)
+
+    def __repr__(self) -> str:
+        return f"TargetSet({self._items!r})"
@@ -0,0 +1,227 @@
+"""TCP connect prober for hosts that drop ICMP.
+
+Each host is probed with non-blocking connects to a small port set at
+once. Any TCP answer proves the host is up: a SYN-ACK (open port) as much
+as an RST (closed port). Only silence or an ICMP unreachable means down.
+No privileges are needed, since these are ordinary connect() calls.
+"""
+
+import asyncio
+import socket
+import struct
+import time
+from typing import Optional, Sequence
+
+from network_tools.config import get_config
+from network_tools.logging import get_logger
+from network_tools.scanner.interfaces import bind_to_interface
+from network_tools.scanner.ratelimit import RateLimiter, get_rate_limiter
+from network_tools.scanner.sweep import ProbeResult, ProgressCallback
+
+logger = get_logger("scanner.tcp")
+
+# After the first answer, how long to keep listening for other ports, in
+# multiples of its RTT; silently filtered ports would otherwise hold every
+# live host for the full timeout
+_ANSWER_GRACE_RTTS = 2
+_MIN_ANSWER_GRACE = 0.05
+
+# SO_LINGER with a zero timeout: close() sends RST and frees the port
+# immediately instead of leaving thousands of sockets in TIME_WAIT
+_LINGER_ABORT = struct.pack("ii", 1, 0)
+
+
+def parse_ports(text: str) -> tuple[int, ...]:
+    """Parse a comma or whitespace separated port list.
+
+    Args:
+        text: Ports, e.g. '22,80,443'.
+
+    Returns:
+        Unique ports, in the given order.
+
+    Raises:
+        ValueError: A port is not a number from 1 to 65535, or none given.
+    """
+    ports: dict[int, None] = {}
+    for item in text.replace(",", " ").split():
+        port = int(item)
+        if not 1 <= port <= 65535:
+            raise ValueError(f"Invalid TCP port {item}")
+        ports[port] = None
+    if not ports:
+        raise ValueError("No TCP ports given")
+    return tuple(ports)
+
+
+async def _connect(
+    ip: str,
+    port: int,
+    timeout: float,
+    limiter: Optional[RateLimiter],
+    interface: Optional[str] = None,
+) -> Optional[tuple[bool, float]]:
+    """Attempt one TCP connection.
+
+    Returns:
+        Tuple of (port open, RTT in ms), or None if nothing answered.
+    """
+    if limiter is not None:
+        delay = limiter.reserve(ip)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    loop = asyncio.get_running_loop()
+    family = socket.AF_INET6 if ":" in ip else socket.AF_INET
+    try:
+        sock = socket.socket(family, socket.SOCK_STREAM)
+    except OSError as e:
+        # Out of descriptors (EMFILE/ENFILE): count the port as silent
+        # rather than aborting the whole sweep
+        logger.debug(f"Cannot open socket to probe {ip}:{port}: {e}")
+        return None
+    try:
+        sock.setblocking(False)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, _LINGER_ABORT)
+        if interface is not None:
+            bind_to_interface(sock, interface)
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(loop.sock_connect(sock, (ip, port)), timeout)
+            is_open = True
+        except ConnectionRefusedError:
+            is_open = False
+        except (TimeoutError, OSError):
+            return None
+        return is_open, (time.monotonic() - started) * 1000
+    finally:
+        sock.close()
+
+
+async def tcp_probe(
+    ip: str,
+    timeout: float,
+    ports: Optional[Sequence[int]] = None,
+    limiter: Optional[RateLimiter] = None,
+    interface: Optional[str] = None,
+) -> ProbeResult:
+    """Probe one host with concurrent TCP connects.
+
+    Args:
+        ip: Address to probe.
+        timeout: Seconds to wait for any port to answer.
+        ports: Ports to try. Defaults to config scan_tcp_ports.
+        limiter: Paces every connect attempt. Defaults to no pacing.
+        interface: Interface to connect through. Defaults to the kernel's
+            route lookup.
+
+    Returns:
+        Probe result; `tcp_ports` maps each answering port to whether it
+        is open, and the RTT is that of the first answer.
+    """
+    if ports is None:
+        ports = parse_ports(get_config().scan_tcp_ports)
+
+    loop = asyncio.get_running_loop()
+    tasks = {
+        asyncio.ensure_future(_connect(ip, port, timeout, limiter, interface)): port
+        for port in ports
+    }
+    pending = set(tasks)
+    answered: dict[int, bool] = {}
+    rtt_ms: Optional[float] = None
+    deadline: Optional[float] = None
+
+    try:
+        while pending:
+            wait = None if deadline is None else max(0.0, deadline - loop.time())
+            done, pending = await asyncio.wait(
+                pending, timeout=wait, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                break
+            for task in done:
+                outcome = task.result()
+                if outcome is None:
+                    continue
+                is_open, rtt = outcome
+                answered[tasks[task]] = is_open
+                if rtt_ms is None:
+                    rtt_ms = rtt
+                    grace = max(_ANSWER_GRACE_RTTS * rtt / 1000, _MIN_ANSWER_GRACE)
+                    deadline = loop.time() + grace
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    if answered:
+        logger.debug(f"Host {ip} answered on TCP ports {sorted(answered)}")
+    return ProbeResult(
+        ip_address=ip,
+        alive=bool(answered),
+        rtt_ms=rtt_ms,
+        tcp_ports=dict(sorted(answered.items())),
+    )
+
+
+async def _tcp_sweep(
+    hosts: Sequence[str],
+    timeout: float,
+    concurrency: int,
+    progress: Optional[ProgressCallback],
+    ports: Sequence[int],
+    interface: Optional[str],
+) -> list[ProbeResult]:
+    """Probe hosts with at most `concurrency` hosts in flight."""
+    limiter = get_rate_limiter()
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    total = len(hosts)
+    done = 0
+
+    async def bounded(ip: str) -> ProbeResult:
+        nonlocal done
+        async with semaphore:
+            result = await tcp_probe(ip, timeout, ports, limiter, interface)
+        done += 1
+        if progress is not None:
+            progress(done, total)
+        return result
+
+    return list(await asyncio.gather(*(bounded(ip) for ip in hosts)))
+
+
+def tcp_sweep(
+    hosts: Sequence[str],
+    timeout: float,
+    concurrency: int = 50,
+    progress: Optional[ProgressCallback] = None,
+    interface: Optional[str] = None,
+) -> list[ProbeResult]:
+    """Sweep hosts with TCP connects to the configured ports.
+
+    Args:
+        hosts: IP addresses to probe.
+        timeout: Seconds to wait for any port of a host to answer.
+        concurrency: Maximum hosts in flight; each uses one socket per port.
+        progress: Optional callback receiving (done, total).
+        interface: Interface to connect through. Defaults to the kernel's
+            route lookup.
+
+    Returns:
+        One result per host, in input order.
+
+    Raises:
+        ValueError: Config scan_tcp_ports is invalid.
+    """
+    if not hosts:
+        return []
+
+    ports = parse_ports(get_config().scan_tcp_ports)
+    results = asyncio.run(
+        _tcp_sweep(hosts, timeout, concurrency, progress, ports, interface)
+    )
+
+    alive = sum(1 for r in results if r.alive)
+    logger.debug(f"TCP sweep of ports {list(ports)}: {alive}/{len(hosts)} hosts up")
+    return results
@@ -0,0 +1,191 @@
+"""Adaptive probe timeouts estimated from observed round-trip times.
+
+Each target subnet keeps a TCP-style smoothed RTT and RTT variance
+(RFC 6298), updated from every reply of the current scan and optionally
+seeded from earlier scans. A sweep chunk waits srtt + 4 * rttvar for its
+slowest subnet, so dead hosts on a fast LAN cost milliseconds while slow
+links get as long as their replies actually take.
+"""
+
+import socket
+import threading
+from typing import Iterable, Optional
+
+from network_tools.config import get_config
+from network_tools.logging import get_logger
+
+logger = get_logger("scanner.timing")
+
+# RFC 6298 gains and variance multiplier
+RTT_ALPHA = 1 / 8
+RTT_BETA = 1 / 4
+RTT_K = 4
+
+# Subnets without replies of their own fall back to the enclosing site
+_IPV4_SITE_PREFIX = 16
+_IPV6_SUBNET_PREFIX = 64
+_IPV6_SITE_PREFIX = 48
+
+
+class RttEstimator:
+    """Smoothed RTT and RTT variance of one network segment."""
+
+    def __init__(self) -> None:
+        self.srtt: Optional[float] = None
+        self.rttvar: Optional[float] = None
+        self.samples = 0
+
+    def update(self, rtt: float) -> None:
+        """Fold in one RTT sample.
+
+        Args:
+            rtt: Round-trip time in seconds.
+        """
+        if self.srtt is None or self.rttvar is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar += RTT_BETA * (abs(self.srtt - rtt) - self.rttvar)
+            self.srtt += RTT_ALPHA * (rtt - self.srtt)
+        self.samples += 1
+
+    @property
+    def timeout(self) -> Optional[float]:
+        """Retransmission-style timeout in seconds, or None without samples."""
+        if self.srtt is None or self.rttvar is None:
+            return None
+        return self.srtt + RTT_K * self.rttvar
+
+
+class AdaptiveTimeout:
+    """Per-subnet probe timeouts learned from RTTs.
+
+    A subnet with replies of its own uses its estimate; otherwise the
+    estimate of its site (/16 for IPv4, /48 for IPv6) is used, and with no
+    replies from the site either, the initial timeout. Timeouts are only
+    learned from replies, so a segment never speeds up on silence alone.
+
+    Thread-safe; one instance can be shared by the sweeps of several
+    interfaces.
+    """
+
+    def __init__(
+        self,
+        initial: Optional[float] = None,
+        min_timeout: Optional[float] = None,
+        max_timeout: Optional[float] = None,
+        subnet_prefix: Optional[int] = None,
+    ) -> None:
+        """Create an estimator.
+
+        Args:
+            initial: Timeout for segments without any RTT samples. Defaults
+                to config scan_probe_timeout.
+            min_timeout: Lower bound in seconds. Defaults to config
+                scan_min_timeout.
+            max_timeout: Upper bound in seconds. Defaults to config
+                scan_max_timeout.
+            subnet_prefix: IPv4 prefix length of a subnet. Defaults to config
+                scan_subnet_prefix.
+        """
+        config = get_config()
+        self.initial = config.scan_probe_timeout if initial is None else initial
+        self.min_timeout = (
+            config.scan_min_timeout if min_timeout is None else min_timeout
+        )
+        self.max_timeout = (
+            config.scan_max_timeout if max_timeout is None else max_timeout
+        )
+        self.subnet_prefix = (
+            config.scan_subnet_prefix if subnet_prefix is None else subnet_prefix
+        )
+        self._lock = threading.Lock()
+        # (address bits, prefix length, network number) -> estimator
+        self._estimators: dict[tuple[int, int, int], RttEstimator] = {}
+
+    def _keys(self, ip: str) -> Optional[tuple[tuple[int, int, int], ...]]:
+        """Subnet and site keys of an address, or None if it is not an IP."""
+        try:
+            packed = socket.inet_pton(socket.AF_INET, ip)
+            prefixes = (self.subnet_prefix, _IPV4_SITE_PREFIX)
+        except OSError:
+            try:
+                packed = socket.inet_pton(socket.AF_INET6, ip.split("%", 1)[0])
+            except OSError:
+                return None
+            prefixes = (_IPV6_SUBNET_PREFIX, _IPV6_SITE_PREFIX)
+        bits = len(packed) * 8
+        value = int.from_bytes(packed, "big")
+        return tuple((bits, p, value >> (bits - p)) for p in prefixes)
+
+    def observe(self, ip: str, rtt_ms: float) -> None:
+        """Record a reply RTT from a host.
+
+        Args:
+            ip: Address that replied.
+            rtt_ms: Measured round-trip time in milliseconds.
+        """
+        keys = self._keys(ip)
+        if keys is None or rtt_ms < 0:
+            return
+        with self._lock:
+            for key in keys:
+                estimator = self._estimators.get(key)
+                if estimator is None:
+                    estimator = self._estimators[key] = RttEstimator()
+                estimator.update(rtt_ms / 1000)
+
+    def seed(self, samples: Iterable[tuple[str, float]]) -> int:
+        """Start from RTTs recorded by earlier scans.
+
+        Args:
+            samples: (IP address, RTT in ms) pairs, oldest first.
+
+        Returns:
+            Number of samples used.
+        """
+        count = 0
+        for ip, rtt_ms in samples:
+            self.observe(ip, rtt_ms)
+            count += 1
+        if count:
+            logger.debug(f"Seeded adaptive timeouts with {count} RTT samples")
+        return count
+
+    def timeout_for(self, ip: str) -> float:
+        """Timeout for probing one host.
+
+        Args:
+            ip: Target address.
+
+        Returns:
+            Seconds to wait for the host's reply.
+        """
+        timeout: Optional[float] = None
+        keys = self._keys(ip)
+        with self._lock:
+            for key in keys or ():
+                estimator = self._estimators.get(key)
+                if estimator is not None:
+                    timeout = estimator.timeout
+                    break
+        if timeout is None:
+            return self.initial
+        return min(self.max_timeout, max(self.min_timeout, timeout))
+
+    def timeout_for_hosts(self, hosts: Iterable[str]) -> float:
+        """Timeout for a batch of hosts probed together.
+
+        Args:
+            hosts: Target addresses.
+
+        Returns:
+            The longest timeout of any of the hosts' subnets.
+        """
+        timeouts: dict[Optional[tuple[int, int, int]], float] = {}
+        for ip in hosts:
+            keys = self._keys(ip)
+            subnet = keys[0] if keys else None
+            if subnet not in timeouts:
+                timeouts[subnet] = self.timeout_for(ip)
+        return max(timeouts.values(), default=self.initial)
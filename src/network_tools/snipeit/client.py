@@ -1,10 +1,12 @@
 """Snipe-IT API client."""
 
 import logging
-from typing import Any, Optional
+from typing import Any, Optional, Union
 
 import requests
 
+from network_tools.addresses import MacAddress
+
 from .exceptions import (
     SnipeITAuthError,
     SnipeITConnectionError,
@@ -265,27 +267,27 @@ class SnipeITClient:
         asset_data = data.get("payload", data)
         return Asset.from_api_response(asset_data)
 
-    def search_by_mac(self, mac_address: str) -> Optional[Asset]:
+    def search_by_mac(self, mac_address: Union[MacAddress, str]) -> Optional[Asset]:
         """Search for asset by MAC address custom field.
 
         Args:
-            mac_address: MAC address to search for.
+            mac_address: MAC address to search for, in any format.
 
         Returns:
             Asset instance or None if not found.
+
+        Raises:
+            ValueError: mac_address is not a MAC address.
         """
-        # Normalize MAC format for search
-        mac_normalized = mac_address.upper().replace("-", ":")
+        mac = MacAddress(mac_address)
 
-        # Search using the MAC address
-        assets, _ = self.list_hardware(search=mac_normalized, limit=10)
+        # Search using the canonical MAC text
+        assets, _ = self.list_hardware(search=str(mac), limit=10)
 
         # Filter to exact MAC match
         for asset in assets:
-            if asset.mac_address:
-                asset_mac = asset.mac_address.upper().replace("-", ":")
-                if asset_mac == mac_normalized:
-                    return asset
+            if asset.mac_address == mac:
+                return asset
 
         return None
 
@@ -1,9 +1,14 @@
 """Data models for Snipe-IT entities and discovery."""
 
+import logging
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, Optional
 
+from network_tools.addresses import MacAddress
+
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class Asset:
@@ -25,13 +30,17 @@ class Asset:
     notes: Optional[str] = None
 
     # Custom fields
-    mac_address: Optional[str] = None
+    mac_address: Optional[MacAddress] = None
     ip_address: Optional[str] = None
 
     # Timestamps
     created_at: Optional[str] = None
     updated_at: Optional[str] = None
 
+    def __post_init__(self) -> None:
+        if isinstance(self.mac_address, str):
+            self.mac_address = MacAddress(self.mac_address)
+
     @classmethod
     def from_api_response(cls, data: dict) -> "Asset":
         """Create Asset from Snipe-IT API response.
@@ -54,6 +63,15 @@ class Asset:
         mac_field = custom_fields.get("MAC Address") or {}
         ip_field = custom_fields.get("IP Address") or {}
 
+        # Free-text custom field; unparseable values are treated as unset
+        mac_value = mac_field.get("value")
+        mac_address = MacAddress.parse(mac_value)
+        if mac_address is None and mac_value and str(mac_value).strip():
+            logger.warning(
+                f"Ignoring invalid MAC address {mac_value!r} on asset "
+                f"{data.get('asset_tag') or data.get('id')}"
+            )
+
         return cls(
             id=data.get("id", 0),
             name=data.get("name", ""),
@@ -69,7 +87,7 @@ class Asset:
             location_name=location.get("name") if location else None,
             serial=data.get("serial"),
             notes=data.get("notes"),
-            mac_address=mac_field.get("value"),
+            mac_address=mac_address,
             ip_address=ip_field.get("value"),
             created_at=data.get("created_at", {}).get("datetime")
             if isinstance(data.get("created_at"), dict)
@@ -85,11 +103,11 @@ class DiscoveredDevice:
     """Device discovered during network scan."""
 
     ip_address: str
-    mac_address: Optional[str] = None
+    mac_address: Optional[MacAddress] = None
     hostname: Optional[str] = None
     manufacturer: Optional[str] = None
     device_type_guess: Optional[str] = None
-    response_time_ms: Optional[int] = None
+    response_time_ms: Optional[float] = None
     discovery_method: str = "arp"
     last_seen: Optional[datetime] = None
 
@@ -98,6 +116,10 @@ class DiscoveredDevice:
     matched_asset: Optional[Asset] = None
     confidence: str = "low"  # low, medium, high
 
+    def __post_init__(self) -> None:
+        if isinstance(self.mac_address, str):
+            self.mac_address = MacAddress(self.mac_address)
+
     def to_snipeit_payload(
         self,
         model_id: int,
@@ -126,13 +148,7 @@ class DiscoveredDevice:
             else:
                 name = f"device-{self.ip_address.replace('.', '-')}"
 
-        # Generate asset tag from MAC (last 6 chars) or IP
-        if self.mac_address:
-            mac_clean = self.mac_address.replace(":", "").replace("-", "").upper()
-            asset_tag = f"NET-{mac_clean[-6:]}"
-        else:
-            ip_clean = self.ip_address.replace(".", "")
-            asset_tag = f"NET-{ip_clean[-6:]}"
+        asset_tag = self.generate_asset_tag()
 
         # Build notes
         notes_parts = []
@@ -152,7 +168,7 @@ class DiscoveredDevice:
 
         # Add custom fields
         if self.mac_address:
-            payload["_snipeit_mac_address_1"] = self.mac_address.upper()
+            payload["_snipeit_mac_address_1"] = str(self.mac_address)
         if self.ip_address:
             payload["_snipeit_ip_address_2"] = self.ip_address
 
@@ -169,8 +185,8 @@ class DiscoveredDevice:
             Asset tag string (e.g., NET-DDEEFF).
         """
         if self.mac_address:
-            mac_clean = self.mac_address.replace(":", "").replace("-", "").upper()
-            return f"NET-{mac_clean[-6:]}"
+            # Last 3 octets of the MAC
+            return f"NET-{int(self.mac_address) & 0xFFFFFF:06X}"
         else:
             ip_clean = self.ip_address.replace(".", "")
             return f"NET-{ip_clean[-6:]}"
@@ -0,0 +1,102 @@
+"""Tests for the address value types."""
+
+import pytest
+
+from network_tools.addresses import MacAddress, parse_mac_values
+
+
+class TestMacAddress:
+    """Tests for MacAddress."""
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "AA:BB:CC:DD:EE:FF",
+            "aa-bb-cc-dd-ee-ff",
+            "aabb.ccdd.eeff",
+            "AABBCCDDEEFF",
+        ],
+    )
+    def test_parses_common_formats(self, text):
+        """All common notations should parse to the same value."""
+        mac = MacAddress(text)
+
+        assert int(mac) == 0xAABBCCDDEEFF
+        assert str(mac) == "AA:BB:CC:DD:EE:FF"
+
+    def test_short_octets(self):
+        """Octets with dropped leading zeros (macOS) should be padded."""
+        assert str(MacAddress("0:1b:2c:3:4:5")) == "00:1B:2C:03:04:05"
+
+    @pytest.mark.parametrize(
+        "text",
+        ["", "AA:BB:CC", "AABBCC", "AA:BB:CC:DD:EE:GG", "AAA:BB:CC:DD:EE:FF", "0x1"],
+    )
+    def test_rejects_invalid(self, text):
+        """Malformed text should raise ValueError, and parse() return None."""
+        with pytest.raises(ValueError):
+            MacAddress(text)
+        assert MacAddress.parse(text) is None
+
+    def test_int_and_bytes(self):
+        """Integers and raw bytes should be accepted and range-checked."""
+        assert MacAddress(bytes.fromhex("aabbccddeeff")) == MacAddress(0xAABBCCDDEEFF)
+        assert MacAddress(1).packed == b"\x00\x00\x00\x00\x00\x01"
+        with pytest.raises(ValueError):
+            MacAddress(1 << 48)
+
+    def test_equality_and_hash(self):
+        """Equal addresses should compare and hash as integers."""
+        a = MacAddress("aa-bb-cc-dd-ee-ff")
+        b = MacAddress("AA:BB:CC:DD:EE:FF")
+
+        assert a == b
+        assert hash(a) == hash(b)
+        assert {a: 1}[b] == 1
+        assert a == MacAddress("aabb.ccdd.eeff")
+        assert MacAddress(1) < MacAddress(2)
+
+    def test_never_equals_text(self):
+        """Strings never compare equal, as their hashes differ."""
+        a = MacAddress("AA:BB:CC:DD:EE:FF")
+
+        assert a != "AA:BB:CC:DD:EE:FF"
+        assert "AA:BB:CC:DD:EE:FF" not in {a}
+
+    def test_oui_and_flags(self):
+        """OUI and unicast/multicast flags should come from the integer value."""
+        assert MacAddress("B8:27:EB:12:34:56").oui == 0xB827EB
+        assert MacAddress("B8:27:EB:12:34:56").is_unicast
+        assert not MacAddress("FF:FF:FF:FF:FF:FF").is_unicast
+        assert MacAddress("01:00:5E:00:00:01").is_multicast
+        assert not MacAddress(0).is_unicast
+
+    def test_slots(self):
+        """Instances should not carry a per-instance __dict__."""
+        assert not hasattr(MacAddress(0), "__dict__")
+
+
+class TestParseMacValues:
+    """Tests for bulk MAC parsing."""
+
+    def test_matches_single_parse(self):
+        """Every notation gives the same value as MacAddress."""
+        values = [
+            "aa:bb:cc:dd:ee:ff",
+            "AA-BB-CC-DD-EE-FF",
+            "aabb.ccdd.eeff",
+            "0:1b:c5:0:0:1",
+            MacAddress("B8:27:EB:12:34:56"),
+            0xB827EB123456,
+        ]
+
+        assert parse_mac_values(values) == [int(MacAddress(value)) for value in values]
+
+    def test_invalid_is_none(self):
+        """Malformed and missing entries parse to None."""
+        assert (
+            parse_mac_values(
+                ["aa:bb:cc:dd:ee:fg", "aa:bb:cc:dd:ee:f_", "aa:bb:cc", "", None]
+            )
+            == [None] * 5
+        )
@@ -1,13 +1,23 @@
 """Tests for main CLI commands."""
 
+import ipaddress
 import re
+import struct
+from datetime import datetime, timezone
 from unittest.mock import MagicMock, patch
 
 import pytest
 from click.testing import CliRunner
 
+from network_tools.addresses import MacAddress
 from network_tools.cli.main import cli
 from network_tools.config import Config, set_config
+from network_tools.history import HistoryStore
+from network_tools.passive import DeviceTable, Observation
+from network_tools.scanner.checkpoint import ScanCheckpoint
+from network_tools.scanner.interfaces import LocalSubnet
+from network_tools.scanner.models import ARPEntry
+from network_tools.scanner.sweep import ProbeResult
 
 
 def strip_ansi(text: str) -> str:
@@ -84,9 +94,24 @@ class TestDiscoverCommand:
 
         assert "SNIPEIT_API_KEY not configured" in output
 
-    def test_discover_with_network(self):
+    def test_discover_preloads_oui_database(self):
+        """The vendor database starts loading before Snipe-IT is contacted."""
+        set_config(Config(snipeit_api_key=""))
+
+        runner = CliRunner()
+        with patch("network_tools.oui.preload_oui_database") as mock_preload:
+            runner.invoke(cli, ["discover", "--network", "192.168.1.0/24"])
+
+        mock_preload.assert_called_once_with()
+
+    def test_discover_with_network(self, tmp_path):
         """Test discover with network option shows header."""
-        set_config(Config(snipeit_api_key="test_key"))
+        set_config(
+            Config(
+                snipeit_api_key="test_key",
+                history_database_path=str(tmp_path / "history.db"),
+            )
+        )
 
         runner = CliRunner()
 
@@ -97,8 +122,8 @@ class TestDiscoverCommand:
             mock_client.get_network_assets.return_value = []
             mock_client_class.return_value = mock_client
 
-            with patch("network_tools.scanner.scan_network") as mock_scan:
-                mock_scan.return_value = []
+            with patch("network_tools.scanner.iter_scan_network") as mock_scan:
+                mock_scan.return_value = iter([])
 
                 result = runner.invoke(cli, ["discover", "--network", "192.168.1.0/24"])
                 output = strip_ansi(result.output)
@@ -106,9 +131,14 @@ class TestDiscoverCommand:
         assert "Network Discovery" in output
         assert "192.168.1.0/24" in output
 
-    def test_discover_with_yes_flag(self):
+    def test_discover_with_yes_flag(self, tmp_path):
         """Test discover with auto-confirm flag."""
-        set_config(Config(snipeit_api_key="test_key"))
+        set_config(
+            Config(
+                snipeit_api_key="test_key",
+                history_database_path=str(tmp_path / "history.db"),
+            )
+        )
 
         runner = CliRunner()
 
@@ -118,8 +148,8 @@ class TestDiscoverCommand:
             mock_client.get_network_assets.return_value = []
             mock_client_class.return_value = mock_client
 
-            with patch("network_tools.scanner.scan_network") as mock_scan:
-                mock_scan.return_value = []
+            with patch("network_tools.scanner.iter_scan_network") as mock_scan:
+                mock_scan.return_value = iter([])
 
                 result = runner.invoke(
                     cli, ["discover", "-n", "192.168.1.0/24", "-y"]
@@ -128,6 +158,336 @@ class TestDiscoverCommand:
 
         assert "Auto-confirm: True" in output
 
+    def test_discover_records_history(self, tmp_path):
+        """Discovered devices should be written to the scan history."""
+        db_path = tmp_path / "history.db"
+        set_config(
+            Config(snipeit_api_key="test_key", history_database_path=str(db_path))
+        )
+
+        runner = CliRunner()
+
+        with patch("network_tools.snipeit.SnipeITClient") as mock_client_class:
+            mock_client = MagicMock()
+            mock_client.test_connection.return_value = True
+            mock_client.get_network_assets.return_value = []
+            mock_client_class.return_value = mock_client
+
+            with patch("network_tools.scanner.iter_scan_network") as mock_scan:
+                mock_scan.return_value = iter(
+                    [ARPEntry(ip_address="10.0.0.5", mac_address="AA:BB:CC:DD:EE:05")]
+                )
+
+                runner.invoke(cli, ["discover", "-n", "10.0.0.0/24"], input="n\n")
+
+        with HistoryStore(db_path) as history:
+            assert list(history.last_seen(["AA:BB:CC:DD:EE:05"])) == [
+                MacAddress("AA:BB:CC:DD:EE:05")
+            ]
+
+    def test_discover_incremental_rejects_no_ping(self):
+        """--incremental needs probes, so --no-ping should be refused."""
+        set_config(Config(snipeit_api_key="test_key"))
+
+        runner = CliRunner()
+        result = runner.invoke(
+            cli, ["discover", "-n", "10.0.0.0/24", "--incremental", "--no-ping"]
+        )
+
+        output = strip_ansi(result.output)
+        assert "cannot be used with --no-ping" in output
+        assert "Network Discovery" not in output
+
+    def test_discover_from_pcap(self, tmp_path):
+        """--pcap feeds devices seen in a capture into the comparison."""
+        set_config(
+            Config(
+                snipeit_api_key="test_key",
+                history_database_path=str(tmp_path / "history.db"),
+            )
+        )
+        mac = bytes.fromhex("aabbcc000005")
+        arp = (
+            b"\xff" * 6
+            + mac
+            + b"\x08\x06\x00\x01\x08\x00\x06\x04\x00\x01"
+            + mac
+            + bytes([10, 0, 0, 5])
+            + b"\x00" * 6
+            + bytes([10, 0, 0, 254])
+        )
+        capture = tmp_path / "site.pcap"
+        capture.write_bytes(
+            struct.pack("<IHHiIII", 0xA1B2C3D4, 2, 4, 0, 0, 65535, 1)
+            + struct.pack("<IIII", 1_700_000_000, 0, len(arp), len(arp))
+            + arp
+        )
+
+        runner = CliRunner()
+
+        with patch("network_tools.snipeit.SnipeITClient") as mock_client_class:
+            mock_client = MagicMock()
+            mock_client.test_connection.return_value = True
+            mock_client.get_network_assets.return_value = []
+            mock_client_class.return_value = mock_client
+
+            with patch("network_tools.scanner.iter_scan_network") as mock_scan:
+                result = runner.invoke(
+                    cli,
+                    ["discover", "-n", "10.0.0.0/24", "--pcap", str(capture)],
+                    input="n\n",
+                )
+
+        output = strip_ansi(result.output)
+        mock_scan.assert_not_called()
+        assert "Found 1 devices" in output
+        assert "AA:BB:CC:00:00:05" in output
+
+    def test_discover_pcap_rejects_incremental(self, tmp_path):
+        """A capture cannot be combined with incremental probing."""
+        set_config(Config(snipeit_api_key="test_key"))
+        capture = tmp_path / "site.pcap"
+        capture.write_bytes(b"")
+
+        runner = CliRunner()
+        result = runner.invoke(
+            cli,
+            ["discover", "-n", "10.0.0.0/24", "--incremental", "--pcap", str(capture)],
+        )
+
+        output = strip_ansi(result.output)
+        assert "cannot be used with --pcap" in output
+        assert "Network Discovery" not in output
+
+    def test_discover_passive_reads_listener_table(self, tmp_path):
+        """--passive uses the listener's snapshot instead of sweeping."""
+        snapshot = tmp_path / "passive.json"
+        table = DeviceTable()
+        table.update(
+            Observation(
+                mac_address="AA:BB:CC:00:00:07",
+                ip_address="10.0.0.7",
+                hostname="nas",
+                protocol="mdns",
+                seen_at=datetime.now(timezone.utc),
+            )
+        )
+        table.save(snapshot)
+        set_config(
+            Config(
+                snipeit_api_key="test_key",
+                history_database_path=str(tmp_path / "history.db"),
+                passive_table_path=str(snapshot),
+            )
+        )
+
+        runner = CliRunner()
+
+        with patch("network_tools.snipeit.SnipeITClient") as mock_client_class:
+            mock_client = MagicMock()
+            mock_client.test_connection.return_value = True
+            mock_client.get_network_assets.return_value = []
+            mock_client_class.return_value = mock_client
+
+            with patch("network_tools.scanner.iter_scan_network") as mock_scan:
+                result = runner.invoke(
+                    cli, ["discover", "-n", "10.0.0.0/24", "--passive"], input="n\n"
+                )
+
+        mock_scan.assert_not_called()
+        assert "Found 1 devices" in strip_ansi(result.output)
+
+    def test_discover_all_interfaces(self, tmp_path):
+        """--all-interfaces scans every attached subnet instead of --network."""
+        set_config(
+            Config(
+                snipeit_api_key="test_key",
+                history_database_path=str(tmp_path / "history.db"),
+            )
+        )
+        subnets = [
+            LocalSubnet("eth0", ipaddress.IPv4Network("10.0.0.0/24")),
+            LocalSubnet("eth0.20", ipaddress.IPv4Network("10.0.20.0/24")),
+        ]
+
+        runner = CliRunner()
+
+        with patch("network_tools.snipeit.SnipeITClient") as mock_client_class:
+            mock_client = MagicMock()
+            mock_client.test_connection.return_value = True
+            mock_client.get_network_assets.return_value = []
+            mock_client_class.return_value = mock_client
+
+            with (
+                patch("network_tools.scanner.local_subnets", return_value=subnets),
+                patch("network_tools.scanner.iter_scan_interfaces") as mock_scan,
+            ):
+                mock_scan.return_value = iter([])
+                result = runner.invoke(cli, ["discover", "--all-interfaces"])
+
+        output = strip_ansi(result.output)
+        assert mock_scan.call_args.args[0] == subnets
+        assert "10.0.0.0/24,10.0.20.0/24" in output
+        assert "10.0.20.0/24 on eth0.20" in output
+
+    def test_discover_network_and_all_interfaces(self):
+        """--network and --all-interfaces are mutually exclusive."""
+        runner = CliRunner()
+        result = runner.invoke(
+            cli, ["discover", "-n", "10.0.0.0/24", "--all-interfaces"]
+        )
+
+        assert "cannot be used with --all-interfaces" in strip_ansi(result.output)
+
+    def _run_with_checkpoint(self, tmp_path, scan_effect, *args):
+        """Run discover on 10.0.0.0/23 with one sweep shard already finished."""
+        set_config(
+            Config(
+                snipeit_api_key="test_key",
+                history_database_path=str(tmp_path / "history.db"),
+                scan_checkpoint_dir=str(tmp_path / "checkpoints"),
+            )
+        )
+        checkpoint = ScanCheckpoint.for_targets("10.0.0.0/23")
+        checkpoint.record(0, [ProbeResult(ip_address="10.0.0.1", alive=True)])
+        checkpoint.close()
+
+        runner = CliRunner()
+        with patch("network_tools.snipeit.SnipeITClient") as mock_client_class:
+            mock_client = MagicMock()
+            mock_client.get_network_assets.return_value = []
+            mock_client_class.return_value = mock_client
+
+            with patch("network_tools.scanner.iter_scan_network") as mock_scan:
+                mock_scan.side_effect = scan_effect
+                result = runner.invoke(cli, ["discover", "-n", "10.0.0.0/23", *args])
+
+        return checkpoint.path, mock_scan, strip_ansi(result.output)
+
+    def test_discover_resumes_sweep(self, tmp_path):
+        """A finished run resumes the checkpoint, then discards it."""
+        path, mock_scan, output = self._run_with_checkpoint(
+            tmp_path, lambda *args, **kwargs: iter([])
+        )
+
+        assert "510 hosts already probed" in output
+        assert mock_scan.call_args.kwargs["checkpoint"].path == path
+        assert not path.exists()
+
+    def test_discover_failure_keeps_checkpoint(self, tmp_path):
+        """A failed run keeps the finished shards for the next one."""
+        path, _, output = self._run_with_checkpoint(
+            tmp_path, RuntimeError("Snipe-IT went away")
+        )
+
+        assert "Discovery failed" in output
+        assert list(ScanCheckpoint.for_targets("10.0.0.0/23").completed) == [0]
+        assert path.exists()
+
+    def test_discover_no_resume(self, tmp_path):
+        """--no-resume starts the sweep over."""
+        _, mock_scan, output = self._run_with_checkpoint(
+            tmp_path, lambda *args, **kwargs: iter([]), "--no-resume"
+        )
+
+        assert "already probed" not in output
+        assert mock_scan.call_args.kwargs["checkpoint"].completed == {}
+
+
+class TestListenCommand:
+    """Tests for listen command."""
+
+    def setup_method(self):
+        """Reset config before each test."""
+        set_config(None)
+
+    def teardown_method(self):
+        """Clean up after each test."""
+        set_config(None)
+
+    def test_listen_replay_saves_table(self, tmp_path):
+        """--replay feeds a capture and saves the device table."""
+        snapshot = tmp_path / "passive.json"
+        set_config(Config(passive_table_path=str(snapshot)))
+        mac = bytes.fromhex("aabbcc000005")
+        arp = (
+            b"\xff" * 6
+            + mac
+            + b"\x08\x06\x00\x01\x08\x00\x06\x04\x00\x01"
+            + mac
+            + bytes([10, 0, 0, 5])
+            + b"\x00" * 6
+            + bytes([10, 0, 0, 254])
+        )
+        capture = tmp_path / "replay.pcap"
+        capture.write_bytes(
+            struct.pack("<IHHiIII", 0xA1B2C3D4, 2, 4, 0, 0, 65535, 1)
+            + struct.pack("<IIII", 1_700_000_000, 0, len(arp), len(arp))
+            + arp
+        )
+
+        runner = CliRunner()
+        result = runner.invoke(cli, ["listen", "--replay", str(capture)])
+
+        output = strip_ansi(result.output)
+        assert "AA:BB:CC:00:00:05" in output
+        assert "1 devices" in output
+        assert DeviceTable.load(snapshot).get("AA:BB:CC:00:00:05") is not None
+
+
+class TestBuildOuiIndexCommand:
+    """Tests for build-oui-index command."""
+
+    def setup_method(self):
+        """Reset config before each test."""
+        set_config(None)
+
+    def teardown_method(self):
+        """Clean up after each test."""
+        set_config(None)
+
+    def test_builds_configured_index(self, tmp_path):
+        """Registry and index paths default to config; missing blocks are skipped."""
+        registry = tmp_path / "oui.txt"
+        registry.write_text("FC-FB-FB   (hex)\t\tExample Corp\n")
+        index = tmp_path / "oui.idx"
+        (tmp_path / "oui36.txt").write_text(
+            "70-B3-D5   (hex)\t\tTiny Sensors GmbH\n"
+            "C08000-C08FFF     (base 16)\t\tTiny Sensors GmbH\n"
+        )
+        set_config(
+            Config(
+                oui_database_path=str(registry),
+                oui_mam_path=str(tmp_path / "mam.txt"),
+                oui_oui36_path=str(tmp_path / "oui36.txt"),
+                oui_manuf_path=str(tmp_path / "manuf"),
+                oui_index_path=str(index),
+            )
+        )
+
+        runner = CliRunner()
+        result = runner.invoke(cli, ["build-oui-index"])
+
+        assert "Compiled 2 OUI entries" in strip_ansi(result.output)
+        assert index.exists()
+
+    def test_missing_registry(self, tmp_path):
+        """A missing registry is reported without a traceback."""
+        runner = CliRunner()
+        result = runner.invoke(
+            cli,
+            [
+                "build-oui-index",
+                "--source",
+                str(tmp_path / "missing.txt"),
+                "--output",
+                str(tmp_path / "oui.idx"),
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert "Cannot read OUI registry" in strip_ansi(result.output)
+
 
 class TestStatusCommand:
     """Tests for status command."""
@@ -29,6 +29,7 @@ class TestConfig:
         # Network defaults
         assert config.default_network == "192.168.68.0/22"
         assert config.scan_timeout == 5
+        assert config.scan_probe_timeout == 1
         assert config.scan_concurrency == 50
 
     def test_from_env_defaults(self):
@@ -54,6 +55,7 @@ class TestConfig:
             "SNIPEIT_DEFAULT_MODEL_ID": "25",
             "DEFAULT_NETWORK": "10.0.0.0/8",
             "SCAN_TIMEOUT": "10",
+            "SCAN_PROBE_TIMEOUT": "0.5",
             "SCAN_CONCURRENCY": "100",
             "OUI_DATABASE_PATH": "/opt/oui.txt",
         }
@@ -75,6 +77,7 @@ class TestConfig:
             # Network config
             assert config.default_network == "10.0.0.0/8"
             assert config.scan_timeout == 10
+            assert config.scan_probe_timeout == 0.5
             assert config.scan_concurrency == 100
             assert config.oui_database_path == "/opt/oui.txt"
 
@@ -0,0 +1,144 @@
+"""Tests for incremental rescans."""
+
+from unittest.mock import patch
+
+import pytest
+
+from network_tools.history import HistoryStore, incremental_scan
+from network_tools.history import incremental
+from network_tools.scanner.models import ARPEntry
+from network_tools.scanner.targets import TargetSet
+
+
+class FakeNetwork:
+    """Stand-in for scan_network over a set of live hosts."""
+
+    def __init__(self, hosts: dict[str, str]):
+        self.hosts = hosts
+        self.probed: list[list[str]] = []
+
+    def scan_network(
+        self,
+        network,
+        use_ping=True,
+        timeout=None,
+        progress=None,
+        backend=None,
+        timing=None,
+    ):
+        targets = TargetSet.parse(network)
+        if use_ping:
+            self.probed.append(list(targets))
+        return [
+            ARPEntry(ip_address=ip, mac_address=mac)
+            for ip, mac in self.hosts.items()
+            if ip in targets
+        ]
+
+
+@pytest.fixture
+def store():
+    """In-memory history store."""
+    with HistoryStore(":memory:") as history:
+        yield history
+
+
+def _scan(net: FakeNetwork, store, **kwargs):
+    """Run an incremental scan of 10.0.0.0/24 against the fake network."""
+    with patch.object(incremental, "scan_network", side_effect=net.scan_network):
+        return incremental_scan("10.0.0.0/24", store=store, **kwargs)
+
+
+class TestIncrementalScan:
+    """Tests for incremental_scan."""
+
+    def test_first_run_is_full_sweep(self, store):
+        """Without history the whole target should be swept."""
+        net = FakeNetwork({"10.0.0.1": "AA:BB:CC:00:00:01"})
+
+        delta = _scan(net, store)
+
+        assert delta.full
+        assert delta.probed == 254
+        assert [e.ip_address for e in delta.new] == ["10.0.0.1"]
+
+    def test_rescan_probes_known_hosts_only(self, store):
+        """Later runs should probe only hosts seen since the last full sweep."""
+        net = FakeNetwork(
+            {
+                "10.0.0.1": "AA:BB:CC:00:00:01",
+                "10.0.0.2": "AA:BB:CC:00:00:02",
+                "10.0.0.3": "AA:BB:CC:00:00:03",
+            }
+        )
+        _scan(net, store)
+
+        # .2 leaves, .3 moves to .30, and a new device appears at .40
+        net.hosts = {
+            "10.0.0.1": "AA:BB:CC:00:00:01",
+            "10.0.0.30": "AA:BB:CC:00:00:03",
+            "10.0.0.40": "AA:BB:CC:00:00:40",
+        }
+        delta = _scan(net, store)
+
+        assert not delta.full
+        assert delta.probed == 3
+        assert net.probed[-1] == ["10.0.0.1", "10.0.0.2", "10.0.0.3"]
+        assert [s.ip_address for s in delta.gone] == ["10.0.0.2", "10.0.0.3"]
+        assert [(e.ip_address, ip) for e, ip in delta.changed] == [
+            ("10.0.0.30", "10.0.0.3")
+        ]
+        assert [e.ip_address for e in delta.new] == ["10.0.0.40"]
+
+    def test_trusted_hosts_not_probed(self, store):
+        """Hosts seen within the trust TTL should be reported without a probe."""
+        net = FakeNetwork({"10.0.0.1": "AA:BB:CC:00:00:01"})
+        _scan(net, store)
+
+        net.hosts = {}
+        delta = _scan(net, store, trust_ttl=3600)
+
+        assert delta.probed == 0
+        assert len(net.probed) == 1
+        assert [e.ip_address for e in delta.devices] == ["10.0.0.1"]
+        assert delta.gone == []
+
+    def test_full_sweep_after_interval(self, store):
+        """Dead address space should be swept again once the interval passes."""
+        net = FakeNetwork({"10.0.0.1": "AA:BB:CC:00:00:01"})
+        _scan(net, store)
+
+        delta = _scan(net, store, full_interval=0)
+
+        assert delta.full
+        assert delta.probed == 254
+        assert delta.new == []
+
+    def test_gone_hosts_skipped_until_full_sweep(self, store):
+        """Hosts found gone should not be probed again by later rescans."""
+        net = FakeNetwork(
+            {"10.0.0.1": "AA:BB:CC:00:00:01", "10.0.0.2": "AA:BB:CC:00:00:02"}
+        )
+        _scan(net, store)
+
+        net.hosts = {"10.0.0.1": "AA:BB:CC:00:00:01"}
+        first = _scan(net, store)
+        second = _scan(net, store)
+
+        assert [s.ip_address for s in first.gone] == ["10.0.0.2"]
+        assert second.gone == []
+        assert net.probed[-1] == ["10.0.0.1"]
+
+        # Back in the neighbor table, it is confirmed again on the next run
+        net.hosts["10.0.0.2"] = "AA:BB:CC:00:00:02"
+        _scan(net, store)
+        assert _scan(net, store).probed == 2
+
+    def test_prunes_history(self, store):
+        """Each run should prune old history like a regular discover."""
+        net = FakeNetwork({"10.0.0.1": "AA:BB:CC:00:00:01"})
+
+        with patch.object(store, "prune", wraps=store.prune) as prune:
+            _scan(net, store)
+
+        prune.assert_called_once_with()
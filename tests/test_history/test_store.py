@@ -0,0 +1,158 @@
+"""Tests for the scan history store."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from network_tools.addresses import MacAddress
+from network_tools.history import HistoryError, HistoryStore
+from network_tools.scanner.models import ARPEntry
+from network_tools.snipeit.models import DiscoveredDevice
+
+
+@pytest.fixture
+def store():
+    """In-memory history store."""
+    with HistoryStore(":memory:") as history:
+        yield history
+
+
+def _entry(i: int) -> ARPEntry:
+    """ARP entry for host number i."""
+    return ARPEntry(
+        ip_address=f"10.0.{i // 256}.{i % 256}",
+        mac_address=MacAddress(0x020000000000 + i),
+        interface="eth0",
+        response_time_ms=0.5,
+    )
+
+
+class TestHistoryStore:
+    """Tests for HistoryStore."""
+
+    def test_record_and_query(self, store):
+        """Recorded devices should be queryable by MAC and IP."""
+        device = DiscoveredDevice(
+            ip_address="10.0.0.5",
+            mac_address="AA:BB:CC:DD:EE:05",
+            manufacturer="Example",
+        )
+        scan_id = store.record_scan("10.0.0.0/24", [device, _entry(1)])
+
+        by_mac = store.sightings(mac_address="aa-bb-cc-dd-ee-05")
+        assert len(by_mac) == 1
+        assert by_mac[0].scan_id == scan_id
+        assert by_mac[0].ip_address == "10.0.0.5"
+        assert by_mac[0].manufacturer == "Example"
+
+        by_ip = store.sightings(ip_address="10.0.0.1")
+        assert by_ip[0].mac_address == _entry(1).mac_address
+        assert by_ip[0].interface == "eth0"
+
+    def test_devices_without_mac_skipped(self, store):
+        """Devices with no MAC cannot be tracked and should be skipped."""
+        store.record_scan("10.0.0.0/24", [DiscoveredDevice(ip_address="10.0.0.9")])
+
+        assert store.sightings() == []
+
+    def test_last_seen_bulk(self, store):
+        """last_seen should return the newest sighting for thousands of MACs."""
+        earlier = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        later = earlier + timedelta(hours=1)
+        store.record_scan("10.0.0.0/16", [_entry(i) for i in range(5000)], earlier)
+        store.record_scan("10.0.0.0/16", [_entry(i) for i in range(0, 5000, 2)], later)
+
+        result = store.last_seen(
+            [_entry(i).mac_address for i in range(5000)] + ["02:FF:FF:FF:FF:FF"]
+        )
+
+        assert len(result) == 5000
+        assert result[_entry(0).mac_address] == later
+        assert result[_entry(1).mac_address] == earlier
+
+    def test_prune(self, store):
+        """Scans older than the retention period should be deleted."""
+        old = datetime.now(timezone.utc) - timedelta(days=40)
+        store.record_scan("10.0.0.0/24", [_entry(1), _entry(2)], old)
+        store.record_scan("10.0.0.0/24", [_entry(3)])
+
+        assert store.prune(retention_days=30) == 2
+        assert [s.ip_address for s in store.sightings()] == ["10.0.0.3"]
+        assert store.prune(retention_days=0) == 0
+
+    def test_prune_shrinks_file(self, tmp_path):
+        """Pruning frees pages incrementally, without a full VACUUM."""
+        db_path = tmp_path / "history.db"
+        old = datetime.now(timezone.utc) - timedelta(days=40)
+        with HistoryStore(db_path) as history:
+            history.record_scan("10.0.0.0/16", [_entry(i) for i in range(5000)], old)
+            size = db_path.stat().st_size
+            statements: list[str] = []
+            history._conn.set_trace_callback(statements.append)
+
+            assert history.prune(retention_days=30) == 5000
+            assert db_path.stat().st_size < size / 2
+            assert not any(s.upper().startswith("VACUUM") for s in statements)
+
+    def test_unwritable_path(self, tmp_path):
+        """An unusable database path should raise HistoryError."""
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+
+        with pytest.raises(HistoryError):
+            HistoryStore(blocker / "history.db")
+
+    def test_last_full_scan(self, store):
+        """Only full scans of the same target should count as full sweeps."""
+        earlier = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        store.record_scan("10.0.0.0/24", [], earlier)
+        store.record_scan("10.0.0.0/24", [], earlier + timedelta(hours=1), full=False)
+        store.record_scan("10.0.1.0/24", [], earlier + timedelta(hours=2))
+
+        assert store.last_full_scan("10.0.0.0/24") == earlier
+        assert store.last_full_scan("10.0.2.0/24") is None
+
+    def test_departures(self, store):
+        """Departures should be reported per IP for the same target only."""
+        earlier = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        later = earlier + timedelta(hours=1)
+        store.record_scan("10.0.0.0/24", [], earlier, full=False, gone=["10.0.0.1"])
+        store.record_scan(
+            "10.0.0.0/24", [], later, full=False, gone=["10.0.0.1", "10.0.0.2"]
+        )
+        store.record_scan("10.0.1.0/24", [], later, full=False, gone=["10.0.1.1"])
+
+        assert store.departures("10.0.0.0/24", earlier) == {
+            "10.0.0.1": later,
+            "10.0.0.2": later,
+        }
+        assert store.departures("10.0.0.0/24", later + timedelta(seconds=1)) == {}
+
+    def test_rtt_samples(self, store):
+        """RTT samples should be recent, within the target and oldest first."""
+        now = datetime.now(timezone.utc)
+        slow = ARPEntry(
+            ip_address="10.0.0.9",
+            mac_address=MacAddress(0x020000000009),
+            response_time_ms=40.0,
+        )
+        store.record_scan("10.0.0.0/24", [_entry(1)], now - timedelta(days=30))
+        store.record_scan("10.0.0.0/24", [slow], now - timedelta(hours=2))
+        store.record_scan("10.0.0.0/24", [_entry(2)], now - timedelta(hours=1))
+        store.record_scan("10.0.1.0/24", [_entry(257)], now)
+
+        since = now - timedelta(days=7)
+        assert store.rtt_samples(since, "10.0.0.0/24") == [
+            ("10.0.0.9", 40.0),
+            ("10.0.0.2", 0.5),
+        ]
+        assert len(store.rtt_samples(since)) == 3
+
+    def test_timing_seeded_from_history(self, store):
+        """timing() should start from the RTTs earlier scans measured."""
+        store.record_scan("10.0.0.0/24", [_entry(1), _entry(2)])
+
+        timing = store.timing("10.0.0.0/24")
+
+        assert timing.timeout_for("10.0.0.99") < timing.initial
+        assert timing.timeout_for("172.16.0.1") == timing.initial
@@ -0,0 +1,141 @@
+"""Tests for batch longest-prefix matching."""
+
+import random
+
+import pytest
+
+from network_tools.oui.batch import match_each, match_sorted, parse_macs
+from network_tools.oui.index import OuiIndex, build_oui_index
+from network_tools.oui.registry import OuiTable
+
+ENTRIES = [
+    (24, 0x70B3D5, "IEEE Registration Authority"),
+    (36, 0x70B3D5C08, "Tiny Sensors GmbH"),
+    (28, 0xF40E11A, "Industrial Widgets Co"),
+    (24, 0xB827EB, "Raspberry Pi Foundation"),
+]
+
+MACS = [
+    0x70B3D5C08123,
+    0x70B3D5D00000,
+    None,
+    0xF40E11A12345,
+    0xF40E11B12345,
+    0xB827EB000001,
+    0x70B3D5C08FFF,
+]
+
+
+def _registry(path):
+    """Write ENTRIES as IEEE registry text."""
+    lines = []
+    for bits, prefix, name in ENTRIES:
+        oui = prefix >> (bits - 24)
+        lines.append(f"{oui >> 16:02X}-{(oui >> 8) & 255:02X}-{oui & 255:02X}")
+        lines[-1] += f"   (hex)\t\t{name}"
+        if bits > 24:
+            host_bits = 48 - bits
+            low = (prefix << host_bits) & 0xFFFFFF
+            high = low + (1 << host_bits) - 1
+            lines.append(f"{low:06X}-{high:06X}     (base 16)\t\t{name}")
+    path.write_text("\n".join(lines) + "\n")
+
+
+class TestMatchEach:
+    """Tests for the pure-Python batch path."""
+
+    def test_same_as_single_matches(self):
+        """Results equal OuiTable.match per address, None kept."""
+        table = OuiTable(ENTRIES)
+
+        assert match_each(table.match, MACS) == [
+            table.match(mac) if mac is not None else None for mac in MACS
+        ]
+
+    def test_one_match_per_prefix(self):
+        """Plain OUIs are matched once; carved OUIs once per 36-bit block."""
+        calls = []
+
+        def match(value):
+            calls.append(value)
+            return "Vendor"
+
+        macs = [0xB827EB000001, 0xB827EBFFFFFF, 0x70B3D5C08001, 0x70B3D5C08002]
+        carved = OuiTable(ENTRIES).carved_ouis
+
+        assert match_each(match, macs + [0x70B3D5C09001], carved) == ["Vendor"] * 5
+        assert calls == [0xB827EB000001, 0x70B3D5C08001, 0x70B3D5C09001]
+
+
+class TestMatchSorted:
+    """Tests for the NumPy batch path."""
+
+    def test_table_and_index_agree(self, tmp_path):
+        """Vectorized results equal single matches for both table kinds."""
+        numpy = pytest.importorskip("numpy")
+        table = OuiTable(ENTRIES)
+        _registry(tmp_path / "oui.txt")
+        build_oui_index([tmp_path / "oui.txt"], tmp_path / "oui.idx")
+        index = OuiIndex(tmp_path / "oui.idx")
+        rng = random.Random(1)
+        values = MACS + [rng.getrandbits(48) for _ in range(500)]
+        macs = numpy.array([-1 if v is None else v for v in values], dtype="int64")
+        expected = [table.match(v) if v is not None else None for v in values]
+
+        assert (
+            match_sorted(numpy, table.sorted_keys(numpy), table.name_at, macs)
+            == expected
+        )
+        assert (
+            match_sorted(numpy, index.sorted_keys(numpy), index.name_at, macs)
+            == expected
+        )
+        assert index.carved_ouis == table.carved_ouis == {0x70B3D5, 0xF40E11}
+        index.close()
+
+    def test_empty_table(self):
+        """Nothing matches an empty table."""
+        numpy = pytest.importorskip("numpy")
+        table = OuiTable()
+
+        macs = numpy.array([0x70B3D5C08123, -1], dtype="int64")
+
+        assert match_sorted(numpy, table.sorted_keys(numpy), table.name_at, macs) == [
+            None,
+            None,
+        ]
+
+
+class TestParseMacs:
+    """Tests for NumPy batch parsing."""
+
+    def test_canonical_matrix(self):
+        """Six-octet strings decode like MacAddress; junk gives -1."""
+        numpy = pytest.importorskip("numpy")
+        macs = [
+            "aa:bb:cc:dd:ee:ff",
+            "00-1B-C5-00-00-01",
+            "aa:bb-cc:dd:ee:ff",
+            "aa:bb:cc:dd:ee:fg",
+            "aa:bb:cc_dd:ee:ff",
+        ]
+
+        assert parse_macs(numpy, macs).tolist() == [
+            0xAABBCCDDEEFF,
+            0x001BC5000001,
+            0xAABBCCDDEEFF,
+            -1,
+            -1,
+        ]
+
+    def test_mixed_notations(self):
+        """Batches with other notations fall back to parse_mac_values."""
+        numpy = pytest.importorskip("numpy")
+        macs = ["aabb.ccdd.eeff", "aa:bb:cc:dd:ee:ff", None, "garbage"]
+
+        assert parse_macs(numpy, macs).tolist() == [
+            0xAABBCCDDEEFF,
+            0xAABBCCDDEEFF,
+            -1,
+            -1,
+        ]
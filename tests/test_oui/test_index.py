@@ -0,0 +1,182 @@
+"""Tests for the compiled OUI index."""
+
+import hashlib
+import os
+
+import pytest
+
+from network_tools.oui.exceptions import OuiError
+from network_tools.oui.index import (
+    OuiIndex,
+    SourceStamp,
+    build_oui_index,
+    write_oui_index,
+)
+
+REGISTRY = (
+    "OUI/MA-L   Organization\n"
+    "FC-FB-FB   (hex)\t\tExample Corp\n"
+    "FCFBFB     (base 16)\t\tExample Corp\n"
+    "00-00-0C   (hex)\t\tCisco Systems, Inc\n"
+    "00-00-0D   (hex)\t\tExample Corp\n"
+    "10-00-00   (hex)\t\tPrivate\n"
+    "10-00-00   (hex)\t\tRenamed Ltd\n"
+)
+
+
+@pytest.fixture
+def registry(tmp_path):
+    """A small IEEE-format registry file."""
+    path = tmp_path / "oui.txt"
+    path.write_text(REGISTRY)
+    return path
+
+
+MA_S_REGISTRY = (
+    "70-B3-D5   (hex)\t\tTiny Sensors GmbH\n"
+    "C08000-C08FFF     (base 16)\t\tTiny Sensors GmbH\n"
+)
+
+
+class TestOuiIndex:
+    """Tests for building and reading an index."""
+
+    def test_round_trip(self, registry, tmp_path):
+        """Every prefix resolves; unknown prefixes miss on both ends."""
+        target = tmp_path / "oui.idx"
+
+        assert build_oui_index([registry], target) == 4
+        index = OuiIndex(target)
+        try:
+            assert len(index) == 4
+            assert index.get(24, 0x00000C) == "Cisco Systems, Inc"
+            assert index.get(24, 0xFCFBFB) == "Example Corp"
+            assert index.get(24, 0x00000D) == "Example Corp"
+            assert index.get(24, 0x000000) is None
+            assert index.get(24, 0x00000E) is None
+            assert index.get(24, 0xFFFFFF) is None
+            assert index.get(36, 0x00000C) is None
+        finally:
+            index.close()
+
+    def test_longest_prefix_match(self, registry, tmp_path):
+        """An MA-S block wins over the OUI it was carved from."""
+        ieee = "70-B3-D5   (hex)\t\tIEEE Registration Authority\n"
+        registry.write_text(REGISTRY + ieee)
+        oui36 = tmp_path / "oui36.txt"
+        oui36.write_text(MA_S_REGISTRY)
+        build_oui_index([registry, oui36], tmp_path / "oui.idx")
+        index = OuiIndex(tmp_path / "oui.idx")
+
+        assert index.match(0x70B3D5C08123) == "Tiny Sensors GmbH"
+        assert index.match(0x70B3D5C09123) == "IEEE Registration Authority"
+        assert index.match(0xFCFBFB000001) == "Example Corp"
+        assert index.match(0x020000000001) is None
+        index.close()
+
+    def test_later_entry_wins(self, registry, tmp_path):
+        """A prefix listed twice keeps its last name."""
+        build_oui_index([registry], tmp_path / "oui.idx")
+        index = OuiIndex(tmp_path / "oui.idx")
+
+        assert index.get(24, 0x100000) == "Renamed Ltd"
+        index.close()
+
+    def test_names_deduplicated(self, registry, tmp_path):
+        """Repeated manufacturers are stored once in the string table."""
+        target = tmp_path / "oui.idx"
+        build_oui_index([registry], target)
+
+        assert target.read_bytes().count(b"Example Corp") == 1
+
+    def test_check_sources(self, registry, tmp_path):
+        """Added or changed sources make the index stale."""
+        target = tmp_path / "oui.idx"
+        oui36 = tmp_path / "oui36.txt"
+        build_oui_index([registry], target)
+        index = OuiIndex(target)
+
+        assert index.check_sources([registry]) is True
+        oui36.write_text(MA_S_REGISTRY)
+        assert index.check_sources([registry, oui36]) is False
+        registry.write_text(REGISTRY + "AA-BB-CC   (hex)\t\tNewcomer\n")
+        assert index.check_sources([registry]) is False
+        assert index.check_sources([]) is True
+        index.close()
+
+    def test_touched_source_needs_restamp(self, registry, tmp_path):
+        """A new mtime with the same content is told apart by its hash."""
+        target = tmp_path / "oui.idx"
+        build_oui_index([registry], target)
+        index = OuiIndex(target)
+        stat = registry.stat()
+        os.utime(registry, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        assert index.check_sources([registry]) is None
+        registry.write_text(REGISTRY.replace("Example", "Exemple"))
+        os.utime(registry, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert index.check_sources([registry]) is False
+        index.close()
+
+    def test_manifest(self, registry, tmp_path):
+        """The index records each source's resolved path and content hash."""
+        target = tmp_path / "oui.idx"
+        build_oui_index([registry], target)
+        index = OuiIndex(target)
+
+        assert index.sources == [SourceStamp.of(registry)]
+        assert (
+            index.sources[0].sha256 == hashlib.sha256(registry.read_bytes()).hexdigest()
+        )
+        index.close()
+
+    def test_entries_round_trip(self, registry, tmp_path):
+        """Entries read back from an index rebuild the same index."""
+        build_oui_index([registry], tmp_path / "a.idx")
+        first = OuiIndex(tmp_path / "a.idx")
+        write_oui_index(first.entries(), tmp_path / "b.idx")
+        second = OuiIndex(tmp_path / "b.idx")
+
+        assert list(second.entries()) == list(first.entries())
+        assert second.sources == []
+        first.close()
+        second.close()
+
+    def test_mixed_formats(self, tmp_path):
+        """CSV and manuf sources compile alongside IEEE text."""
+        manuf = tmp_path / "manuf"
+        manuf.write_text("FC:FB:FB\tExample\tExample Corp\n")
+        csv = tmp_path / "oui36.csv"
+        csv.write_text(
+            "Registry,Assignment,Organization Name,Organization Address\n"
+            'MA-S,70B3D5C08,Tiny Sensors GmbH,"1 Road, Town"\n'
+        )
+
+        assert build_oui_index([manuf, csv], tmp_path / "oui.idx") == 2
+        index = OuiIndex(tmp_path / "oui.idx")
+        assert index.match(0x70B3D5C08123) == "Tiny Sensors GmbH"
+        assert index.match(0xFCFBFB000001) == "Example Corp"
+        index.close()
+
+    def test_missing_registry(self, tmp_path):
+        """A registry that cannot be read raises OuiError."""
+        with pytest.raises(OuiError, match="Cannot read"):
+            build_oui_index([tmp_path / "missing.txt"], tmp_path / "oui.idx")
+
+    @pytest.mark.parametrize("content", [b"", b"OUIX", b"NOPE" + bytes(32)])
+    def test_invalid_index(self, tmp_path, content):
+        """Empty, truncated or foreign files are rejected."""
+        target = tmp_path / "oui.idx"
+        target.write_bytes(content)
+
+        with pytest.raises(OuiError):
+            OuiIndex(target)
+
+    def test_truncated_tables(self, registry, tmp_path):
+        """An index cut short after its header is rejected."""
+        target = tmp_path / "oui.idx"
+        build_oui_index([registry], target)
+        os.truncate(target, 40)
+
+        with pytest.raises(OuiError, match="Truncated"):
+            OuiIndex(target)
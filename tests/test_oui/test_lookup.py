@@ -0,0 +1,313 @@
+"""Tests for OUI manufacturer lookup."""
+
+import os
+import threading
+import time
+
+import pytest
+
+from network_tools.addresses import MacAddress
+from network_tools.config import Config, set_config
+from network_tools.oui import lookup
+from network_tools.oui.index import build_oui_index
+from network_tools.oui.lookup import (
+    lookup_manufacturer,
+    lookup_manufacturers,
+    preload_oui_database,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_oui_db(tmp_path):
+    """Point the OUI database at a temp file and clear the cache."""
+    oui_file = tmp_path / "oui.txt"
+    oui_file.write_text("FC-FB-FB   (hex)\t\tExample Corp\n")
+    set_config(
+        Config(
+            oui_database_path=str(oui_file),
+            oui_mam_path=str(tmp_path / "mam.txt"),
+            oui_oui36_path=str(tmp_path / "oui36.txt"),
+            oui_manuf_path=str(tmp_path / "manuf"),
+            oui_index_path=str(tmp_path / "oui.idx"),
+        )
+    )
+    lookup._oui_db = None
+    yield
+    lookup._oui_db = None
+    if lookup._oui_index is not None:
+        lookup._oui_index.close()
+        lookup._oui_index = None
+    set_config(None)
+
+
+class TestLookupManufacturer:
+    """Tests for lookup_manufacturer."""
+
+    def test_builtin_prefix(self):
+        """Built-in OUIs should match any MAC notation."""
+        assert lookup_manufacturer("b8-27-eb-00-11-22") == "Raspberry Pi Foundation"
+        assert lookup_manufacturer(MacAddress("B8:27:EB:00:11:22")) == (
+            "Raspberry Pi Foundation"
+        )
+
+    def test_database_file(self, tmp_path):
+        """Entries from the IEEE file are parsed and cached as an index."""
+        assert lookup_manufacturer("FC:FB:FB:01:02:03") == "Example Corp"
+        assert lookup._oui_index.get(24, 0xFCFBFB) == "Example Corp"
+        assert (tmp_path / "oui.idx").exists()
+
+    def test_without_cache(self, tmp_path):
+        """An empty OUI_INDEX_PATH keeps the parsed entries in memory."""
+        set_config(
+            Config(oui_database_path=str(tmp_path / "oui.txt"), oui_index_path="")
+        )
+
+        assert lookup_manufacturer("FC:FB:FB:01:02:03") == "Example Corp"
+        assert lookup._oui_index is None
+        assert lookup._oui_db.get(24, 0xFCFBFB) == "Example Corp"
+
+    def test_unknown_or_invalid(self):
+        """Unknown prefixes and malformed MACs should return None."""
+        assert lookup_manufacturer("02:00:00:00:00:01") is None
+        assert lookup_manufacturer("garbage") is None
+
+    def test_vendor_prefix(self):
+        """A bare OUI, or any text starting with six hex digits, still works."""
+        assert lookup_manufacturer("B8:27:EB") == "Raspberry Pi Foundation"
+        assert lookup_manufacturer("b827eb") == "Raspberry Pi Foundation"
+        assert lookup_manufacturer("B8-27-EB-00") == "Raspberry Pi Foundation"
+        assert lookup_manufacturer("FC:FB:FB") == "Example Corp"
+        assert lookup_manufacturer("B8:27") is None
+
+
+class TestLongestPrefix:
+    """Tests for MA-M and MA-S assignments."""
+
+    def test_block_overrides_oui(self, tmp_path):
+        """A MAC in an MA-M block gets the block owner, not the IEEE."""
+        (tmp_path / "oui.txt").write_text(
+            "F4-0E-11   (hex)\t\tIEEE Registration Authority\n"
+        )
+        (tmp_path / "mam.txt").write_text(
+            "F4-0E-11   (hex)\t\tIndustrial Widgets Co\n"
+            "A00000-AFFFFF     (base 16)\t\tIndustrial Widgets Co\n"
+        )
+
+        assert lookup_manufacturer("F4:0E:11:A1:23:45") == "Industrial Widgets Co"
+        assert lookup_manufacturer("F4:0E:11:B1:23:45") == (
+            "IEEE Registration Authority"
+        )
+
+    def test_compiled_block_overrides_oui(self, tmp_path):
+        """The compiled index matches the longest prefix too."""
+        (tmp_path / "oui36.txt").write_text(
+            "70-B3-D5   (hex)\t\tTiny Sensors GmbH\n"
+            "C08000-C08FFF     (base 16)\t\tTiny Sensors GmbH\n"
+        )
+        build_oui_index(
+            [tmp_path / "oui.txt", tmp_path / "oui36.txt"], tmp_path / "oui.idx"
+        )
+
+        assert lookup_manufacturer("70:B3:D5:C0:81:23") == "Tiny Sensors GmbH"
+        assert lookup._oui_index is not None
+
+
+class TestCompiledIndex:
+    """Tests for lookups through the compiled index."""
+
+    def test_uses_current_index(self, tmp_path):
+        """A current index is used instead of parsing the registry."""
+        build_oui_index([tmp_path / "oui.txt"], tmp_path / "oui.idx")
+
+        assert lookup_manufacturer("FC:FB:FB:01:02:03") == "Example Corp"
+        assert lookup._oui_index is not None
+        assert lookup._oui_db.get(24, 0xFCFBFB) is None
+
+    def test_builtins_still_match(self, tmp_path):
+        """Prefixes missing from the index fall back to the built-in list."""
+        build_oui_index([tmp_path / "oui.txt"], tmp_path / "oui.idx")
+
+        assert lookup_manufacturer("B8:27:EB:00:11:22") == "Raspberry Pi Foundation"
+
+    def test_registry_overrides_builtin(self, tmp_path):
+        """Index entries take precedence over built-in names."""
+        (tmp_path / "oui.txt").write_text("B8-27-EB   (hex)\t\tRaspberry Pi\n")
+        build_oui_index([tmp_path / "oui.txt"], tmp_path / "oui.idx")
+
+        assert lookup_manufacturer("B8:27:EB:00:11:22") == "Raspberry Pi"
+
+    def test_stale_index_rebuilt(self, tmp_path):
+        """An index older than the registry is rebuilt from it."""
+        build_oui_index([tmp_path / "oui.txt"], tmp_path / "oui.idx")
+        (tmp_path / "oui.txt").write_text("AA-BB-CC   (hex)\t\tNewcomer Inc\n")
+
+        assert lookup_manufacturer("AA:BB:CC:00:00:01") == "Newcomer Inc"
+        assert lookup_manufacturer("FC:FB:FB:01:02:03") is None
+        assert lookup._oui_index.check_sources([tmp_path / "oui.txt"]) is True
+
+
+class TestDatabaseCache:
+    """Tests for parsing once and loading the compiled cache afterwards."""
+
+    def _count_parses(self, monkeypatch) -> list:
+        calls = []
+        parse = lookup.iter_registry
+
+        def counting(path):
+            calls.append(path)
+            return parse(path)
+
+        monkeypatch.setattr(lookup, "iter_registry", counting)
+        return calls
+
+    def test_later_loads_use_cache(self, monkeypatch):
+        """Only the first load parses; later loads map the cache."""
+        calls = self._count_parses(monkeypatch)
+
+        assert lookup_manufacturer("FC:FB:FB:01:02:03") == "Example Corp"
+        lookup._oui_db = None
+        assert lookup_manufacturer("FC:FB:FB:01:02:03") == "Example Corp"
+
+        assert len(calls) == 1
+
+    def test_touched_database_not_reparsed(self, monkeypatch, tmp_path):
+        """A re-downloaded but identical database keeps the cache."""
+        calls = self._count_parses(monkeypatch)
+        oui_file = tmp_path / "oui.txt"
+        lookup_manufacturer("FC:FB:FB:01:02:03")
+        stat = oui_file.stat()
+        os.utime(oui_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        lookup._oui_db = None
+        assert lookup_manufacturer("FC:FB:FB:01:02:03") == "Example Corp"
+        assert len(calls) == 1
+        # Restamped, so the next load needs no hashing either
+        assert lookup._oui_index.sources[0].mtime_ns == oui_file.stat().st_mtime_ns
+        lookup._oui_db = None
+        lookup_manufacturer("FC:FB:FB:01:02:03")
+        assert lookup._oui_index.check_sources([oui_file]) is True
+
+    def test_formats_merged(self, tmp_path):
+        """manuf and CSV databases merge, the IEEE registries winning."""
+        (tmp_path / "manuf").write_text(
+            "# Wireshark manuf\n"
+            "FC:FB:FB\tOldName\tOld Name Inc\n"
+            "00:1B:C5:00:00:00/36\tCaptured\tCaptured Ltd\n"
+        )
+        (tmp_path / "oui36.txt").write_text(
+            "Registry,Assignment,Organization Name,Organization Address\n"
+            "MA-S,70B3D5C08,Tiny Sensors GmbH,Somewhere\n"
+        )
+        set_config(
+            Config(
+                oui_database_path=str(tmp_path / "oui.txt"),
+                oui_oui36_path=str(tmp_path / "oui36.txt"),
+                oui_mam_path=str(tmp_path / "mam.txt"),
+                oui_manuf_path=str(tmp_path / "manuf"),
+                oui_index_path=str(tmp_path / "oui.idx"),
+            )
+        )
+
+        assert lookup_manufacturers(
+            ["FC:FB:FB:01:02:03", "00:1B:C5:00:00:01", "70:B3:D5:C0:81:23"]
+        ) == ["Example Corp", "Captured Ltd", "Tiny Sensors GmbH"]
+
+
+class TestLookupManufacturers:
+    """Tests for batch lookups."""
+
+    MACS = [
+        "FC:FB:FB:01:02:03",
+        "b8-27-eb-00-11-22",
+        MacAddress("B8:27:EB:00:11:23"),
+        "02:00:00:00:00:01",
+        "garbage",
+        "F4:0E:11:A1:23:45",
+        "b8:27:eb",
+    ]
+
+    def _registries(self, tmp_path):
+        (tmp_path / "mam.txt").write_text(
+            "F4-0E-11   (hex)\t\tIndustrial Widgets Co\n"
+            "A00000-AFFFFF     (base 16)\t\tIndustrial Widgets Co\n"
+        )
+
+    def test_matches_single_lookups(self, tmp_path):
+        """Batch answers equal one-by-one answers, in input order."""
+        self._registries(tmp_path)
+
+        assert lookup_manufacturers(self.MACS) == [
+            "Example Corp",
+            "Raspberry Pi Foundation",
+            "Raspberry Pi Foundation",
+            None,
+            None,
+            "Industrial Widgets Co",
+            "Raspberry Pi Foundation",
+        ]
+        assert lookup_manufacturers(self.MACS) == [
+            lookup_manufacturer(mac) for mac in self.MACS
+        ]
+
+    def test_with_compiled_index(self, tmp_path):
+        """Index misses fall back to the built-in list."""
+        self._registries(tmp_path)
+        build_oui_index(
+            [tmp_path / "oui.txt", tmp_path / "mam.txt"], tmp_path / "oui.idx"
+        )
+
+        results = lookup_manufacturers(self.MACS)
+
+        assert lookup._oui_index is not None
+        assert results == [lookup_manufacturer(mac) for mac in self.MACS]
+        assert results[1] == "Raspberry Pi Foundation"
+
+    def test_empty(self):
+        """An empty batch gives an empty list."""
+        assert lookup_manufacturers([]) == []
+
+
+class TestBackgroundLoading:
+    """Tests for thread-safe and background database loading."""
+
+    def _slow_registry(self, monkeypatch, calls):
+        """Make registry parsing slow and count how often it runs."""
+        parse = lookup.iter_registry
+
+        def slow(path):
+            calls.append(path)
+            time.sleep(0.05)
+            return parse(path)
+
+        monkeypatch.setattr(lookup, "iter_registry", slow)
+
+    def test_concurrent_lookups_load_once(self, monkeypatch):
+        """Lookups racing the first load wait for one shared load."""
+        calls = []
+        self._slow_registry(monkeypatch, calls)
+        results = []
+
+        def worker():
+            results.append(lookup_manufacturer("FC:FB:FB:01:02:03"))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == ["Example Corp"] * 8
+        assert len(calls) == 1
+
+    def test_preload(self, monkeypatch):
+        """Preloading parses in the background; later lookups reuse it."""
+        calls = []
+        self._slow_registry(monkeypatch, calls)
+
+        thread = preload_oui_database()
+        assert thread.daemon
+        assert lookup_manufacturer("FC:FB:FB:01:02:03") == "Example Corp"
+        thread.join()
+
+        assert len(calls) == 1
+        assert lookup._oui_db is not None
@@ -0,0 +1,162 @@
+"""Tests for registry parsing and longest-prefix matching."""
+
+import pytest
+
+from network_tools.oui.exceptions import OuiError
+from network_tools.oui.registry import (
+    OuiTable,
+    detect_format,
+    iter_ieee_csv,
+    iter_manuf,
+    iter_registry,
+)
+
+
+class TestIterRegistry:
+    """Tests for iter_registry."""
+
+    def test_ma_l(self, tmp_path):
+        """oui.txt entries are 24-bit prefixes, in file order."""
+        path = tmp_path / "oui.txt"
+        path.write_text(
+            "OUI/MA-L\t\t\tOrganization\n"
+            "FC-FB-FB   (hex)\t\tExample Corp\n"
+            "FCFBFB     (base 16)\t\tExample Corp\n"
+            "\t\t\t\t1 Example Way\n"
+            "\n"
+            "00-00-0C   (hex)\t\tCisco Systems, Inc\n"
+            "10-00-00   (hex)\t\tPrivate\n"
+        )
+
+        assert list(iter_registry(path)) == [
+            (24, 0xFCFBFB, "Example Corp"),
+            (24, 0x00000C, "Cisco Systems, Inc"),
+            (24, 0x100000, "Private"),
+        ]
+
+    def test_ma_m_and_ma_s(self, tmp_path):
+        """Block ranges give 28- and 36-bit prefixes within the OUI."""
+        path = tmp_path / "blocks.txt"
+        path.write_text(
+            "F4-0E-11   (hex)\t\tIndustrial Widgets Co\n"
+            "A00000-AFFFFF     (base 16)\t\tIndustrial Widgets Co\n"
+            "\n"
+            "70-B3-D5   (hex)\t\tTiny Sensors GmbH\n"
+            "C08000-C08FFF     (base 16)\t\tTiny Sensors GmbH\n"
+        )
+
+        assert list(iter_registry(path)) == [
+            (28, 0xF40E11A, "Industrial Widgets Co"),
+            (36, 0x70B3D5C08, "Tiny Sensors GmbH"),
+        ]
+
+    def test_malformed_range_skipped(self, tmp_path):
+        """A range that is not an aligned block is ignored."""
+        path = tmp_path / "oui36.txt"
+        path.write_text(
+            "70-B3-D5   (hex)\t\tOdd Ltd\n" "C08001-C08FFF     (base 16)\t\tOdd Ltd\n"
+        )
+
+        assert list(iter_registry(path)) == []
+
+    def test_unknown_format(self, tmp_path):
+        """An unknown format name should raise OuiError."""
+        path = tmp_path / "oui.txt"
+        path.write_text("")
+
+        with pytest.raises(OuiError, match="Unknown registry format"):
+            iter_registry(path, fmt="xml")
+
+    def test_detect_format(self, tmp_path):
+        """Each format is recognised from the start of the file."""
+        files = {
+            "ieee": "OUI/MA-L\nFC-FB-FB   (hex)\t\tExample Corp\n",
+            "csv": "\ufeffRegistry,Assignment,Organization Name\n",
+            "manuf": "# Wireshark manuf\n00:00:0C\tCisco\tCisco Systems, Inc\n",
+        }
+        for fmt, content in files.items():
+            path = tmp_path / fmt
+            path.write_text(content, encoding="utf-8")
+
+            assert detect_format(path) == fmt
+
+
+class TestIterIeeeCsv:
+    """Tests for iter_ieee_csv."""
+
+    def test_block_sizes(self, tmp_path):
+        """The assignment's length gives the prefix length; CIDs are skipped."""
+        path = tmp_path / "oui.csv"
+        path.write_text(
+            "Registry,Assignment,Organization Name,Organization Address\n"
+            'MA-L,FCFBFB,Example Corp,"1 Example Way, Town"\n'
+            "MA-M,F40E11A,Industrial Widgets Co,Somewhere\n"
+            "MA-S,70B3D5C08,Tiny Sensors GmbH,Somewhere\n"
+            "CID,0A1B2C,Not A Block,Somewhere\n"
+            "MA-L,XYZXYZ,Broken Row,Somewhere\n"
+        )
+
+        assert list(iter_ieee_csv(path)) == [
+            (24, 0xFCFBFB, "Example Corp"),
+            (28, 0xF40E11A, "Industrial Widgets Co"),
+            (36, 0x70B3D5C08, "Tiny Sensors GmbH"),
+        ]
+
+
+class TestIterManuf:
+    """Tests for iter_manuf."""
+
+    def test_entries(self, tmp_path):
+        """Long names are preferred and block masks give the prefix length."""
+        path = tmp_path / "manuf"
+        path.write_text(
+            "# Wireshark manuf\n"
+            "\n"
+            "00:00:0C\tCisco\tCisco Systems, Inc\n"
+            "00:00:0D\tFibronic\n"
+            "F4:0E:11:A0:00:00/28\tIndustri\tIndustrial Widgets Co\n"
+            "00:1B:C5:00:00:00/36\tCaptured\tCaptured Ltd\n"
+            "00:50:C2:00:00:00/40\tTooSmall\tToo Small Block\n"
+        )
+
+        assert list(iter_manuf(path)) == [
+            (24, 0x00000C, "Cisco Systems, Inc"),
+            (24, 0x00000D, "Fibronic"),
+            (28, 0xF40E11A, "Industrial Widgets Co"),
+            (36, 0x001BC5000, "Captured Ltd"),
+        ]
+
+    def test_older_layout(self, tmp_path):
+        """Space-separated columns with the long name as a comment."""
+        path = tmp_path / "manuf"
+        path.write_text("00-00-0C    Cisco    # Cisco Systems, Inc\n")
+
+        assert list(iter_manuf(path)) == [(24, 0x00000C, "Cisco Systems, Inc")]
+
+
+class TestOuiTable:
+    """Tests for OuiTable."""
+
+    def test_longest_prefix_wins(self):
+        """36-bit beats 28-bit beats 24-bit."""
+        table = OuiTable(
+            [
+                (24, 0x70B3D5, "IEEE Registration Authority"),
+                (28, 0x70B3D5C, "Medium Block Ltd"),
+                (36, 0x70B3D5C08, "Tiny Sensors GmbH"),
+            ]
+        )
+
+        assert len(table) == 3
+        assert table.match(0x70B3D5C08123) == "Tiny Sensors GmbH"
+        assert table.match(0x70B3D5C18123) == "Medium Block Ltd"
+        assert table.match(0x70B3D5D00000) == "IEEE Registration Authority"
+        assert table.match(0x020000000001) is None
+
+    def test_update_overrides(self):
+        """Later entries replace earlier names of the same prefix."""
+        table = OuiTable([(24, 0xB827EB, "Raspberry Pi Foundation")])
+        table.update([(24, 0xB827EB, "Raspberry Pi")])
+
+        assert table.get(24, 0xB827EB) == "Raspberry Pi"
+        assert table.get(28, 0xB827EB0) is None
@@ -0,0 +1,160 @@
+"""Tests for the pcap/pcapng capture reader."""
+
+import os
+import socket
+import struct
+
+import pytest
+
+from network_tools.passive import (
+    CaptureFormatError,
+    iter_observations,
+    load_capture,
+    read_capture,
+)
+
+
+def _arp_frame(mac_hex: str, ip: str) -> bytes:
+    """Build a broadcast ARP request from `mac_hex`/`ip`."""
+    mac = bytes.fromhex(mac_hex)
+    return (
+        b"\xff" * 6
+        + mac
+        + b"\x08\x06"
+        + struct.pack("!HHBBH", 1, 0x0800, 6, 4, 1)
+        + mac
+        + socket.inet_aton(ip)
+        + b"\x00" * 6
+        + socket.inet_aton("10.0.0.254")
+    )
+
+
+def _pcap(frames, endian="<", nanosecond=False, linktype=1) -> bytes:
+    """Build a classic pcap file from (timestamp, frame) pairs."""
+    magic = 0xA1B23C4D if nanosecond else 0xA1B2C3D4
+    scale = 1_000_000_000 if nanosecond else 1_000_000
+    data = struct.pack(endian + "IHHiIII", magic, 2, 4, 0, 0, 65535, linktype)
+    for timestamp, frame in frames:
+        seconds = int(timestamp)
+        fraction = round((timestamp - seconds) * scale)
+        data += struct.pack(endian + "IIII", seconds, fraction, len(frame), len(frame))
+        data += frame
+    return data
+
+
+def _block(block_type: int, body: bytes) -> bytes:
+    """Build a little-endian pcapng block, padding the body to 32 bits."""
+    body += b"\x00" * (-len(body) % 4)
+    length = len(body) + 12
+    return struct.pack("<II", block_type, length) + body + struct.pack("<I", length)
+
+
+def _pcapng(frames, tsresol=None) -> bytes:
+    """Build a pcapng file with one Ethernet interface."""
+    section = struct.pack("<IHHq", 0x1A2B3C4D, 1, 0, -1)
+    options = b""
+    if tsresol is not None:
+        options = struct.pack("<HHB3x", 9, 1, tsresol) + struct.pack("<HH", 0, 0)
+    interface = struct.pack("<HHI", 1, 0, 0) + options
+    data = _block(0x0A0D0D0A, section) + _block(1, interface)
+
+    unit = 10.0 ** -(tsresol if tsresol is not None else 6)
+    for timestamp, frame in frames:
+        ticks = round(timestamp / unit)
+        header = struct.pack(
+            "<IIIII", 0, ticks >> 32, ticks & 0xFFFFFFFF, len(frame), len(frame)
+        )
+        data += _block(6, header + frame)
+    return data
+
+
+FRAMES = [
+    (1_700_000_000.25, _arp_frame("aabbcc000001", "10.0.0.5")),
+    (1_700_000_001.5, _arp_frame("aabbcc000002", "10.0.0.6")),
+]
+
+
+class TestReadCapture:
+    """Tests for read_capture."""
+
+    @pytest.mark.parametrize("endian", ["<", ">"])
+    @pytest.mark.parametrize("nanosecond", [False, True])
+    def test_pcap(self, tmp_path, endian, nanosecond):
+        """Classic pcap in either byte order and resolution is read."""
+        path = tmp_path / "capture.pcap"
+        path.write_bytes(_pcap(FRAMES, endian=endian, nanosecond=nanosecond))
+
+        frames = list(read_capture(path))
+
+        assert [f.data for f in frames] == [frame for _, frame in FRAMES]
+        assert frames[0].timestamp == pytest.approx(1_700_000_000.25)
+        assert all(f.linktype == 1 for f in frames)
+
+    @pytest.mark.parametrize("tsresol", [None, 9])
+    def test_pcapng(self, tmp_path, tsresol):
+        """pcapng enhanced packets honor the interface timestamp resolution."""
+        path = tmp_path / "capture.pcapng"
+        path.write_bytes(_pcapng(FRAMES, tsresol=tsresol))
+
+        frames = list(read_capture(path))
+
+        assert [f.data for f in frames] == [frame for _, frame in FRAMES]
+        assert frames[1].timestamp == pytest.approx(1_700_000_001.5)
+
+    def test_pcapng_simple_packets(self, tmp_path):
+        """Simple packets are dated by the packet before them, or the file."""
+        path = tmp_path / "capture.pcapng"
+        frame = FRAMES[0][1]
+        simple = _block(3, struct.pack("<I", len(frame)) + frame)
+        data = _pcapng([])
+        path.write_bytes(data + simple + _pcapng(FRAMES)[len(data) :] + simple)
+        os.utime(path, (1_700_000_100, 1_700_000_100))
+
+        frames = list(read_capture(path))
+
+        assert [f.timestamp for f in frames] == pytest.approx(
+            [1_700_000_100, 1_700_000_000.25, 1_700_000_001.5, 1_700_000_001.5]
+        )
+        assert frames[0].data == frame
+
+    def test_not_a_capture(self, tmp_path):
+        """Other files are rejected."""
+        path = tmp_path / "notes.txt"
+        path.write_text("hello world")
+
+        with pytest.raises(CaptureFormatError):
+            list(read_capture(path))
+
+    def test_truncated(self, tmp_path):
+        """A record cut short raises after the complete records."""
+        path = tmp_path / "capture.pcap"
+        path.write_bytes(_pcap(FRAMES)[:-10])
+
+        frames = read_capture(path)
+        next(frames)
+        with pytest.raises(CaptureFormatError):
+            next(frames)
+
+
+class TestObservations:
+    """Tests for iter_observations and load_capture."""
+
+    def test_unsupported_linktype_skipped(self, tmp_path):
+        """Frames of other link types yield nothing."""
+        path = tmp_path / "capture.pcap"
+        path.write_bytes(_pcap(FRAMES, linktype=105))
+
+        assert list(iter_observations(path)) == []
+
+    def test_load_capture(self, tmp_path):
+        """A capture becomes a table of devices."""
+        path = tmp_path / "capture.pcap"
+        path.write_bytes(_pcap(FRAMES + [(1_700_000_002.0, FRAMES[0][1])]))
+
+        table = load_capture(path)
+
+        assert len(table) == 2
+        assert {(e.ip_address, str(e.mac_address)) for e in table.entries()} == {
+            ("10.0.0.5", "AA:BB:CC:00:00:01"),
+            ("10.0.0.6", "AA:BB:CC:00:00:02"),
+        }
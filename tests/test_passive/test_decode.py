@@ -0,0 +1,300 @@
+"""Tests for passive frame decoders."""
+
+import socket
+import struct
+
+from network_tools.passive.decode import (
+    LINKTYPE_ETHERNET,
+    LINKTYPE_LINUX_SLL,
+    decode_frame,
+)
+from network_tools.passive.models import Frame
+
+HOST_MAC = bytes.fromhex("aabbcc000001")
+OTHER_MAC = bytes.fromhex("aabbcc000002")
+BROADCAST = b"\xff" * 6
+MDNS_MAC = bytes.fromhex("01005e0000fb")
+
+
+def _ethernet(src, ethertype, payload, dst=BROADCAST, vlan=None):
+    """Build an Ethernet II frame, optionally 802.1Q tagged."""
+    header = dst + src
+    if vlan is not None:
+        header += struct.pack("!HH", 0x8100, vlan)
+    return header + struct.pack("!H", ethertype) + payload
+
+
+def _arp(sender_mac, sender_ip, target_ip="10.0.0.254", op=1):
+    """Build an Ethernet/IPv4 ARP packet."""
+    return (
+        struct.pack("!HHBBH", 1, 0x0800, 6, 4, op)
+        + sender_mac
+        + socket.inet_aton(sender_ip)
+        + b"\x00" * 6
+        + socket.inet_aton(target_ip)
+    )
+
+
+def _udp(src_ip, dst_ip, src_port, dst_port, payload):
+    """Build an IPv4/UDP packet (checksums left zero)."""
+    udp = struct.pack("!HHHH", src_port, dst_port, 8 + len(payload), 0) + payload
+    ip = struct.pack(
+        "!BBHHHBBH4s4s",
+        0x45,
+        0,
+        20 + len(udp),
+        0,
+        0,
+        64,
+        socket.IPPROTO_UDP,
+        0,
+        socket.inet_aton(src_ip),
+        socket.inet_aton(dst_ip),
+    )
+    return ip + udp
+
+
+def _dhcp(chaddr, message_type, ciaddr="0.0.0.0", yiaddr="0.0.0.0", hostname=None):
+    """Build a BOOTP/DHCP message."""
+    op = 2 if message_type in (2, 5) else 1
+    fixed = struct.pack("!BBBBIHH", op, 1, 6, 0, 0x1234, 0, 0)
+    fixed += socket.inet_aton(ciaddr) + socket.inet_aton(yiaddr)
+    fixed += b"\x00" * 8 + chaddr + b"\x00" * 10 + b"\x00" * 192
+    options = b"\x63\x82\x53\x63" + bytes([53, 1, message_type])
+    if hostname:
+        options += bytes([12, len(hostname)]) + hostname.encode()
+    return fixed + options + b"\xff"
+
+
+def _dns_name(name):
+    """Encode a DNS name without compression."""
+    return (
+        b"".join(bytes([len(label)]) + label.encode() for label in name.split("."))
+        + b"\x00"
+    )
+
+
+def _mdns_response(name, ip):
+    """Build an mDNS response with one A record."""
+    header = struct.pack("!HHHHHH", 0, 0x8400, 0, 1, 0, 0)
+    record = _dns_name(name) + struct.pack("!HHIH", 1, 0x8001, 120, 4)
+    return header + record + socket.inet_aton(ip)
+
+
+def _netbios_name(name, suffix=0x00):
+    """First-level encode a NetBIOS name."""
+    raw = name.upper().ljust(15).encode() + bytes([suffix])
+    encoded = b"".join(bytes([0x41 + (b >> 4), 0x41 + (b & 0x0F)]) for b in raw)
+    return bytes([32]) + encoded + b"\x00"
+
+
+def _netbios_registration(name, ip, suffix=0x00):
+    """Build a NetBIOS name registration request."""
+    header = struct.pack("!HHHHHH", 1, 0x2910, 1, 0, 0, 1)
+    question = _netbios_name(name, suffix) + struct.pack("!HH", 0x20, 1)
+    additional = b"\xc0\x0c" + struct.pack("!HHIH", 0x20, 1, 300000, 6)
+    return header + question + additional + b"\x00\x00" + socket.inet_aton(ip)
+
+
+def _lldp(chassis_mac, system_name, mgmt_ip):
+    """Build an LLDPDU with chassis ID, system name and management address."""
+
+    def tlv(tlv_type, value):
+        return struct.pack("!H", (tlv_type << 9) | len(value)) + value
+
+    return (
+        tlv(1, b"\x04" + chassis_mac)
+        + tlv(2, b"\x05" + b"Gi0/1")
+        + tlv(3, b"\x00\x78")
+        + tlv(5, system_name.encode())
+        + tlv(8, b"\x05\x01" + socket.inet_aton(mgmt_ip) + b"\x02\x00\x00\x00\x01\x00")
+        + tlv(0, b"")
+    )
+
+
+def _decode(data, linktype=LINKTYPE_ETHERNET):
+    return decode_frame(Frame(timestamp=1_700_000_000.0, linktype=linktype, data=data))
+
+
+class TestArp:
+    """Tests for ARP decoding."""
+
+    def test_sender_pair(self):
+        """ARP requests reveal the sender's MAC and IP."""
+        (obs,) = _decode(_ethernet(HOST_MAC, 0x0806, _arp(HOST_MAC, "10.0.0.5")))
+
+        assert str(obs.mac_address) == "AA:BB:CC:00:00:01"
+        assert obs.ip_address == "10.0.0.5"
+        assert obs.protocol == "arp"
+        assert obs.seen_at.timestamp() == 1_700_000_000.0
+
+    def test_address_probe_ignored(self):
+        """RFC 5227 probes have no sender IP yet."""
+        frame = _ethernet(HOST_MAC, 0x0806, _arp(HOST_MAC, "0.0.0.0"))
+
+        assert _decode(frame) == []
+
+    def test_vlan_tagged(self):
+        """802.1Q tags are skipped."""
+        frame = _ethernet(HOST_MAC, 0x0806, _arp(HOST_MAC, "10.0.0.5"), vlan=10)
+
+        assert [o.ip_address for o in _decode(frame)] == ["10.0.0.5"]
+
+    def test_linux_cooked_capture(self):
+        """Linux SLL captures carry the source MAC in their own header."""
+        sll = struct.pack("!HHH", 0, 1, 6) + HOST_MAC + b"\x00\x00"
+        frame = sll + struct.pack("!H", 0x0806) + _arp(HOST_MAC, "10.0.0.5")
+
+        (obs,) = _decode(frame, LINKTYPE_LINUX_SLL)
+
+        assert obs.ip_address == "10.0.0.5"
+
+    def test_truncated_frame(self):
+        """Short frames are ignored, not raised on."""
+        frame = _ethernet(HOST_MAC, 0x0806, _arp(HOST_MAC, "10.0.0.5"))[:20]
+
+        assert _decode(frame) == []
+
+
+class TestDhcp:
+    """Tests for DHCP decoding."""
+
+    def test_ack_gives_lease_and_hostname(self):
+        """A server ACK ties the client MAC to its leased IP."""
+        dhcp = _dhcp(HOST_MAC, 5, yiaddr="10.0.0.20", hostname="laptop")
+        frame = _ethernet(
+            OTHER_MAC, 0x0800, _udp("10.0.0.1", "10.0.0.20", 67, 68, dhcp)
+        )
+
+        (obs,) = _decode(frame)
+
+        assert str(obs.mac_address) == "AA:BB:CC:00:00:01"
+        assert obs.ip_address == "10.0.0.20"
+        assert obs.hostname == "laptop"
+        assert obs.protocol == "dhcp"
+
+    def test_discover_gives_hostname_only(self):
+        """A DISCOVER names the client before it has an address."""
+        dhcp = _dhcp(HOST_MAC, 1, hostname="printer")
+        frame = _ethernet(
+            HOST_MAC, 0x0800, _udp("0.0.0.0", "255.255.255.255", 68, 67, dhcp)
+        )
+
+        (obs,) = _decode(frame)
+
+        assert obs.ip_address is None
+        assert obs.hostname == "printer"
+
+    def test_offer_without_hostname_ignored(self):
+        """An OFFER's address is not yet the client's."""
+        dhcp = _dhcp(HOST_MAC, 2, yiaddr="10.0.0.20")
+        frame = _ethernet(
+            OTHER_MAC, 0x0800, _udp("10.0.0.1", "10.0.0.20", 67, 68, dhcp)
+        )
+
+        assert _decode(frame) == []
+
+
+class TestMdns:
+    """Tests for mDNS decoding."""
+
+    def test_response_names_sender(self):
+        """An A record for the sender's own address gives its hostname."""
+        mdns = _mdns_response("nas.local", "10.0.0.7")
+        frame = _ethernet(
+            HOST_MAC,
+            0x0800,
+            _udp("10.0.0.7", "224.0.0.251", 5353, 5353, mdns),
+            dst=MDNS_MAC,
+        )
+
+        (obs,) = _decode(frame)
+
+        assert obs.ip_address == "10.0.0.7"
+        assert obs.hostname == "nas"
+        assert obs.protocol == "mdns"
+
+    def test_record_for_other_host_not_used(self):
+        """Names of other hosts (e.g. cached answers) are not attributed."""
+        mdns = _mdns_response("nas.local", "10.0.0.8")
+        frame = _ethernet(
+            HOST_MAC, 0x0800, _udp("10.0.0.7", "224.0.0.251", 5353, 5353, mdns)
+        )
+
+        (obs,) = _decode(frame)
+
+        assert obs.hostname is None
+
+
+class TestNetbios:
+    """Tests for NetBIOS name service decoding."""
+
+    def test_registration(self):
+        """Broadcast name registrations give the workstation name."""
+        nbns = _netbios_registration("DESKTOP-1", "10.0.0.9")
+        frame = _ethernet(
+            HOST_MAC, 0x0800, _udp("10.0.0.9", "10.0.0.255", 137, 137, nbns)
+        )
+
+        (obs,) = _decode(frame)
+
+        assert obs.ip_address == "10.0.0.9"
+        assert obs.hostname == "DESKTOP-1"
+        assert obs.protocol == "netbios"
+
+    def test_group_suffix_not_a_hostname(self):
+        """Domain/workgroup names are not hostnames."""
+        nbns = _netbios_registration("WORKGROUP", "10.0.0.9", suffix=0x1E)
+        frame = _ethernet(
+            HOST_MAC, 0x0800, _udp("10.0.0.9", "10.0.0.255", 137, 137, nbns)
+        )
+
+        (obs,) = _decode(frame)
+
+        assert obs.hostname is None
+
+    def test_unicast_ignored(self):
+        """Unicast name traffic may have been routed; its MAC is not the host's."""
+        nbns = _netbios_registration("DESKTOP-1", "10.0.0.9")
+        frame = _ethernet(
+            HOST_MAC,
+            0x0800,
+            _udp("10.0.0.9", "10.0.0.1", 137, 137, nbns),
+            dst=OTHER_MAC,
+        )
+
+        assert _decode(frame) == []
+
+    def test_linux_cooked_capture(self):
+        """SLL packet types tell broadcast registrations from unicast ones."""
+        nbns = _netbios_registration("DESKTOP-1", "10.0.0.9")
+        packet = _udp("10.0.0.9", "10.0.0.255", 137, 137, nbns)
+
+        def sll(packet_type):
+            header = struct.pack("!HHH", packet_type, 1, 6) + HOST_MAC + b"\x00\x00"
+            return header + struct.pack("!H", 0x0800) + packet
+
+        (obs,) = _decode(sll(1), LINKTYPE_LINUX_SLL)
+
+        assert obs.hostname == "DESKTOP-1"
+        assert _decode(sll(0), LINKTYPE_LINUX_SLL) == []
+
+
+class TestLldp:
+    """Tests for LLDP decoding."""
+
+    def test_neighbor(self):
+        """LLDP gives chassis MAC, management IP and system name."""
+        frame = _ethernet(
+            OTHER_MAC,
+            0x88CC,
+            _lldp(HOST_MAC, "core-sw1", "10.0.0.2"),
+            dst=bytes.fromhex("0180c200000e"),
+        )
+
+        (obs,) = _decode(frame)
+
+        assert str(obs.mac_address) == "AA:BB:CC:00:00:01"
+        assert obs.ip_address == "10.0.0.2"
+        assert obs.hostname == "core-sw1"
+        assert obs.protocol == "lldp"
@@ -0,0 +1,102 @@
+"""Tests for the live passive listener."""
+
+import socket
+import struct
+import time
+
+import pytest
+
+from network_tools.passive import (
+    DeviceTable,
+    Frame,
+    PassiveError,
+    PassiveListener,
+    open_packet_socket,
+)
+from network_tools.passive import listener as listener_module
+
+
+def _arp_frame(mac_hex: str, ip: str) -> bytes:
+    """Build a broadcast ARP request from `mac_hex`/`ip`."""
+    mac = bytes.fromhex(mac_hex)
+    return (
+        b"\xff" * 6
+        + mac
+        + b"\x08\x06"
+        + struct.pack("!HHBBH", 1, 0x0800, 6, 4, 1)
+        + mac
+        + socket.inet_aton(ip)
+        + b"\x00" * 6
+        + socket.inet_aton("10.0.0.254")
+    )
+
+
+def _frame(mac_hex: str, ip: str, timestamp: float = 1_700_000_000.0) -> Frame:
+    return Frame(timestamp=timestamp, linktype=1, data=_arp_frame(mac_hex, ip))
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    return tmp_path / "passive.json"
+
+
+class TestFeed:
+    """Tests for feeding frames into a listener."""
+
+    def test_reports_new_and_changed_devices(self, snapshot):
+        """The callback fires for new devices and address changes only."""
+        seen = []
+        listener = PassiveListener(snapshot_path=snapshot, on_device=seen.append)
+
+        assert listener.feed(_frame("aabbcc000001", "10.0.0.5")) == 1
+        assert listener.feed(_frame("aabbcc000001", "10.0.0.5", 1_700_000_001)) == 0
+        assert listener.feed(_frame("aabbcc000001", "10.0.0.6", 1_700_000_002)) == 1
+
+        assert [d.ip_address for d in seen] == ["10.0.0.5", "10.0.0.6"]
+        assert listener.frames == 3
+
+    def test_replay_and_flush(self, snapshot, tmp_path):
+        """Replayed captures are saved to the snapshot a discover run reads."""
+        frame = _arp_frame("aabbcc000001", "10.0.0.5")
+        capture = tmp_path / "replay.pcap"
+        capture.write_bytes(
+            struct.pack("<IHHiIII", 0xA1B2C3D4, 2, 4, 0, 0, 65535, 1)
+            + struct.pack("<IIII", 1_700_000_000, 0, len(frame), len(frame))
+            + frame
+        )
+        listener = PassiveListener(snapshot_path=snapshot)
+
+        assert listener.replay(capture) == 1
+        listener.flush()
+
+        table = DeviceTable.load(snapshot)
+        assert [e.ip_address for e in table.entries()] == ["10.0.0.5"]
+
+
+class TestLiveListener:
+    """Tests for the listener thread."""
+
+    def test_thread_learns_from_socket(self, snapshot, monkeypatch):
+        """Frames arriving on the packet socket reach the table."""
+        ours, theirs = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+        ours.setblocking(False)
+        monkeypatch.setattr(listener_module, "open_packet_socket", lambda iface: ours)
+
+        with PassiveListener(snapshot_path=snapshot, flush_interval=60) as listener:
+            theirs.send(_arp_frame("aabbcc000001", "10.0.0.5"))
+            deadline = time.monotonic() + 5
+            while "AA:BB:CC:00:00:01" not in listener.table:
+                assert time.monotonic() < deadline, "frame never processed"
+                time.sleep(0.01)
+
+        theirs.close()
+        assert not listener.running
+        # Stopping writes a final snapshot
+        assert DeviceTable.load(snapshot).get("AA:BB:CC:00:00:01").ip_address == (
+            "10.0.0.5"
+        )
+
+    def test_unknown_interface(self):
+        """Opening a missing interface (or lacking privileges) is a PassiveError."""
+        with pytest.raises(PassiveError):
+            open_packet_socket("nonexistent0")
@@ -0,0 +1,95 @@
+"""Tests for the passive device table."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from network_tools.passive import DeviceTable, Observation, PassiveError
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+MAC = "AA:BB:CC:00:00:01"
+
+
+def _obs(ip=None, hostname=None, protocol="arp", offset=0, mac=MAC):
+    return Observation(
+        mac_address=mac,
+        ip_address=ip,
+        hostname=hostname,
+        protocol=protocol,
+        seen_at=T0 + timedelta(seconds=offset),
+    )
+
+
+class TestDeviceTable:
+    """Tests for DeviceTable."""
+
+    def test_merges_by_mac(self):
+        """Observations of one MAC combine into one device."""
+        table = DeviceTable()
+        table.update(_obs(hostname="laptop", protocol="dhcp"))
+        table.update(_obs(ip="10.0.0.5", offset=5))
+
+        device = table.get(MAC)
+        assert len(table) == 1
+        assert device.ip_address == "10.0.0.5"
+        assert device.hostname == "laptop"
+        assert device.protocols == {"arp", "dhcp"}
+        assert device.first_seen == T0
+        assert device.last_seen == T0 + timedelta(seconds=5)
+
+    def test_newest_address_wins(self):
+        """A device that moved keeps its latest IP, even if seen out of order."""
+        table = DeviceTable()
+        table.update(_obs(ip="10.0.0.6", offset=10))
+        table.update(_obs(ip="10.0.0.5", offset=0))
+
+        assert table.get(MAC).ip_address == "10.0.0.6"
+        assert table.get(MAC).first_seen == T0
+
+    def test_entries_filtered_by_network(self):
+        """Only devices with an IP inside the targets become entries."""
+        table = DeviceTable()
+        table.update_all(
+            [
+                _obs(ip="10.0.0.5"),
+                _obs(ip="192.168.1.9", mac="AA:BB:CC:00:00:02"),
+                _obs(hostname="no-ip", mac="AA:BB:CC:00:00:03"),
+            ]
+        )
+
+        entries = table.entries("10.0.0.0/24")
+
+        assert [e.ip_address for e in entries] == ["10.0.0.5"]
+        assert len(table.entries()) == 2
+        assert "aa-bb-cc-00-00-03" in table
+
+    def test_since_filter(self):
+        """Devices not heard since the cutoff are left out."""
+        table = DeviceTable()
+        table.update(_obs(ip="10.0.0.5"))
+        table.update(_obs(ip="10.0.0.6", mac="AA:BB:CC:00:00:02", offset=60))
+
+        entries = table.entries(since=T0 + timedelta(seconds=30))
+
+        assert [e.ip_address for e in entries] == ["10.0.0.6"]
+
+    def test_snapshot_round_trip(self, tmp_path):
+        """save() and load() preserve every field."""
+        table = DeviceTable()
+        table.update(_obs(ip="10.0.0.5", hostname="nas", protocol="mdns"))
+        path = tmp_path / "state" / "passive.json"
+
+        table.save(path)
+        loaded = DeviceTable.load(path)
+
+        assert loaded.get(MAC) == table.get(MAC)
+
+    def test_load_invalid(self, tmp_path):
+        """A missing or corrupt snapshot raises PassiveError."""
+        path = tmp_path / "passive.json"
+        path.write_text("{not json")
+
+        with pytest.raises(PassiveError):
+            DeviceTable.load(path)
+        with pytest.raises(PassiveError):
+            DeviceTable.load(tmp_path / "missing.json")
@@ -0,0 +1,104 @@
+"""Tests for the active ARP sweep backend."""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from network_tools.scanner import active_arp
+from network_tools.scanner.active_arp import arp_available, arp_request_sweep
+from network_tools.scanner.exceptions import ScannerError, ScannerPermissionError
+
+
+def _fake_scapy(answered=(), srp_error=None, route=lambda ip: ("eth0",)):
+    """Build a stand-in for the scapy.all namespace."""
+    srp = MagicMock(return_value=(list(answered), []))
+    if srp_error is not None:
+        srp.side_effect = srp_error
+    return SimpleNamespace(
+        Ether=MagicMock(return_value=MagicMock(__truediv__=lambda s, o: o)),
+        ARP=MagicMock(side_effect=lambda pdst: pdst),
+        srp=srp,
+        conf=SimpleNamespace(route=SimpleNamespace(route=route)),
+    )
+
+
+def _reply(ip, mac, sent_time, received_time):
+    """Build a fake (sent, received) pair as returned by srp."""
+    return (
+        SimpleNamespace(sent_time=sent_time),
+        SimpleNamespace(psrc=ip, hwsrc=mac, time=received_time),
+    )
+
+
+class TestArpRequestSweep:
+    """Tests for arp_request_sweep."""
+
+    def test_replies_carry_mac_and_rtt(self):
+        """Responders should get MAC, interface and RTT from the reply."""
+        scapy = _fake_scapy([_reply("10.0.0.2", "aa-bb-cc-dd-ee-02", 100.0, 100.0015)])
+
+        with patch.object(active_arp, "_load_scapy", return_value=scapy):
+            results = arp_request_sweep(["10.0.0.1", "10.0.0.2"], timeout=1)
+
+        assert [r.alive for r in results] == [False, True]
+        assert str(results[1].mac_address) == "AA:BB:CC:DD:EE:02"
+        assert results[1].interface == "eth0"
+        assert results[1].rtt_ms == pytest.approx(1.5)
+
+    def test_capture_window_capped(self):
+        """A long scan timeout should not stretch the ARP capture window."""
+        scapy = _fake_scapy()
+
+        with patch.object(active_arp, "_load_scapy", return_value=scapy):
+            arp_request_sweep(["10.0.0.1"], timeout=30, interface="eth1")
+
+        kwargs = scapy.srp.call_args.kwargs
+        assert kwargs["timeout"] == active_arp.MAX_ARP_WINDOW
+        assert kwargs["iface"] == "eth1"
+
+    def test_hosts_grouped_by_route(self):
+        """A chunk spanning links should send one batch out of each interface."""
+        replies = {
+            "eth0": [_reply("10.0.0.1", "aa-bb-cc-dd-ee-01", 100.0, 100.001)],
+            "eth1": [_reply("192.168.1.1", "aa-bb-cc-dd-ee-02", 100.0, 100.001)],
+        }
+        scapy = _fake_scapy(
+            route=lambda ip: ("eth0" if ip.startswith("10.") else "eth1",)
+        )
+        scapy.srp.side_effect = lambda frames, iface, **kw: (replies[iface], [])
+
+        with patch.object(active_arp, "_load_scapy", return_value=scapy):
+            results = arp_request_sweep(
+                ["10.0.0.1", "192.168.1.1", "10.0.0.2"], timeout=1
+            )
+
+        batches = {c.kwargs["iface"]: c.args[0] for c in scapy.srp.call_args_list}
+        assert batches == {
+            "eth0": ["10.0.0.1", "10.0.0.2"],
+            "eth1": ["192.168.1.1"],
+        }
+        assert [r.interface for r in results] == ["eth0", "eth1", None]
+        assert [r.alive for r in results] == [True, True, False]
+
+    def test_permission_error(self):
+        """Refused raw access should raise ScannerPermissionError."""
+        scapy = _fake_scapy(srp_error=PermissionError("denied"))
+
+        with patch.object(active_arp, "_load_scapy", return_value=scapy):
+            with pytest.raises(ScannerPermissionError):
+                arp_request_sweep(["10.0.0.1"], timeout=1)
+
+    def test_missing_scapy(self):
+        """Without scapy the backend should raise a ScannerError with a hint."""
+        with patch.dict("sys.modules", {"scapy.all": None}):
+            with pytest.raises(ScannerError, match=r"network-tools\[scan\]"):
+                arp_request_sweep(["10.0.0.1"], timeout=1)
+            assert arp_available() is False
+
+    def test_empty_hosts(self):
+        """An empty chunk should not touch scapy."""
+        with patch.object(active_arp, "_load_scapy") as load:
+            assert arp_request_sweep([], timeout=1) == []
+
+        load.assert_not_called()
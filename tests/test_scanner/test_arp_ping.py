@@ -0,0 +1,139 @@
+"""Tests for the native asyncio ARP prober."""
+
+import asyncio
+import importlib
+import ipaddress
+import struct
+import sys
+
+import network_tools.scanner
+from network_tools.addresses import MacAddress
+from network_tools.scanner.arp_ping import (
+    ARP_REPLY,
+    ETH_P_ARP,
+    AsyncArpPinger,
+    Ipv4Link,
+    build_arp_request,
+    ipv4_links,
+    parse_arp_reply,
+)
+
+LINK = Ipv4Link(
+    interface="eth0",
+    mac_address=MacAddress("02:00:00:00:00:01"),
+    ip_address="192.168.1.10",
+    network=ipaddress.IPv4Network("192.168.1.0/24"),
+)
+
+
+def _arp_reply(sender_mac: str, sender_ip: str) -> bytes:
+    """Build an Ethernet ARP reply from a host to LINK."""
+    mac = MacAddress(sender_mac).packed
+    return (
+        LINK.mac_address.packed
+        + mac
+        + struct.pack("!H", ETH_P_ARP)
+        + struct.pack("!HHBBH", 1, 0x0800, 6, 4, ARP_REPLY)
+        + mac
+        + ipaddress.IPv4Address(sender_ip).packed
+        + LINK.mac_address.packed
+        + ipaddress.IPv4Address(LINK.ip_address).packed
+    )
+
+
+class TestFrames:
+    """Tests for ARP frame encoding."""
+
+    def test_build_request(self):
+        """Request should be a broadcast who-has from the link's addresses."""
+        frame = build_arp_request(LINK, "192.168.1.1")
+
+        assert frame[:6] == b"\xff" * 6
+        assert frame[6:12] == LINK.mac_address.packed
+        assert struct.unpack_from("!HH", frame, 12)[0] == ETH_P_ARP
+        assert struct.unpack_from("!H", frame, 20)[0] == 1
+        assert frame[28:32] == bytes([192, 168, 1, 10])
+        assert frame[38:42] == bytes([192, 168, 1, 1])
+
+    def test_parse_reply(self):
+        """Replies should yield the sender's IP and MAC."""
+        assert parse_arp_reply(_arp_reply("AA:BB:CC:DD:EE:01", "192.168.1.1")) == (
+            "192.168.1.1",
+            MacAddress("AA:BB:CC:DD:EE:01"),
+        )
+
+    def test_parse_ignores_requests(self):
+        """Our own who-has requests are not replies."""
+        assert parse_arp_reply(build_arp_request(LINK, "192.168.1.1")) is None
+        assert parse_arp_reply(b"\x00" * 20) is None
+
+
+class TestWithoutFcntl:
+    """Tests for platforms without fcntl, such as Windows."""
+
+    def test_scanner_imports(self, monkeypatch):
+        """The scanner package imports without fcntl."""
+        monkeypatch.setitem(sys.modules, "fcntl", None)
+        # Re-imported below; the originals are put back afterwards
+        monkeypatch.setattr(network_tools, "scanner", network_tools.scanner)
+        for name in list(sys.modules):
+            if name.startswith("network_tools.scanner"):
+                monkeypatch.delitem(sys.modules, name)
+
+        scanner = importlib.import_module("network_tools.scanner")
+
+        assert scanner.get_sweep_backend("race")
+
+    def test_no_links(self, monkeypatch):
+        """Interface enumeration finds nothing rather than failing."""
+        monkeypatch.setitem(sys.modules, "fcntl", None)
+
+        assert ipv4_links() == []
+
+
+class TestAsyncArpPinger:
+    """Tests for AsyncArpPinger without a packet socket."""
+
+    def test_link_for(self):
+        """Only addresses on an attached subnet, other than our own, are probed."""
+        pinger = AsyncArpPinger()
+        pinger._links = [LINK]
+
+        assert pinger.link_for("192.168.1.1") == LINK
+        assert pinger.link_for("192.168.1.10") is None
+        assert pinger.link_for("10.0.0.1") is None
+
+    def test_reply_resolves_probe(self, monkeypatch):
+        """A reply read from the socket should complete the matching probe."""
+        frames = []
+
+        class FakeSocket:
+            def fileno(self):
+                return -1
+
+            def recv(self, size):
+                if not frames:
+                    raise BlockingIOError
+                return frames.pop(0)
+
+            def close(self):
+                pass
+
+        async def run():
+            loop = asyncio.get_running_loop()
+            pinger = AsyncArpPinger()
+            pinger._sock, pinger._loop, pinger._links = FakeSocket(), loop, [LINK]
+
+            async def fake_sendto(sock, data, addr):
+                assert addr == ("eth0", ETH_P_ARP)
+                frames.append(_arp_reply("AA:BB:CC:DD:EE:01", "192.168.1.1"))
+                loop.call_soon(pinger._on_readable)
+
+            monkeypatch.setattr(loop, "sock_sendto", fake_sendto)
+            return await pinger.ping("192.168.1.1", timeout=1)
+
+        result = asyncio.run(run())
+
+        assert result.alive
+        assert str(result.mac_address) == "AA:BB:CC:DD:EE:01"
+        assert result.interface == "eth0"
@@ -0,0 +1,388 @@
+"""Tests for the ARP scanner."""
+
+import ipaddress
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from network_tools.config import Config, set_config
+from network_tools.scanner import arp_scanner
+from network_tools.scanner.arp_scanner import (
+    ARPEntry,
+    iter_scan_interfaces,
+    iter_scan_network,
+    ping_sweep,
+    scan_network,
+)
+from network_tools.scanner.checkpoint import ScanCheckpoint
+from network_tools.scanner.exceptions import ScanLimitError
+from network_tools.scanner.interfaces import LocalSubnet
+from network_tools.scanner.models import normalize_mac
+from network_tools.scanner.sweep import ProbeResult
+
+
+class TestNormalizeMac:
+    """Tests for normalize_mac."""
+
+    def test_dash_separated(self):
+        """Dash-separated MACs should become colon-separated uppercase."""
+        assert normalize_mac("aa-bb-cc-dd-ee-ff") == "AA:BB:CC:DD:EE:FF"
+
+    def test_cisco_dotted(self):
+        """Cisco dotted notation should be normalized."""
+        assert normalize_mac("aabb.ccdd.eeff") == "AA:BB:CC:DD:EE:FF"
+
+
+class TestPingSweep:
+    """Tests for ping_sweep."""
+
+    def setup_method(self):
+        """Reset config before each test."""
+        set_config(None)
+
+    def teardown_method(self):
+        """Clean up after each test."""
+        set_config(None)
+
+    def test_invalid_network(self):
+        """Invalid CIDR should return empty list."""
+        assert ping_sweep("not-a-network") == []
+
+    def test_returns_responders_in_order(self):
+        """Only responding hosts are returned, in address order."""
+
+        def fake_backend(hosts, timeout, concurrency, progress):
+            return [
+                ProbeResult(ip_address=ip, alive=ip.endswith((".2", ".5")))
+                for ip in hosts
+            ]
+
+        with patch.object(arp_scanner, "get_sweep_backend", return_value=fake_backend):
+            result = ping_sweep("10.0.0.0/29", timeout=1, concurrency=4)
+
+        assert result == ["10.0.0.2", "10.0.0.5"]
+
+    def test_uses_config_defaults(self):
+        """Timeout, concurrency and backend should come from config when omitted."""
+        set_config(
+            Config(scan_probe_timeout=3, scan_concurrency=7, scan_backend="ping")
+        )
+        calls = []
+
+        def fake_backend(hosts, timeout, concurrency, progress):
+            calls.append((timeout, concurrency))
+            return []
+
+        with patch.object(
+            arp_scanner, "get_sweep_backend", return_value=fake_backend
+        ) as mock_get:
+            ping_sweep("10.0.0.0/30")
+
+        mock_get.assert_called_once_with("ping")
+        assert calls == [(3, 7)]
+
+    def test_sweeps_beyond_old_cap(self):
+        """A /16 should be swept in full rather than truncated to 1024."""
+        probed = []
+
+        def fake_backend(hosts, timeout, concurrency, progress):
+            probed.append(len(hosts))
+            return [ProbeResult(ip_address=ip, alive=False) for ip in hosts]
+
+        with patch.object(arp_scanner, "get_sweep_backend", return_value=fake_backend):
+            ping_sweep("10.1.0.0/16", timeout=1)
+
+        assert sum(probed) == 65534
+        assert max(probed) <= 1024
+
+    def test_overlapping_targets_swept_once(self):
+        """Hosts covered by several targets should be probed only once."""
+        probed = []
+
+        def fake_backend(hosts, timeout, concurrency, progress):
+            probed.extend(hosts)
+            return [ProbeResult(ip_address=ip, alive=False) for ip in hosts]
+
+        with patch.object(arp_scanner, "get_sweep_backend", return_value=fake_backend):
+            ping_sweep("10.0.0.0/28, 10.0.0.0/29, 10.0.0.10-10.0.0.20", timeout=1)
+
+        assert probed == [f"10.0.0.{i}" for i in range(1, 21)]
+
+    def test_max_hosts_limit(self):
+        """Targets above scan_max_hosts should be refused explicitly."""
+        set_config(Config(scan_max_hosts=256))
+
+        with pytest.raises(ScanLimitError, match="SCAN_MAX_HOSTS"):
+            ping_sweep("10.0.0.0/23", timeout=1)
+
+    def test_max_hosts_disabled(self):
+        """scan_max_hosts=0 should disable the limit check."""
+        set_config(Config(scan_max_hosts=0))
+
+        def fake_backend(hosts, timeout, concurrency, progress):
+            return [ProbeResult(ip_address=ip, alive=False) for ip in hosts]
+
+        with patch.object(arp_scanner, "get_sweep_backend", return_value=fake_backend):
+            assert ping_sweep("10.0.0.0/23", timeout=1) == []
+
+
+class TestScanNetwork:
+    """Tests for scan_network."""
+
+    def test_filters_to_network(self):
+        """Entries outside the target network should be dropped."""
+        table = [
+            ARPEntry(ip_address="10.0.0.5", mac_address="AA:BB:CC:DD:EE:01"),
+            ARPEntry(ip_address="10.0.1.5", mac_address="AA:BB:CC:DD:EE:02"),
+        ]
+
+        with patch.object(arp_scanner, "get_arp_table", return_value=table):
+            result = scan_network("10.0.0.0/24", use_ping=False)
+
+        assert [e.ip_address for e in result] == ["10.0.0.5"]
+
+    def test_filters_to_multiple_targets(self):
+        """Entries should be kept if they fall in any of several targets."""
+        table = [
+            ARPEntry(ip_address="10.0.0.5", mac_address="AA:BB:CC:DD:EE:01"),
+            ARPEntry(ip_address="10.0.1.5", mac_address="AA:BB:CC:DD:EE:02"),
+            ARPEntry(ip_address="10.0.2.5", mac_address="AA:BB:CC:DD:EE:03"),
+            ARPEntry(ip_address="10.0.3.5", mac_address="AA:BB:CC:DD:EE:04"),
+        ]
+
+        with patch.object(arp_scanner, "get_arp_table", return_value=table):
+            result = scan_network("10.0.0.0/24,10.0.2.1-10.0.2.9", use_ping=False)
+
+        assert [e.ip_address for e in result] == ["10.0.0.5", "10.0.2.5"]
+
+    def test_keeps_network_and_broadcast_neighbors(self):
+        """Neighbors at a CIDR's network or broadcast address stay in range."""
+        table = [
+            ARPEntry(ip_address="10.0.0.0", mac_address="AA:BB:CC:DD:EE:01"),
+            ARPEntry(ip_address="10.0.0.255", mac_address="AA:BB:CC:DD:EE:02"),
+            ARPEntry(ip_address="10.0.1.0", mac_address="AA:BB:CC:DD:EE:03"),
+        ]
+
+        with patch.object(arp_scanner, "get_arp_table", return_value=table):
+            result = scan_network("10.0.0.0/24", use_ping=False)
+
+        assert [e.ip_address for e in result] == ["10.0.0.0", "10.0.0.255"]
+
+    def test_attaches_rtt_from_sweep(self):
+        """Measured RTTs should be copied onto matching ARP entries."""
+        table = [
+            ARPEntry(ip_address="10.0.0.1", mac_address="AA:BB:CC:DD:EE:01"),
+            ARPEntry(ip_address="10.0.0.2", mac_address="AA:BB:CC:DD:EE:02"),
+        ]
+
+        def fake_backend(hosts, timeout, concurrency, progress):
+            return [ProbeResult(ip_address="10.0.0.1", alive=True, rtt_ms=1.5)]
+
+        with (
+            patch.object(arp_scanner, "get_sweep_backend", return_value=fake_backend),
+            patch.object(arp_scanner, "get_arp_table", return_value=table),
+        ):
+            result = scan_network("10.0.0.0/30", timeout=1)
+
+        assert result[0].response_time_ms == 1.5
+        assert result[1].response_time_ms is None
+
+
+class TestIterScanNetwork:
+    """Tests for the streaming scan."""
+
+    def test_yields_before_sweep_finishes(self):
+        """A responder should be yielded while later chunks are still pending."""
+        swept_chunks = []
+
+        def fake_backend(hosts, timeout, concurrency, progress):
+            swept_chunks.append(hosts[0])
+            return [ProbeResult(ip_address=ip, alive=ip == "10.0.0.1") for ip in hosts]
+
+        table = [ARPEntry(ip_address="10.0.0.1", mac_address="AA:BB:CC:DD:EE:01")]
+
+        with (
+            patch.object(arp_scanner, "get_sweep_backend", return_value=fake_backend),
+            patch.object(arp_scanner, "get_arp_table", return_value=table),
+        ):
+            # A /21 is swept in two chunks
+            stream = iter_scan_network("10.0.0.0/21", timeout=1)
+            first = next(stream)
+
+        assert first.ip_address == "10.0.0.1"
+        assert swept_chunks == ["10.0.0.1"]
+
+    def test_cache_only_entries_yielded_last(self):
+        """Neighbors that did not answer the sweep are still reported, once."""
+        table = [
+            ARPEntry(ip_address="10.0.0.2", mac_address="AA:BB:CC:DD:EE:02"),
+            ARPEntry(ip_address="10.0.0.1", mac_address="AA:BB:CC:DD:EE:01"),
+            ARPEntry(ip_address="10.0.9.9", mac_address="AA:BB:CC:DD:EE:09"),
+        ]
+
+        def fake_backend(hosts, timeout, concurrency, progress):
+            return [
+                ProbeResult(ip_address=ip, alive=ip == "10.0.0.1", rtt_ms=0.3)
+                for ip in hosts
+            ]
+
+        with (
+            patch.object(arp_scanner, "get_sweep_backend", return_value=fake_backend),
+            patch.object(arp_scanner, "get_arp_table", return_value=table),
+        ):
+            result = list(iter_scan_network("10.0.0.0/29", timeout=1))
+
+        assert [e.ip_address for e in result] == ["10.0.0.1", "10.0.0.2"]
+        assert result[0].response_time_ms == 0.3
+        assert result[1].response_time_ms is None
+
+    def test_layer2_results_skip_table(self):
+        """Results that already carry a MAC should not need the neighbor table."""
+
+        def fake_backend(hosts, timeout, concurrency, progress):
+            return [
+                ProbeResult(
+                    ip_address=ip,
+                    alive=ip == "10.0.0.3",
+                    rtt_ms=0.4,
+                    mac_address="AA:BB:CC:DD:EE:03" if ip == "10.0.0.3" else None,
+                    interface="eth0",
+                )
+                for ip in hosts
+            ]
+
+        with (
+            patch.object(arp_scanner, "get_sweep_backend", return_value=fake_backend),
+            patch.object(arp_scanner, "get_arp_table", return_value=[]),
+        ):
+            result = list(iter_scan_network("10.0.0.0/29", timeout=1))
+
+        assert len(result) == 1
+        assert str(result[0].mac_address) == "AA:BB:CC:DD:EE:03"
+        assert result[0].interface == "eth0"
+        assert result[0].response_time_ms == 0.4
+
+    def test_bound_to_interface(self):
+        """With an interface, the backend is bound to it and entries tagged."""
+        interfaces = []
+
+        def fake_backend(hosts, timeout, concurrency, progress, interface=None):
+            interfaces.append(interface)
+            return [ProbeResult(ip_address=ip, alive=ip == "10.0.0.1") for ip in hosts]
+
+        table = [
+            ARPEntry(ip_address="10.0.0.1", mac_address="AA:BB:CC:DD:EE:01"),
+            ARPEntry(
+                ip_address="10.0.0.2",
+                mac_address="AA:BB:CC:DD:EE:02",
+                interface="eth1",
+            ),
+        ]
+
+        with (
+            patch.object(arp_scanner, "get_sweep_backend", return_value=fake_backend),
+            patch.object(arp_scanner, "get_arp_table", return_value=table),
+        ):
+            result = list(iter_scan_network("10.0.0.0/29", timeout=1, interface="eth0"))
+
+        assert interfaces == ["eth0"]
+        assert [(e.ip_address, e.interface) for e in result] == [("10.0.0.1", "eth0")]
+
+    def test_resumed_shards_keep_resolved_macs(self, tmp_path):
+        """A resumed shard yields the MACs saved with it, not the live table."""
+        table = [ARPEntry(ip_address="10.0.0.1", mac_address="AA:BB:CC:DD:EE:01")]
+
+        def fake_backend(hosts, timeout, concurrency, progress):
+            return [
+                ProbeResult(ip_address=ip, alive=ip == "10.0.0.1", rtt_ms=0.5)
+                for ip in hosts
+            ]
+
+        path = tmp_path / "sweep.jsonl"
+        with (
+            patch.object(arp_scanner, "get_sweep_backend", return_value=fake_backend),
+            patch.object(arp_scanner, "get_arp_table", return_value=table),
+        ):
+            checkpoint = ScanCheckpoint(path, "10.0.0.0/29", max_age=3600)
+            list(iter_scan_network("10.0.0.0/29", timeout=1, checkpoint=checkpoint))
+            checkpoint.close()
+
+        def unused_backend(hosts, timeout, concurrency, progress):
+            raise AssertionError("a finished shard was probed again")
+
+        # The neighbor entry has expired by the time the sweep resumes
+        with (
+            patch.object(arp_scanner, "get_sweep_backend", return_value=unused_backend),
+            patch.object(arp_scanner, "get_arp_table", return_value=[]),
+        ):
+            checkpoint = ScanCheckpoint(path, "10.0.0.0/29", max_age=3600)
+            result = list(
+                iter_scan_network("10.0.0.0/29", timeout=1, checkpoint=checkpoint)
+            )
+
+        assert [(e.ip_address, str(e.mac_address)) for e in result] == [
+            ("10.0.0.1", "AA:BB:CC:DD:EE:01")
+        ]
+        assert result[0].response_time_ms == 0.5
+
+
+class TestIterScanInterfaces:
+    """Tests for scanning every attached subnet in parallel."""
+
+    SUBNETS = [
+        LocalSubnet("eth0", ipaddress.IPv4Network("10.0.0.0/24")),
+        LocalSubnet("eth0.20", ipaddress.IPv4Network("10.0.20.0/24")),
+    ]
+
+    def test_subnets_scanned_in_parallel(self):
+        """Each subnet is scanned on its own interface, concurrently."""
+        calls = []
+        lock = threading.Lock()
+
+        def fake_scan(network, interface=None, progress=None, **kwargs):
+            with lock:
+                calls.append((network, interface))
+            progress(128, 254)
+            time.sleep(0.2)
+            progress(254, 254)
+            yield ARPEntry(
+                ip_address=network.replace("0/24", "1"),
+                mac_address="AA:BB:CC:DD:EE:01",
+                interface=interface,
+            )
+
+        reports = []
+        started = time.monotonic()
+        with patch.object(arp_scanner, "iter_scan_network", side_effect=fake_scan):
+            result = list(
+                iter_scan_interfaces(
+                    self.SUBNETS, progress=lambda d, t: reports.append((d, t))
+                )
+            )
+
+        assert time.monotonic() - started < 0.35
+        assert sorted(calls) == [("10.0.0.0/24", "eth0"), ("10.0.20.0/24", "eth0.20")]
+        assert sorted((e.ip_address, e.interface) for e in result) == [
+            ("10.0.0.1", "eth0"),
+            ("10.0.20.1", "eth0.20"),
+        ]
+        assert reports[-1] == (508, 508)
+
+    def test_worker_error_raised(self):
+        """An error in one subnet's scan should reach the caller."""
+
+        def fake_scan(network, **kwargs):
+            if network == "10.0.20.0/24":
+                raise ScanLimitError("too big")
+            yield from ()
+
+        with patch.object(arp_scanner, "iter_scan_network", side_effect=fake_scan):
+            with pytest.raises(ScanLimitError):
+                list(iter_scan_interfaces(self.SUBNETS))
+
+    def test_no_subnets(self):
+        """Nothing to scan yields nothing."""
+        with patch.object(arp_scanner, "local_subnets", return_value=[]):
+            assert list(iter_scan_interfaces()) == []
@@ -0,0 +1,194 @@
+"""Tests for the asyncio scanner API."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from network_tools.config import set_config
+from network_tools.scanner import async_scanner
+from network_tools.scanner.async_scanner import (
+    AsyncIcmpPinger,
+    async_ping_sweep,
+    async_scan_network,
+)
+from network_tools.scanner.exceptions import ScannerError
+from network_tools.scanner.icmp import icmp_available
+from network_tools.scanner.models import ARPEntry
+from network_tools.scanner.sweep import ProbeResult
+
+
+class FakePingProcess:
+    """Subprocess stand-in whose ping never finishes until killed."""
+
+    def __init__(self):
+        self.returncode = None
+        self.killed = False
+        self.reaped = False
+
+    async def communicate(self):
+        await asyncio.sleep(10)
+
+    def kill(self):
+        self.killed = True
+
+    async def wait(self):
+        await asyncio.sleep(0)
+        self.returncode = -9
+        self.reaped = True
+        return self.returncode
+
+
+class TestAsyncPingSweep:
+    """Tests for async_ping_sweep."""
+
+    def setup_method(self):
+        """Reset config before each test."""
+        set_config(None)
+
+    def teardown_method(self):
+        """Clean up after each test."""
+        set_config(None)
+
+    def test_results_in_address_order(self):
+        """Responders should come back in address order."""
+
+        async def fake_ping(ip, timeout):
+            # Later hosts answer first
+            await asyncio.sleep((10 - int(ip.split(".")[-1])) * 0.001)
+            return ProbeResult(ip_address=ip, alive=ip.endswith((".3", ".6")))
+
+        with patch.object(async_scanner, "async_ping_host", side_effect=fake_ping):
+            result = asyncio.run(
+                async_ping_sweep("10.0.0.0/28", timeout=1, backend="ping")
+            )
+
+        assert result == ["10.0.0.3", "10.0.0.6"]
+
+    def test_semaphore_bounds_in_flight(self):
+        """No more than `concurrency` probes should be awaiting at once."""
+        in_flight = 0
+        peak = 0
+
+        async def fake_ping(ip, timeout):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+            return ProbeResult(ip_address=ip, alive=False)
+
+        with patch.object(async_scanner, "async_ping_host", side_effect=fake_ping):
+            asyncio.run(
+                async_ping_sweep(
+                    "10.0.0.0/26", timeout=1, concurrency=5, backend="ping"
+                )
+            )
+
+        assert peak == 5
+
+    def test_cancellation_stops_probes(self):
+        """Cancelling the sweep should cancel outstanding probes."""
+        cancelled = 0
+
+        async def slow_ping(ip, timeout):
+            nonlocal cancelled
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled += 1
+                raise
+            return ProbeResult(ip_address=ip, alive=True)
+
+        async def run():
+            task = asyncio.create_task(
+                async_ping_sweep(
+                    "10.0.0.0/28", timeout=1, concurrency=4, backend="ping"
+                )
+            )
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        with patch.object(async_scanner, "async_ping_host", side_effect=slow_ping):
+            asyncio.run(run())
+
+        assert cancelled == 4
+
+    def test_cancelled_ping_process_is_reaped(self):
+        """Cancelling a probe should kill and wait for its ping process."""
+        proc = FakePingProcess()
+
+        async def run():
+            task = asyncio.create_task(async_scanner.async_ping_host("10.0.0.1", 5))
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        with patch.object(
+            async_scanner.asyncio, "create_subprocess_exec", return_value=proc
+        ):
+            asyncio.run(run())
+
+        assert proc.killed
+        assert proc.reaped
+
+    def test_invalid_network(self):
+        """Invalid CIDR should return empty list."""
+        assert asyncio.run(async_ping_sweep("bogus", backend="ping")) == []
+
+    def test_unknown_backend(self):
+        """Unknown backend names should be rejected like the blocking sweep."""
+        with pytest.raises(ScannerError, match="Unknown sweep backend"):
+            asyncio.run(async_ping_sweep("10.0.0.0/30", backend="carrier-pigeon"))
+
+    def test_backend_without_async_probe(self):
+        """Registered backends with no asyncio probe should say so."""
+        with pytest.raises(ScannerError, match="no async implementation"):
+            asyncio.run(async_ping_sweep("10.0.0.0/30", backend="arp"))
+
+
+class TestAsyncScanNetwork:
+    """Tests for async_scan_network."""
+
+    def test_filters_and_attaches_rtt(self):
+        """Entries should be filtered to the network with RTTs attached."""
+        table = [
+            ARPEntry(ip_address="10.0.0.1", mac_address="AA:BB:CC:DD:EE:01"),
+            ARPEntry(ip_address="10.9.0.1", mac_address="AA:BB:CC:DD:EE:02"),
+        ]
+
+        async def fake_ping(ip, timeout):
+            return ProbeResult(ip_address=ip, alive=ip == "10.0.0.1", rtt_ms=0.7)
+
+        with (
+            patch.object(async_scanner, "async_ping_host", side_effect=fake_ping),
+            patch.object(async_scanner, "get_arp_table", return_value=table),
+        ):
+            result = asyncio.run(
+                async_scan_network("10.0.0.0/30", timeout=1, backend="ping")
+            )
+
+        assert [e.ip_address for e in result] == ["10.0.0.1"]
+        assert result[0].response_time_ms == 0.7
+
+
+@pytest.mark.skipif(not icmp_available(), reason="ICMP sockets not permitted")
+class TestAsyncIcmpPinger:
+    """Tests for the shared-socket async ICMP pinger."""
+
+    def test_loopback(self):
+        """Many concurrent probes should share one socket and all resolve."""
+
+        async def run():
+            async with AsyncIcmpPinger() as pinger:
+                return await asyncio.gather(
+                    *(pinger.ping(f"127.0.0.{i}", 1) for i in range(1, 51))
+                )
+
+        results = asyncio.run(run())
+
+        assert all(r.alive for r in results)
+        assert all(r.rtt_ms is not None for r in results)
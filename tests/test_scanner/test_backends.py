@@ -0,0 +1,99 @@
+"""Tests for sweep backend selection and the subprocess ping backend."""
+
+import subprocess
+from unittest.mock import patch
+
+import pytest
+
+from network_tools.scanner import backends, ping
+from network_tools.scanner.backends import SWEEP_BACKENDS, get_sweep_backend
+from network_tools.scanner.exceptions import ScannerError
+
+
+class TestGetSweepBackend:
+    """Tests for get_sweep_backend."""
+
+    def test_named_backend(self):
+        """Known names should resolve to their backend."""
+        assert get_sweep_backend("ping") is SWEEP_BACKENDS["ping"]
+        assert get_sweep_backend("icmp") is SWEEP_BACKENDS["icmp"]
+
+    def test_unknown_backend(self):
+        """Unknown names should raise ScannerError."""
+        with pytest.raises(ScannerError, match="Unknown sweep backend"):
+            get_sweep_backend("carrier-pigeon")
+
+    def test_auto_prefers_icmp(self):
+        """Auto should pick the ICMP engine when sockets are available."""
+        with patch.object(backends, "icmp_available", return_value=True):
+            assert get_sweep_backend("auto") is SWEEP_BACKENDS["icmp"]
+
+    def test_auto_falls_back_to_ping(self):
+        """Auto should fall back to the ping command without ICMP sockets."""
+        with patch.object(backends, "icmp_available", return_value=False):
+            assert get_sweep_backend("auto") is SWEEP_BACKENDS["ping"]
+
+
+class TestPingCommand:
+    """Tests for the subprocess ping backend."""
+
+    @pytest.mark.parametrize(
+        "platform,expected",
+        [
+            ("win32", ["ping", "-n", "1", "-w", "1500", "10.0.0.1"]),
+            ("darwin", ["ping", "-c", "1", "-W", "1500", "10.0.0.1"]),
+            ("linux", ["ping", "-c", "1", "-W", "2", "10.0.0.1"]),
+        ],
+    )
+    def test_platform_flags(self, platform, expected):
+        """Ping flags should match the host platform."""
+        with patch.object(ping.sys, "platform", platform):
+            assert ping.ping_command("10.0.0.1", 1.5) == expected
+
+    def test_linux_interface(self):
+        """On Linux the source interface is passed with -I."""
+        with patch.object(ping.sys, "platform", "linux"):
+            assert ping.ping_command("10.0.0.1", 1, "eth0") == [
+                "ping",
+                "-c",
+                "1",
+                "-W",
+                "1",
+                "-I",
+                "eth0",
+                "10.0.0.1",
+            ]
+
+    def test_ping_host_parses_rtt(self):
+        """RTT should be parsed from ping output."""
+        completed = subprocess.CompletedProcess(
+            args=[], returncode=0, stdout="64 bytes from 10.0.0.1: time=0.45 ms\n"
+        )
+        with patch.object(ping.subprocess, "run", return_value=completed):
+            result = ping.ping_host("10.0.0.1", 1)
+
+        assert result.alive
+        assert result.rtt_ms == 0.45
+
+    def test_ping_host_windows_sub_millisecond(self):
+        """Windows 'time<1ms' output should parse."""
+        completed = subprocess.CompletedProcess(
+            args=[],
+            returncode=0,
+            stdout="Reply from 10.0.0.1: bytes=32 time<1ms TTL=64",
+        )
+        with patch.object(ping.subprocess, "run", return_value=completed):
+            assert ping.ping_host("10.0.0.1", 1).rtt_ms == 1.0
+
+    def test_ping_host_no_reply(self):
+        """Non-zero exit status means the host is not alive."""
+        completed = subprocess.CompletedProcess(args=[], returncode=1, stdout="")
+        with patch.object(ping.subprocess, "run", return_value=completed):
+            assert not ping.ping_host("10.0.0.1", 1).alive
+
+    def test_ping_host_timeout(self):
+        """A hung ping process should count as no reply."""
+        with patch.object(
+            ping.subprocess, "run", side_effect=subprocess.TimeoutExpired("ping", 3)
+        ):
+            assert not ping.ping_host("10.0.0.1", 1).alive
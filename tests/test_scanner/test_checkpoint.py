@@ -0,0 +1,140 @@
+"""Tests for resumable sweep checkpoints."""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+from network_tools.addresses import MacAddress
+from network_tools.config import Config, set_config
+from network_tools.scanner.checkpoint import ScanCheckpoint
+from network_tools.scanner.sweep import ProbeResult
+
+NETWORK = "10.0.0.0/22"
+
+
+def _results(shard: int, alive: set[int]) -> list[ProbeResult]:
+    """Results of a 256-host shard with the given last octets alive."""
+    return [
+        ProbeResult(
+            ip_address=f"10.0.{shard}.{i}",
+            alive=i in alive,
+            rtt_ms=1.5 if i in alive else None,
+        )
+        for i in range(256)
+    ]
+
+
+class TestScanCheckpoint:
+    """Tests for ScanCheckpoint."""
+
+    def setup_method(self):
+        set_config(Config())
+
+    def teardown_method(self):
+        set_config(None)
+
+    def test_resume_restores_finished_shards(self, tmp_path):
+        """Shards recorded by one run are restored by the next."""
+        path = tmp_path / "sweep.jsonl"
+        first = ScanCheckpoint(path, NETWORK, shard_size=256)
+        first.record(0, _results(0, {1, 7}))
+        first.record(2, _results(2, set()))
+        first.close()
+
+        resumed = ScanCheckpoint(path, NETWORK, shard_size=256)
+
+        assert sorted(resumed.completed) == [0, 2]
+        assert [r.ip_address for r in resumed.completed[0]] == ["10.0.0.1", "10.0.0.7"]
+        assert resumed.completed[0][0].rtt_ms == 1.5
+        assert resumed.completed[2] == []
+        assert resumed.done_hosts == 512
+        assert resumed.created_at == first.created_at
+
+    def test_layer2_details_kept(self, tmp_path):
+        """MACs, interfaces and TCP ports survive the round trip."""
+        path = tmp_path / "sweep.jsonl"
+        result = ProbeResult(
+            ip_address="10.0.0.5",
+            alive=True,
+            mac_address=MacAddress("AA:BB:CC:DD:EE:05"),
+            interface="eth0",
+            tcp_ports={22: True, 80: False},
+        )
+        ScanCheckpoint(path, NETWORK).record(0, [result])
+
+        (restored,) = ScanCheckpoint(path, NETWORK).completed[0]
+
+        assert str(restored.mac_address) == "AA:BB:CC:DD:EE:05"
+        assert restored.interface == "eth0"
+        assert restored.tcp_ports == {22: True, 80: False}
+
+    def test_torn_line_dropped(self, tmp_path):
+        """A half-written last line is ignored and not kept on rewrite."""
+        path = tmp_path / "sweep.jsonl"
+        checkpoint = ScanCheckpoint(path, NETWORK, shard_size=256)
+        checkpoint.record(0, _results(0, {1}))
+        checkpoint.close()
+        with open(path, "a") as f:
+            f.write('{"shard": 1, "ali')
+
+        resumed = ScanCheckpoint(path, NETWORK, shard_size=256)
+        assert list(resumed.completed) == [0]
+
+        resumed.record(1, _results(1, {2}))
+        resumed.close()
+        assert sorted(ScanCheckpoint(path, NETWORK, shard_size=256).completed) == [0, 1]
+
+    def test_other_sweep_starts_over(self, tmp_path):
+        """A checkpoint of other targets or shard size is not resumed."""
+        path = tmp_path / "sweep.jsonl"
+        ScanCheckpoint(path, NETWORK, shard_size=256).record(0, _results(0, {1}))
+
+        assert ScanCheckpoint(path, "10.0.0.0/24", shard_size=256).completed == {}
+        assert ScanCheckpoint(path, NETWORK, shard_size=1024).completed == {}
+
+    def test_expired_starts_over(self, tmp_path):
+        """A checkpoint older than max_age is not resumed."""
+        path = tmp_path / "sweep.jsonl"
+        ScanCheckpoint(path, NETWORK).record(0, _results(0, {1}))
+        lines = path.read_text().splitlines()
+        header = json.loads(lines[0])
+        header["created_at"] = (
+            datetime.now(timezone.utc) - timedelta(hours=2)
+        ).isoformat()
+        path.write_text("\n".join([json.dumps(header), *lines[1:]]) + "\n")
+
+        assert ScanCheckpoint(path, NETWORK, max_age=3600).completed == {}
+        assert list(ScanCheckpoint(path, NETWORK, max_age=86400).completed) == [0]
+
+    def test_discard(self, tmp_path):
+        """Discarding removes the file and forgets finished shards."""
+        path = tmp_path / "sweep.jsonl"
+        checkpoint = ScanCheckpoint(path, NETWORK)
+        checkpoint.record(0, _results(0, {1}))
+
+        checkpoint.discard()
+
+        assert not path.exists()
+        assert checkpoint.completed == {}
+
+    def test_unwritable_checkpoint_disabled(self, tmp_path):
+        """A checkpoint that cannot be written must not fail the sweep."""
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+        checkpoint = ScanCheckpoint(blocker / "sweep.jsonl", NETWORK)
+
+        checkpoint.record(0, _results(0, {1}))
+        checkpoint.record(1, _results(1, {1}))
+
+        assert checkpoint.completed == {}
+
+    def test_for_targets(self, tmp_path):
+        """Equal targets share a checkpoint file in the configured directory."""
+        set_config(Config(scan_checkpoint_dir=str(tmp_path)))
+
+        first = ScanCheckpoint.for_targets("10.0.0.0/24, 10.0.1.0/24")
+        second = ScanCheckpoint.for_targets("10.0.0.0/24,10.0.1.0/24")
+        other = ScanCheckpoint.for_targets("10.0.2.0/24")
+
+        assert first.path == second.path
+        assert first.path.parent == tmp_path
+        assert other.path != first.path
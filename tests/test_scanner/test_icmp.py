@@ -0,0 +1,78 @@
+"""Tests for the native ICMP echo engine."""
+
+import struct
+
+import pytest
+
+from network_tools.scanner.icmp import (
+    ICMP_ECHO_REPLY,
+    ICMP_ECHO_REQUEST,
+    build_echo_request,
+    checksum,
+    icmp_available,
+    icmp_sweep,
+    parse_echo_reply,
+)
+
+
+def _echo_reply(ident: int, seq: int) -> bytes:
+    """Build an echo reply packet for parser tests."""
+    header = struct.pack("!BBHHH", ICMP_ECHO_REPLY, 0, 0, ident, seq)
+    return header + b"payload"
+
+
+class TestPacketHelpers:
+    """Tests for checksum and packet encoding."""
+
+    def test_checksum_of_valid_packet_is_zero(self):
+        """Re-checksumming a packet including its checksum yields zero."""
+        packet = build_echo_request(0x1234, 7)
+        assert checksum(packet) == 0
+
+    def test_checksum_odd_length(self):
+        """Odd-length data should be padded, not rejected."""
+        assert checksum(b"\x01") == checksum(b"\x01\x00")
+
+    def test_build_echo_request_header(self):
+        """Echo request should carry type 8, identifier and sequence."""
+        packet = build_echo_request(0xBEEF, 42)
+        icmp_type, code, _, ident, seq = struct.unpack("!BBHHH", packet[:8])
+
+        assert icmp_type == ICMP_ECHO_REQUEST
+        assert code == 0
+        assert ident == 0xBEEF
+        assert seq == 42
+
+    def test_parse_echo_reply(self):
+        """Echo reply without IP header should parse."""
+        assert parse_echo_reply(_echo_reply(5, 9)) == (5, 9)
+
+    def test_parse_echo_reply_with_ip_header(self):
+        """IPv4 header delivered by raw sockets should be skipped."""
+        ip_header = bytes([0x45]) + bytes(19)
+        assert parse_echo_reply(ip_header + _echo_reply(5, 9)) == (5, 9)
+
+    def test_parse_ignores_echo_request(self):
+        """Echo requests (e.g. our own on raw sockets) are not replies."""
+        assert parse_echo_reply(build_echo_request(5, 9)) is None
+
+    def test_parse_truncated(self):
+        """Truncated packets should be ignored."""
+        assert parse_echo_reply(b"\x00\x00") is None
+
+
+class TestIcmpSweep:
+    """Tests for icmp_sweep."""
+
+    def test_empty_hosts(self):
+        """Empty host list should not open a socket."""
+        assert icmp_sweep([], timeout=1) == []
+
+    @pytest.mark.skipif(not icmp_available(), reason="ICMP sockets not permitted")
+    def test_loopback_replies(self):
+        """Loopback should answer with a measured RTT."""
+        results = icmp_sweep(["127.0.0.1"], timeout=1)
+
+        assert len(results) == 1
+        assert results[0].alive
+        assert results[0].rtt_ms is not None
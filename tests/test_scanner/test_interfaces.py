@@ -0,0 +1,94 @@
+"""Tests for local interface and subnet enumeration."""
+
+import ipaddress
+
+from network_tools.addresses import MacAddress
+from network_tools.scanner import interfaces
+from network_tools.scanner.arp_ping import Ipv4Link
+from network_tools.scanner.interfaces import (
+    LocalSubnet,
+    bind_to_interface,
+    local_subnets,
+    parse_route_table,
+)
+
+ROUTE_TABLE = """\
+Iface\tDestination\tGateway \tFlags\tRefCnt\tUse\tMetric\tMask\t\tMTU\tWindow\tIRTT
+eth0\t00000000\t0101A8C0\t0003\t0\t0\t100\t00000000\t0\t0\t0
+eth0\t0001A8C0\t00000000\t0001\t0\t0\t100\t00FFFFFF\t0\t0\t0
+eth0.20\t0014000A\t00000000\t0001\t0\t0\t0\t00FCFFFF\t0\t0\t0
+eth0.20\t0014000A\t00000000\t0001\t0\t0\t10\t00FCFFFF\t0\t0\t0
+eth0.30\t00000A0A\t0101A8C0\t0003\t0\t0\t0\t0000FFFF\t0\t0\t0
+eth0.30\t0500000A\t00000000\t0005\t0\t0\t0\tFFFFFFFF\t0\t0\t0
+eth1\t0002000A\t00000000\t0000\t0\t0\t0\t00FFFFFF\t0\t0\t0
+lo\t0000007F\t00000000\t0001\t0\t0\t0\t000000FF\t0\t0\t0
+"""
+
+
+def _subnet(interface: str, cidr: str) -> LocalSubnet:
+    return LocalSubnet(interface=interface, network=ipaddress.IPv4Network(cidr))
+
+
+class TestParseRouteTable:
+    """Tests for parse_route_table."""
+
+    def test_attached_subnets_only(self):
+        """Only up, gateway-less, non-host routes off loopback are attached."""
+        assert parse_route_table(ROUTE_TABLE) == [
+            _subnet("eth0", "192.168.1.0/24"),
+            _subnet("eth0.20", "10.0.20.0/22"),
+        ]
+
+    def test_malformed_lines_skipped(self):
+        """Short or non-hex lines should be ignored."""
+        assert parse_route_table("header\neth0 zz\neth0\tXX\t0\t1\t0\t0\t0\tYY\n") == []
+
+
+class TestLocalSubnets:
+    """Tests for local_subnets."""
+
+    def test_reads_route_table(self, tmp_path, monkeypatch):
+        """Subnets should come from the routing table, filtered by interface."""
+        route = tmp_path / "route"
+        route.write_text(ROUTE_TABLE)
+        monkeypatch.setattr(interfaces, "ROUTE_TABLE_PATH", route)
+
+        assert len(local_subnets()) == 2
+        assert local_subnets(["eth0.20"]) == [_subnet("eth0.20", "10.0.20.0/22")]
+
+    def test_falls_back_to_interface_addresses(self, tmp_path, monkeypatch):
+        """Without procfs, each interface's primary subnet is used."""
+        link = Ipv4Link(
+            interface="en0",
+            mac_address=MacAddress("02:00:00:00:00:01"),
+            ip_address="10.1.0.5",
+            network=ipaddress.IPv4Network("10.1.0.0/24"),
+        )
+        monkeypatch.setattr(interfaces, "ROUTE_TABLE_PATH", tmp_path / "missing")
+        monkeypatch.setattr(interfaces, "ipv4_links", lambda: [link])
+
+        assert local_subnets() == [_subnet("en0", "10.1.0.0/24")]
+
+
+class TestBindToInterface:
+    """Tests for bind_to_interface."""
+
+    def test_failure_is_not_fatal(self):
+        """A refused bind should be reported, not raised."""
+
+        class RefusingSocket:
+            def setsockopt(self, *args):
+                raise PermissionError("not permitted")
+
+        assert bind_to_interface(RefusingSocket(), "eth0") is False
+
+    def test_binds(self):
+        """The interface name should be passed to SO_BINDTODEVICE."""
+        calls = []
+
+        class RecordingSocket:
+            def setsockopt(self, *args):
+                calls.append(args)
+
+        assert bind_to_interface(RecordingSocket(), "eth0") is True
+        assert calls[0][1:] == (interfaces.SO_BINDTODEVICE, b"eth0")
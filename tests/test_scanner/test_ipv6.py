@@ -0,0 +1,218 @@
+"""Tests for IPv6 discovery by multicast echo."""
+
+import socket
+import struct
+from contextlib import contextmanager
+from typing import Optional
+from unittest.mock import patch
+
+from network_tools.scanner import arp_scanner, ipv6, plan
+from network_tools.scanner.arp_scanner import ARPEntry, scan_network
+from network_tools.scanner.ipv6 import (
+    ALL_NODES,
+    ICMPV6_ECHO_REPLY,
+    ICMPV6_ECHO_REQUEST,
+    build_echo6_request,
+    discover_ipv6,
+    multicast_echo,
+    parse_echo6_reply,
+)
+from network_tools.scanner.sweep import ProbeResult
+from network_tools.scanner.targets import TargetSet
+
+
+def _echo6_reply(ident: int, seq: int) -> bytes:
+    """Build an ICMPv6 echo reply packet."""
+    return struct.pack("!BBHHH", ICMPV6_ECHO_REPLY, 0, 0, ident, seq) + b"payload"
+
+
+class FakeIcmp6Socket:
+    """Socket answering each multicast echo with canned replies."""
+
+    def __init__(
+        self,
+        responders: dict[int, list[str]],
+        global_responders: Optional[dict[int, list[str]]] = None,
+    ) -> None:
+        # interface index -> responder addresses, for link-local requests
+        self.responders = responders
+        # interface index -> responder addresses, for global-source requests
+        self.global_responders = global_responders or {}
+        self.sent: list[tuple[bytes, tuple]] = []
+        self.sources: list[Optional[str]] = []
+        self.queue: list[tuple[bytes, tuple]] = []
+        self.closed = False
+
+    def setsockopt(self, *args) -> None:
+        pass
+
+    def _answer(self, packet: bytes, addr: tuple, responders: list[str]) -> None:
+        self.sent.append((packet, addr))
+        _, _, _, ident, seq = struct.unpack_from("!BBHHH", packet)
+        for ip in responders:
+            self.queue.append((_echo6_reply(ident, seq), (ip, 0, 0, addr[3])))
+
+    def sendto(self, packet: bytes, addr: tuple) -> None:
+        self.sources.append(None)
+        self._answer(packet, addr, self.responders.get(addr[3], []))
+
+    def sendmsg(self, buffers: list, ancdata: list, flags: int, addr: tuple) -> None:
+        packed = ancdata[0][2][:16]
+        self.sources.append(socket.inet_ntop(socket.AF_INET6, packed))
+        self._answer(buffers[0], addr, self.global_responders.get(addr[3], []))
+
+    def recvfrom(self, size: int) -> tuple[bytes, tuple]:
+        return self.queue.pop(0)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@contextmanager
+def _patched(sock: FakeIcmp6Socket, local: dict[str, set[str]]):
+    """Patch socket creation, interface lookup and select for multicast_echo."""
+    indexes = {"eth0": 2, "wlan0": 3}
+
+    def fake_select(readers, writers, errors, timeout):
+        return (readers if sock.queue else [], [], [])
+
+    with (
+        patch.object(ipv6, "open_icmp6_socket", return_value=(sock, True)),
+        patch.object(ipv6, "_local_addresses", return_value=local),
+        patch.object(ipv6.socket, "if_nametoindex", side_effect=indexes.__getitem__),
+        patch.object(ipv6.select, "select", side_effect=fake_select),
+    ):
+        yield
+
+
+class TestPacketHelpers:
+    """Tests for ICMPv6 packet encoding."""
+
+    def test_build_echo6_request(self):
+        """Echo request should carry type 128 and leave the checksum to the kernel."""
+        packet = build_echo6_request(0xBEEF, 3)
+        icmp_type, code, checksum, ident, seq = struct.unpack("!BBHHH", packet[:8])
+
+        assert (icmp_type, code, checksum) == (ICMPV6_ECHO_REQUEST, 0, 0)
+        assert (ident, seq) == (0xBEEF, 3)
+
+    def test_parse_echo6_reply(self):
+        """Echo replies should parse; our own requests should not."""
+        assert parse_echo6_reply(_echo6_reply(5, 9)) == (5, 9)
+        assert parse_echo6_reply(build_echo6_request(5, 9)) is None
+        assert parse_echo6_reply(b"\x81\x00") is None
+
+
+class TestMulticastEcho:
+    """Tests for multicast_echo."""
+
+    def test_one_probe_per_link_collects_all_responders(self):
+        """A single packet per interface should find every node on that link."""
+        sock = FakeIcmp6Socket({2: ["fe80::1", "fe80::2", "fe80::1"], 3: ["fe80::9"]})
+        local = {"eth0": {"fe80::aa"}, "wlan0": set()}
+
+        with _patched(sock, local):
+            results = multicast_echo(timeout=1)
+
+        assert [addr for _, addr in sock.sent] == [
+            (ALL_NODES, 0, 0, 2),
+            (ALL_NODES, 0, 0, 3),
+        ]
+        assert sorted((r.ip_address, r.interface) for r in results) == [
+            ("fe80::1", "eth0"),
+            ("fe80::2", "eth0"),
+            ("fe80::9", "wlan0"),
+        ]
+        assert all(r.alive and r.rtt_ms is not None for r in results)
+        assert sock.closed
+
+    def test_ignores_own_address_and_foreign_replies(self):
+        """Our own reply and replies to other processes' echoes are dropped."""
+        sock = FakeIcmp6Socket({2: ["fe80::aa", "fe80::1"]})
+        sock.queue.append((_echo6_reply(0, 99), ("fe80::7", 0, 0, 2)))
+
+        with _patched(sock, {"eth0": {"fe80::aa"}}):
+            results = multicast_echo(["eth0"], timeout=1)
+
+        assert [r.ip_address for r in results] == ["fe80::1"]
+
+    def test_global_prefix_echoes_from_global_source(self):
+        """A global target gets an echo from our address in that prefix."""
+        sock = FakeIcmp6Socket({2: ["fe80::1"]}, {2: ["2001:db8::1"]})
+        local = {"eth0": {"fe80::aa", "fe80::aa%eth0", "2001:db8::aa", "fd00::aa"}}
+        targets = TargetSet.parse("2001:db8::/64")
+
+        with _patched(sock, local):
+            results = multicast_echo(timeout=1, targets=targets)
+            rtts = plan.multicast_rtts(targets, timeout=1)
+
+        assert sock.sources == [None, "2001:db8::aa", None, "2001:db8::aa"]
+        assert sorted(r.ip_address for r in results) == ["2001:db8::1", "fe80::1"]
+        assert list(rtts) == ["2001:db8::1"]
+
+    def test_no_interfaces(self):
+        """Without IPv6 links no socket should be opened."""
+        with (
+            patch.object(ipv6, "_local_addresses", return_value={}),
+            patch.object(ipv6, "open_icmp6_socket") as opener,
+        ):
+            assert multicast_echo(timeout=1) == []
+        opener.assert_not_called()
+
+
+class TestDiscoverIpv6:
+    """Tests for merging responders with the neighbor table."""
+
+    def test_merges_rtts_with_neighbor_table(self):
+        """IPv6 neighbors are returned with RTTs for those that answered."""
+        table = [
+            ARPEntry("10.0.0.5", "AA:BB:CC:DD:EE:01", "eth0"),
+            ARPEntry("fe80::1", "AA:BB:CC:DD:EE:02", "eth0"),
+            ARPEntry("fd00::5", "AA:BB:CC:DD:EE:02", "eth0"),
+        ]
+        echo = [ProbeResult("fe80::1", True, rtt_ms=0.8, interface="eth0")]
+
+        with (
+            patch.object(ipv6, "multicast_echo", return_value=echo),
+            patch.object(ipv6, "read_neighbor_table", return_value=table),
+        ):
+            result = discover_ipv6()
+            scoped = discover_ipv6("fd00::/64")
+
+        assert [(e.ip_address, e.response_time_ms) for e in result] == [
+            ("fe80::1", 0.8),
+            ("fd00::5", None),
+        ]
+        assert [e.ip_address for e in scoped] == ["fd00::5"]
+
+
+class TestScanNetworkIpv6:
+    """Tests for IPv6 targets in scan_network."""
+
+    def test_ipv6_prefix_not_swept(self):
+        """A /64 should be covered by multicast echo, not a host-by-host sweep."""
+        table = [ARPEntry("fe80::1", "AA:BB:CC:DD:EE:02", "eth0")]
+        echo = [ProbeResult("fe80::1", True, rtt_ms=0.8, interface="eth0")]
+
+        with (
+            patch.object(arp_scanner, "get_sweep_backend") as backend,
+            patch.object(plan, "multicast_echo", return_value=echo),
+            patch.object(arp_scanner, "get_arp_table", return_value=table),
+        ):
+            result = scan_network("fe80::/64", timeout=1)
+
+        backend.assert_not_called()
+        assert [(e.ip_address, e.response_time_ms) for e in result] == [
+            ("fe80::1", 0.8)
+        ]
+
+    def test_ipv4_only_targets_skip_multicast(self):
+        """IPv4 scans should not send any ICMPv6."""
+        with (
+            patch.object(arp_scanner, "get_sweep_backend", return_value=lambda *a: []),
+            patch.object(plan, "multicast_echo") as echo,
+            patch.object(arp_scanner, "get_arp_table", return_value=[]),
+        ):
+            scan_network("10.0.0.0/30", timeout=1)
+
+        echo.assert_not_called()
@@ -0,0 +1,179 @@
+"""Tests for neighbor table backends."""
+
+import socket
+import struct
+import subprocess
+from unittest.mock import patch
+
+import pytest
+
+from network_tools.scanner import neighbors
+from network_tools.scanner.exceptions import ScannerError
+from network_tools.scanner.neighbors import (
+    read_arp_command,
+    read_neighbor_table,
+    read_proc_net_arp,
+)
+
+PROC_NET_ARP = """\
+IP address       HW type     Flags       HW address            Mask     Device
+192.168.1.1      0x1         0x2         aa:bb:cc:dd:ee:01     *        eth0
+192.168.1.7      0x1         0x0         00:00:00:00:00:00     *        eth0
+10.20.0.5        0x1         0x6         aa:bb:cc:dd:ee:02     *        vlan20
+224.0.0.251      0x1         0x6         01:00:5e:00:00:fb     *        eth0
+"""
+
+WINDOWS_ARP = """
+Interface: 192.168.68.5 --- 0xb
+  Internet Address      Physical Address      Type
+  192.168.68.1          aa-bb-cc-dd-ee-01     dynamic
+  192.168.68.255        ff-ff-ff-ff-ff-ff     static
+"""
+
+UNIX_ARP = """\
+? (192.168.1.1) at aa:bb:cc:dd:ee:1 on en0 ifscope [ethernet]
+router.lan (192.168.1.2) at aa:bb:cc:dd:ee:02 [ether] on eth0
+? (192.168.1.3) at <incomplete> on eth0
+"""
+
+
+def _neighbor_message(
+    family: int, ifindex: int, state: int, dst: bytes, mac: bytes
+) -> bytes:
+    """Build an RTM_NEWNEIGH netlink message."""
+
+    def attr(attr_type: int, value: bytes) -> bytes:
+        raw = struct.pack("=HH", 4 + len(value), attr_type) + value
+        return raw + b"\x00" * (-len(raw) % 4)
+
+    body = struct.pack("=BBHiHBB", family, 0, 0, ifindex, state, 0, 0)
+    body += attr(neighbors.NDA_DST, dst) + attr(neighbors.NDA_LLADDR, mac)
+    header = struct.pack("=IHHII", 16 + len(body), neighbors.RTM_NEWNEIGH, 0, 1, 0)
+    return header + body
+
+
+class TestProcNetArp:
+    """Tests for the procfs backend."""
+
+    def test_parses_complete_entries(self, tmp_path):
+        """Resolved unicast entries are returned with their interface."""
+        path = tmp_path / "arp"
+        path.write_text(PROC_NET_ARP)
+
+        entries = read_proc_net_arp(str(path))
+
+        assert [(e.ip_address, str(e.mac_address), e.interface) for e in entries] == [
+            ("192.168.1.1", "AA:BB:CC:DD:EE:01", "eth0"),
+            ("10.20.0.5", "AA:BB:CC:DD:EE:02", "vlan20"),
+        ]
+
+
+class TestArpCommand:
+    """Tests for the `arp -a` backend."""
+
+    def _run(self, stdout: str):
+        completed = subprocess.CompletedProcess(args=[], returncode=0, stdout=stdout)
+        with patch.object(neighbors.subprocess, "run", return_value=completed):
+            return read_arp_command()
+
+    def test_windows_format(self):
+        """Windows output should use the interface header and skip broadcast."""
+        entries = self._run(WINDOWS_ARP)
+
+        assert len(entries) == 1
+        assert entries[0].ip_address == "192.168.68.1"
+        assert str(entries[0].mac_address) == "AA:BB:CC:DD:EE:01"
+        assert entries[0].interface == "192.168.68.5"
+
+    def test_unix_format(self):
+        """BSD-style output should parse, padding shortened octets."""
+        entries = self._run(UNIX_ARP)
+
+        assert [(e.ip_address, str(e.mac_address), e.interface) for e in entries] == [
+            ("192.168.1.1", "AA:BB:CC:DD:EE:01", "en0"),
+            ("192.168.1.2", "AA:BB:CC:DD:EE:02", "eth0"),
+        ]
+
+    def test_command_failure(self):
+        """A failing arp command should raise ScannerError."""
+        completed = subprocess.CompletedProcess(
+            args=[], returncode=1, stdout="", stderr="boom"
+        )
+        with patch.object(neighbors.subprocess, "run", return_value=completed):
+            with pytest.raises(ScannerError):
+                read_arp_command()
+
+
+class TestNetlinkParsing:
+    """Tests for rtnetlink message parsing."""
+
+    def test_ipv4_neighbor(self):
+        """IPv4 neighbor should be parsed with interface name."""
+        msg = _neighbor_message(
+            socket.AF_INET, 1, 0x02, bytes([10, 0, 0, 1]), bytes.fromhex("aabbccddee01")
+        )
+        with patch.object(neighbors.socket, "if_indextoname", return_value="eth0"):
+            entry = neighbors._parse_neighbor(msg, 0, len(msg), {})
+
+        assert entry.ip_address == "10.0.0.1"
+        assert str(entry.mac_address) == "AA:BB:CC:DD:EE:01"
+        assert entry.interface == "eth0"
+
+    def test_ipv6_neighbor(self):
+        """IPv6 neighbors should be parsed too."""
+        dst = socket.inet_pton(socket.AF_INET6, "fe80::1")
+        msg = _neighbor_message(
+            socket.AF_INET6, 2, 0x04, dst, bytes.fromhex("aabbccddee02")
+        )
+
+        entry = neighbors._parse_neighbor(msg, 0, len(msg), {2: "eth1"})
+
+        assert entry.ip_address == "fe80::1"
+        assert entry.interface == "eth1"
+
+    def test_failed_neighbor_skipped(self):
+        """FAILED entries carry no usable MAC."""
+        msg = _neighbor_message(
+            socket.AF_INET,
+            1,
+            neighbors.NUD_FAILED,
+            bytes(4),
+            bytes.fromhex("aabbccddee01"),
+        )
+        assert neighbors._parse_neighbor(msg, 0, len(msg), {1: "eth0"}) is None
+
+
+class TestReadNeighborTable:
+    """Tests for backend selection."""
+
+    def test_unknown_backend(self):
+        """Unknown names should raise ScannerError."""
+        with pytest.raises(ScannerError, match="Unknown neighbor backend"):
+            read_neighbor_table("magic")
+
+    def test_auto_falls_back(self):
+        """Auto should try the next backend when one fails."""
+        backends = {
+            "netlink": lambda: (_ for _ in ()).throw(OSError("no netlink")),
+            "proc": lambda: ["proc-entry"],
+            "arp": lambda: ["arp-entry"],
+        }
+        with (
+            patch.dict(neighbors.NEIGHBOR_BACKENDS, backends),
+            patch.object(
+                neighbors, "_auto_backends", return_value=["netlink", "proc", "arp"]
+            ),
+        ):
+            assert read_neighbor_table("auto") == ["proc-entry"]
+
+    def test_all_backends_fail(self):
+        """ScannerError should be raised when nothing works."""
+        with (
+            patch.dict(
+                neighbors.NEIGHBOR_BACKENDS,
+                {"arp": lambda: (_ for _ in ()).throw(OSError("missing"))},
+            ),
+            patch.object(neighbors, "_auto_backends", return_value=["arp"]),
+        ):
+            with pytest.raises(ScannerError, match="No neighbor backend"):
+                read_neighbor_table("auto")
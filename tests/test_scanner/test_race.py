@@ -0,0 +1,144 @@
+"""Tests for first-reply-wins liveness probing."""
+
+import asyncio
+import time
+
+import pytest
+
+from network_tools.config import Config, set_config
+from network_tools.scanner import race
+from network_tools.scanner.backends import get_sweep_backend
+from network_tools.scanner.exceptions import ScannerError, ScannerPermissionError
+from network_tools.scanner.race import LivenessRacer, race_sweep
+from network_tools.scanner.sweep import ProbeResult
+
+
+class FakePinger:
+    """Protocol probe answering after a fixed delay."""
+
+    delay = 0.0
+    alive = True
+    fail_open = False
+
+    def __init__(self, interface=None) -> None:
+        self.interface = interface
+        self.cancelled = 0
+        self.closed = False
+
+    def open(self) -> None:
+        if self.fail_open:
+            raise ScannerPermissionError("not permitted")
+
+    def close(self) -> None:
+        self.closed = True
+
+    async def ping(self, ip: str, timeout: float) -> ProbeResult:
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return ProbeResult(ip_address=ip, alive=self.alive, rtt_ms=self.delay * 1000)
+
+
+def _fake(delay: float, alive: bool = True, fail_open: bool = False) -> type:
+    """Make a FakePinger subclass with fixed behaviour."""
+    attributes = {"delay": delay, "alive": alive, "fail_open": fail_open}
+    return type("Pinger", (FakePinger,), attributes)
+
+
+class TestLivenessRacer:
+    """Tests for LivenessRacer."""
+
+    def test_first_answer_wins_and_cancels_rest(self, monkeypatch):
+        """The fastest positive answer decides; slower probes are cancelled."""
+        monkeypatch.setattr(race, "AsyncIcmpPinger", _fake(5))
+        monkeypatch.setattr(race, "AsyncArpPinger", _fake(0.01))
+
+        async def run():
+            racer = LivenessRacer(protocols=("icmp", "arp"))
+            racer.open()
+            icmp = racer._icmp
+            try:
+                result = await racer.probe("10.0.0.1", timeout=5)
+            finally:
+                racer.close()
+            return result, icmp
+
+        started = time.monotonic()
+        result, icmp = asyncio.run(run())
+
+        assert result.alive
+        assert result.rtt_ms == 10
+        assert icmp.cancelled == 1
+        assert icmp.closed
+        assert time.monotonic() - started < 1
+
+    def test_negative_answers_do_not_win(self, monkeypatch):
+        """A fast 'down' from one protocol must wait for the others."""
+        monkeypatch.setattr(race, "AsyncIcmpPinger", _fake(0, alive=False))
+        monkeypatch.setattr(race, "AsyncArpPinger", _fake(0.02))
+
+        async def run():
+            async with LivenessRacer(protocols=("icmp", "arp")) as racer:
+                return await racer.probe("10.0.0.1", timeout=1)
+
+        assert asyncio.run(run()).alive
+
+    def test_all_down(self, monkeypatch):
+        """If no protocol answers, the host is down."""
+        monkeypatch.setattr(race, "AsyncIcmpPinger", _fake(0, alive=False))
+        monkeypatch.setattr(race, "AsyncArpPinger", _fake(0, alive=False))
+
+        async def run():
+            async with LivenessRacer(protocols=("icmp", "arp")) as racer:
+                return await racer.probe("10.0.0.1", timeout=1)
+
+        assert not asyncio.run(run()).alive
+
+    def test_unusable_protocols_left_out(self, monkeypatch):
+        """Protocols that cannot open are skipped rather than failing the race."""
+        monkeypatch.setattr(race, "AsyncIcmpPinger", _fake(0, fail_open=True))
+        monkeypatch.setattr(race, "AsyncArpPinger", _fake(0))
+
+        async def run():
+            async with LivenessRacer() as racer:
+                return racer.protocols
+
+        assert asyncio.run(run()) == ["arp", "tcp"]
+
+    def test_no_usable_protocol(self, monkeypatch):
+        """Opening with nothing usable should raise ScannerError."""
+        monkeypatch.setattr(race, "AsyncIcmpPinger", _fake(0, fail_open=True))
+
+        async def run():
+            LivenessRacer(protocols=("icmp",)).open()
+
+        with pytest.raises(ScannerError, match="can be used"):
+            asyncio.run(run())
+
+    def test_unknown_protocol(self):
+        """Unknown protocol names should be rejected."""
+        with pytest.raises(ScannerError, match="Unknown race protocols"):
+            LivenessRacer(protocols=("icmp", "carrier-pigeon"))
+
+
+class TestRaceSweep:
+    """Tests for the race sweep backend."""
+
+    def setup_method(self):
+        set_config(Config())
+
+    def teardown_method(self):
+        set_config(None)
+
+    def test_registered_backend(self):
+        """The race backend should be selectable by name."""
+        assert get_sweep_backend("race") is race_sweep
+
+    def test_loopback_alive(self):
+        """Loopback answers at least the TCP connect (with an RST)."""
+        results = race_sweep(["127.0.0.1"], timeout=1)
+
+        assert len(results) == 1
+        assert results[0].alive
@@ -0,0 +1,246 @@
+"""Tests for the shared packet-rate limiter."""
+
+import pytest
+
+from network_tools.config import Config, set_config
+from network_tools.scanner import ratelimit
+from network_tools.scanner.ratelimit import (
+    MIN_SCALE,
+    RateLimiter,
+    TokenBucket,
+    get_rate_limiter,
+    set_rate_limiter,
+)
+from network_tools.scanner.sweep import ProbeResult, iter_sweep, retry_on_loss
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def _results(alive_ips, hosts):
+    """Build sweep results where only `alive_ips` replied."""
+    return [ProbeResult(ip_address=ip, alive=ip in alive_ips) for ip in hosts]
+
+
+class TestTokenBucket:
+    """Tests for TokenBucket."""
+
+    def test_burst_then_paced(self):
+        """A full bucket serves its burst, then spaces callers by 1/rate."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10, burst=2, clock=clock)
+
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == pytest.approx(0.1)
+        assert bucket.reserve() == pytest.approx(0.2)
+
+    def test_refills_over_time(self):
+        """Tokens come back at the configured rate, capped at the burst."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10, burst=1, clock=clock)
+        bucket.reserve()
+
+        clock.now += 10
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == pytest.approx(0.1)
+
+    def test_burst_scales_with_rate(self):
+        """A rate change resizes the burst and returns to it without drift."""
+        clock = FakeClock()
+        bucket = TokenBucket(rate=100, clock=clock)
+
+        bucket.set_rate(50)
+        assert bucket.burst == pytest.approx(5)
+        assert sum(bucket.reserve() == 0 for _ in range(10)) == 5
+
+        bucket.set_rate(100)
+        assert bucket.burst == pytest.approx(10)
+
+
+class TestRateLimiter:
+    """Tests for RateLimiter."""
+
+    def test_disabled_never_waits(self):
+        """Without limits every probe may go immediately."""
+        limiter = RateLimiter()
+
+        assert not limiter.enabled
+        assert all(limiter.reserve("10.0.0.1") == 0 for _ in range(1000))
+        assert limiter.packet_interval() == 0
+        assert limiter.observe(100, 0) is False
+
+    def test_subnets_have_separate_buckets(self):
+        """The per-subnet limit only spaces probes to the same subnet."""
+        clock = FakeClock()
+        limiter = RateLimiter(subnet_rate=10, subnet_prefix=24, clock=clock)
+
+        assert limiter.reserve("10.0.0.1") == 0
+        assert limiter.reserve("10.0.0.2") == pytest.approx(0.1)
+        assert limiter.reserve("10.0.1.1") == 0
+        assert limiter.reserve("fe80::1%eth0") == 0
+
+    def test_global_limit_applies_across_subnets(self):
+        """The global limit spaces probes regardless of subnet."""
+        clock = FakeClock()
+        limiter = RateLimiter(rate=10, clock=clock)
+
+        assert limiter.reserve("10.0.0.1") == 0
+        assert limiter.reserve("192.168.1.1") == pytest.approx(0.1)
+
+    def test_packet_interval_uses_tightest_limit(self):
+        """Batch engines are paced by the stricter of the two limits."""
+        limiter = RateLimiter(rate=100, subnet_rate=20)
+
+        assert limiter.packet_interval() == pytest.approx(0.05)
+
+    def test_back_off_and_recover(self):
+        """Back-off halves the rate, recover undoes it, within bounds."""
+        limiter = RateLimiter(rate=100)
+
+        limiter.back_off()
+        assert limiter.scale == 0.5
+        assert limiter.packet_interval() == pytest.approx(0.02)
+
+        limiter.recover()
+        assert limiter.scale == 1.0
+
+        for _ in range(20):
+            limiter.back_off()
+        assert limiter.scale == MIN_SCALE
+
+    def test_observe_flags_reply_rate_drop(self):
+        """A chunk replying far below the baseline suggests loss."""
+        limiter = RateLimiter(rate=100)
+
+        assert limiter.observe(100, 40) is False
+        assert limiter.observe(100, 38) is False
+        assert limiter.observe(100, 5) is True
+
+    def test_clean_chunks_raise_rate_again(self):
+        """After a back-off, chunks without loss step the rate back up."""
+        limiter = RateLimiter(rate=100)
+        limiter.observe(100, 40)
+        limiter.back_off()
+
+        limiter.observe(100, 40)
+        assert limiter.scale == 0.5
+
+        limiter.observe(100, 40)
+        assert limiter.scale == pytest.approx(0.6)
+
+    def test_back_off_resets_baseline(self):
+        """After a back-off the next chunk sets a fresh baseline."""
+        limiter = RateLimiter(rate=100)
+        limiter.observe(100, 40)
+        limiter.back_off()
+
+        assert limiter.observe(100, 10) is False
+        assert limiter.observe(100, 9) is False
+        assert limiter.observe(100, 2) is True
+
+
+class TestGetRateLimiter:
+    """Tests for the shared limiter."""
+
+    @pytest.fixture(autouse=True)
+    def reset(self):
+        set_rate_limiter(None)
+        yield
+        set_config(None)
+        set_rate_limiter(None)
+
+    def test_built_from_config(self):
+        """The shared limiter follows the configured rates."""
+        set_config(Config(scan_rate_limit=500, scan_subnet_rate_limit=50))
+
+        limiter = get_rate_limiter()
+
+        assert limiter.rate == 500
+        assert limiter.subnet_rate == 50
+        assert get_rate_limiter() is limiter
+
+    def test_rebuilt_when_config_changes(self):
+        """Changing the configured rates replaces the shared limiter."""
+        set_config(Config(scan_rate_limit=500))
+        first = get_rate_limiter()
+
+        set_config(Config(scan_rate_limit=100))
+
+        assert get_rate_limiter() is not first
+        assert ratelimit._limiter.rate == 100
+
+
+class TestRetryOnLoss:
+    """Tests for loss handling in the sweep engine."""
+
+    HOSTS = [f"10.0.0.{i}" for i in range(1, 11)]
+
+    def _limiter_with_baseline(self):
+        limiter = RateLimiter(rate=1000)
+        limiter.observe(10, 5)
+        return limiter
+
+    def test_reprobes_silent_hosts_and_keeps_back_off(self):
+        """Hosts answering the re-probe are reported; the rate stays cut."""
+        limiter = self._limiter_with_baseline()
+        reprobed = []
+
+        def sweep(hosts, timeout, concurrency, progress):
+            reprobed.extend(hosts)
+            return _results({"10.0.0.3", "10.0.0.4"}, hosts)
+
+        results = retry_on_loss(
+            _results({"10.0.0.1"}, self.HOSTS), sweep, 1, 1, limiter
+        )
+
+        assert "10.0.0.1" not in reprobed
+        assert [r.ip_address for r in results if r.alive] == [
+            "10.0.0.1",
+            "10.0.0.3",
+            "10.0.0.4",
+        ]
+        assert limiter.scale == 0.5
+
+    def test_false_alarm_restores_rate(self):
+        """If the re-probe finds nothing, the rate is restored."""
+        limiter = self._limiter_with_baseline()
+
+        def sweep(hosts, timeout, concurrency, progress):
+            return _results(set(), hosts)
+
+        results = retry_on_loss(
+            _results({"10.0.0.1"}, self.HOSTS), sweep, 1, 1, limiter
+        )
+
+        assert sum(r.alive for r in results) == 1
+        assert limiter.scale == 1.0
+
+    def test_iter_sweep_feeds_limiter(self):
+        """iter_sweep re-probes a chunk whose reply rate collapsed."""
+        limiter = RateLimiter(rate=1000)
+        calls = []
+
+        def sweep(hosts, timeout, concurrency, progress):
+            calls.append(list(hosts))
+            if len(calls) == 1:
+                return _results(set(hosts[:5]), hosts)
+            if len(calls) == 2:
+                return _results(set(), hosts)
+            return _results(set(hosts), hosts)
+
+        hosts = [f"10.0.{i // 10}.{i % 10 + 1}" for i in range(20)]
+        results = list(
+            iter_sweep(hosts, sweep, 1, 1, len(hosts), chunk_size=10, limiter=limiter)
+        )
+
+        assert len(calls) == 3
+        assert calls[2] == hosts[10:]
+        assert sum(r.alive for r in results) == 15
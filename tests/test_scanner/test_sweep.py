@@ -0,0 +1,207 @@
+"""Tests for the concurrent sweep engine."""
+
+import ipaddress
+import threading
+import time
+
+import pytest
+
+from network_tools.scanner.sweep import (
+    ProbeResult,
+    chunked,
+    count_hosts,
+    iter_hosts,
+    iter_sweep,
+    run_sweep,
+)
+
+
+def _probe_even_alive(ip: str) -> ProbeResult:
+    """Probe stub: hosts with an even last octet are alive."""
+    return ProbeResult(ip_address=ip, alive=int(ip.split(".")[-1]) % 2 == 0)
+
+
+class TestRunSweep:
+    """Tests for run_sweep."""
+
+    def test_empty_hosts(self):
+        """Empty host list should return no results."""
+        assert run_sweep([], _probe_even_alive) == []
+
+    def test_results_in_input_order(self):
+        """Results should follow input order even if probes finish out of order."""
+        hosts = [f"10.0.0.{i}" for i in range(1, 21)]
+
+        def slow_first(ip: str) -> ProbeResult:
+            # Earlier hosts take longer, so completion order is reversed
+            time.sleep((21 - int(ip.split(".")[-1])) * 0.002)
+            return _probe_even_alive(ip)
+
+        results = run_sweep(hosts, slow_first, concurrency=20)
+
+        assert [r.ip_address for r in results] == hosts
+        assert [r.alive for r in results] == [i % 2 == 0 for i in range(1, 21)]
+
+    def test_concurrency_is_bounded(self):
+        """No more than `concurrency` probes should run at once."""
+        lock = threading.Lock()
+        in_flight = 0
+        peak = 0
+
+        def tracking_probe(ip: str) -> ProbeResult:
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.01)
+            with lock:
+                in_flight -= 1
+            return ProbeResult(ip_address=ip, alive=True)
+
+        hosts = [f"10.0.0.{i}" for i in range(1, 41)]
+        run_sweep(hosts, tracking_probe, concurrency=4)
+
+        assert 1 < peak <= 4
+
+    def test_runs_in_parallel(self):
+        """Probes should overlap rather than run back to back."""
+        hosts = [f"10.0.0.{i}" for i in range(1, 21)]
+
+        def sleepy_probe(ip: str) -> ProbeResult:
+            time.sleep(0.05)
+            return ProbeResult(ip_address=ip, alive=False)
+
+        start = time.monotonic()
+        run_sweep(hosts, sleepy_probe, concurrency=20)
+
+        # Sequential would take 1s
+        assert time.monotonic() - start < 0.5
+
+    def test_progress_callback(self):
+        """Progress should be reported once per host up to the total."""
+        hosts = [f"10.0.0.{i}" for i in range(1, 6)]
+        calls = []
+
+        run_sweep(hosts, _probe_even_alive, progress=lambda d, t: calls.append((d, t)))
+
+        assert calls == [(1, 5), (2, 5), (3, 5), (4, 5), (5, 5)]
+
+
+class TestHostIteration:
+    """Tests for lazy host iteration helpers."""
+
+    @pytest.mark.parametrize(
+        "cidr",
+        ["10.0.0.0/24", "10.0.0.0/31", "10.0.0.1/32", "fd00::/120", "fd00::/127"],
+    )
+    def test_count_matches_hosts(self, cidr):
+        """count_hosts should agree with ipaddress hosts()."""
+        net = ipaddress.ip_network(cidr)
+        assert count_hosts(net) == len(list(net.hosts()))
+
+    def test_count_large_network(self):
+        """Counting a /8 should not enumerate it."""
+        assert count_hosts(ipaddress.ip_network("10.0.0.0/8")) == 2**24 - 2
+
+    def test_iter_hosts_is_lazy(self):
+        """iter_hosts should yield without building the whole /8."""
+        hosts = iter_hosts(ipaddress.ip_network("10.0.0.0/8"))
+        assert next(hosts) == "10.0.0.1"
+        assert next(hosts) == "10.0.0.2"
+
+    def test_chunked(self):
+        """chunked should split into fixed-size lists with a short tail."""
+        assert list(chunked(range(7), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+
+
+class TestIterSweep:
+    """Tests for chunked sweeping."""
+
+    def test_backend_sees_bounded_chunks(self):
+        """The backend should never receive more than chunk_size hosts."""
+        sizes = []
+
+        def backend(hosts, timeout, concurrency, progress):
+            sizes.append(len(hosts))
+            return [ProbeResult(ip_address=ip, alive=True) for ip in hosts]
+
+        hosts = (f"10.0.{i // 256}.{i % 256}" for i in range(10))
+        results = list(iter_sweep(hosts, backend, 1, 4, total=10, chunk_size=4))
+
+        assert sizes == [4, 4, 2]
+        assert len(results) == 10
+
+    def test_progress_spans_chunks(self):
+        """Progress should be cumulative across chunks."""
+        calls = []
+
+        def backend(hosts, timeout, concurrency, progress):
+            for i in range(len(hosts)):
+                progress(i + 1, len(hosts))
+            return [ProbeResult(ip_address=ip, alive=False) for ip in hosts]
+
+        hosts = [f"10.0.0.{i}" for i in range(1, 6)]
+        stream = iter_sweep(
+            hosts,
+            backend,
+            1,
+            4,
+            total=5,
+            progress=lambda d, t: calls.append((d, t)),
+            chunk_size=2,
+        )
+        list(stream)
+
+        assert calls == [(1, 5), (2, 5), (3, 5), (4, 5), (5, 5)]
+
+    def test_stream_is_consumed_lazily(self):
+        """Only the chunks actually requested should be probed."""
+        probed = []
+
+        def backend(hosts, timeout, concurrency, progress):
+            probed.extend(hosts)
+            return [ProbeResult(ip_address=ip, alive=True) for ip in hosts]
+
+        stream = iter_sweep(
+            iter_hosts(ipaddress.ip_network("10.0.0.0/8")),
+            backend,
+            1,
+            4,
+            total=2**24 - 2,
+            chunk_size=256,
+        )
+        next(stream)
+
+        assert len(probed) == 256
+
+    def test_completed_chunks_not_probed(self):
+        """Chunks finished by an earlier run are restored, not probed."""
+        probed = []
+        finished = []
+
+        def backend(hosts, timeout, concurrency, progress):
+            probed.append(hosts[0])
+            return [ProbeResult(ip_address=ip, alive=True) for ip in hosts]
+
+        hosts = [f"10.0.0.{i}" for i in range(1, 9)]
+        completed = {0: [ProbeResult(ip_address="10.0.0.2", alive=True, rtt_ms=1.0)]}
+        calls = []
+        results = list(
+            iter_sweep(
+                hosts,
+                backend,
+                1,
+                4,
+                total=8,
+                progress=lambda d, t: calls.append(d),
+                chunk_size=4,
+                completed=completed,
+                on_chunk=lambda index, chunk: finished.append((index, len(chunk))),
+            )
+        )
+
+        assert probed == ["10.0.0.5"]
+        assert finished == [(1, 4)]
+        assert [r.alive for r in results] == [False, True, False, False] + [True] * 4
+        assert results[1].rtt_ms == 1.0
+        assert calls[0] == 4
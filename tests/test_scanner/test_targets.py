@@ -0,0 +1,69 @@
+"""Tests for scan target sets."""
+
+import ipaddress
+
+import pytest
+
+from network_tools.scanner.targets import TargetSet
+
+
+class TestTargetSet:
+    """Tests for TargetSet."""
+
+    def test_cidr_matches_hosts(self):
+        """A CIDR should cover the same addresses as net.hosts()."""
+        for cidr in ["10.0.0.0/29", "10.0.0.0/31", "10.0.0.7/32", "fd00::/125"]:
+            net = ipaddress.ip_network(cidr)
+            targets = TargetSet.parse(cidr)
+
+            assert list(targets) == [str(h) for h in net.hosts()]
+            assert targets.num_hosts == len(list(net.hosts()))
+
+    def test_overlaps_merged(self):
+        """Overlapping and adjacent targets should be swept once."""
+        targets = TargetSet.parse(
+            "10.0.0.0/24, 10.0.0.0/25 10.0.0.200-10.0.1.10,10.0.1.11"
+        )
+
+        hosts = list(targets)
+        assert len(hosts) == len(set(hosts)) == targets.num_hosts
+        assert targets.num_intervals == 1
+        assert hosts[0] == "10.0.0.1"
+        assert hosts[-1] == "10.0.1.11"
+
+    def test_membership(self):
+        """Membership should respect every interval and address family."""
+        targets = TargetSet.parse(
+            [f"10.{i}.0.0/24" for i in range(0, 200, 2)] + ["fe80::/64"]
+        )
+
+        assert "10.4.0.9" in targets
+        assert "10.5.0.9" not in targets
+        assert "10.4.0.0" in targets  # Network address
+        assert "10.4.0.255" in targets  # Broadcast address
+        assert "10.3.0.0" not in targets
+        assert "9.255.255.255" not in targets
+        assert "fe80::1%eth0" in targets
+        assert "not-an-ip" not in targets
+
+    @pytest.mark.parametrize(
+        "spec", ["", "10.0.0.0/33", "10.0.0.9-10.0.0.1", "10.0.0.1-fe80::1", "bogus"]
+    )
+    def test_invalid(self, spec):
+        """Invalid targets should raise ValueError."""
+        with pytest.raises(ValueError):
+            TargetSet.parse(spec)
+
+    def test_parse_passthrough(self):
+        """Parsing a TargetSet should return it unchanged."""
+        targets = TargetSet.parse("10.0.0.0/30")
+        assert TargetSet.parse(targets) is targets
+
+    def test_family(self):
+        """Restricting to one family should keep only its targets."""
+        targets = TargetSet.parse("10.0.0.0/30, fd00::/64")
+
+        assert list(targets.family(4)) == ["10.0.0.1", "10.0.0.2"]
+        assert "fd00::1" in targets.family(6)
+        assert "10.0.0.1" not in targets.family(6)
+        assert TargetSet.parse("10.0.0.0/30").family(6) is None
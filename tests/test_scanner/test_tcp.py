@@ -0,0 +1,164 @@
+"""Tests for the TCP connect prober."""
+
+import asyncio
+import errno
+import socket
+import time
+
+import pytest
+
+from network_tools.config import Config, set_config
+from network_tools.scanner import tcp
+from network_tools.scanner.backends import get_sweep_backend
+from network_tools.scanner.tcp import parse_ports, tcp_probe, tcp_sweep
+
+
+def _listener() -> socket.socket:
+    """Open a listening socket on a free loopback port."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.listen(8)
+    return sock
+
+
+def _closed_port() -> int:
+    """Find a loopback port nothing listens on."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+class TestParsePorts:
+    """Tests for parse_ports."""
+
+    def test_parses_and_dedupes(self):
+        """Ports should keep their order with duplicates dropped."""
+        assert parse_ports("443, 22 80,443") == (443, 22, 80)
+
+    @pytest.mark.parametrize("text", ["", "0", "65536", "http"])
+    def test_invalid(self, text):
+        """Out-of-range, non-numeric and empty lists should raise ValueError."""
+        with pytest.raises(ValueError):
+            parse_ports(text)
+
+
+class TestTcpProbe:
+    """Tests for tcp_probe against loopback sockets."""
+
+    def test_open_port_marks_alive(self):
+        """A SYN-ACK should mark the host alive and the port open."""
+        server = _listener()
+        port = server.getsockname()[1]
+        try:
+            result = asyncio.run(tcp_probe("127.0.0.1", 1, ports=[port]))
+        finally:
+            server.close()
+
+        assert result.alive
+        assert result.rtt_ms is not None
+        assert result.tcp_ports == {port: True}
+
+    def test_refused_port_marks_alive(self):
+        """An RST proves the host is up even though the port is closed."""
+        port = _closed_port()
+        result = asyncio.run(tcp_probe("127.0.0.1", 1, ports=[port]))
+
+        assert result.alive
+        assert result.tcp_ports == {port: False}
+
+    def test_records_every_answering_port(self):
+        """Open and closed ports answering together should all be recorded."""
+        server = _listener()
+        open_port, closed_port = server.getsockname()[1], _closed_port()
+        try:
+            result = asyncio.run(
+                tcp_probe("127.0.0.1", 1, ports=[closed_port, open_port])
+            )
+        finally:
+            server.close()
+
+        assert result.tcp_ports == {open_port: True, closed_port: False}
+
+    def test_silent_host_is_down(self, monkeypatch):
+        """No answer on any port within the timeout means down."""
+
+        async def silent(ip, port, timeout, limiter, interface):
+            await asyncio.sleep(timeout)
+            return None
+
+        monkeypatch.setattr(tcp, "_connect", silent)
+        result = asyncio.run(tcp_probe("10.0.0.1", 0.05, ports=[22, 80]))
+
+        assert not result.alive
+        assert result.tcp_ports == {}
+
+    def test_out_of_sockets_is_silent(self, monkeypatch):
+        """Failing to open a socket should mark the port silent, not raise."""
+
+        real_socket = socket.socket
+
+        def exhausted(family=-1, type=-1, proto=-1, fileno=None):
+            # The event loop still needs its own self-pipe sockets
+            if fileno is None and type == socket.SOCK_STREAM:
+                raise OSError(errno.EMFILE, "Too many open files")
+            return real_socket(family, type, proto, fileno)
+
+        monkeypatch.setattr(socket, "socket", exhausted)
+        result = asyncio.run(tcp_probe("10.0.0.1", 0.05, ports=[22, 80]))
+
+        assert not result.alive
+        assert result.tcp_ports == {}
+
+    def test_filtered_ports_do_not_hold_live_host(self, monkeypatch):
+        """After one answer, silently dropped ports are abandoned quickly."""
+
+        async def partly_filtered(ip, port, timeout, limiter, interface):
+            if port == 80:
+                return False, 1.0
+            await asyncio.sleep(timeout)
+            return None
+
+        monkeypatch.setattr(tcp, "_connect", partly_filtered)
+        started = time.monotonic()
+        result = asyncio.run(tcp_probe("10.0.0.1", 5, ports=[22, 80]))
+
+        assert result.alive
+        assert time.monotonic() - started < 1
+
+
+class TestTcpSweep:
+    """Tests for the tcp sweep backend."""
+
+    def setup_method(self):
+        set_config(Config())
+
+    def teardown_method(self):
+        set_config(None)
+
+    def test_registered_backend(self):
+        """The tcp backend should be selectable by name."""
+        assert get_sweep_backend("tcp") is tcp_sweep
+
+    def test_sweep_uses_configured_ports(self):
+        """Results should be in input order and use config scan_tcp_ports."""
+        server = _listener()
+        port = server.getsockname()[1]
+        set_config(Config(scan_tcp_ports=str(port)))
+        progress = []
+        try:
+            results = tcp_sweep(
+                ["127.0.0.1", "127.0.0.2"],
+                timeout=1,
+                concurrency=2,
+                progress=lambda done, total: progress.append((done, total)),
+            )
+        finally:
+            server.close()
+
+        assert [r.ip_address for r in results] == ["127.0.0.1", "127.0.0.2"]
+        assert results[0].tcp_ports == {port: True}
+        # Nothing listens on 127.0.0.2, so the kernel answers with an RST
+        assert results[1].tcp_ports == {port: False}
+        assert progress[-1] == (2, 2)
@@ -0,0 +1,175 @@
+"""Tests for adaptive probe timeouts."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from network_tools.config import Config, set_config
+from network_tools.scanner.sweep import ProbeResult, iter_sweep
+from network_tools.scanner.timing import AdaptiveTimeout, RttEstimator
+
+
+class TestRttEstimator:
+    """Tests for the RFC 6298 estimator."""
+
+    def test_no_samples(self):
+        """Without samples there is no timeout."""
+        assert RttEstimator().timeout is None
+
+    def test_first_sample(self):
+        """The first sample sets srtt and half of it as variance."""
+        estimator = RttEstimator()
+        estimator.update(0.010)
+
+        assert estimator.timeout == pytest.approx(0.010 + 4 * 0.005)
+
+    def test_converges_on_steady_rtt(self):
+        """Steady RTTs shrink the variance towards zero."""
+        estimator = RttEstimator()
+        for _ in range(50):
+            estimator.update(0.002)
+
+        assert estimator.srtt == pytest.approx(0.002)
+        assert estimator.timeout == pytest.approx(0.002, rel=0.01)
+
+    def test_jitter_widens_timeout(self):
+        """Jittery RTTs should give a longer timeout than steady ones."""
+        steady, jittery = RttEstimator(), RttEstimator()
+        for i in range(20):
+            steady.update(0.010)
+            jittery.update(0.002 if i % 2 else 0.018)
+
+        assert jittery.timeout > steady.timeout
+
+
+class TestAdaptiveTimeout:
+    """Tests for per-subnet AdaptiveTimeout."""
+
+    def setup_method(self):
+        set_config(Config())
+
+    def teardown_method(self):
+        set_config(None)
+
+    def _timing(self) -> AdaptiveTimeout:
+        return AdaptiveTimeout(
+            initial=2, min_timeout=0.05, max_timeout=5, subnet_prefix=24
+        )
+
+    def test_unseen_uses_initial(self):
+        """Addresses without any samples nearby get the initial timeout."""
+        assert self._timing().timeout_for("10.0.0.1") == 2
+
+    def test_subnet_estimate(self):
+        """Replies from a subnet set the timeout of its other hosts."""
+        timing = self._timing()
+        timing.observe("10.0.0.1", 100)
+
+        assert timing.timeout_for("10.0.0.200") == pytest.approx(0.3)
+
+    def test_site_fallback(self):
+        """An unseen subnet borrows the estimate of its /16 site."""
+        timing = self._timing()
+        timing.observe("10.0.0.1", 100)
+        timing.observe("10.0.1.1", 1000)
+
+        # 10.0.0.x has its own estimate; 10.0.9.x only the site's
+        assert timing.timeout_for("10.0.0.2") == pytest.approx(0.3)
+        assert 0.3 < timing.timeout_for("10.0.9.1") < 3
+        assert timing.timeout_for("10.1.0.1") == 2
+
+    def test_clamped(self):
+        """Estimates are kept within the configured bounds."""
+        timing = self._timing()
+        timing.observe("10.0.0.1", 0.1)
+        timing.observe("10.0.1.1", 60_000)
+
+        assert timing.timeout_for("10.0.0.2") == 0.05
+        assert timing.timeout_for("10.0.1.2") == 5
+
+    def test_ipv6(self):
+        """IPv6 addresses are keyed by /64, scope IDs ignored."""
+        timing = self._timing()
+        timing.observe("fe80::1%eth0", 10)
+
+        assert timing.timeout_for("fe80::2") == pytest.approx(0.05)
+        assert timing.timeout_for("not-an-ip") == 2
+
+    def test_timeout_for_hosts_takes_slowest(self):
+        """A chunk waits for its slowest subnet."""
+        timing = self._timing()
+        timing.observe("10.0.0.1", 100)
+
+        assert timing.timeout_for_hosts(["10.0.0.5"]) == pytest.approx(0.3)
+        assert timing.timeout_for_hosts(["10.0.0.5", "10.9.0.1"]) == 2
+        assert timing.timeout_for_hosts([]) == 2
+
+    def test_shared_across_threads(self):
+        """Concurrent sweeps sharing one estimator lose no samples."""
+        timing = self._timing()
+
+        def observe(subnet: int) -> None:
+            for _ in range(2000):
+                timing.observe(f"10.0.{subnet}.1", 100)
+                timing.timeout_for("10.0.0.1")
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(observe, range(8)))
+
+        # Every subnet shares the 10.0.0.0/16 site estimator
+        assert timing._estimators[(32, 16, 0x0A00)].samples == 16000
+
+    def test_seed(self):
+        """Seeding counts the samples and primes the estimates."""
+        timing = self._timing()
+
+        assert timing.seed([("10.0.0.1", 100), ("10.0.0.2", 100)]) == 2
+        assert timing.timeout_for("10.0.0.3") < 2
+
+    def test_config_defaults(self):
+        """Unspecified bounds come from config."""
+        set_config(
+            Config(scan_probe_timeout=3, scan_min_timeout=0.2, scan_max_timeout=7)
+        )
+        timing = AdaptiveTimeout()
+
+        assert (timing.initial, timing.min_timeout, timing.max_timeout) == (3, 0.2, 7)
+
+
+class TestAdaptiveSweep:
+    """Tests for iter_sweep with adaptive timing."""
+
+    def setup_method(self):
+        set_config(Config())
+
+    def teardown_method(self):
+        set_config(None)
+
+    def test_timeout_shrinks_after_replies(self):
+        """Later chunks should wait only as long as measured RTTs call for."""
+        timeouts = []
+
+        def backend(hosts, timeout, concurrency, progress):
+            timeouts.append(timeout)
+            return [ProbeResult(ip_address=ip, alive=True, rtt_ms=2.0) for ip in hosts]
+
+        timing = AdaptiveTimeout(initial=5, min_timeout=0.01)
+        hosts = [f"10.0.0.{i}" for i in range(1, 9)]
+        list(iter_sweep(hosts, backend, 5, 4, total=8, chunk_size=4, timing=timing))
+
+        assert timeouts[0] == 5
+        assert timeouts[1] < 0.05
+
+    def test_silence_keeps_timeout(self):
+        """Dead hosts alone never shorten the timeout."""
+        timeouts = []
+
+        def backend(hosts, timeout, concurrency, progress):
+            timeouts.append(timeout)
+            return [ProbeResult(ip_address=ip, alive=False) for ip in hosts]
+
+        timing = AdaptiveTimeout(initial=5)
+        hosts = [f"10.0.0.{i}" for i in range(1, 9)]
+        list(iter_sweep(hosts, backend, 5, 4, total=8, chunk_size=4, timing=timing))
+
+        assert timeouts == [5, 5]
@@ -147,7 +147,7 @@ class TestSnipeITClientHardware:
         assert total == 1
         assert isinstance(assets[0], Asset)
         assert assets[0].name == "Test Device"
-        assert assets[0].mac_address == "AA:BB:CC:DD:EE:FF"
+        assert str(assets[0].mac_address) == "AA:BB:CC:DD:EE:FF"
 
     def test_list_hardware_with_search(self, client, mock_response):
         """List hardware should pass search parameter."""
@@ -249,7 +249,7 @@ class TestSnipeITClientSearch:
             asset = client.search_by_mac("AA:BB:CC:DD:EE:FF")
 
         assert asset is not None
-        assert asset.mac_address == "AA:BB:CC:DD:EE:FF"
+        assert str(asset.mac_address) == "AA:BB:CC:DD:EE:FF"
 
     def test_search_by_mac_normalizes_format(self, client, mock_response):
         """Search by MAC should normalize MAC format."""
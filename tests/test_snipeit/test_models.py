@@ -1,5 +1,6 @@
 """Tests for Snipe-IT models."""
 
+import logging
 import pytest
 from datetime import datetime
 
@@ -62,7 +63,7 @@ class TestAsset:
         assert asset.manufacturer_name == "TP-Link"
         assert asset.location_id == 15
         assert asset.location_name == "Server Closet"
-        assert asset.mac_address == "AA:BB:CC:DD:EE:FF"
+        assert str(asset.mac_address) == "AA:BB:CC:DD:EE:FF"
         assert asset.ip_address == "192.168.1.1"
 
     def test_from_api_response_empty_custom_fields(self):
@@ -79,6 +80,22 @@ class TestAsset:
         assert asset.mac_address is None
         assert asset.ip_address is None
 
+    def test_from_api_response_invalid_mac(self, caplog):
+        """An unparseable MAC field is left unset, with a warning."""
+        data = {
+            "id": 1,
+            "name": "Test",
+            "asset_tag": "NET-000001",
+            "custom_fields": {"MAC Address": {"value": "see label"}},
+        }
+
+        with caplog.at_level(logging.WARNING):
+            asset = Asset.from_api_response(data)
+
+        assert asset.mac_address is None
+        assert "'see label'" in caplog.text
+        assert "NET-000001" in caplog.text
+
     def test_from_api_response_null_nested(self):
         """Asset should handle null nested objects."""
         data = {